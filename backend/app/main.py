@@ -2,6 +2,7 @@ from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, StreamingResponse
 from app.services.legacy_imports import add_legacy_to_syspath
+import asyncio
 import json
 import logging
 from datetime import datetime, timezone
@@ -20,10 +21,11 @@ from app.services.sku_list import (
     get_distinct_values,
     get_json_column_status,
     compute_json_column_for_all_skus,
+    iter_skus,
 )
 from app.services.image_listing import list_images_for_sku
 from app.services.image_serving import resolve_image_path
-from app.services.image_rotation import rotate_image, clear_image_cache
+from app.services.image_rotation import rotate_image, rotate_images_batch, clear_image_cache
 from app.services.image_deletion import delete_image
 from app.services.json_generation import check_json_exists, generate_json_for_sku
 from app.services.image_classification import classify_images
@@ -42,22 +44,26 @@ from app.services.ebay_category_ai import (
     detect_and_save_ebay_category_for_skus,
 )
 from app.services.ai_enrichment import enrich_sku_fields, enrich_multiple_skus
+from app.repositories import product_doc_store
 from app.repositories.sku_json_repo import read_sku_json
 from app.repositories.preferences_repo import get_sku_filter_state, save_sku_filter_state
 from app.services.folder_images_cache import get_last_update_time as get_folder_images_last_update
 from app.services.folder_images_computation import compute_folder_images_for_all_skus
-from app.services.ebay_listings_cache import get_last_update_time as get_ebay_listings_last_update, read_cache as read_ebay_cache, get_sku_has_listing, update_listing_price_in_cache, update_listing_to_auction_in_cache
+from app.services.ebay_listings_cache import get_last_update_time as get_ebay_listings_last_update, read_cache as read_ebay_cache, read_sync_state as read_ebay_sync_state, get_sku_has_listing, update_listing_price_in_cache, update_listing_to_auction_in_cache
 from app.services.ebay_category_search import search_ebay_categories
-from app.services.ebay_listings_computation import compute_ebay_listings_fast, compute_ebay_listings_detailed, recompute_cached_profit_analysis
+from app.services.ebay_listings_computation import compute_ebay_listings_fast, compute_ebay_listings_detailed, compute_ebay_listings_delta, recompute_cached_profit_analysis, simulate_cached_repricing
 from app.services.inventory_json_db_importer import update_db_from_jsons
+from app.services.excel_inventory import excel_inventory
 from app.services.excel_to_json_updater import update_jsons_from_excel
 from app.services.excel_to_db_sync import get_excel_sheets, get_excel_columns, sync_excel_to_db, add_missing_sku_rows_from_excel, refresh_category_mapping_from_excel
 from app.services.db_to_excel_sync import sync_db_to_excel
 from app.services.inventory_cleanup import cleanup_duplicate_skus
 from app.services.change_log import append_product_change_log
+from app.services.event_loop_monitor import start_monitor_from_env
+from app.services.tabular_export import EXPORT_FORMATS, MEDIA_TYPES, flatten_record, iter_export
 
 # Import eBay services
-from app.services import ebay_schema, ebay_enrichment, ebay_listing, ebay_sync
+from app.services import ebay_schema, ebay_enrichment, ebay_listing, ebay_listing_batch, ebay_sync
 
 # Import models
 from app.models.sku_list import (
@@ -73,6 +79,7 @@ from app.models.sku_list import (
 )
 from app.models.image_operations import (
     ImageRotateRequest, ImageRotateResponse, 
+    BatchImageRotateRequest, BatchImageRotateResponse,
     JsonStatusResponse, JsonGenerateResponse, 
     SkuDetailResponse
 )
@@ -177,6 +184,12 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+async def start_event_loop_stall_monitor():
+    """Debug guard: log event-loop stalls when EVENT_LOOP_STALL_THRESHOLD_MS is set"""
+    app.state.event_loop_monitor = start_monitor_from_env()
+
+
 @app.get("/health")
 def health():
     """Health check endpoint"""
@@ -265,12 +278,16 @@ def get_skus(
     filters: str | None = Query(None, description="JSON string of column filters"),
     sort_by: str | None = Query(None, description="Column name to sort by"),
     sort_dir: str = Query("asc", description="Sort direction: asc or desc"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (keyset pagination)"),
 ):
     """
     List SKUs with per-column filtering support.
     
     filters format: JSON list of {column, value, operator} objects
     Example: [{"column": "Brand", "value": "Nike", "operator": "equals"}]
+
+    Pass the returned next_cursor together with page+1 to fetch the next page
+    without OFFSET scanning; stale cursors fall back to `page`.
     """
     # Parse columns parameter if provided
     columns_list = None
@@ -292,13 +309,46 @@ def get_skus(
         columns=columns_list,
         sort_by=sort_by,
         sort_dir=sort_dir,
+        cursor=cursor,
     )
     return SkuListResponse(
         page=data["page"],
         page_size=data["page_size"],
         total=data["total"],
         items=data["items"],
-        available_columns=data.get("available_columns")
+        available_columns=data.get("available_columns"),
+        next_cursor=data.get("next_cursor"),
+    )
+
+
+@app.get("/api/skus/export")
+def export_skus(
+    columns: str | None = Query(None, description="Comma-separated column names to include"),
+    filters: str | None = Query(None, description="JSON string of column filters"),
+    sort_by: str | None = Query(None, description="Column name to sort by"),
+    sort_dir: str = Query("asc", description="Sort direction: asc or desc"),
+    format: str = Query("csv", description="csv or xlsx"),
+):
+    """Stream all SKUs matching the /api/skus filters as CSV or XLSX."""
+    fmt = (format or "csv").strip().lower()
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(EXPORT_FORMATS)}")
+
+    columns_list = [col.strip() for col in columns.split(",") if col.strip()] if columns else get_available_columns()
+
+    filters_list = None
+    if filters:
+        try:
+            filters_list = json.loads(filters)
+        except json.JSONDecodeError:
+            filters_list = None
+
+    rows = iter_skus(filters=filters_list, columns=columns_list, sort_by=sort_by, sort_dir=sort_dir)
+    filename = f"skus_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+    return StreamingResponse(
+        iter_export(fmt, columns_list, rows, sheet_title="SKUs"),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
@@ -429,6 +479,16 @@ def rotate_image_endpoint(
     return ImageRotateResponse(**result)
 
 
+@app.post("/api/images/rotate-batch", response_model=BatchImageRotateResponse)
+def rotate_images_batch_endpoint(request: BatchImageRotateRequest):
+    """Rotate multiple images across multiple SKUs on a worker pool"""
+    result = rotate_images_batch(
+        images=[img.model_dump() for img in request.images],
+        degrees=request.degrees,
+    )
+    return BatchImageRotateResponse(**result)
+
+
 @app.delete("/api/images/{sku}/{filename}")
 def delete_image_endpoint(sku: str, filename: str):
     """Delete an image from folder and metadata"""
@@ -798,7 +858,7 @@ def get_ai_config():
 def get_distinct(
     column: str = Query(..., description="Column name"),
     limit: int = Query(200, ge=1, le=1000),
-    q: str | None = Query(None, description="Optional substring filter (case-insensitive)"),
+    q: str | None = Query(None, description="Optional filter: prefix of the value or of a word in it (case-insensitive)"),
 ):
     """Get distinct values for a column for multi-select UIs."""
     meta = get_available_columns()
@@ -912,18 +972,42 @@ def refresh_ebay_schemas(request: EbaySchemaRefreshRequest):
         
         refreshed = result.get("refreshed", [])
         failed = result.get("failed", [])
+        changed = result.get("changed", [])
         
         return EbaySchemaRefreshResponse(
             success=len(failed) == 0,
             refreshed_count=len(refreshed),
             failed_count=len(failed),
+            changed_count=len(changed),
+            changed=changed,
             details=refreshed + failed,
-            message=f"Refreshed {len(refreshed)} schemas, {len(failed)} failed"
+            message=f"Refreshed {len(refreshed)} schemas ({len(changed)} changed), {len(failed)} failed"
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/ebay/schemas/refresh/stream")
+def refresh_ebay_schemas_stream(request: EbaySchemaRefreshRequest):
+    """Refresh eBay schemas from API, streaming each category's result as it finishes."""
+    def event_stream():
+        try:
+            for event in ebay_schema.iter_refresh_schemas(category_ids=request.category_ids, force=request.force):
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            ebay_schema.logger.exception("Schema refresh stream failed: %s", e)
+            yield f"data: {json.dumps({'type': 'error', 'message': str(e)}, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
 # ============================================================
 # eBay Field Enrichment Endpoints
 # ============================================================
@@ -1174,7 +1258,8 @@ async def get_ebay_fields_for_sku(sku: str):
         logger = logging.getLogger(__name__)
         
         logger.info(f"Getting eBay fields for SKU: {sku}")
-        product_json = read_sku_json(sku)
+        # File read + JSON parse off the event loop
+        product_json = await asyncio.to_thread(read_sku_json, sku)
         if not product_json:
             logger.warning(f"No JSON found for SKU {sku}")
             return {
@@ -1341,19 +1426,20 @@ async def get_ebay_fields_for_sku(sku: str):
 def save_ebay_fields_for_sku(sku: str, request: dict):
     """Save eBay fields to SKU JSON file"""
     try:
-        from app.repositories.sku_json_repo import read_sku_json, write_sku_json
-        
-        product_json = read_sku_json(sku)
-        if not product_json:
-            raise HTTPException(status_code=404, detail=f"No JSON found for SKU {sku}")
-        
-        # Update eBay Fields with new structured format
-        product_json["eBay Fields"] = {
-            "required": request.get("required_fields", {}),
-            "optional": request.get("optional_fields", {})
-        }
+        from app.repositories.sku_json_repo import read_sku_json, sku_lock, write_sku_json
         
-        write_sku_json(sku, product_json)
+        with sku_lock(sku):
+            product_json = read_sku_json(sku)
+            if not product_json:
+                raise HTTPException(status_code=404, detail=f"No JSON found for SKU {sku}")
+            
+            # Update eBay Fields with new structured format
+            product_json["eBay Fields"] = {
+                "required": request.get("required_fields", {}),
+                "optional": request.get("optional_fields", {})
+            }
+            
+            write_sku_json(sku, product_json)
         
         return {
             "success": True,
@@ -1431,23 +1517,24 @@ def get_ebay_seo_fields_for_sku(sku: str):
 def save_ebay_seo_fields_for_sku(sku: str, request: dict):
     """Save eBay SEO fields to SKU JSON file."""
     try:
-        from app.repositories.sku_json_repo import read_sku_json, write_sku_json
+        from app.repositories.sku_json_repo import read_sku_json, sku_lock, write_sku_json
 
-        product_json = read_sku_json(sku)
-        if not product_json:
-            raise HTTPException(status_code=404, detail=f"No JSON found for SKU {sku}")
+        with sku_lock(sku):
+            product_json = read_sku_json(sku)
+            if not product_json:
+                raise HTTPException(status_code=404, detail=f"No JSON found for SKU {sku}")
 
-        if "eBay SEO" not in product_json or not isinstance(product_json.get("eBay SEO"), dict):
-            product_json["eBay SEO"] = {}
+            if "eBay SEO" not in product_json or not isinstance(product_json.get("eBay SEO"), dict):
+                product_json["eBay SEO"] = {}
 
-        seo_section = product_json["eBay SEO"]
-        seo_section["Product Type"] = request.get("product_type", "")
-        seo_section["Product Model"] = request.get("product_model", "")
-        seo_section["Keyword 1"] = request.get("keyword_1", "")
-        seo_section["Keyword 2"] = request.get("keyword_2", "")
-        seo_section["Keyword 3"] = request.get("keyword_3", "")
+            seo_section = product_json["eBay SEO"]
+            seo_section["Product Type"] = request.get("product_type", "")
+            seo_section["Product Model"] = request.get("product_model", "")
+            seo_section["Keyword 1"] = request.get("keyword_1", "")
+            seo_section["Keyword 2"] = request.get("keyword_2", "")
+            seo_section["Keyword 3"] = request.get("keyword_3", "")
 
-        write_sku_json(sku, product_json)
+            write_sku_json(sku, product_json)
 
         return {
             "success": True,
@@ -1543,18 +1630,19 @@ def get_ebay_listing_data(sku: str):
 def save_ebay_listing_data(sku: str, request: dict):
     """Save eBay listing data for a SKU."""
     try:
-        from app.repositories.sku_json_repo import read_sku_json, write_sku_json
+        from app.repositories.sku_json_repo import read_sku_json, sku_lock, write_sku_json
 
-        product_json = read_sku_json(sku)
-        if not product_json:
-            raise HTTPException(status_code=404, detail=f"No JSON found for SKU {sku}")
+        with sku_lock(sku):
+            product_json = read_sku_json(sku)
+            if not product_json:
+                raise HTTPException(status_code=404, detail=f"No JSON found for SKU {sku}")
 
-        data = request.get("data", {}) if isinstance(request, dict) else {}
-        if not isinstance(data, dict):
-            raise HTTPException(status_code=400, detail="Invalid data payload")
+            data = request.get("data", {}) if isinstance(request, dict) else {}
+            if not isinstance(data, dict):
+                raise HTTPException(status_code=400, detail="Invalid data payload")
 
-        _apply_ebay_listing_updates(product_json, data)
-        write_sku_json(sku, product_json)
+            _apply_ebay_listing_updates(product_json, data)
+            write_sku_json(sku, product_json)
         append_product_change_log(
             sku,
             "ebay_listing_save",
@@ -1576,7 +1664,7 @@ def save_ebay_listing_data(sku: str, request: dict):
 @app.post("/api/ebay/listing/bulk-update", response_model=EbayListingBulkUpdateResponse)
 def bulk_update_ebay_listing_data(request: EbayListingBulkUpdateRequest):
     """Bulk update eBay listing data for multiple SKUs."""
-    from app.repositories.sku_json_repo import read_sku_json, write_sku_json
+    from app.repositories.sku_json_repo import read_sku_json, sku_lock, write_sku_json
 
     updated = 0
     failed = 0
@@ -1584,33 +1672,34 @@ def bulk_update_ebay_listing_data(request: EbayListingBulkUpdateRequest):
 
     for sku in request.skus:
         try:
-            product_json = read_sku_json(sku)
-            if not product_json:
-                raise ValueError("No JSON found")
-
-            current = _read_ebay_listing_data(product_json)
-
-            set_updates = request.set or {}
-            adjust_updates = request.adjust or {}
-
-            merged = dict(current)
-            for key, value in set_updates.items():
-                if value is None or value == "":
-                    continue
-                merged[key] = value
-
-            for key, delta in adjust_updates.items():
-                if delta is None:
-                    continue
-                if key in ("price", "shipping_costs_net"):
-                    base = float(str(merged.get(key) or 0).replace(",", "."))
-                    merged[key] = f"{base + float(delta):.2f}"
-                elif key == "quantity":
-                    base = int(float(str(merged.get(key) or 0).replace(",", ".")))
-                    merged[key] = str(max(0, base + int(delta)))
-
-            _apply_ebay_listing_updates(product_json, merged)
-            write_sku_json(sku, product_json)
+            with sku_lock(sku):
+                product_json = read_sku_json(sku)
+                if not product_json:
+                    raise ValueError("No JSON found")
+
+                current = _read_ebay_listing_data(product_json)
+
+                set_updates = request.set or {}
+                adjust_updates = request.adjust or {}
+
+                merged = dict(current)
+                for key, value in set_updates.items():
+                    if value is None or value == "":
+                        continue
+                    merged[key] = value
+
+                for key, delta in adjust_updates.items():
+                    if delta is None:
+                        continue
+                    if key in ("price", "shipping_costs_net"):
+                        base = float(str(merged.get(key) or 0).replace(",", "."))
+                        merged[key] = f"{base + float(delta):.2f}"
+                    elif key == "quantity":
+                        base = int(float(str(merged.get(key) or 0).replace(",", ".")))
+                        merged[key] = str(max(0, base + int(delta)))
+
+                _apply_ebay_listing_updates(product_json, merged)
+                write_sku_json(sku, product_json)
             append_product_change_log(
                 sku,
                 "ebay_listing_bulk_update",
@@ -1636,7 +1725,7 @@ def bulk_update_ebay_listing_data(request: EbayListingBulkUpdateRequest):
 @app.post("/api/ebay/listing/bulk-save", response_model=EbayListingBulkSaveResponse)
 def bulk_save_ebay_listing_data(request: EbayListingBulkSaveRequest):
     """Save listing draft fields per SKU."""
-    from app.repositories.sku_json_repo import read_sku_json, write_sku_json
+    from app.repositories.sku_json_repo import read_sku_json, sku_lock, write_sku_json
 
     updated = 0
     failed = 0
@@ -1644,14 +1733,15 @@ def bulk_save_ebay_listing_data(request: EbayListingBulkSaveRequest):
 
     for sku, updates in (request.listings or {}).items():
         try:
-            product_json = read_sku_json(sku)
-            if not product_json:
-                raise ValueError("No JSON found")
-            if not isinstance(updates, dict):
-                raise ValueError("Invalid listing data")
-
-            _apply_ebay_listing_updates(product_json, updates)
-            write_sku_json(sku, product_json)
+            with sku_lock(sku):
+                product_json = read_sku_json(sku)
+                if not product_json:
+                    raise ValueError("No JSON found")
+                if not isinstance(updates, dict):
+                    raise ValueError("Invalid listing data")
+
+                _apply_ebay_listing_updates(product_json, updates)
+                write_sku_json(sku, product_json)
             append_product_change_log(
                 sku,
                 "ebay_listing_bulk_save",
@@ -1702,33 +1792,34 @@ def get_ebay_image_orders(sku: str):
 def save_ebay_image_orders(sku: str, request: dict):
     """Save eBay image orders for a SKU"""
     try:
-        from app.repositories.sku_json_repo import read_sku_json, write_sku_json
-        
-        product_json = read_sku_json(sku)
-        if not product_json:
-            raise HTTPException(status_code=404, detail=f"No JSON found for SKU {sku}")
-        
-        orders = request.get("orders", {})
-        
-        # Ensure Images section exists
-        if "Images" not in product_json:
-            product_json["Images"] = {}
-        
-        # Build eBay Images array from orders dict
-        ebay_images = []
-        for filename, order in orders.items():
-            ebay_images.append({
-                "filename": filename,
-                "order": order,
-                "eBay URL": ""  # Will be filled when uploaded to eBay
-            })
+        from app.repositories.sku_json_repo import read_sku_json, sku_lock, write_sku_json
         
-        # Sort by order
-        ebay_images.sort(key=lambda x: x["order"])
-        
-        product_json["Images"]["eBay Images"] = ebay_images
-        
-        write_sku_json(sku, product_json)
+        with sku_lock(sku):
+            product_json = read_sku_json(sku)
+            if not product_json:
+                raise HTTPException(status_code=404, detail=f"No JSON found for SKU {sku}")
+            
+            orders = request.get("orders", {})
+            
+            # Ensure Images section exists
+            if "Images" not in product_json:
+                product_json["Images"] = {}
+            
+            # Build eBay Images array from orders dict
+            ebay_images = []
+            for filename, order in orders.items():
+                ebay_images.append({
+                    "filename": filename,
+                    "order": order,
+                    "eBay URL": ""  # Will be filled when uploaded to eBay
+                })
+            
+            # Sort by order
+            ebay_images.sort(key=lambda x: x["order"])
+            
+            product_json["Images"]["eBay Images"] = ebay_images
+            
+            write_sku_json(sku, product_json)
         
         return {
             "success": True,
@@ -1864,24 +1955,19 @@ def create_ebay_listing(request: CreateListingRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@app.post("/api/ebay/listings/batch", response_model=BatchCreateListingResponse)
-def create_ebay_listings_batch(request: BatchCreateListingRequest):
-    """Create multiple eBay listings"""
+def _start_listing_batch(request: BatchCreateListingRequest, endpoint: str):
     batch_id = uuid4().hex[:10]
     ebay_listing.logger.info(
-        "[BATCH %s] /api/ebay/listings/batch received: total=%s stop_on_error=%s",
+        "[BATCH %s] %s received: total=%s stop_on_error=%s generate_condition_descriptions=%s",
         batch_id,
+        endpoint,
         len(request.listings or []),
         bool(request.stop_on_error),
+        bool(request.generate_condition_descriptions),
     )
-
-    results = []
-    successful = 0
-    failed = 0
-    
     for idx, listing_req in enumerate(request.listings or [], start=1):
         ebay_listing.logger.info(
-            "[BATCH %s] Processing %s/%s sku=%s price=%s qty=%s condition_id=%s schedule_days=%s has_ean=%s has_modified_sku=%s",
+            "[BATCH %s] Queued %s/%s sku=%s price=%s qty=%s condition_id=%s schedule_days=%s has_ean=%s has_modified_sku=%s",
             batch_id,
             idx,
             len(request.listings or []),
@@ -1893,89 +1979,62 @@ def create_ebay_listings_batch(request: BatchCreateListingRequest):
             bool((listing_req.ean or "").strip() if isinstance(listing_req.ean, str) else listing_req.ean),
             bool((listing_req.ebay_sku or "").strip() if isinstance(listing_req.ebay_sku, str) else listing_req.ebay_sku),
         )
-        try:
-            result = ebay_listing.create_listing(
-                sku=listing_req.sku,
-                price=listing_req.price,
-                condition_id=listing_req.condition_id,
-                condition_description=listing_req.condition_description,
-                schedule_days=listing_req.schedule_days,
-                payment_policy=listing_req.payment_policy,
-                return_policy=listing_req.return_policy,
-                shipping_policy=listing_req.shipping_policy,
-                custom_description=listing_req.custom_description,
-                best_offer_enabled=listing_req.best_offer_enabled,
-                quantity=listing_req.quantity,
-                ebay_sku=listing_req.ebay_sku,
-                ean=listing_req.ean
-            )
-            results.append(CreateListingResponse(**result))
-            
-            if result.get("success"):
-                successful += 1
-                ebay_listing.logger.info(
-                    "[BATCH %s] SUCCESS sku=%s item_id=%s",
-                    batch_id,
-                    listing_req.sku,
-                    result.get("item_id"),
-                )
-            else:
-                failed += 1
-                ebay_listing.logger.error(
-                    "[BATCH %s] FAILED sku=%s message=%s errors=%s",
-                    batch_id,
-                    listing_req.sku,
-                    result.get("message"),
-                    result.get("errors"),
-                )
-                if request.stop_on_error:
-                    ebay_listing.logger.warning(
-                        "[BATCH %s] stop_on_error triggered after sku=%s",
-                        batch_id,
-                        listing_req.sku,
-                    )
-                    break
-        except Exception as e:
-            ebay_listing.logger.exception(
-                "[BATCH %s] EXCEPTION sku=%s: %s",
-                batch_id,
-                listing_req.sku,
-                e,
-            )
-            results.append(CreateListingResponse(
-                success=False,
-                sku=listing_req.sku,
-                message=f"Error: {str(e)}",
-                errors=[str(e)]
-            ))
-            failed += 1
-            if request.stop_on_error:
-                ebay_listing.logger.warning(
-                    "[BATCH %s] stop_on_error triggered by exception at sku=%s",
-                    batch_id,
-                    listing_req.sku,
-                )
-                break
+    return ebay_listing_batch.run_listing_batch(
+        [listing_req.model_dump() for listing_req in request.listings or []],
+        stop_on_error=bool(request.stop_on_error),
+        generate_condition_descriptions=bool(request.generate_condition_descriptions),
+        batch_id=batch_id,
+    )
 
-    response = BatchCreateListingResponse(
+
+@app.post("/api/ebay/listings/batch", response_model=BatchCreateListingResponse)
+def create_ebay_listings_batch(request: BatchCreateListingRequest):
+    """Create multiple eBay listings (stages pipelined across SKUs)"""
+    summary = {}
+    for event in _start_listing_batch(request, "/api/ebay/listings/batch"):
+        if event["type"] == "complete":
+            summary = event
+
+    successful = summary.get("successful", 0)
+    failed = summary.get("failed", 0)
+    return BatchCreateListingResponse(
         success=successful > 0,
         total_count=len(request.listings),
         successful_count=successful,
         failed_count=failed,
-        results=results,
+        results=[CreateListingResponse(**result) for result in summary.get("results", [])],
         message=f"Created {successful} listings, {failed} failed"
     )
 
-    ebay_listing.logger.info(
-        "[BATCH %s] Completed: success=%s total=%s successful=%s failed=%s",
-        batch_id,
-        bool(response.success),
-        response.total_count,
-        response.successful_count,
-        response.failed_count,
-    )
 
-    return response
+@app.post("/api/ebay/listings/batch/stream")
+def create_ebay_listings_batch_stream(request: BatchCreateListingRequest):
+    """Create multiple eBay listings, streaming each SKU's result as it finishes."""
+    if not request.listings:
+        raise HTTPException(status_code=400, detail="At least one listing required")
+
+    events = _start_listing_batch(request, "/api/ebay/listings/batch/stream")
+
+    def event_stream():
+        try:
+            for event in events:
+                if event["type"] == "result":
+                    event = dict(event, result=CreateListingResponse(**event["result"]).model_dump())
+                elif event["type"] == "complete":
+                    event = dict(event, results=[CreateListingResponse(**r).model_dump() for r in event["results"]])
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            ebay_listing.logger.exception("Batch listing stream failed: %s", e)
+            yield f"data: {json.dumps({'type': 'error', 'message': str(e)}, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
 
 
 # ============================================================
@@ -1998,6 +2057,12 @@ def get_json_column_compute_status():
     return get_json_column_status()
 
 
+@app.get("/api/inventory/snapshot/status")
+def get_inventory_snapshot_status():
+    """Rows, loaded columns, dtypes and memory footprint of the in-memory inventory snapshot."""
+    return excel_inventory.memory_usage()
+
+
 @app.get("/api/skus/json/compute")
 def compute_json_column():
     """Recompute Json column values for all SKUs in inventory_fast cache."""
@@ -2027,10 +2092,13 @@ def get_ebay_listings_status():
     last_update = get_ebay_listings_last_update()
     cache = read_ebay_cache()
     count = len(cache.get('listings', [])) if cache else 0
+    sync_state = read_ebay_sync_state() or {}
     return {
         "last_update": last_update,
         "has_cache": last_update is not None,
-        "listings_count": count
+        "listings_count": count,
+        "last_sync": sync_state.get("synced_at"),
+        "last_sync_mode": sync_state.get("mode"),
     }
 
 
@@ -2056,8 +2124,17 @@ def _extract_lookup_sku(raw_sku):
     return sku_value
 
 
-def _get_listing_sku_json_mapping(raw_sku):
-    """Map count_main_images and eBay SEO fields from SKU JSON."""
+# Parts of the SKU JSON used by _get_listing_sku_json_mapping (fetched in bulk from the doc store)
+LISTING_SKU_JSON_PATHS = ("Images.main_images", "OP", "eBay SEO", "System Logs.Change Log")
+
+
+def _get_listing_sku_json_mapping(raw_sku, documents=None):
+    """Map count_main_images and eBay SEO fields from SKU JSON.
+
+    documents: optional {sku: partial product JSON} prefetched with
+    product_doc_store.get_sections(..., LISTING_SKU_JSON_PATHS); SKUs missing
+    from it have no JSON. Without it the SKU's file is read.
+    """
     mapped = {
         "count_main_images": None,
         "op": None,
@@ -2083,7 +2160,10 @@ def _get_listing_sku_json_mapping(raw_sku):
         return mapped
 
     try:
-        sku_json = read_sku_json(lookup_sku)
+        if documents is not None:
+            sku_json = documents.get(lookup_sku)
+        else:
+            sku_json = read_sku_json(lookup_sku)
         if not sku_json:
             return mapped
 
@@ -2165,23 +2245,20 @@ def _get_listing_sku_json_mapping(raw_sku):
     return mapped
 
 
-@app.get("/api/ebay-cache/de-listings")
-def get_de_ebay_listings(
-    page: int = Query(1, ge=1),
-    limit: int = Query(200, ge=10, le=500),
-    search_sku: str = Query(""),
-    search_title: str = Query(""),
-    min_price: float = Query(0, ge=0),
-    max_price: float = Query(999999, ge=0),
-    min_profit_margin: float = Query(-999999),
-    max_profit_margin: float = Query(999999),
-    listing_status: str = Query(""),
-    condition: str = Query(""),
-    sort_by: str = Query("sku"),  # sku, price, profit_margin, date
-    sort_order: str = Query("asc"),  # asc, desc
-    column_filters: str = Query("{}"),  # JSON string containing per-column filters
-):
-    """Get DE marketplace eBay listings with filters and pagination"""
+def _filter_de_listings(
+    search_sku: str = "",
+    search_title: str = "",
+    min_price: float = 0,
+    max_price: float = 999999,
+    min_profit_margin: float = -999999,
+    max_profit_margin: float = 999999,
+    listing_status: str = "",
+    condition: str = "",
+    sort_by: str = "sku",
+    sort_order: str = "asc",
+    column_filters: str = "{}",
+) -> list:
+    """Filter, enrich and sort DE marketplace listings from the cache (shared by list and export)."""
     import json
     import re
     from datetime import datetime
@@ -2231,10 +2308,14 @@ def get_de_ebay_listings(
     # (so column filters can use count_main_images and eBay SEO fields)
     from datetime import timezone as _tz
     _now_utc = datetime.now(_tz.utc)
+    sku_documents = None
+    if product_doc_store.is_enabled():
+        lookup_skus = {_extract_lookup_sku(listing.get("sku")) for listing in de_listings}
+        sku_documents = product_doc_store.get_sections(lookup_skus, LISTING_SKU_JSON_PATHS)
     enriched_listings = []
     for listing in de_listings:
         listing_copy = dict(listing)
-        listing_copy.update(_get_listing_sku_json_mapping(listing.get("sku")))
+        listing_copy.update(_get_listing_sku_json_mapping(listing.get("sku"), sku_documents))
 
         title_value = str(listing_copy.get("title") or "").strip()
         seo_title_value = str(listing_copy.get("ebay_seo_title") or "").strip()
@@ -2364,6 +2445,40 @@ def get_de_ebay_listings(
             reverse=(sort_order == "desc")
         )
     
+    return de_listings
+
+
+@app.get("/api/ebay-cache/de-listings")
+def get_de_ebay_listings(
+    page: int = Query(1, ge=1),
+    limit: int = Query(200, ge=10, le=500),
+    search_sku: str = Query(""),
+    search_title: str = Query(""),
+    min_price: float = Query(0, ge=0),
+    max_price: float = Query(999999, ge=0),
+    min_profit_margin: float = Query(-999999),
+    max_profit_margin: float = Query(999999),
+    listing_status: str = Query(""),
+    condition: str = Query(""),
+    sort_by: str = Query("sku"),  # sku, price, profit_margin, date
+    sort_order: str = Query("asc"),  # asc, desc
+    column_filters: str = Query("{}"),  # JSON string containing per-column filters
+):
+    """Get DE marketplace eBay listings with filters and pagination"""
+    de_listings = _filter_de_listings(
+        search_sku=search_sku,
+        search_title=search_title,
+        min_price=min_price,
+        max_price=max_price,
+        min_profit_margin=min_profit_margin,
+        max_profit_margin=max_profit_margin,
+        listing_status=listing_status,
+        condition=condition,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        column_filters=column_filters,
+    )
+
     # Paginate
     total = len(de_listings)
     start = (page - 1) * limit
@@ -2378,6 +2493,59 @@ def get_de_ebay_listings(
         "listings": paginated
     }
 
+@app.get("/api/ebay-cache/de-listings/export")
+def export_de_ebay_listings(
+    search_sku: str = Query(""),
+    search_title: str = Query(""),
+    min_price: float = Query(0, ge=0),
+    max_price: float = Query(999999, ge=0),
+    min_profit_margin: float = Query(-999999),
+    max_profit_margin: float = Query(999999),
+    listing_status: str = Query(""),
+    condition: str = Query(""),
+    sort_by: str = Query("sku"),  # sku, price, profit_margin, date
+    sort_order: str = Query("asc"),  # asc, desc
+    column_filters: str = Query("{}"),  # JSON string containing per-column filters
+    format: str = Query("csv", description="csv or xlsx"),
+    columns: str | None = Query(None, description="Comma-separated (dotted) fields to export; default: all"),
+):
+    """Stream the filtered DE listings (same filters as /api/ebay-cache/de-listings) as CSV or XLSX."""
+    fmt = (format or "csv").strip().lower()
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(EXPORT_FORMATS)}")
+
+    de_listings = _filter_de_listings(
+        search_sku=search_sku,
+        search_title=search_title,
+        min_price=min_price,
+        max_price=max_price,
+        min_profit_margin=min_profit_margin,
+        max_profit_margin=max_profit_margin,
+        listing_status=listing_status,
+        condition=condition,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        column_filters=column_filters,
+    )
+
+    if columns:
+        export_columns = [c.strip() for c in columns.split(",") if c.strip()]
+    else:
+        # Union of flattened fields in first-seen order (no flattened rows are kept)
+        seen: dict = {}
+        for listing in de_listings:
+            for key in flatten_record(listing):
+                seen.setdefault(key, None)
+        export_columns = list(seen)
+
+    rows = (flatten_record(listing) for listing in de_listings)
+    filename = f"ebay_de_listings_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+    return StreamingResponse(
+        iter_export(fmt, export_columns, rows, sheet_title="DE Listings"),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
 
 @app.get("/api/skus/ebay-listings/has")
 def get_ebay_listings_has(skus: str = Query("", description="Comma-separated SKUs to check")):
@@ -2490,27 +2658,25 @@ def cleanup_duplicates_endpoint():
 @app.get("/api/debug/db-tables")
 def debug_db_tables():
     """DEBUG: Show database table structure"""
-    import sqlite3
+    from app.repositories.sqlite_db import connection
     from app.services.config import Config
     config = Config()
     
     db_path = config.DATABASE_PATH or config.LEGACY_DB_PATH
-    conn = sqlite3.connect(db_path)
-    
-    # Get all tables
-    tables = conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
     result = {}
+    with connection(db_path) as conn:
+        # Get all tables
+        tables = conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
+        
+        for (table_name,) in tables:
+            # Get columns for each table
+            cols = conn.execute(f"PRAGMA table_info({table_name})").fetchall()
+            row_count = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+            result[table_name] = {
+                "columns": [col[1] for col in cols],  # col[1] is column name
+                "row_count": row_count
+            }
     
-    for (table_name,) in tables:
-        # Get columns for each table
-        cols = conn.execute(f"PRAGMA table_info({table_name})").fetchall()
-        row_count = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
-        result[table_name] = {
-            "columns": [col[1] for col in cols],  # col[1] is column name
-            "row_count": row_count
-        }
-    
-    conn.close()
     return result
 
 
@@ -2548,6 +2714,23 @@ def compute_ebay_listings_detailed_endpoint():
     )
 
 
+@app.get("/api/skus/ebay-listings/compute-delta")
+def compute_ebay_listings_delta_endpoint():
+    """Delta sync eBay listings (only items modified since the last sync) with SSE progress updates"""
+    def event_stream():
+        for progress in compute_ebay_listings_delta():
+            yield f"data: {json.dumps(progress)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
 @app.post("/api/skus/ebay-listings/recompute-profit")
 def recompute_ebay_listings_profit_endpoint():
     """Recalculate profit_analysis for all cached eBay listings (no API fetch)."""
@@ -2557,6 +2740,23 @@ def recompute_ebay_listings_profit_endpoint():
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.get("/api/skus/ebay-listings/profit-what-if")
+def simulate_ebay_listings_repricing_endpoint(
+    price_multiplier: float = Query(1.0, description="New price = price * price_multiplier + price_delta"),
+    price_delta: float = Query(0.0),
+    include_listings: bool = Query(False),
+):
+    """Repricing what-if over all cached eBay listings (nothing is saved)."""
+    try:
+        return simulate_cached_repricing(
+            price_multiplier=price_multiplier,
+            price_delta=price_delta,
+            include_listings=include_listings,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.post("/api/ebay/sync/listings", response_model=SyncListingsResponse)
 def sync_ebay_listings(request: SyncListingsRequest):
     """Fetch active eBay listings"""
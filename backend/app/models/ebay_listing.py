@@ -137,6 +137,7 @@ class BatchCreateListingRequest(BaseModel):
     """Request to create multiple listings"""
     listings: List[CreateListingRequest]
     stop_on_error: bool = False
+    generate_condition_descriptions: bool = Field(default=False, description="AI-generate missing condition descriptions for non-new items")
 
 
 class BatchCreateListingResponse(BaseModel):
@@ -54,5 +54,7 @@ class EbaySchemaRefreshResponse(BaseModel):
     success: bool
     refreshed_count: int
     failed_count: int
+    changed_count: int = 0
+    changed: List[str] = []  # Category IDs whose schema file changed
     details: List[Dict[str, Any]]  # List of {category_id, status, message}
     message: str
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 
 class ImageRotateRequest(BaseModel):
@@ -16,6 +16,28 @@ class ImageRotateResponse(BaseModel):
     sku: str
     filename: str
     degrees: int
+    method: Optional[str] = Field(None, description="lossless | pixels | none (batch rotations that cancel out)")
+
+
+class ImageRotateReference(BaseModel):
+    """Single image in a batch rotation; degrees overrides the batch default"""
+    sku: str
+    filename: str
+    degrees: Optional[int] = None
+
+
+class BatchImageRotateRequest(BaseModel):
+    """Request to rotate many images at once"""
+    images: List[ImageRotateReference]
+    degrees: int = Field(90, description="Default rotation degrees: 90, 180, or 270")
+
+
+class BatchImageRotateResponse(BaseModel):
+    """Response after rotating many images"""
+    success: bool
+    message: str
+    processed_count: int
+    results: List[ImageRotateResponse]
 
 
 class JsonStatusResponse(BaseModel):
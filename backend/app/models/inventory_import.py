@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -14,4 +14,6 @@ class InventoryImportResponse(BaseModel):
     processed: int = 0
     updated: int = 0
     appended: int = 0
+    column_changes: Dict[str, int] = Field(default_factory=dict, description="Rows changed per column")
+    timings: Dict[str, float] = Field(default_factory=dict, description="Seconds per import phase")
     message: str
\ No newline at end of file
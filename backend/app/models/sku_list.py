@@ -30,6 +30,7 @@ class SkuListResponse(BaseModel):
     total: int
     items: List[Dict[str, Any]]
     available_columns: List[str] | None = None
+    next_cursor: str | None = None  # pass as `cursor` to fetch the following page
 
 
 class SkuColumnsResponse(BaseModel):
@@ -100,6 +101,9 @@ class ColumnMeta(BaseModel):
     type: ColumnType
     operators: List[str]
     enum_values: List[str] | None = None
+    distinct_count: int | None = None
+    min_value: float | None = None
+    max_value: float | None = None
 
 
 class SkuColumnMetaResponse(BaseModel):
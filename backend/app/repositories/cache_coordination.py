@@ -0,0 +1,275 @@
+"""
+Cross-process coordination for in-memory and derived caches
+
+Every uvicorn worker keeps its own module-level caches. This module keeps one
+row per named cache in legacy/cache/cache_state.db so the workers can agree on
+what is current:
+
+- generation: bumped whenever the cache's source changes (bump()). A worker
+  compares it with the generation its copy was built from (GenerationWatch)
+  and drops/reloads its copy when they differ, so invalidating in one worker
+  invalidates everywhere.
+- built_at / meta: when the shared artefact was last built or revalidated and
+  small metadata other workers need to use it without rebuilding (e.g. the
+  inventory_fast facets).
+- lease: rebuild_lease() lets exactly one worker rebuild a shared artefact;
+  the others wait for it to finish and then revalidate instead of rebuilding.
+  Leases expire after ttl_seconds so a crashed worker cannot block others.
+
+Coordination is best effort: if cache_state.db cannot be used, generation()
+returns 0, bump() does nothing and rebuild_lease() always grants the lease,
+i.e. every worker behaves as it did before on its own.
+
+Usage:
+    watch = GenerationWatch(cache_coordination.EBAY_PROFIT)
+    if _CACHE is None or watch.changed():
+        generation = watch.current()
+        _CACHE = build()
+        watch.sync(generation)
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, NamedTuple, Optional
+
+from app.repositories.sqlite_db import connection
+
+LEGACY = Path(__file__).resolve().parents[2] / "legacy"
+sys.path.insert(0, str(LEGACY))
+import json_codec  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+CACHE_STATE_DB_PATH = LEGACY / "cache" / "cache_state.db"
+
+# Cache names (one row each)
+INVENTORY = "inventory"                  # inventory table of inventory.db
+INVENTORY_FAST = "inventory_fast"        # derived inventory_fast table + facets
+PRODUCT_DOCS = "product_docs"            # product_docs.db refresh scan
+PRODUCT_JSON = "product_json"            # product JSON files written through sku_json_repo
+EBAY_PROFIT = "ebay_profit"              # fee/cost caches of the profit calculator
+EBAY_CATEGORIES = "ebay_categories"      # ebay_categories table (category AI token IDF)
+
+LEASE_SECONDS = 300.0
+LEASE_POLL_SECONDS = 0.05
+GENERATION_CHECK_SECONDS = 1.0
+
+
+class CacheState(NamedTuple):
+    generation: int
+    built_at: Optional[float]
+    meta: Any
+
+
+_schema_lock = threading.Lock()
+_ready_for: Optional[Path] = None
+
+
+def _ensure_schema() -> Path:
+    global _ready_for
+    path = Path(CACHE_STATE_DB_PATH)
+    if _ready_for == path:
+        return path
+    with _schema_lock:
+        if _ready_for != path:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with connection(path) as conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS cache_state (
+                        name TEXT PRIMARY KEY,
+                        generation INTEGER NOT NULL DEFAULT 0,
+                        built_at REAL,
+                        meta TEXT,
+                        lease_owner TEXT,
+                        lease_expires REAL
+                    )
+                    """
+                )
+                conn.commit()
+            _ready_for = path
+    return path
+
+
+def _owner() -> str:
+    return f"{os.getpid()}:{threading.get_ident()}"
+
+
+def state(name: str, with_meta: bool = True) -> Optional[CacheState]:
+    """Shared state of a cache, or None if it was never built (or is unavailable)."""
+    try:
+        path = _ensure_schema()
+        with connection(path) as conn:
+            row = conn.execute(
+                f"SELECT generation, built_at, {'meta' if with_meta else 'NULL'} FROM cache_state WHERE name = ?",
+                (name,),
+            ).fetchone()
+    except (sqlite3.Error, OSError) as e:
+        logger.debug(f"[CACHE-STATE] Could not read {name}: {e}")
+        return None
+    if row is None:
+        return None
+    meta = None
+    if row[2]:
+        try:
+            meta = json_codec.loads(row[2])
+        except ValueError:
+            meta = None
+    return CacheState(int(row[0]), row[1], meta)
+
+
+def generation(name: str) -> int:
+    """Current generation of a cache (0 if never bumped or unavailable)."""
+    current = state(name, with_meta=False)
+    return current.generation if current else 0
+
+
+def _write(name: str, sql: str, params: tuple) -> Optional[int]:
+    try:
+        path = _ensure_schema()
+        with connection(path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("INSERT OR IGNORE INTO cache_state (name) VALUES (?)", (name,))
+            conn.execute(sql, params)
+            row = conn.execute("SELECT generation FROM cache_state WHERE name = ?", (name,)).fetchone()
+            conn.commit()
+            return int(row[0])
+    except (sqlite3.Error, OSError) as e:
+        logger.debug(f"[CACHE-STATE] Could not update {name}: {e}")
+        return None
+
+
+def bump(name: str, meta: Any = None) -> int:
+    """
+    Record that the cache changed; returns the new generation.
+
+    meta replaces the stored metadata (None clears it).
+    """
+    new_generation = _write(
+        name,
+        "UPDATE cache_state SET generation = generation + 1, built_at = ?, meta = ? WHERE name = ?",
+        (time.time(), json_codec.dumps(meta) if meta is not None else None, name),
+    )
+    return new_generation or 0
+
+
+def touch(name: str) -> None:
+    """Record a revalidation that found nothing new (built_at only, generation unchanged)."""
+    _write(name, "UPDATE cache_state SET built_at = ? WHERE name = ?", (time.time(), name))
+
+
+def _try_acquire(name: str, ttl_seconds: float) -> bool:
+    now = time.time()
+    owner = _owner()
+    try:
+        path = _ensure_schema()
+        with connection(path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("INSERT OR IGNORE INTO cache_state (name) VALUES (?)", (name,))
+            cur = conn.execute(
+                "UPDATE cache_state SET lease_owner = ?, lease_expires = ? "
+                "WHERE name = ? AND (lease_owner IS NULL OR lease_expires < ? OR lease_owner = ?)",
+                (owner, now + ttl_seconds, name, now, owner),
+            )
+            conn.commit()
+            return cur.rowcount == 1
+    except (sqlite3.Error, OSError) as e:
+        logger.debug(f"[CACHE-STATE] Lease for {name} unavailable, rebuilding locally: {e}")
+        return True
+
+
+def _release(name: str) -> None:
+    try:
+        path = _ensure_schema()
+        with connection(path) as conn:
+            conn.execute(
+                "UPDATE cache_state SET lease_owner = NULL, lease_expires = NULL WHERE name = ? AND lease_owner = ?",
+                (name, _owner()),
+            )
+            conn.commit()
+    except (sqlite3.Error, OSError) as e:
+        logger.debug(f"[CACHE-STATE] Could not release lease for {name}: {e}")
+
+
+def _lease_free(name: str) -> bool:
+    try:
+        path = _ensure_schema()
+        with connection(path) as conn:
+            row = conn.execute(
+                "SELECT lease_owner, lease_expires FROM cache_state WHERE name = ?", (name,)
+            ).fetchone()
+    except (sqlite3.Error, OSError):
+        return True
+    return row is None or row[0] is None or (row[1] or 0) < time.time()
+
+
+@contextmanager
+def rebuild_lease(name: str, ttl_seconds: float = LEASE_SECONDS) -> Iterator[bool]:
+    """
+    Hold the rebuild lease of a cache.
+
+    Yields True when this worker holds the lease and should rebuild. If another
+    worker holds it, waits until that worker is done and yields False if it
+    built or revalidated the cache meanwhile (the caller uses its result); if
+    the other worker gave up without doing either, this worker takes the lease.
+    """
+    before = None
+    while not _try_acquire(name, ttl_seconds):
+        if before is None:
+            before = state(name, with_meta=False)
+        while not _lease_free(name):
+            time.sleep(LEASE_POLL_SECONDS)
+        if state(name, with_meta=False) != before:
+            yield False
+            return
+    try:
+        yield True
+    finally:
+        _release(name)
+
+
+class GenerationWatch:
+    """
+    Tracks which generation of a shared cache this worker's copy belongs to.
+
+    changed() reads the shared generation at most every check_interval seconds,
+    so it is cheap enough for request hot paths.
+    """
+
+    def __init__(self, name: str, check_interval: float = GENERATION_CHECK_SECONDS):
+        self.name = name
+        self.check_interval = check_interval
+        self.seen: Optional[int] = None
+        self._latest: Optional[int] = None
+        self._checked_at = float("-inf")
+
+    def current(self) -> int:
+        """Read the shared generation now."""
+        self._latest = generation(self.name)
+        self._checked_at = time.monotonic()
+        return self._latest
+
+    def changed(self) -> bool:
+        """True if the shared generation differs from the one last synced."""
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self.current()
+        if self.seen is None:
+            # First look: whatever this worker holds belongs to the current generation
+            self.seen = self._latest
+            return False
+        return self._latest != self.seen
+
+    def sync(self, generation_built: Optional[int] = None) -> None:
+        """Mark the local copy as built from generation_built (default: current)."""
+        if generation_built is None:
+            generation_built = self.current()
+        self.seen = generation_built
+        if self._latest is None or self._latest < generation_built:
+            self._latest = generation_built
@@ -2,11 +2,16 @@
 Repository for eBay caches (listings, manufacturers, etc.)
 """
 import json
+import sys
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 import logging
 
+LEGACY = Path(__file__).resolve().parents[2] / "legacy"
+sys.path.insert(0, str(LEGACY))
+import json_codec  # type: ignore
+
 logger = logging.getLogger(__name__)
 
 # Cache directory (relative to backend folder)
@@ -52,8 +57,7 @@ def get_cached_listings(max_age_hours: float = 6) -> Optional[List[Dict[str, Any
         return None
     
     try:
-        with cache_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = json_codec.read_file(cache_path)
         
         listings = data.get("listings", [])
         logger.debug(f"Loaded {len(listings)} listings from cache")
@@ -84,11 +88,7 @@ def save_listings_cache(listings: List[Dict[str, Any]]) -> bool:
     
     try:
         # Atomic write
-        temp_path = cache_path.with_suffix(".tmp.json")
-        with temp_path.open("w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
-        
-        temp_path.replace(cache_path)
+        json_codec.write_file(cache_path, payload)
         logger.info(f"Saved {len(listings)} listings to cache")
         return True
         
@@ -0,0 +1,308 @@
+"""
+Memory-resident catalogue of cached eBay category schemas
+
+Maps category id, full category path and simple category name to the schema
+file and its fees, together with the category_mapping.json lookups. The index
+is persisted as a sidecar file and invalidated by the mtime of the schemas
+directory (schema files are written atomically, so every save bumps it) and of
+category_mapping.json. Schema bodies are loaded lazily through an LRU of the
+raw file bytes, parsed per call so no two callers share a dict.
+"""
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.repositories.ebay_schema_repo import SCHEMAS_DIR
+
+logger = logging.getLogger(__name__)
+
+MAPPING_FILE = SCHEMAS_DIR / "category_mapping.json"
+# Kept outside SCHEMAS_DIR so writing it does not bump the directory mtime
+SIDECAR_FILE = Path(__file__).resolve().parents[2] / "cache" / "ebay_schema_catalog.json"
+CATALOG_FORMAT_VERSION = 1
+SCHEMA_BODY_LRU_SIZE = 64
+
+_lock = threading.RLock()
+_catalog: Optional[Dict[str, Any]] = None
+_schema_bodies: "OrderedDict[tuple[str, int], bytes]" = OrderedDict()
+# Derived in-memory views of the current catalogue (not persisted)
+_views: Dict[str, Any] = {}
+
+
+def _mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _simple_name(category_name: str) -> str:
+    if "/" in category_name:
+        return category_name.split("/")[-1].strip()
+    return category_name
+
+
+def _build_schema_entries() -> List[Dict[str, Any]]:
+    entries: List[Dict[str, Any]] = []
+    if not SCHEMAS_DIR.exists():
+        return entries
+
+    for schema_file in sorted(SCHEMAS_DIR.glob("EbayCat_*.json")):
+        if schema_file.name.endswith(".tmp.json"):
+            continue
+        try:
+            with schema_file.open("r", encoding="utf-8") as f:
+                schema_data = json.load(f)
+        except Exception as e:
+            logger.debug(f"Error reading schema file {schema_file}: {e}")
+            continue
+
+        # Handle both old format (_metadata.category_name) and new format
+        metadata = schema_data.get("_metadata", {}) if isinstance(schema_data, dict) else {}
+        if not isinstance(metadata, dict):
+            metadata = {}
+        category_name = metadata.get("category_name") or schema_data.get("categoryName") or schema_data.get("name") or ""
+        category_id = str(metadata.get("category_id") or schema_data.get("categoryId") or "").strip()
+
+        parts = schema_file.stem.split("_")
+        file_category_id = parts[1] if len(parts) >= 2 else ""
+
+        entries.append({
+            "file": schema_file.name,
+            "file_category_id": file_category_id,
+            "category_id": category_id,
+            "category_name": str(category_name),
+            "fees": metadata.get("fees") or {},
+        })
+    return entries
+
+
+def _build_mapping() -> Dict[str, Any]:
+    mapping: Dict[str, Any] = {"rows": [], "by_id": {}, "by_full_path": {}, "by_simple_name": {}}
+    if not MAPPING_FILE.exists():
+        return mapping
+
+    try:
+        with MAPPING_FILE.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception as e:
+        logger.error(f"Failed to load category mapping: {e}")
+        return mapping
+
+    rows = data.get("categoryMappings", []) if isinstance(data, dict) else []
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        mapping["rows"].append(row)
+        position = len(mapping["rows"]) - 1
+        cat_id = str(row.get("categoryId") or "").strip()
+        if cat_id:
+            # Last row wins, like the dict built by the original loader
+            mapping["by_id"][cat_id] = position
+        full_path = row.get("fullPath", "")
+        if isinstance(full_path, str):
+            mapping["by_full_path"].setdefault(full_path, position)
+        name = row.get("categoryName") or ""
+        if isinstance(name, str):
+            mapping["by_simple_name"].setdefault(name.lower(), position)
+    return mapping
+
+
+def _index_schemas(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    by_id: Dict[str, int] = {}
+    by_name: Dict[str, int] = {}
+    for position, entry in enumerate(entries):
+        for cat_id in (entry["file_category_id"], entry["category_id"]):
+            if cat_id:
+                by_id.setdefault(cat_id, position)
+        name = entry["category_name"]
+        if name:
+            by_name.setdefault(name, position)
+    return {"by_id": by_id, "by_name": by_name}
+
+
+def _load_sidecar() -> Optional[Dict[str, Any]]:
+    if not SIDECAR_FILE.exists():
+        return None
+    try:
+        with SIDECAR_FILE.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and data.get("format_version") == CATALOG_FORMAT_VERSION:
+            return data
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable schema catalog sidecar: {e}")
+    return None
+
+
+def _save_sidecar(catalog: Dict[str, Any]) -> None:
+    try:
+        SIDECAR_FILE.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = SIDECAR_FILE.with_name(f"{SIDECAR_FILE.stem}.{os.getpid()}.tmp.json")
+        with temp_path.open("w", encoding="utf-8") as f:
+            json.dump(catalog, f, ensure_ascii=False)
+        temp_path.replace(SIDECAR_FILE)
+    except Exception as e:
+        logger.warning(f"Failed to persist schema catalog sidecar: {e}")
+
+
+def get_catalog() -> Dict[str, Any]:
+    """Return the current catalogue, rebuilding the stale parts if needed."""
+    global _catalog
+
+    dir_mtime = _mtime_ns(SCHEMAS_DIR)
+    mapping_mtime = _mtime_ns(MAPPING_FILE)
+
+    with _lock:
+        catalog = _catalog
+        if (
+            catalog is not None
+            and catalog["schemas_dir_mtime_ns"] == dir_mtime
+            and catalog["mapping_mtime_ns"] == mapping_mtime
+        ):
+            return catalog
+
+        if catalog is None:
+            catalog = _load_sidecar()
+
+        changed = False
+        if catalog is None or catalog.get("schemas_dir_mtime_ns") != dir_mtime:
+            entries = _build_schema_entries()
+            schemas = {"entries": entries, **_index_schemas(entries)}
+            logger.info(f"Indexed {len(entries)} cached eBay schemas")
+            changed = True
+        else:
+            schemas = catalog["schemas"]
+
+        if catalog is None or catalog.get("mapping_mtime_ns") != mapping_mtime:
+            mapping = _build_mapping()
+            logger.info(f"Indexed {len(mapping['rows'])} category mappings from category_mapping.json")
+            changed = True
+        else:
+            mapping = catalog["mapping"]
+
+        catalog = {
+            "format_version": CATALOG_FORMAT_VERSION,
+            "schemas_dir_mtime_ns": dir_mtime,
+            "mapping_mtime_ns": mapping_mtime,
+            "schemas": schemas,
+            "mapping": mapping,
+        }
+        if changed:
+            _save_sidecar(catalog)
+        _catalog = catalog
+        _views.clear()
+        return catalog
+
+
+def invalidate_catalog() -> None:
+    """Drop the in-memory catalogue and cached schema bodies."""
+    global _catalog
+    with _lock:
+        _catalog = None
+        _schema_bodies.clear()
+        _views.clear()
+
+
+def find_schema_entry(category_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Find the cached schema whose category name matches.
+
+    Order: exact name, simple (last path segment) name, then a suffix match
+    on the simple name.
+    """
+    schemas = get_catalog()["schemas"]
+    entries = schemas["entries"]
+    simple = _simple_name(category_name)
+
+    for key in (category_name, simple):
+        position = schemas["by_name"].get(key)
+        if position is not None:
+            return entries[position]
+
+    for entry in entries:
+        if entry["category_name"].endswith(simple):
+            return entry
+    return None
+
+
+def get_schema_entry_by_id(category_id: Any) -> Optional[Dict[str, Any]]:
+    schemas = get_catalog()["schemas"]
+    position = schemas["by_id"].get(str(category_id or "").strip())
+    return schemas["entries"][position] if position is not None else None
+
+
+def load_schema_body(entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Load a schema file through the LRU (keyed by file name and mtime).
+
+    The LRU holds the file bytes; every call returns a freshly parsed dict
+    that the caller may modify.
+    """
+    path = SCHEMAS_DIR / entry["file"]
+    mtime = _mtime_ns(path)
+    if mtime is None:
+        return None
+
+    key = (entry["file"], mtime)
+    with _lock:
+        raw = _schema_bodies.get(key)
+        if raw is not None:
+            _schema_bodies.move_to_end(key)
+
+    if raw is None:
+        try:
+            raw = path.read_bytes()
+        except OSError as e:
+            logger.error(f"Error loading schema file {path}: {e}")
+            return None
+
+    try:
+        body = json.loads(raw)
+    except ValueError as e:
+        logger.error(f"Error loading schema file {path}: {e}")
+        return None
+
+    with _lock:
+        _schema_bodies[key] = raw
+        _schema_bodies.move_to_end(key)
+        while len(_schema_bodies) > SCHEMA_BODY_LRU_SIZE:
+            _schema_bodies.popitem(last=False)
+    return body
+
+
+def schema_fees_by_category_id() -> Dict[str, Dict[str, Any]]:
+    """Raw `_metadata.fees` of every cached schema, keyed by file category id."""
+    fees: Dict[str, Dict[str, Any]] = {}
+    for entry in get_catalog()["schemas"]["entries"]:
+        if entry["file_category_id"] and entry["fees"]:
+            fees[entry["file_category_id"]] = entry["fees"]
+    return fees
+
+
+def mapping_rows() -> List[Dict[str, Any]]:
+    """All category_mapping.json rows, in file order."""
+    return get_catalog()["mapping"]["rows"]
+
+
+def mapping_by_id() -> Dict[str, Dict[str, Any]]:
+    """category_mapping.json rows keyed by category id."""
+    mapping = get_catalog()["mapping"]
+    with _lock:
+        view = _views.get("mapping_by_id")
+        if view is None:
+            view = {cat_id: mapping["rows"][position] for cat_id, position in mapping["by_id"].items()}
+            _views["mapping_by_id"] = view
+        return view
+
+
+def find_mapping_entry(category_name: str) -> Optional[Dict[str, Any]]:
+    """category_mapping.json row by exact full path, then simple name (case-insensitive)."""
+    mapping = get_catalog()["mapping"]
+    position = mapping["by_full_path"].get(category_name)
+    if position is None:
+        position = mapping["by_simple_name"].get(_simple_name(category_name).lower())
+    return mapping["rows"][position] if position is not None else None
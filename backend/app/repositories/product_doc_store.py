@@ -0,0 +1,361 @@
+"""
+SQLite document store mirroring products/<SKU>.json
+
+Each product JSON (the object under its SKU key) is stored as one row in
+legacy/cache/product_docs.db. Hot fields are exposed as JSON1 generated
+columns with indexes, so cross-SKU questions (missing SEO title, has main
+images, category set, image counts) are single indexed queries instead of
+directory scans.
+
+Sync:
+- write_sku_json upserts the document right after the file is replaced.
+- Files written any other way are picked up by refresh(): a stat-only scan
+  (mtime/size per file, at most every REFRESH_INTERVAL_SECONDS) that re-reads
+  changed files and drops deleted ones. Every query API calls it first. With
+  several workers only one scans per interval (cache_coordination lease on
+  PRODUCT_DOCS); the others reuse its result.
+
+The store is optional: set PRODUCT_DOC_STORE=0 to disable it (callers fall
+back to their file scans). It is also disabled when the SQLite library lacks
+JSON1 or generated columns (needs 3.31+).
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.repositories import cache_coordination
+from app.repositories.sqlite_db import connection
+
+LEGACY = Path(__file__).resolve().parents[2] / "legacy"
+sys.path.insert(0, str(LEGACY))
+import config  # type: ignore
+import json_codec  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+PRODUCT_DOCS_DB_PATH = LEGACY / "cache" / "product_docs.db"
+SCHEMA_VERSION = 1
+REFRESH_INTERVAL_SECONDS = 30.0
+SQL_VARIABLE_CHUNK = 900
+
+# Generated column -> (type, JSON path inside the product document)
+GENERATED_COLUMNS: Dict[str, Tuple[str, str]] = {
+    "count_stock": ("INTEGER", '$.Images.summary.count_stock'),
+    "count_phone": ("INTEGER", '$.Images.summary.count_phone'),
+    "count_enhanced": ("INTEGER", '$.Images.summary.count_enhanced'),
+    "ebay_title": ("TEXT", '$."eBay SEO"."eBay Title"'),
+    "ebay_product_type": ("TEXT", '$."eBay SEO"."Product Type"'),
+    "ebay_product_model": ("TEXT", '$."eBay SEO"."Product Model"'),
+    "ebay_keyword_1": ("TEXT", '$."eBay SEO"."Keyword 1"'),
+    "ebay_keyword_2": ("TEXT", '$."eBay SEO"."Keyword 2"'),
+    "ebay_keyword_3": ("TEXT", '$."eBay SEO"."Keyword 3"'),
+    "ebay_category": ("TEXT", '$."Ebay Category".Category'),
+    "ebay_category_id": ("TEXT", '$."Ebay Category"."eBay Category ID"'),
+    "price_net": ("REAL", '$."Price Data"."Price Net"'),
+    "shipping_net": ("REAL", '$."Price Data"."Shipping Net"'),
+    "total_cost_net": ("REAL", '$."Price Data"."Total Cost Net"'),
+}
+
+_lock = threading.Lock()
+_ready = False
+_supported: Optional[bool] = None
+_last_refresh = 0.0
+
+
+def _products_dir() -> Path:
+    return Path(getattr(config, "PRODUCTS_FOLDER_PATH"))
+
+
+def _sqlite_supported() -> bool:
+    global _supported
+    if _supported is None:
+        try:
+            probe = sqlite3.connect(":memory:")
+            try:
+                probe.execute(
+                    "CREATE TABLE t (doc TEXT, v INTEGER GENERATED ALWAYS AS (json_extract(doc, '$.v')) VIRTUAL)"
+                )
+                _supported = True
+            finally:
+                probe.close()
+        except sqlite3.Error as e:
+            logger.warning("[DOC-STORE] SQLite %s lacks JSON1/generated columns: %s", sqlite3.sqlite_version, e)
+            _supported = False
+    return _supported
+
+
+def is_enabled() -> bool:
+    """True unless PRODUCT_DOC_STORE=0 or the SQLite library cannot host the store."""
+    if os.getenv("PRODUCT_DOC_STORE", "1").strip().lower() in {"0", "false", "no", "off"}:
+        return False
+    return _sqlite_supported()
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    generated = ",\n".join(
+        f'    {name} {col_type} GENERATED ALWAYS AS (json_extract(doc, \'{path}\')) VIRTUAL'
+        for name, (col_type, path) in GENERATED_COLUMNS.items()
+    )
+    conn.execute("DROP TABLE IF EXISTS product_docs")
+    conn.execute(
+        f"""CREATE TABLE product_docs (
+    sku TEXT PRIMARY KEY,
+    file_name TEXT NOT NULL,
+    mtime_ns INTEGER,
+    size INTEGER,
+    doc TEXT NOT NULL,
+    count_main_images INTEGER GENERATED ALWAYS AS (json_array_length(doc, '$.Images.main_images')) VIRTUAL,
+{generated}
+)"""
+    )
+    for name in ["count_main_images", *GENERATED_COLUMNS]:
+        conn.execute(f"CREATE INDEX idx_product_docs_{name} ON product_docs({name})")
+    conn.execute("CREATE INDEX idx_product_docs_file_name ON product_docs(file_name)")
+    conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+
+def _ensure_schema() -> None:
+    global _ready
+    if _ready:
+        return
+    PRODUCT_DOCS_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with connection(PRODUCT_DOCS_DB_PATH) as conn:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            conn.execute("BEGIN IMMEDIATE")
+            # Another worker may have created the schema while we waited for the write lock
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                _create_schema(conn)
+                logger.info("[DOC-STORE] Created product_docs schema v%s", SCHEMA_VERSION)
+            conn.commit()
+    _ready = True
+
+
+def _document_row(sku: str, product_json: Dict[str, Any], path: Path) -> Tuple[Any, ...]:
+    try:
+        st = path.stat()
+        mtime_ns, size = st.st_mtime_ns, st.st_size
+    except OSError:
+        mtime_ns, size = None, None
+    return (sku, path.name, mtime_ns, size, json_codec.dumps(product_json, pretty=False))
+
+
+_UPSERT_SQL = (
+    "INSERT INTO product_docs (sku, file_name, mtime_ns, size, doc) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(sku) DO UPDATE SET file_name = excluded.file_name, mtime_ns = excluded.mtime_ns, "
+    "size = excluded.size, doc = excluded.doc"
+)
+
+
+def upsert_document(sku: str, product_json: Dict[str, Any], path: Optional[Path] = None) -> None:
+    """Mirror one product JSON (called by the repository after each write)."""
+    if not is_enabled():
+        return
+    path = path or _products_dir() / f"{sku}.json"
+    with _lock:
+        _ensure_schema()
+        with connection(PRODUCT_DOCS_DB_PATH) as conn:
+            conn.execute(_UPSERT_SQL, _document_row(sku, product_json, path))
+            conn.commit()
+
+
+def _read_product_file(path: Path) -> Optional[Tuple[str, Dict[str, Any]]]:
+    try:
+        data = json_codec.read_file(path)
+    except Exception as e:
+        logger.warning("[DOC-STORE] Skipping %s: %s", path.name, e)
+        return None
+    if not isinstance(data, dict) or len(data) != 1:
+        return None
+    sku = next(iter(data))
+    payload = data[sku]
+    if not isinstance(payload, dict):
+        return None
+    return str(sku).strip(), payload
+
+
+def refresh(force: bool = False) -> Dict[str, int]:
+    """
+    Re-sync the store with products/ by file mtime/size.
+
+    Returns:
+        {"changed": files re-read, "removed": documents dropped}
+    """
+    global _last_refresh
+    if not force and time.time() - _last_refresh < REFRESH_INTERVAL_SECONDS:
+        return {"changed": 0, "removed": 0}
+
+    with _lock:
+        if not force and time.time() - _last_refresh < REFRESH_INTERVAL_SECONDS:
+            return {"changed": 0, "removed": 0}
+        if not force:
+            # Another worker scanned recently: the shared store is already in sync
+            shared = cache_coordination.state(cache_coordination.PRODUCT_DOCS, with_meta=False)
+            if shared is not None and shared.built_at and time.time() - shared.built_at < REFRESH_INTERVAL_SECONDS:
+                _last_refresh = shared.built_at
+                return {"changed": 0, "removed": 0}
+
+        with cache_coordination.rebuild_lease(cache_coordination.PRODUCT_DOCS) as acquired:
+            if not acquired and not force:
+                _last_refresh = time.time()
+                return {"changed": 0, "removed": 0}
+            result = _scan_and_sync()
+            if result["changed"] or result["removed"]:
+                cache_coordination.bump(cache_coordination.PRODUCT_DOCS)
+            else:
+                cache_coordination.touch(cache_coordination.PRODUCT_DOCS)
+        _last_refresh = time.time()
+        return result
+
+
+def _scan_and_sync() -> Dict[str, int]:
+    _ensure_schema()
+    products_dir = _products_dir()
+    on_disk: Dict[str, Tuple[int, int]] = {}
+    if products_dir.exists():
+        with os.scandir(products_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and not entry.name.endswith(".tmp.json") and entry.is_file():
+                    st = entry.stat()
+                    on_disk[entry.name] = (st.st_mtime_ns, st.st_size)
+
+    with connection(PRODUCT_DOCS_DB_PATH) as conn:
+        known = {
+            file_name: (sku, mtime_ns, size)
+            for sku, file_name, mtime_ns, size in conn.execute(
+                "SELECT sku, file_name, mtime_ns, size FROM product_docs"
+            )
+        }
+        changed = [
+            name for name, stat in on_disk.items()
+            if name not in known or known[name][1:] != stat
+        ]
+        removed = [known[name][0] for name in known if name not in on_disk]
+
+        rows = []
+        for name in changed:
+            parsed = _read_product_file(products_dir / name)
+            if parsed is None:
+                continue
+            sku, payload = parsed
+            rows.append((sku, name, *on_disk[name], json_codec.dumps(payload, pretty=False)))
+
+        if rows or removed:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(_UPSERT_SQL, rows)
+            conn.executemany("DELETE FROM product_docs WHERE sku = ?", [(sku,) for sku in removed])
+            conn.commit()
+
+    if rows or removed:
+        logger.info("[DOC-STORE] Refreshed: %s changed, %s removed", len(rows), len(removed))
+    return {"changed": len(rows), "removed": len(removed)}
+
+
+def _query(sql: str, params: Iterable[Any] = ()) -> List[sqlite3.Row]:
+    refresh()
+    with connection(PRODUCT_DOCS_DB_PATH, row_factory=sqlite3.Row) as conn:
+        return conn.execute(sql, list(params)).fetchall()
+
+
+def list_skus() -> Set[str]:
+    """SKUs that have a product JSON."""
+    return {row["sku"] for row in _query("SELECT sku FROM product_docs")}
+
+
+def image_counts() -> Dict[str, Tuple[int, int, int]]:
+    """{sku: (count_stock, count_phone, count_enhanced)} from Images.summary (missing -> 0)."""
+    rows = _query(
+        "SELECT sku, COALESCE(count_stock, 0) AS s, COALESCE(count_phone, 0) AS p, "
+        "COALESCE(count_enhanced, 0) AS e FROM product_docs"
+    )
+    return {row["sku"]: (row["s"], row["p"], row["e"]) for row in rows}
+
+
+def find_skus(
+    missing_seo_title: Optional[bool] = None,
+    has_main_images: Optional[bool] = None,
+    has_ebay_category: Optional[bool] = None,
+    ebay_category_id: Optional[str] = None,
+) -> List[str]:
+    """
+    SKUs matching all given conditions (None = don't care), sorted.
+
+    e.g. find_skus(missing_seo_title=True, has_main_images=True)
+    """
+    where: List[str] = []
+    params: List[Any] = []
+    if missing_seo_title is not None:
+        blank = "COALESCE(TRIM(ebay_title), '') = ''"
+        where.append(blank if missing_seo_title else f"NOT ({blank})")
+    if has_main_images is not None:
+        where.append("COALESCE(count_main_images, 0) > 0" if has_main_images else "COALESCE(count_main_images, 0) = 0")
+    if has_ebay_category is not None:
+        blank = "COALESCE(TRIM(ebay_category_id), '') = ''"
+        where.append(f"NOT ({blank})" if has_ebay_category else blank)
+    if ebay_category_id is not None:
+        where.append("ebay_category_id = ?")
+        params.append(str(ebay_category_id).strip())
+
+    sql = "SELECT sku FROM product_docs"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return [row["sku"] for row in _query(sql + " ORDER BY sku", params)]
+
+
+def get_sections(skus: Iterable[str], paths: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Selected parts of several product documents in one query per chunk.
+
+    Args:
+        skus: SKUs to fetch (unknown SKUs are left out of the result)
+        paths: dotted paths into the document, e.g. "eBay SEO", "Images.main_images"
+
+    Returns:
+        {sku: nested dict with only the requested paths}, e.g.
+        {"JAL00001": {"eBay SEO": {...}, "Images": {"main_images": [...]}}}
+    """
+    wanted = [str(s).strip() for s in skus if str(s).strip()]
+    split_paths = [path.split(".") for path in paths]
+    if not wanted or not split_paths:
+        return {}
+
+    def _json_path(parts: List[str]) -> str:
+        return "$" + "".join(f'."{part}"' for part in parts)
+
+    # Each path's value, then json_type of its parent so an existing section
+    # without the leaf still shows up as {} (as it would in the full document)
+    selected = ", ".join(
+        [f"json_extract(doc, '{_json_path(parts)}')" for parts in split_paths]
+        + [f"json_type(doc, '{_json_path(parts[:-1])}')" for parts in split_paths]
+    )
+    refresh()
+
+    result: Dict[str, Dict[str, Any]] = {}
+    with connection(PRODUCT_DOCS_DB_PATH) as conn:
+        for i in range(0, len(wanted), SQL_VARIABLE_CHUNK):
+            chunk = wanted[i:i + SQL_VARIABLE_CHUNK]
+            placeholders = ",".join(["?"] * len(chunk))
+            # json_array keeps nested objects/arrays as JSON (not quoted strings)
+            for sku, values in conn.execute(
+                f"SELECT sku, json_array({selected}) FROM product_docs WHERE sku IN ({placeholders})",
+                chunk,
+            ):
+                values = json_codec.loads(values)
+                document: Dict[str, Any] = {}
+                for parts, value, parent_type in zip(split_paths, values, values[len(split_paths):]):
+                    if value is None and parent_type != "object":
+                        continue
+                    node = document
+                    for part in parts[:-1]:
+                        node = node.setdefault(part, {})
+                    if value is not None:
+                        node[parts[-1]] = value
+                result[sku] = document
+    return result
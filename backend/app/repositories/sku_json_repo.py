@@ -1,13 +1,20 @@
 from __future__ import annotations
 
-import json
+import logging
 import sys
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional, Tuple
 
 LEGACY = Path(__file__).resolve().parents[2] / "legacy"
 sys.path.insert(0, str(LEGACY))
 import config  # type: ignore
+import json_codec  # type: ignore
+import product_files  # type: ignore
+from product_files import VersionConflict  # type: ignore  # noqa: F401  (re-exported)
+
+from app.repositories import cache_coordination, product_doc_store
+
+logger = logging.getLogger(__name__)
 
 
 def _sku_json_path(sku: str) -> Path:
@@ -15,13 +22,7 @@ def _sku_json_path(sku: str) -> Path:
     return products_dir / f"{sku}.json"
 
 
-def read_sku_json(sku: str) -> Dict[str, Any]:
-    path = _sku_json_path(sku)
-    if not path.exists():
-        return {}
-
-    data = json.loads(path.read_text(encoding="utf-8"))
-
+def _unwrap(sku: str, data: Any) -> Dict[str, Any]:
     # Your JSON files are structured like: { "JAL00022": {...fields...} }
     if isinstance(data, dict) and sku in data and isinstance(data[sku], dict):
         return data[sku]
@@ -33,16 +34,72 @@ def read_sku_json(sku: str) -> Dict[str, Any]:
     return {}
 
 
-def write_sku_json(sku: str, product_json: Dict[str, Any]) -> None:
-    """Write product JSON for a SKU back to disk with atomic write"""
+def read_sku_json(sku: str) -> Dict[str, Any]:
+    path = _sku_json_path(sku)
+    if not path.exists():
+        return {}
+
+    return _unwrap(sku, json_codec.read_file(path))
+
+
+def read_sku_json_versioned(sku: str) -> Tuple[Dict[str, Any], Optional[product_files.Version]]:
+    """Product JSON plus its file version, for a later write_sku_json(expected_version=...)."""
+    data, version = product_files.read_json(_sku_json_path(sku), {})
+    return _unwrap(sku, data), version
+
+
+def sku_lock(sku: str):
+    """Context manager holding the SKU's write lock (threads and processes).
+
+    Wrap read_sku_json ... write_sku_json in it so the read-modify-write is
+    atomic; write_sku_json takes the same (reentrant) lock.
+    """
+    return product_files.lock(_sku_json_path(sku))
+
+
+def write_sku_json(
+    sku: str,
+    product_json: Dict[str, Any],
+    pretty: bool | None = None,
+    expected_version: Optional[product_files.Version] = None,
+) -> None:
+    """Write product JSON for a SKU back to disk with atomic write (compact unless pretty)
+
+    expected_version: version from read_sku_json_versioned; raises
+    VersionConflict if the file was rewritten in the meantime.
+    """
     path = _sku_json_path(sku)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    
+
     # Wrap in SKU key if not already wrapped
     full_data = {sku: product_json}
-    
-    # Atomic write using temp file
-    temp_path = path.with_suffix(".tmp.json")
-    with temp_path.open("w", encoding="utf-8") as f:
-        json.dump(full_data, f, ensure_ascii=False, indent=2)
-    temp_path.replace(path)
+
+    # Atomic write through a unique temp file; the doc store is synced under the
+    # same lock so its recorded mtime always belongs to the content it holds
+    with product_files.lock(path):
+        product_files.write_json(path, full_data, expected_version=expected_version, pretty=pretty)
+
+        try:
+            product_doc_store.upsert_document(sku, product_json, path)
+        except Exception as e:
+            # The file is the source of truth; the next refresh picks it up
+            logger.warning(f"Product doc store sync failed for {sku}: {e}")
+
+    # Caches derived from product JSON (profit calculator cost fallbacks) reload in every worker
+    cache_coordination.bump(cache_coordination.PRODUCT_JSON)
+
+
+def update_sku_json(sku: str, mutate: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Locked read-modify-write of a SKU's product JSON.
+
+    mutate gets the current product JSON ({} if there is no file) and edits it
+    in place or returns a replacement. Use it to apply the result of slow work
+    (AI calls, uploads) onto the latest file instead of a copy read earlier.
+    Returns the written product JSON.
+    """
+    with sku_lock(sku):
+        product_json = read_sku_json(sku)
+        result = mutate(product_json)
+        if result is not None:
+            product_json = result
+        write_sku_json(sku, product_json)
+        return product_json
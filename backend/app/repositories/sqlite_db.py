@@ -0,0 +1,198 @@
+"""
+Shared SQLite connection provider for inventory.db
+
+Connections are pooled per thread and per (database, read-only) pair, opened
+once with WAL journaling, a larger page cache, memory-mapped I/O and a
+statement cache, then reused. WAL lets readers keep using the last committed
+snapshot while a writer (e.g. the inventory_fast rebuild) holds its
+transaction.
+
+Usage:
+    with connection(row_factory=sqlite3.Row) as conn:
+        rows = conn.execute("SELECT ...").fetchall()
+
+Leaving the block rolls back anything not committed (the same outcome as the
+old connect/close pattern) and returns the connection to the pool. A nested
+checkout on the same thread gets its own connection.
+
+Per-query timing: add_query_hook(callback) registers callback(sql, seconds)
+for every execute/executemany/executescript on pooled connections (time to
+the first result step). Set SQLITE_SLOW_QUERY_MS to log slow statements.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INVENTORY_DB_PATH = Path(__file__).resolve().parents[2] / "legacy" / "cache" / "inventory.db"
+
+BUSY_TIMEOUT_MS = 5000
+CACHE_SIZE_KIB = 20000        # PRAGMA cache_size=-N is in KiB
+MMAP_SIZE_BYTES = 256 * 1024 * 1024
+STATEMENT_CACHE_SIZE = 256
+MAX_IDLE_PER_THREAD = 2
+
+QueryHook = Callable[[str, float], None]
+
+_hooks: List[QueryHook] = []
+_hooks_lock = threading.Lock()
+_local = threading.local()
+
+
+def _slow_query_threshold() -> Optional[float]:
+    raw = os.getenv("SQLITE_SLOW_QUERY_MS")
+    if not raw:
+        return None
+    try:
+        return float(raw) / 1000
+    except ValueError:
+        return None
+
+
+_SLOW_QUERY_SECONDS = _slow_query_threshold()
+
+
+def add_query_hook(hook: QueryHook) -> None:
+    """Register hook(sql, seconds) for statements run on pooled connections."""
+    with _hooks_lock:
+        _hooks.append(hook)
+
+
+def remove_query_hook(hook: QueryHook) -> None:
+    with _hooks_lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
+
+
+def _report(sql: str, seconds: float) -> None:
+    if _SLOW_QUERY_SECONDS is not None and seconds >= _SLOW_QUERY_SECONDS:
+        logger.warning("[SQLITE] Slow query (%.0f ms): %s", seconds * 1000, " ".join(sql.split())[:300])
+    for hook in list(_hooks):
+        try:
+            hook(sql, seconds)
+        except Exception as e:
+            logger.debug(f"SQLite query hook failed: {e}")
+
+
+class TimedConnection(sqlite3.Connection):
+    """sqlite3.Connection that reports statement timings to the query hooks."""
+
+    def execute(self, sql: str, parameters: Any = (), /) -> sqlite3.Cursor:
+        if not _hooks and _SLOW_QUERY_SECONDS is None:
+            return super().execute(sql, parameters)
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            _report(sql, time.perf_counter() - start)
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /) -> sqlite3.Cursor:
+        if not _hooks and _SLOW_QUERY_SECONDS is None:
+            return super().executemany(sql, seq_of_parameters)
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            _report(sql, time.perf_counter() - start)
+
+    def executescript(self, sql_script: str, /) -> sqlite3.Cursor:
+        if not _hooks and _SLOW_QUERY_SECONDS is None:
+            return super().executescript(sql_script)
+        start = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            _report(sql_script, time.perf_counter() - start)
+
+
+def _open(db_path: Path, read_only: bool) -> sqlite3.Connection:
+    if read_only:
+        conn = sqlite3.connect(
+            f"{db_path.resolve().as_uri()}?mode=ro",
+            uri=True,
+            factory=TimedConnection,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+        )
+    else:
+        conn = sqlite3.connect(
+            str(db_path),
+            factory=TimedConnection,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+        )
+        try:
+            # Persistent per database file; only needs to succeed once
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        except sqlite3.DatabaseError as e:
+            logger.debug(f"Could not enable WAL for {db_path}: {e}")
+
+    conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KIB}")
+    conn.execute(f"PRAGMA mmap_size={MMAP_SIZE_BYTES}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+def _pool() -> Dict[Tuple[str, bool], List[sqlite3.Connection]]:
+    pool = getattr(_local, "pool", None)
+    if pool is None:
+        pool = {}
+        _local.pool = pool
+    return pool
+
+
+@contextmanager
+def connection(
+    db_path: Path | str | None = None,
+    read_only: bool = False,
+    row_factory: Any = None,
+) -> Iterator[sqlite3.Connection]:
+    """
+    Check out a pooled connection for the current thread.
+
+    Args:
+        db_path: Database file (default: legacy/cache/inventory.db)
+        read_only: Open with mode=ro (fails if the file does not exist)
+        row_factory: row_factory for this checkout (e.g. sqlite3.Row)
+    """
+    path = Path(db_path) if db_path is not None else INVENTORY_DB_PATH
+    key = (str(path), bool(read_only))
+    idle = _pool().setdefault(key, [])
+    conn = idle.pop() if idle else _open(path, read_only)
+    conn.row_factory = row_factory
+
+    healthy = True
+    try:
+        yield conn
+    except sqlite3.DatabaseError:
+        healthy = False
+        raise
+    finally:
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            healthy = False
+        conn.row_factory = None
+        if healthy and len(idle) < MAX_IDLE_PER_THREAD:
+            idle.append(conn)
+        else:
+            conn.close()
+
+
+def close_thread_connections() -> None:
+    """Close all idle pooled connections of the current thread."""
+    pool = _pool()
+    for idle in pool.values():
+        while idle:
+            idle.pop().close()
+    pool.clear()
@@ -13,7 +13,7 @@ from dotenv import load_dotenv
 from openai import OpenAI
 
 from app.config import ai_config
-from app.repositories.sku_json_repo import read_sku_json, _sku_json_path
+from app.repositories.sku_json_repo import read_sku_json, update_sku_json, _sku_json_path
 import config as app_config
 
 load_dotenv()
@@ -415,9 +415,9 @@ def enrich_sku_fields(sku: str) -> Dict[str, any]:
         # Write back to record
         _write_fields_to_record(record, merged)
 
-        # Save updated JSON
-        with json_path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # Save updated JSON: the vision call takes a while, so write the fields
+        # onto the current file under the SKU lock rather than the copy read above
+        update_sku_json(sku, lambda latest: _write_fields_to_record(latest, merged))
 
         # Count changed fields (including quality/style upgrades)
         updated_count = sum(
@@ -6,7 +6,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict
 
-from app.repositories.sku_json_repo import read_sku_json, write_sku_json
+from app.repositories.sku_json_repo import update_sku_json
 
 LOG_FILE = Path(__file__).resolve().parents[1] / "logs" / "product_change_log.jsonl"
 PRODUCTS_DIR = Path(__file__).resolve().parents[2] / "legacy" / "products"
@@ -46,16 +46,18 @@ def append_product_change_log(
     product_json_written = False
     try:
         if normalized_sku and (PRODUCTS_DIR / f"{normalized_sku}.json").exists():
-            product_json = read_sku_json(normalized_sku) or {}
-            logs_section = product_json.setdefault("System Logs", {})
-            history = logs_section.get("Change Log", [])
-            if not isinstance(history, list):
-                history = []
+            def _prepend_entry(product_json: Dict[str, Any]) -> None:
+                logs_section = product_json.setdefault("System Logs", {})
+                history = logs_section.get("Change Log", [])
+                if not isinstance(history, list):
+                    history = []
 
-            # Keep newest first and cap to avoid unbounded growth
-            history.insert(0, entry)
-            logs_section["Change Log"] = history[:300]
-            write_sku_json(normalized_sku, product_json)
+                # Keep newest first and cap to avoid unbounded growth
+                history.insert(0, entry)
+                logs_section["Change Log"] = history[:300]
+
+            # Locked read-modify-write: concurrent log appends must not drop entries
+            update_sku_json(normalized_sku, _prepend_entry)
             product_json_written = True
     except Exception:
         pass
@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import json
-import sqlite3
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -14,6 +13,7 @@ LEGACY = Path(__file__).resolve().parents[2] / "legacy"
 import sys
 sys.path.insert(0, str(LEGACY))
 import config  # type: ignore
+from app.repositories.sqlite_db import connection
 from app.services.excel_inventory import _get_db_path
 
 # Excel columns to sync from JSON
@@ -81,11 +81,8 @@ def _coerce_excel_value(col_name: str, value: Any) -> Any:
 def load_db_inventory() -> pd.DataFrame:
     """Load inventory table from SQLite database."""
     db_path = _get_db_path()
-    conn = sqlite3.connect(db_path)
-    try:
+    with connection(db_path) as conn:
         return pd.read_sql("SELECT * FROM inventory", conn)
-    finally:
-        conn.close()
 
 
 def detect_changes(current_values: Dict[str, Any], new_values: Dict[str, Any]) -> bool:
@@ -18,7 +18,9 @@ from app.config.ebay_config import (
 	EBAY_CATEGORY_RERANK_MAX_TOKENS,
 	EBAY_CATEGORY_TEMP,
 )
-from app.repositories.sku_json_repo import read_sku_json, write_sku_json
+from app.repositories import cache_coordination
+from app.repositories.sku_json_repo import read_sku_json, update_sku_json
+from app.repositories.sqlite_db import connection
 from app.services.ebay_enrichment import get_openai_client
 from app.services.excel_inventory import _get_db_path
 from app.services.image_listing import list_images_for_sku
@@ -27,6 +29,8 @@ logger = logging.getLogger(__name__)
 
 _category_debug_logger: Optional[logging.Logger] = None
 _category_token_idf_cache: Optional[Dict[str, float]] = None
+# Rebuilt when any worker syncs the ebay_categories table
+_category_token_idf_watch = cache_coordination.GenerationWatch(cache_coordination.EBAY_CATEGORIES)
 _GENERIC_TOKENS = {
 	"zubehor",
 	"zubehoer",
@@ -193,8 +197,9 @@ def _tokenize(value: Any) -> List[str]:
 
 def _build_category_token_idf(entries: List[Dict[str, Any]]) -> Dict[str, float]:
 	global _category_token_idf_cache
-	if _category_token_idf_cache is not None:
+	if _category_token_idf_cache is not None and not _category_token_idf_watch.changed():
 		return _category_token_idf_cache
+	generation = _category_token_idf_watch.current()
 
 	n = max(len(entries), 1)
 	doc_freq: Dict[str, int] = {}
@@ -208,14 +213,13 @@ def _build_category_token_idf(entries: List[Dict[str, Any]]) -> Dict[str, float]
 		idf[token] = 1.0 + math.log((n + 1) / (df + 1))
 
 	_category_token_idf_cache = idf
+	_category_token_idf_watch.sync(generation)
 	return idf
 
 
 def _load_category_entries() -> List[Dict[str, Any]]:
 	db_path = _get_db_path()
-	conn = sqlite3.connect(db_path)
-	conn.row_factory = sqlite3.Row
-	try:
+	with connection(db_path, row_factory=sqlite3.Row) as conn:
 		columns = [r[1] for r in conn.execute("PRAGMA table_info(ebay_categories)").fetchall()]
 		if not columns:
 			return []
@@ -260,8 +264,6 @@ def _load_category_entries() -> List[Dict[str, Any]]:
 			)
 
 		return entries
-	finally:
-		conn.close()
 
 
 def _collect_main_image_paths(sku: str, product_json: Dict[str, Any], max_images: int = 12) -> List[Path]:
@@ -731,14 +733,17 @@ def _ai_choose_category_level(
 
 
 def _save_selected_category(sku: str, product_json: Dict[str, Any], chosen: Dict[str, Any]) -> None:
-	if "Ebay Category" not in product_json or not isinstance(product_json.get("Ebay Category"), dict):
-		product_json["Ebay Category"] = {}
+	def _apply(target: Dict[str, Any]) -> None:
+		if "Ebay Category" not in target or not isinstance(target.get("Ebay Category"), dict):
+			target["Ebay Category"] = {}
 
-	product_json["Ebay Category"]["Category"] = chosen["category_path"]
-	if chosen.get("category_id"):
-		product_json["Ebay Category"]["eBay Category ID"] = str(chosen["category_id"])
+		target["Ebay Category"]["Category"] = chosen["category_path"]
+		if chosen.get("category_id"):
+			target["Ebay Category"]["eBay Category ID"] = str(chosen["category_id"])
 
-	write_sku_json(sku, product_json)
+	_apply(product_json)
+	# product_json was read before the (slow) AI selection; save onto the current file
+	update_sku_json(sku, _apply)
 
 
 def detect_and_save_ebay_category_for_sku(sku: str, use_images: bool = True) -> Dict[str, Any]:
@@ -0,0 +1,195 @@
+"""
+Unified eBay category fee resolver
+
+Fees of a category come from three sources, each indexed once into a
+category id -> {"payment_fee", "sales_commission_percentage"} dict:
+
+- MAPPING: schemas/category_mapping.json (authoritative, refreshed from the
+  ebay_categories table)
+- SCHEMA: `_metadata.fees` of the cached schema files
+- INVENTORY: "Payment Fee €" / "Sales Commission % up to 7500€" of the
+  inventory table (first row per eBay Category ID)
+
+MAPPING and SCHEMA are rebuilt when the schema catalogue changes, INVENTORY
+when the inventory snapshot does (and only once a caller asks for it).
+Callers pass the sources in the order they trust them; the first source
+with a fee for the category wins.
+"""
+import logging
+import math
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.repositories import ebay_schema_catalog_repo
+from app.services.excel_inventory import excel_inventory
+
+logger = logging.getLogger(__name__)
+
+MAPPING = "mapping"
+SCHEMA = "schema"
+INVENTORY = "inventory"
+SOURCES = (MAPPING, SCHEMA, INVENTORY)
+
+INVENTORY_CATEGORY_COLUMN = "eBay Category ID"
+INVENTORY_PAYMENT_FEE_COLUMN = "Payment Fee €"
+INVENTORY_COMMISSION_COLUMN = "Sales Commission % up to 7500€"
+
+Fees = Dict[str, float]
+
+_lock = threading.RLock()
+# Catalogue the MAPPING/SCHEMA indexes were built from (get_catalog() returns a new dict on change)
+_catalog: Optional[Dict[str, Any]] = None
+_indexes: Dict[str, Dict[str, Fees]] = {}
+_inventory_version: Optional[Tuple[Any, ...]] = None
+
+
+def coerce_fee(value: Any) -> Optional[float]:
+    """float(value), or None for missing, blank, NaN and non-numeric values."""
+    if value is None:
+        return None
+    if isinstance(value, str) and not value.strip():
+        return None
+    try:
+        numeric = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(numeric) else numeric
+
+
+def normalize_fees(raw_fees: Any) -> Fees:
+    """
+    Fees in the resolver's shape; keys without a usable value are left out.
+
+    The commission is read from sales_commission_up_to (category_mapping.json)
+    or sales_commission_percentage (schema metadata).
+    """
+    fees = raw_fees if isinstance(raw_fees, dict) else {}
+    payment_fee = coerce_fee(fees.get("payment_fee"))
+    commission = coerce_fee(fees.get("sales_commission_up_to"))
+    if commission is None:
+        commission = coerce_fee(fees.get("sales_commission_percentage"))
+
+    normalized: Fees = {}
+    if payment_fee is not None:
+        normalized["payment_fee"] = payment_fee
+    if commission is not None:
+        normalized["sales_commission_percentage"] = commission
+    return normalized
+
+
+def _category_key(category_id: Any) -> str:
+    """Category ids as text ("11450" for 11450, 11450.0 and " 11450 ")."""
+    if isinstance(category_id, float) and category_id.is_integer():
+        category_id = int(category_id)
+    return str(category_id if category_id is not None else "").strip()
+
+
+def _build_mapping_index() -> Dict[str, Fees]:
+    index: Dict[str, Fees] = {}
+    for entry in ebay_schema_catalog_repo.mapping_rows():
+        if not isinstance(entry, dict):
+            continue
+        cat_id = _category_key(entry.get("categoryId"))
+        fees = normalize_fees(entry.get("fees"))
+        if cat_id and fees:
+            # Last row wins, like mapping_by_id()
+            index[cat_id] = fees
+    return index
+
+
+def _build_schema_index() -> Dict[str, Fees]:
+    index: Dict[str, Fees] = {}
+    for cat_id, raw_fees in ebay_schema_catalog_repo.schema_fees_by_category_id().items():
+        fees = normalize_fees(raw_fees)
+        if fees:
+            index[_category_key(cat_id)] = fees
+    return index
+
+
+def _build_inventory_index() -> Dict[str, Fees]:
+    df = excel_inventory.load(
+        [INVENTORY_CATEGORY_COLUMN, INVENTORY_PAYMENT_FEE_COLUMN, INVENTORY_COMMISSION_COLUMN]
+    )
+    if INVENTORY_CATEGORY_COLUMN not in df.columns:
+        logger.warning("[FEES] Inventory is missing %r; no inventory fees", INVENTORY_CATEGORY_COLUMN)
+        return {}
+
+    df = df[df[INVENTORY_CATEGORY_COLUMN].notna()]
+    category_ids = df[INVENTORY_CATEGORY_COLUMN].astype(object).map(_category_key)
+    first_rows = ~category_ids.duplicated()
+    payment_fees = df[INVENTORY_PAYMENT_FEE_COLUMN] if INVENTORY_PAYMENT_FEE_COLUMN in df.columns else None
+    commissions = df[INVENTORY_COMMISSION_COLUMN] if INVENTORY_COMMISSION_COLUMN in df.columns else None
+
+    index: Dict[str, Fees] = {}
+    for position in first_rows.to_numpy().nonzero()[0]:
+        fees: Fees = {}
+        if payment_fees is not None:
+            payment_fee = coerce_fee(payment_fees.iloc[position])
+            if payment_fee is not None:
+                fees["payment_fee"] = payment_fee
+        if commissions is not None:
+            commission = coerce_fee(commissions.iloc[position])
+            if commission is not None:
+                fees["sales_commission_percentage"] = commission
+        cat_id = category_ids.iloc[position]
+        if cat_id and fees:
+            index[cat_id] = fees
+    return index
+
+
+def _index(source: str) -> Dict[str, Fees]:
+    global _catalog, _inventory_version
+    with _lock:
+        if source == INVENTORY:
+            version = excel_inventory.version()
+            if INVENTORY not in _indexes or version != _inventory_version:
+                _indexes[INVENTORY] = _build_inventory_index()
+                _inventory_version = version
+                logger.info("[FEES] Indexed inventory fees for %s categories", len(_indexes[INVENTORY]))
+            return _indexes[INVENTORY]
+
+        catalog = ebay_schema_catalog_repo.get_catalog()
+        if catalog is not _catalog:
+            _indexes.pop(MAPPING, None)
+            _indexes.pop(SCHEMA, None)
+            _catalog = catalog
+        if source not in _indexes:
+            _indexes[source] = _build_mapping_index() if source == MAPPING else _build_schema_index()
+            logger.info("[FEES] Indexed %s fees for %s categories", source, len(_indexes[source]))
+        return _indexes[source]
+
+
+def fees_by_category(source: str) -> Dict[str, Fees]:
+    """The category id -> fees index of one source (shared, do not modify)."""
+    if source not in SOURCES:
+        raise ValueError(f"Unknown fee source: {source}")
+    try:
+        return _index(source)
+    except Exception as e:
+        logger.warning("[FEES] Could not index %s fees: %s", source, e)
+        return {}
+
+
+def resolve(category_id: Any, sources: Iterable[str] = SOURCES) -> Tuple[Optional[str], Fees]:
+    """
+    (source, fees) of the first source with fees for the category.
+
+    Returns (None, {}) when no source has any.
+    """
+    cat_id = _category_key(category_id)
+    if not cat_id:
+        return None, {}
+    for source in sources:
+        fees = fees_by_category(source).get(cat_id)
+        if fees:
+            return source, dict(fees)
+    return None, {}
+
+
+def invalidate() -> None:
+    """Drop all fee indexes (rebuilt on next use)."""
+    global _catalog, _inventory_version
+    with _lock:
+        _indexes.clear()
+        _catalog = None
+        _inventory_version = None
@@ -3,6 +3,7 @@ from __future__ import annotations
 import sqlite3
 from typing import Any, Dict, List, Optional
 
+from app.repositories.sqlite_db import connection
 from app.services.excel_inventory import _get_db_path
 
 
@@ -20,9 +21,7 @@ def search_ebay_categories(query: str, limit: int = 20) -> List[Dict[str, Any]]:
         return []
 
     db_path = _get_db_path()
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    try:
+    with connection(db_path, row_factory=sqlite3.Row) as conn:
         columns = [r[1] for r in conn.execute("PRAGMA table_info(ebay_categories)").fetchall()]
         if not columns:
             return []
@@ -64,5 +63,3 @@ def search_ebay_categories(query: str, limit: int = 20) -> List[Dict[str, Any]]:
             )
 
         return results
-    finally:
-        conn.close()
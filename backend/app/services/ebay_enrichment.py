@@ -23,7 +23,7 @@ from app.config.ebay_config import (
     EBAY_SEO_ENRICHMENT_PROMPT_V2,
 )
 from app.services.ebay_schema import get_schema_for_sku
-from app.repositories.sku_json_repo import read_sku_json, _sku_json_path
+from app.repositories.sku_json_repo import read_sku_json, update_sku_json, _sku_json_path
 from app.services.image_listing import list_images_for_sku
 
 logger = logging.getLogger(__name__)
@@ -1002,13 +1002,9 @@ def _copy_seo_to_sku(sku: str, seo_fields: Dict[str, str], force: bool = False,
     # Write SEO fields to product JSON
     _write_ebay_seo_fields(product_json, merged)
     
-    # Save back to file
+    # Save back to file (SEO section only, onto the current file under the SKU lock)
     json_path = _sku_json_path(sku)
-    full_data = {sku: product_json}
-    temp_path = json_path.with_suffix(".tmp.json")
-    with temp_path.open("w", encoding="utf-8") as f:
-        json.dump(full_data, f, ensure_ascii=False, indent=2)
-    temp_path.replace(json_path)
+    update_sku_json(sku, lambda latest: _write_ebay_seo_fields(latest, merged))
     
     logger.info(f"[SEO] Copied SEO to {sku} ({updated_count} fields updated)")
     if trace_id:
@@ -1229,12 +1225,9 @@ def _enrich_single_sku_seo(sku: str, force: bool = False, trace_id: Optional[str
 
     _write_ebay_seo_fields(product_json, merged)
 
+    # The AI call takes a while: write the SEO section onto the current file
     json_path = _sku_json_path(sku)
-    full_data = {sku: product_json}
-    temp_path = json_path.with_suffix(".tmp.json")
-    with temp_path.open("w", encoding="utf-8") as f:
-        json.dump(full_data, f, ensure_ascii=False, indent=2)
-    temp_path.replace(json_path)
+    update_sku_json(sku, lambda latest: _write_ebay_seo_fields(latest, merged))
     if trace_id:
         _seo_debug(
             "seo_single_saved",
@@ -1535,23 +1528,20 @@ def enrich_ebay_fields(sku: str, force: bool = False) -> Dict[str, Any]:
     missing_required = [name for name in required_names if not (merged_required.get(name) or "").strip()]
     
     # Save back to JSON
-    product_json["eBay Fields"] = {
-        "required": merged_required,
-        "optional": merged_optional
-    }
-    
-    # Remove legacy Ebay section if exists
-    if "Ebay" in product_json and "Fields" in product_json.get("Ebay", {}):
-        del product_json["Ebay"]
+    def _save_fields(target: Dict[str, Any]) -> None:
+        target["eBay Fields"] = {
+            "required": merged_required,
+            "optional": merged_optional
+        }
+        
+        # Remove legacy Ebay section if exists
+        if "Ebay" in target and "Fields" in target.get("Ebay", {}):
+            del target["Ebay"]
     
-    # Atomic write
-    json_path = _sku_json_path(sku)
-    full_data = {sku: product_json}
+    _save_fields(product_json)
     
-    temp_path = json_path.with_suffix(".tmp.json")
-    with temp_path.open("w", encoding="utf-8") as f:
-        json.dump(full_data, f, ensure_ascii=False, indent=2)
-    temp_path.replace(json_path)
+    # Locked write onto the current file (the vision call above takes a while)
+    update_sku_json(sku, _save_fields)
     
     seo_result = enrich_ebay_seo_fields(sku, force=force)
     updated_seo_fields = int(seo_result.get("updated_seo_fields", 0))
@@ -9,6 +9,7 @@ import os
 import re
 import time
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from decimal import Decimal, InvalidOperation
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -45,13 +46,15 @@ from app.config.ebay_config import (
     LISTING_SHIPPING_INFO
 )
 from app.repositories import ebay_cache_repo
-from app.repositories.sku_json_repo import read_sku_json, write_sku_json, _sku_json_path
+from app.repositories.sku_json_repo import read_sku_json, update_sku_json
 from app.services.image_listing import list_images_for_sku
 from app.services.ebay_listings_cache import read_cache
 from app.services.ebay_oauth import get_access_token
 
 logger = logging.getLogger(__name__)
 
+EBAY_UPLOAD_WORKERS = max(1, int(os.getenv("EBAY_UPLOAD_WORKERS", "4")))  # EPS uploads in flight per SKU
+
 
 def _safe_prompt_replace(template: str, replacements: Dict[str, Any]) -> str:
     text = template or ""
@@ -300,7 +303,9 @@ def upload_images_for_sku(
     # Sort eBay images by order
     sorted_ebay_images = sorted(ebay_images, key=lambda x: x.get('order', 999))
     
-    urls: List[str] = []
+    slots: List[Optional[str]] = []
+    pending: List[Tuple[int, Dict[str, Any], Path]] = []
+    uploaded_urls: Dict[str, str] = {}
     uploaded_count = 0
     cached_count = 0
     updated = False
@@ -313,7 +318,7 @@ def upload_images_for_sku(
         # Check if already uploaded (has eBay URL cached)
         cached_url = img_data.get('eBay URL')
         if cached_url and not force_reupload:
-            urls.append(cached_url)
+            slots.append(cached_url)
             cached_count += 1
             logger.debug(f"Using cached URL for {filename}")
             continue
@@ -324,19 +329,33 @@ def upload_images_for_sku(
             logger.warning(f"Image file not found on disk: {filename}")
             continue
         
-        try:
-            logger.info(f"Uploading to eBay: {image_path.name}")
-            url = upload_picture_to_ebay(image_path)
-            urls.append(url)
-            uploaded_count += 1
-            
-            # Update JSON with eBay URL
-            img_data['eBay URL'] = url
-            updated = True
-            
-        except Exception as e:
-            logger.error(f"Failed to upload {filename}: {e}")
-            continue
+        pending.append((len(slots), img_data, image_path))
+        slots.append(None)
+    
+    # Upload missing images concurrently; slots keep the eBay Images order
+    if pending:
+        workers = max(1, min(EBAY_UPLOAD_WORKERS, len(pending)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="eps-upload") as executor:
+            futures = {}
+            for slot, img_data, image_path in pending:
+                logger.info(f"Uploading to eBay: {image_path.name}")
+                futures[executor.submit(upload_picture_to_ebay, image_path)] = (slot, img_data)
+            for future in as_completed(futures):
+                slot, img_data = futures[future]
+                try:
+                    url = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to upload {img_data.get('filename', '')}: {e}")
+                    continue
+                slots[slot] = url
+                uploaded_count += 1
+                
+                # Update JSON with eBay URL
+                img_data['eBay URL'] = url
+                uploaded_urls[img_data.get('filename', '')] = url
+                updated = True
+    
+    urls: List[str] = [url for url in slots if url]
 
     logger.info(
         "Upload summary for SKU %s -> uploaded: %s, cached: %s, urls: %s",
@@ -350,13 +369,24 @@ def upload_images_for_sku(
     if updated:
         try:
             product_json["Images"]["eBay Images"] = sorted_ebay_images
-            json_path = _sku_json_path(sku)
-            full_data = {sku: product_json}
-            
-            temp_path = json_path.with_suffix(".tmp.json")
-            with temp_path.open("w", encoding="utf-8") as f:
-                json.dump(full_data, f, ensure_ascii=False, indent=2)
-            temp_path.replace(json_path)
+
+            # Uploads take a while: merge the new URLs into the current file by filename
+            def _store_urls(latest: Dict[str, Any]) -> None:
+                latest_images = latest.get("Images")
+                if not isinstance(latest_images, dict):
+                    latest_images = latest["Images"] = {}
+                current = latest_images.get("eBay Images")
+                if not isinstance(current, list) or not current:
+                    latest_images["eBay Images"] = sorted_ebay_images
+                    return
+                for entry in current:
+                    if isinstance(entry, dict) and entry.get("filename") in uploaded_urls:
+                        entry["eBay URL"] = uploaded_urls[entry["filename"]]
+                latest_images["eBay Images"] = sorted(
+                    current, key=lambda x: x.get('order', 999) if isinstance(x, dict) else 999
+                )
+
+            update_sku_json(sku, _store_urls)
             
             logger.info(f"Saved {uploaded_count} new eBay URLs to JSON")
         except Exception as e:
@@ -924,17 +954,18 @@ def generate_and_save_ebay_title(sku: str) -> Dict[str, Any]:
         product_json["eBay SEO"] = {}
     
     product_json["eBay SEO"]["eBay Title"] = assembled_title
-    write_sku_json(first_sku, product_json)
+
+    def _set_title(target: Dict[str, Any]) -> None:
+        if "eBay SEO" not in target or not isinstance(target.get("eBay SEO"), dict):
+            target["eBay SEO"] = {}
+        target["eBay SEO"]["eBay Title"] = assembled_title
+
+    update_sku_json(first_sku, _set_title)
     
     # Copy title to all other SKUs with JSON files (without regenerating)
     if len(skus_with_json) > 1:
         for other_sku in skus_with_json[1:]:
-            other_json = read_sku_json(other_sku)
-            if other_json:
-                if "eBay SEO" not in other_json or not isinstance(other_json.get("eBay SEO"), dict):
-                    other_json["eBay SEO"] = {}
-                other_json["eBay SEO"]["eBay Title"] = assembled_title
-                write_sku_json(other_sku, other_json)
+            update_sku_json(other_sku, _set_title)
     
     return {
         "success": True,
@@ -1458,15 +1489,94 @@ def create_listing(
 ) -> Dict[str, Any]:
     """
     Create eBay listing from product JSON
+
+    Runs the listing stages one after another: prepare_listing_draft,
+    resolve_listing_ai_fields, upload_listing_images, submit_listing_draft
+    (ebay_listing_batch runs the same stages pipelined for many SKUs).
     
     Returns:
         Dict with creation results
     """
+    draft = prepare_listing_draft(
+        sku=sku,
+        price=price,
+        condition_id=condition_id,
+        condition_description=condition_description,
+        schedule_days=schedule_days,
+        payment_policy=payment_policy,
+        return_policy=return_policy,
+        shipping_policy=shipping_policy,
+        custom_description=custom_description,
+        best_offer_enabled=best_offer_enabled,
+        quantity=quantity,
+        ebay_sku=ebay_sku,
+        ean=ean,
+    )
+    resolve_listing_ai_fields(draft)
+    upload_listing_images(draft)
+    return submit_listing_draft(draft)
+
+
+def _build_item_specifics_xml(
+    required_values: Dict[str, Any],
+    optional_values: Dict[str, Any],
+) -> str:
+    lines = ["<ItemSpecifics>"]
+
+    for name, value in (required_values or {}).items():
+        value_text = "" if value is None else str(value).strip()
+        if value_text:
+            lines.append("  <NameValueList>")
+            lines.append(f"    <Name>{html.escape(str(name))}</Name>")
+            lines.append(f"    <Value>{html.escape(value_text)}</Value>")
+            lines.append("  </NameValueList>")
+
+    for name, value in (optional_values or {}).items():
+        value_text = "" if value is None else str(value).strip()
+        if value_text:
+            lines.append("  <NameValueList>")
+            lines.append(f"    <Name>{html.escape(str(name))}</Name>")
+            lines.append(f"    <Value>{html.escape(value_text)}</Value>")
+            lines.append("  </NameValueList>")
+
+    lines.append("</ItemSpecifics>")
+    return "\n    ".join(lines)
+
+
+def _build_product_listing_details_xml(ean_value: Any) -> str:
+    clean = "" if ean_value is None else str(ean_value).strip()
+    if not clean:
+        return ""
+    return (
+        "<ProductListingDetails>"
+        f"<EAN>{html.escape(clean)}</EAN>"
+        "</ProductListingDetails>"
+    )
+
+
+def prepare_listing_draft(
+    sku: str,
+    price: float,
+    condition_id: Optional[int] = None,
+    condition_description: Optional[str] = None,
+    schedule_days: int = DEFAULT_SCHEDULE_DAYS,
+    payment_policy: Optional[str] = None,
+    return_policy: Optional[str] = None,
+    shipping_policy: Optional[str] = None,
+    custom_description: Optional[str] = None,
+    best_offer_enabled: bool = True,
+    quantity: int = DEFAULT_QUANTITY,
+    ebay_sku: Optional[str] = None,
+    ean: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Listing stage 1: everything derived from the product JSON (no remote calls).
+
+    Returns:
+        Draft dict consumed by the later stages
+    """
     logger.info(f"Creating eBay listing for SKU {sku} at price {price}€")
     
-    token = get_ebay_token()
-    endpoint = get_api_endpoint()
-    
     # Use ebay_sku if provided, otherwise use original sku
     listing_sku = ebay_sku if ebay_sku else sku
     
@@ -1477,7 +1587,6 @@ def create_listing(
     
     # Extract sections
     product_info = product_json.get("Intern Product Info", {})
-    generated_info = product_json.get("Intern Generated Info", {})
     condition_section = product_json.get("Product Condition", {})
     ebay_cat = product_json.get("Ebay Category", {})
     ebay_fields = product_json.get("eBay Fields", {})
@@ -1514,26 +1623,6 @@ def create_listing(
         condition_id,
         category_id,
     )
-
-    condition_desc_clean = (condition_description or "").strip()
-    if condition_id != 1000 and not condition_desc_clean:
-        logger.warning("Missing condition description for non-new SKU %s (condition_id=%s)", sku, condition_id)
-    
-    # Upload images
-    upload_result = upload_images_for_sku(sku, max_images=EBAY_MAX_IMAGES)
-    image_urls = upload_result.get("urls", [])
-    logger.info("Upload result for %s: %s", sku, upload_result)
-    
-    if not image_urls:
-        logger.error("No image URLs after upload for SKU %s", sku)
-        raise ValueError(f"No images uploaded for SKU {sku}")
-    
-    # Build picture details XML
-    picture_lines = ["<PictureDetails>"]
-    for url in image_urls:
-        picture_lines.append(f"  <PictureURL>{url}</PictureURL>")
-    picture_lines.append("</PictureDetails>")
-    picture_details_xml = "\n    ".join(picture_lines)
     
     # Resolve EAN from request first, then JSON fallbacks
     ean_section = product_json.get("EAN", {}) if isinstance(product_json.get("EAN", {}), dict) else {}
@@ -1550,79 +1639,120 @@ def create_listing(
     required_fields.pop("EAN", None)
     optional_fields.pop("EAN", None)
 
-    def _build_item_specifics_xml(
-        required_values: Dict[str, Any],
-        optional_values: Dict[str, Any],
-    ) -> str:
-        lines = ["<ItemSpecifics>"]
-
-        for name, value in (required_values or {}).items():
-            value_text = "" if value is None else str(value).strip()
-            if value_text:
-                lines.append("  <NameValueList>")
-                lines.append(f"    <Name>{html.escape(str(name))}</Name>")
-                lines.append(f"    <Value>{html.escape(value_text)}</Value>")
-                lines.append("  </NameValueList>")
-
-        for name, value in (optional_values or {}).items():
-            value_text = "" if value is None else str(value).strip()
-            if value_text:
-                lines.append("  <NameValueList>")
-                lines.append(f"    <Name>{html.escape(str(name))}</Name>")
-                lines.append(f"    <Value>{html.escape(value_text)}</Value>")
-                lines.append("  </NameValueList>")
-
-        lines.append("</ItemSpecifics>")
-        return "\n    ".join(lines)
-
-    item_specifics_xml = _build_item_specifics_xml(required_fields, optional_fields)
-
-    def _normalize_identifier_value(raw: Any) -> str:
-        if raw is None:
-            return ""
-        value = str(raw).strip()
-        return value
-
-    def _build_product_listing_details_xml(ean_value: Any) -> str:
-        clean = _normalize_identifier_value(ean_value)
-        if not clean:
-            return ""
-        return (
-            "<ProductListingDetails>"
-            f"<EAN>{html.escape(clean)}</EAN>"
-            "</ProductListingDetails>"
-        )
-
     listing_details_ean = resolved_ean if resolved_ean else "Does not apply"
-    product_listing_details_xml = _build_product_listing_details_xml(listing_details_ean)
-    
-    # Get manufacturer info
-    brand = product_info.get("Brand", "").strip()
-    manufacturer_info = None
-    manufacturer_xml = ""
+    logger.info(
+        "Identifier payload for SKU %s: request_ean='%s', json_ean='%s', resolved_ean='%s', sent_product_listing_details_ean='%s'",
+        sku,
+        request_ean_clean,
+        json_ean_clean,
+        resolved_ean,
+        listing_details_ean,
+    )
     
+    # Schedule time (if schedule_days=0, upload immediately, otherwise schedule in future)
+    if schedule_days == 0:
+        schedule_time = None  # Upload immediately
+    else:
+        schedule_time = (datetime.utcnow() + timedelta(days=schedule_days)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+    return {
+        "sku": sku,
+        "listing_sku": listing_sku,
+        "price": price,
+        "quantity": quantity,
+        "title": title,
+        "html_desc": html_desc,
+        "category_id": category_id,
+        "condition_id": condition_id,
+        "condition_description": (condition_description or "").strip(),
+        "brand": str(product_info.get("Brand", "") or "").strip(),
+        "item_specifics_xml": _build_item_specifics_xml(required_fields, optional_fields),
+        "product_listing_details_xml": _build_product_listing_details_xml(listing_details_ean),
+        "payment_policy": payment_policy or PAYMENT_POLICY_NAME,
+        "return_policy": return_policy or RETURN_POLICY_NAME,
+        "shipping_policy": "VERSAND_EU",
+        "schedule_time": schedule_time,
+        "best_offer_enabled": best_offer_enabled,
+        "manufacturer_info": None,
+        "image_urls": [],
+    }
+
+
+def resolve_listing_ai_fields(draft: Dict[str, Any], generate_condition_note: bool = False) -> Dict[str, Any]:
+    """
+    Listing stage 2: fields that may need OpenAI.
+
+    Manufacturer info for the brand (cached per brand) and, when
+    generate_condition_note is set, a condition description for non-new
+    items that have none.
+    """
+    sku = draft["sku"]
+    brand = draft.get("brand") or ""
     if brand:
         try:
-            manufacturer_info = get_manufacturer_info(brand)
-            manufacturer_xml = _build_manufacturer_xml(manufacturer_info)
+            draft["manufacturer_info"] = get_manufacturer_info(brand)
         except Exception as e:
             logger.warning(f"Manufacturer lookup failed for '{brand}': {e}")
+
+    if generate_condition_note and draft["condition_id"] != 1000 and not draft["condition_description"]:
+        generated = generate_condition_description(sku, draft["condition_id"])
+        if generated.get("success"):
+            draft["condition_description"] = (generated.get("condition_description") or "").strip()
+        else:
+            logger.warning("Condition description generation failed for %s: %s", sku, generated.get("message"))
+    return draft
+
+
+def upload_listing_images(draft: Dict[str, Any]) -> Dict[str, Any]:
+    """Listing stage 3: upload (or reuse cached) EPS picture URLs."""
+    sku = draft["sku"]
+    upload_result = upload_images_for_sku(sku, max_images=EBAY_MAX_IMAGES)
+    image_urls = upload_result.get("urls", [])
+    logger.info("Upload result for %s: %s", sku, upload_result)
+    
+    if not image_urls:
+        logger.error("No image URLs after upload for SKU %s", sku)
+        raise ValueError(f"No images uploaded for SKU {sku}")
+    draft["image_urls"] = image_urls
+    return draft
+
+
+def submit_listing_draft(draft: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Listing stage 4: AddFixedPriceItem for a prepared draft with picture URLs.
     
-    # Business policies
-    payment_policy = payment_policy or PAYMENT_POLICY_NAME
-    return_policy = return_policy or RETURN_POLICY_NAME
-    shipping_policy = "VERSAND_EU"
+    Returns:
+        Dict with creation results
+    """
+    token = get_ebay_token()
+    endpoint = get_api_endpoint()
+    sku = draft["sku"]
+    title = draft["title"]
+    html_desc = draft["html_desc"]
+    category_id = draft["category_id"]
+    condition_id = draft["condition_id"]
+    price = draft["price"]
+    schedule_time = draft["schedule_time"]
+    image_urls = draft["image_urls"]
+    manufacturer_info = draft.get("manufacturer_info")
+
+    condition_desc_clean = draft.get("condition_description") or ""
+    if condition_id != 1000 and not condition_desc_clean:
+        logger.warning("Missing condition description for non-new SKU %s (condition_id=%s)", sku, condition_id)
     
-    # Schedule time (if schedule_days=0, upload immediately, otherwise schedule in future)
-    if schedule_days == 0:
-        schedule_time = None  # Upload immediately
-    else:
-        schedule_time = (datetime.utcnow() + timedelta(days=schedule_days)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    # Build picture details XML
+    picture_lines = ["<PictureDetails>"]
+    for url in image_urls:
+        picture_lines.append(f"  <PictureURL>{url}</PictureURL>")
+    picture_lines.append("</PictureDetails>")
+    picture_details_xml = "\n    ".join(picture_lines)
+
+    manufacturer_xml = _build_manufacturer_xml(manufacturer_info) if manufacturer_info else ""
     price_str = f"{price:.2f}"
     
     # Build XML request
     best_offer_xml = ""
-    if best_offer_enabled:
+    if draft.get("best_offer_enabled"):
         best_offer_xml = """<BestOfferDetails>
         <BestOfferEnabled>true</BestOfferEnabled>
     </BestOfferDetails>"""
@@ -1640,7 +1770,7 @@ def create_listing(
   <ErrorLanguage>de_DE</ErrorLanguage>
   <WarningLevel>High</WarningLevel>
   <Item>
-    <SKU>{listing_sku}</SKU>
+    <SKU>{draft["listing_sku"]}</SKU>
     <Title>{html.escape(title)}</Title>
     <Description><![CDATA[{html_desc}]]></Description>
     <PrimaryCategory>
@@ -1665,17 +1795,17 @@ def create_listing(
 
     <SellerProfiles>
       <SellerPaymentProfile>
-        <PaymentProfileName>{payment_policy}</PaymentProfileName>
+        <PaymentProfileName>{draft["payment_policy"]}</PaymentProfileName>
       </SellerPaymentProfile>
       <SellerReturnProfile>
-        <ReturnProfileName>{return_policy}</ReturnProfileName>
+        <ReturnProfileName>{draft["return_policy"]}</ReturnProfileName>
       </SellerReturnProfile>
       <SellerShippingProfile>
-        <ShippingProfileName>{shipping_policy}</ShippingProfileName>
+        <ShippingProfileName>{draft["shipping_policy"]}</ShippingProfileName>
       </SellerShippingProfile>
     </SellerProfiles>
 
-    <Quantity>{quantity}</Quantity>
+    <Quantity>{draft["quantity"]}</Quantity>
     {manufacturer_xml}
     {picture_details_xml}
     {item_specifics_value}
@@ -1722,15 +1852,7 @@ def create_listing(
             "errors": errors,
         }
 
-    logger.info(
-        "Identifier payload for SKU %s: request_ean='%s', json_ean='%s', resolved_ean='%s', sent_product_listing_details_ean='%s'",
-        sku,
-        request_ean_clean,
-        json_ean_clean,
-        resolved_ean,
-        listing_details_ean,
-    )
-    call_result = _send_add_fixed_price_item(item_specifics_xml, product_listing_details_xml)
+    call_result = _send_add_fixed_price_item(draft["item_specifics_xml"], draft["product_listing_details_xml"])
 
     success = bool(call_result.get("success"))
     item_id = call_result.get("item_id")
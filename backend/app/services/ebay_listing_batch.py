@@ -0,0 +1,193 @@
+"""
+Pipelined batch creation of eBay listings.
+
+Each SKU goes through the same stages as ebay_listing.create_listing:
+
+    prepare -> ai -> images -> submit
+
+but every stage has its own bounded worker pool, so SKU 2 is uploading
+pictures while SKU 1 is being submitted and SKU 3 is waiting on OpenAI.
+Total batch time approaches that of the slowest stage instead of the sum
+of all stages.
+
+stop_on_error: SKUs run one at a time in input order, like the old serial
+loop. A SKU's first stage starts only after the previous SKU was submitted,
+so the SKUs after a failure never write AI output into their product JSON
+or upload pictures to EPS. There is no pipelining in this mode.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.services import ebay_listing
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("prepare", "ai", "images", "submit")
+
+# Workers per stage: AI and EPS uploads are the slow, remote ones
+STAGE_WORKERS: Dict[str, int] = {
+    "prepare": 2,
+    "ai": 4,
+    "images": 3,
+    "submit": 2,
+}
+
+
+def _prepare(listing: Dict[str, Any]) -> Dict[str, Any]:
+    return ebay_listing.prepare_listing_draft(
+        sku=listing["sku"],
+        price=listing["price"],
+        condition_id=listing.get("condition_id"),
+        condition_description=listing.get("condition_description"),
+        schedule_days=listing.get("schedule_days", ebay_listing.DEFAULT_SCHEDULE_DAYS),
+        payment_policy=listing.get("payment_policy"),
+        return_policy=listing.get("return_policy"),
+        shipping_policy=listing.get("shipping_policy"),
+        custom_description=listing.get("custom_description"),
+        best_offer_enabled=listing.get("best_offer_enabled", True),
+        quantity=listing.get("quantity", ebay_listing.DEFAULT_QUANTITY),
+        ebay_sku=listing.get("ebay_sku"),
+        ean=listing.get("ean"),
+    )
+
+
+def _error_result(sku: str, error: Exception, stage: str) -> Dict[str, Any]:
+    return {
+        "success": False,
+        "sku": sku,
+        "message": f"Error: {error}",
+        "errors": [str(error)],
+        "stage": stage,
+    }
+
+
+def run_listing_batch(
+    listings: List[Dict[str, Any]],
+    stop_on_error: bool = False,
+    generate_condition_descriptions: bool = False,
+    batch_id: str = "",
+    stage_workers: Optional[Dict[str, int]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Create listings through the stage pipeline.
+
+    Args:
+        listings: CreateListingRequest-shaped dicts
+        stop_on_error: process SKUs one after another and stop at the first failed one
+        generate_condition_descriptions: let the AI stage write missing condition descriptions
+        batch_id: tag for log lines
+        stage_workers: per-stage pool sizes (default STAGE_WORKERS)
+
+    Yields:
+        {"type": "start", ...}, one {"type": "result", ...} per finished SKU
+        (completion order, with its input "index"), then {"type": "complete", ...}
+        whose "results" are in input order. SKUs dropped by stop_on_error
+        are counted as "skipped" and have no result.
+    """
+    workers = dict(STAGE_WORKERS, **(stage_workers or {}))
+    total = len(listings)
+    started = time.perf_counter()
+
+    stage_fns: Dict[str, Callable[[Any], Any]] = {
+        "prepare": _prepare,
+        "ai": lambda draft: ebay_listing.resolve_listing_ai_fields(
+            draft, generate_condition_note=generate_condition_descriptions
+        ),
+        "images": ebay_listing.upload_listing_images,
+        "submit": ebay_listing.submit_listing_draft,
+    }
+    pools = {
+        stage: ThreadPoolExecutor(
+            max_workers=1 if stop_on_error else max(1, workers[stage]),
+            thread_name_prefix=f"listing-{stage}",
+        )
+        for stage in STAGES
+    }
+
+    results: List[Optional[Dict[str, Any]]] = [None] * total
+    in_flight: Dict[Future, Tuple[int, str]] = {}
+    successful = 0
+    failed = 0
+
+    def dispatch(index: int, stage: str, payload: Any) -> None:
+        in_flight[pools[stage].submit(stage_fns[stage], payload)] = (index, stage)
+
+    logger.info(
+        "[BATCH %s] Pipeline start: total=%s stop_on_error=%s workers=%s",
+        batch_id, total, stop_on_error, workers,
+    )
+    yield {"type": "start", "total": total, "stop_on_error": stop_on_error}
+
+    try:
+        # stop_on_error: only the first SKU now, each next one once its predecessor succeeded
+        for index, listing in enumerate(listings[:1] if stop_on_error else listings):
+            dispatch(index, "prepare", listing)
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, stage = in_flight.pop(future)
+                sku = listings[index]["sku"]
+
+                try:
+                    value = future.result()
+                except Exception as e:
+                    logger.exception("[BATCH %s] EXCEPTION sku=%s stage=%s: %s", batch_id, sku, stage, e)
+                    result = _error_result(sku, e, stage)
+                else:
+                    if stage != "submit":
+                        dispatch(index, STAGES[STAGES.index(stage) + 1], value)
+                        continue
+                    result = value
+
+                results[index] = result
+                if result.get("success"):
+                    successful += 1
+                    logger.info("[BATCH %s] SUCCESS sku=%s item_id=%s", batch_id, sku, result.get("item_id"))
+                    if stop_on_error and index + 1 < total:
+                        dispatch(index + 1, "prepare", listings[index + 1])
+                else:
+                    failed += 1
+                    logger.error(
+                        "[BATCH %s] FAILED sku=%s message=%s errors=%s",
+                        batch_id, sku, result.get("message"), result.get("errors"),
+                    )
+                    if stop_on_error:
+                        logger.warning("[BATCH %s] stop_on_error triggered after sku=%s", batch_id, sku)
+
+                yield {
+                    "type": "result",
+                    "index": index,
+                    "sku": sku,
+                    "success": bool(result.get("success")),
+                    "result": result,
+                    "completed": successful + failed,
+                    "total": total,
+                    "successful": successful,
+                    "failed": failed,
+                }
+    finally:
+        for pool in pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    ordered = [result for result in results if result is not None]
+    skipped = total - len(ordered)
+    seconds = time.perf_counter() - started
+    logger.info(
+        "[BATCH %s] Pipeline done in %.1fs: successful=%s failed=%s skipped=%s",
+        batch_id, seconds, successful, failed, skipped,
+    )
+    yield {
+        "type": "complete",
+        "success": successful > 0,
+        "total": total,
+        "successful": successful,
+        "failed": failed,
+        "skipped": skipped,
+        "seconds": round(seconds, 2),
+        "results": ordered,
+    }
@@ -2,11 +2,13 @@
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import config  # type: ignore
+import json_codec  # type: ignore
 
 CACHE_FILE = config.PRODUCTS_FOLDER_PATH / "cache" / "ebay_listings_cache.json"
+SYNC_STATE_FILE = config.PRODUCTS_FOLDER_PATH / "cache" / "ebay_listings_sync_state.json"
 
 
 def _extract_lookup_sku(raw_sku: str) -> str:
@@ -42,8 +44,7 @@ def read_cache() -> Optional[Dict]:
         return None
     
     try:
-        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-            cache = json.load(f)
+        cache = json_codec.read_file(CACHE_FILE)
         
         if 'timestamp' not in cache or 'listings' not in cache:
             return None
@@ -68,80 +69,114 @@ def write_cache(listings: list) -> None:
         'listings': listings
     }
     
-    with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(cache, f, ensure_ascii=False, indent=2)
+    json_codec.write_file(CACHE_FILE, cache)
 
 
-def get_sku_has_listing(sku: str) -> Optional[bool]:
+def read_sync_state() -> Optional[Dict[str, Any]]:
     """
-    Check if a SKU has an active eBay listing (from cache).
-    
-    Args:
-        sku: The SKU to check
-    
+    Read the state of the last successful eBay listings sync.
+
     Returns:
-        True if SKU has listing, False if no listing, None if no cache data
+        Dict with 'synced_at' (UTC ISO timestamp taken when that sync started)
+        and 'mode' ('fast', 'detailed' or 'delta'), or None if unknown.
+    """
+    if not SYNC_STATE_FILE.exists():
+        return None
+    try:
+        with open(SYNC_STATE_FILE, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        return state if state.get('synced_at') else None
+    except Exception as e:
+        print(f"Error reading eBay listings sync state: {e}")
+        return None
+
+
+def write_sync_state(synced_at: datetime, mode: str) -> None:
+    """Record a successful sync; synced_at is the (UTC) time the sync started."""
+    SYNC_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(SYNC_STATE_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'synced_at': synced_at.isoformat(), 'mode': mode}, f, indent=2)
+
+
+def build_listing_sku_index(cache: Optional[Dict]) -> Optional[Dict[str, Any]]:
+    """
+    Index the SKUs of all cached listings for repeated lookups.
+
+    Returns:
+        Dict with 'exact' (set of individual SKUs) and 'ranges' (prefix ->
+        list of (start, end) numbers from range SKUs like JAL00246-JAL00248),
+        or None if there is no cache data
     """
-    cache = read_cache()
     if cache is None:
         return None
-    
-    listings = cache.get('listings', [])
-    
-    # Normalize and check SKU
-    normalized_sku = sku.strip()
-    
-    for listing in listings:
-        listing_sku = listing.get('sku', '').strip()
-        
+
+    exact: Set[str] = set()
+    ranges: Dict[str, List[Tuple[int, int]]] = {}
+    for listing in cache.get('listings', []) or []:
+        listing_sku = (listing.get('sku') or '').strip()
         if not listing_sku:
             continue
-        
+
         # Handle comma-separated combined SKUs
-        individual_skus = [s.strip() for s in listing_sku.split(',')]
-        
-        for individual_sku in individual_skus:
+        for individual_sku in (s.strip() for s in listing_sku.split(',')):
             if not individual_sku:
                 continue
-            
-            # Check for exact match
-            if individual_sku == normalized_sku:
-                return True
-            
-            # Check for range (e.g., JAL00246-JAL00248)
+            exact.add(individual_sku)
+
+            # Range (e.g., JAL00246-JAL00248): prefixes must match
             if '-' in individual_sku:
                 parts = individual_sku.split('-')
-                if len(parts) == 2:
-                    start_sku, end_sku = parts[0].strip(), parts[1].strip()
-                    
-                    # Extract prefix and numeric parts
-                    start_prefix = ''.join([c for c in start_sku if not c.isdigit()])
-                    end_prefix = ''.join([c for c in end_sku if not c.isdigit()])
-                    
-                    # Must have same prefix
-                    if start_prefix == end_prefix:
-                        start_num_str = start_sku[len(start_prefix):]
-                        end_num_str = end_sku[len(end_prefix):]
-                        
-                        try:
-                            start_num = int(start_num_str)
-                            end_num = int(end_num_str)
-                            
-                            # Check if our SKU is in this range
-                            check_prefix = ''.join([c for c in normalized_sku if not c.isdigit()])
-                            check_num_str = normalized_sku[len(check_prefix):]
-                            
-                            if check_prefix == start_prefix:
-                                try:
-                                    check_num = int(check_num_str)
-                                    if start_num <= check_num <= end_num:
-                                        return True
-                                except ValueError:
-                                    pass
-                        except ValueError:
-                            pass
+                if len(parts) != 2:
+                    continue
+                start_sku, end_sku = parts[0].strip(), parts[1].strip()
+                start_prefix = ''.join([c for c in start_sku if not c.isdigit()])
+                end_prefix = ''.join([c for c in end_sku if not c.isdigit()])
+                if start_prefix != end_prefix:
+                    continue
+                try:
+                    start_num = int(start_sku[len(start_prefix):])
+                    end_num = int(end_sku[len(end_prefix):])
+                except ValueError:
+                    continue
+                ranges.setdefault(start_prefix, []).append((start_num, end_num))
+
+    return {'exact': exact, 'ranges': ranges}
+
+
+def sku_in_listing_index(index: Dict[str, Any], sku: str) -> bool:
+    """Check a SKU against an index from build_listing_sku_index."""
+    normalized_sku = sku.strip()
+    if normalized_sku in index['exact']:
+        return True
+
+    check_prefix = ''.join([c for c in normalized_sku if not c.isdigit()])
+    prefix_ranges = index['ranges'].get(check_prefix)
+    if not prefix_ranges:
+        return False
+    try:
+        check_num = int(normalized_sku[len(check_prefix):])
+    except ValueError:
+        return False
+    return any(start_num <= check_num <= end_num for start_num, end_num in prefix_ranges)
+
+
+def get_sku_has_listing(sku: str) -> Optional[bool]:
+    """
+    Check if a SKU has an active eBay listing (from cache).
+
+    Reads the whole cache file; for many SKUs build the index once with
+    build_listing_sku_index and use sku_in_listing_index.
+
+    Args:
+        sku: The SKU to check
     
-    return False
+    Returns:
+        True if SKU has listing, False if no listing, None if no cache data
+    """
+    index = build_listing_sku_index(read_cache())
+    if index is None:
+        return None
+    return sku_in_listing_index(index, sku)
 
 
 def _sku_matches_listing_sku(normalized_sku: str, listing_sku: str) -> bool:
@@ -285,8 +320,7 @@ def update_listing_price_in_cache(sku: str, new_price: float) -> bool:
 
     if updated:
         CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(CACHE_FILE, "w", encoding="utf-8") as f:
-            json.dump(cache, f, ensure_ascii=False, indent=2)
+        json_codec.write_file(CACHE_FILE, cache)
 
     return updated
 
@@ -395,8 +429,7 @@ def update_listing_to_auction_in_cache(
 
     if updated:
         CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(CACHE_FILE, "w", encoding="utf-8") as f:
-            json.dump(cache, f, ensure_ascii=False, indent=2)
+        json_codec.write_file(CACHE_FILE, cache)
 
     return updated
 
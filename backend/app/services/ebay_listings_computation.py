@@ -3,16 +3,22 @@ import logging
 import os
 import requests
 import xml.etree.ElementTree as ET
+from datetime import timedelta
 from pathlib import Path
-from typing import Dict, Generator, Any, List
+from typing import Dict, Generator, Any, List, Tuple
 from urllib.parse import urlparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from app.services.ebay_profit_calculator import calculate_listing_profit, _get_marketplace_shipping_cost, invalidate_profit_caches
+from app.services.ebay_trading_client import build_active_list_request, build_seller_events_request, get_session, iter_pages
 
 TRADING_ENDPOINT = "https://api.ebay.com/ws/api.dll"
 NS = {"e": "urn:ebay:apis:eBLBaseComponents"}
 logger = logging.getLogger(__name__)
 MAX_PARALLEL_DETAIL_LOOKUPS = 10  # Process 10 items in parallel
+DELTA_SYNC_OVERLAP = timedelta(minutes=10)   # re-read a little before the last sync (clock skew)
+DELTA_SYNC_MAX_AGE = timedelta(days=30)      # older syncs fall back to a full fetch
+SELLER_EVENTS_MAX_WINDOW = timedelta(hours=48)  # longest ModTime window per GetSellerEvents call
+SELLER_EVENTS_MAX_ITEMS = 3000               # GetSellerEvents returns at most this many items per call
 
 
 def _setup_file_logging() -> None:
@@ -71,26 +77,52 @@ def _marketplace_from_url(view_url: str) -> str:
     return ""
 
 
+def _local_name(tag: str) -> str:
+    return tag.rpartition("}")[2]
+
+
+# Item children whose own children are read (one level deep)
+_NESTED_ITEM_FIELDS = {"ListingDetails", "SellingStatus", "PictureDetails", "PrimaryCategory", "BestOfferDetails"}
+
+
 def _extract_item_payload(item: ET.Element) -> Dict[str, Any]:
-    item_id = _clean_text(item.findtext("e:ItemID", default="", namespaces=NS))
-    sku = _clean_text(item.findtext("e:SKU", default="", namespaces=NS))
-    title = _clean_text(item.findtext("e:Title", default="", namespaces=NS))
-    site = _clean_text(item.findtext("e:Site", default="", namespaces=NS))
-    view_url = _clean_text(item.findtext("e:ListingDetails/e:ViewItemURL", default="", namespaces=NS))
+    """Normalize one <Item> in a single pass over its children (first occurrence wins, like findtext)."""
+    nodes: Dict[str, ET.Element] = {}
+    picture_nodes: List[ET.Element] = []
+    for child in item:
+        name = _local_name(child.tag)
+        if name in _NESTED_ITEM_FIELDS:
+            for sub in child:
+                sub_name = _local_name(sub.tag)
+                if name == "PictureDetails" and sub_name == "PictureURL":
+                    picture_nodes.append(sub)
+                else:
+                    nodes.setdefault(f"{name}/{sub_name}", sub)
+        else:
+            nodes.setdefault(name, child)
+
+    def text(path: str) -> str:
+        node = nodes.get(path)
+        return (node.text or "") if node is not None else ""
 
-    current_price_value = _clean_text(item.findtext("e:SellingStatus/e:CurrentPrice", default="", namespaces=NS))
+    item_id = _clean_text(text("ItemID"))
+    sku = _clean_text(text("SKU"))
+    title = _clean_text(text("Title"))
+    site = _clean_text(text("Site"))
+    view_url = _clean_text(text("ListingDetails/ViewItemURL"))
+
+    current_price_node = nodes.get("SellingStatus/CurrentPrice")
+    current_price_value = _clean_text(text("SellingStatus/CurrentPrice"))
     current_price_currency = _clean_text(
-        item.find("e:SellingStatus/e:CurrentPrice", namespaces=NS).attrib.get("currencyID", "")
-        if item.find("e:SellingStatus/e:CurrentPrice", namespaces=NS) is not None
-        else ""
+        current_price_node.attrib.get("currencyID", "") if current_price_node is not None else ""
     )
 
     picture_urls: List[str] = [
         _clean_text(node.text or "")
-        for node in item.findall("e:PictureDetails/e:PictureURL", namespaces=NS)
+        for node in picture_nodes
         if _clean_text(node.text or "")
     ]
-    primary_image_url = _clean_text(item.findtext("e:PictureDetails/e:GalleryURL", default="", namespaces=NS))
+    primary_image_url = _clean_text(text("PictureDetails/GalleryURL"))
     if not primary_image_url and picture_urls:
         primary_image_url = picture_urls[0]
     if primary_image_url and not picture_urls:
@@ -107,23 +139,71 @@ def _extract_item_payload(item: ET.Element) -> Dict[str, Any]:
         "view_url": view_url,
         "price": _parse_float(current_price_value),
         "currency": current_price_currency or None,
-        "quantity_total": _parse_int(item.findtext("e:Quantity", default="", namespaces=NS)),
-        "quantity_available": _parse_int(item.findtext("e:SellingStatus/e:QuantityAvailable", default="", namespaces=NS)),
-        "quantity_sold": _parse_int(item.findtext("e:SellingStatus/e:QuantitySold", default="", namespaces=NS)),
-        "listing_status": _clean_text(item.findtext("e:SellingStatus/e:ListingStatus", default="", namespaces=NS)) or None,
-        "listing_type": _clean_text(item.findtext("e:ListingType", default="", namespaces=NS)) or None,
-        "start_time": _clean_text(item.findtext("e:ListingDetails/e:StartTime", default="", namespaces=NS)) or None,
-        "end_time": _clean_text(item.findtext("e:ListingDetails/e:EndTime", default="", namespaces=NS)) or None,
-        "condition_id": _parse_int(item.findtext("e:ConditionID", default="", namespaces=NS)),
-        "condition_name": _clean_text(item.findtext("e:ConditionDisplayName", default="", namespaces=NS)) or None,
-        "category_id": _clean_text(item.findtext("e:PrimaryCategory/e:CategoryID", default="", namespaces=NS)) or None,
-        "category_name": _clean_text(item.findtext("e:PrimaryCategory/e:CategoryName", default="", namespaces=NS)) or None,
-        "best_offer_enabled": _parse_bool(item.findtext("e:BestOfferDetails/e:BestOfferEnabled", default="", namespaces=NS)),
+        "quantity_total": _parse_int(text("Quantity")),
+        "quantity_available": _parse_int(text("SellingStatus/QuantityAvailable")),
+        "quantity_sold": _parse_int(text("SellingStatus/QuantitySold")),
+        "listing_status": _clean_text(text("SellingStatus/ListingStatus")) or None,
+        "listing_type": _clean_text(text("ListingType")) or None,
+        "start_time": _clean_text(text("ListingDetails/StartTime")) or None,
+        "end_time": _clean_text(text("ListingDetails/EndTime")) or None,
+        "condition_id": _parse_int(text("ConditionID")),
+        "condition_name": _clean_text(text("ConditionDisplayName")) or None,
+        "category_id": _clean_text(text("PrimaryCategory/CategoryID")) or None,
+        "category_name": _clean_text(text("PrimaryCategory/CategoryName")) or None,
+        "best_offer_enabled": _parse_bool(text("BestOfferDetails/BestOfferEnabled")),
         "primary_image_url": primary_image_url or None,
         "image_urls": picture_urls,
     }
 
 
+_ITEM_TAG = f"{{{NS['e']}}}Item"
+_ACK_TAG = f"{{{NS['e']}}}Ack"
+_TOTAL_PAGES_TAG = f"{{{NS['e']}}}TotalNumberOfPages"
+_ERROR_TAGS = {f"{{{NS['e']}}}{name}": name for name in ("ShortMessage", "LongMessage", "ErrorCode")}
+
+
+def parse_item_stream(source: Any, call_name: str) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Incrementally parse a Trading API item response (file-like or path) with iterparse.
+
+    Each <Item> is normalized as soon as its end tag is read and then cleared,
+    so the tree never holds more than one item's children. Only end events are
+    requested (start events double the per-element overhead); the calls parsed
+    here have <Item> only as list entries or, for GetItem, as the single item.
+
+    Args:
+        call_name: For error messages (Ack other than Success/Warning raises RuntimeError)
+
+    Returns:
+        (total_pages, payloads); total_pages is 1 when the response has none
+    """
+    payloads: List[Dict[str, Any]] = []
+    ack = ""
+    total_pages_text = ""
+    error: Dict[str, str] = {}
+
+    for _, elem in ET.iterparse(source, events=("end",)):
+        tag = elem.tag
+        if tag == _ITEM_TAG:
+            payloads.append(_extract_item_payload(elem))
+            elem.clear()
+        elif tag == _ACK_TAG:
+            ack = elem.text or ""
+        elif tag == _TOTAL_PAGES_TAG:
+            total_pages_text = total_pages_text or elem.text or ""
+        elif tag in _ERROR_TAGS:
+            error.setdefault(_ERROR_TAGS[tag], elem.text or "")
+
+    if ack not in ("Success", "Warning"):
+        _raise_call_failed(call_name, ack, error.get("ErrorCode", ""), error.get("ShortMessage", ""), error.get("LongMessage", ""))
+
+    try:
+        total_pages = int(total_pages_text)
+    except ValueError:
+        total_pages = 1
+    return total_pages, payloads
+
+
 def _is_missing(value: Any) -> bool:
     if value is None:
         return True
@@ -160,14 +240,9 @@ def _fetch_item_details(oauth_token: str, item_id: str, site_id: int = 77) -> Di
 </GetItemRequest>
 """
     logger.debug("[DETAIL] Calling post_trading GetItem for item_id=%s...", item_id)
-    raw = post_trading("GetItem", oauth_token, xml_body, site_id=site_id)
-    logger.debug("[DETAIL] GetItem response received for item_id=%s, parsing...", item_id)
-    root = ET.fromstring(raw)
-    ensure_success(root, "GetItem")
-    item_node = root.find(".//e:Item", namespaces=NS)
-    if item_node is None:
-        return {}
-    return _extract_item_payload(item_node)
+    _, payloads = post_trading_parsed("GetItem", oauth_token, xml_body, site_id=site_id)
+    logger.debug("[DETAIL] GetItem response parsed for item_id=%s", item_id)
+    return payloads[0] if payloads else {}
 
 
 def _merge_missing_fields(base: Dict[str, Any], details: Dict[str, Any]) -> Dict[str, Any]:
@@ -227,6 +302,16 @@ def _merge_fast_with_existing_cache(fast_listings: List[Dict[str, Any]], existin
     return merged_listings
 
 
+def _trading_headers(call_name: str, oauth_token: str, site_id: int, compatibility_level: int) -> Dict[str, str]:
+    return {
+        "Content-Type": "text/xml",
+        "X-EBAY-API-CALL-NAME": call_name,
+        "X-EBAY-API-SITEID": str(site_id),
+        "X-EBAY-API-COMPATIBILITY-LEVEL": str(compatibility_level),
+        "X-EBAY-API-IAF-TOKEN": oauth_token,
+    }
+
+
 def post_trading(
     call_name: str,
     oauth_token: str,
@@ -235,16 +320,10 @@ def post_trading(
     compatibility_level: int = 1231,
 ) -> str:
     """Post request to eBay Trading API."""
-    headers = {
-        "Content-Type": "text/xml",
-        "X-EBAY-API-CALL-NAME": call_name,
-        "X-EBAY-API-SITEID": str(site_id),
-        "X-EBAY-API-COMPATIBILITY-LEVEL": str(compatibility_level),
-        "X-EBAY-API-IAF-TOKEN": oauth_token,
-    }
+    headers = _trading_headers(call_name, oauth_token, site_id, compatibility_level)
     logger.debug("[API] %s request starting (site_id=%s, timeout=30s)...", call_name, site_id)
     try:
-        r = requests.post(TRADING_ENDPOINT, data=xml_body.encode("utf-8"), headers=headers, timeout=30)
+        r = get_session().post(TRADING_ENDPOINT, data=xml_body.encode("utf-8"), headers=headers, timeout=30)
         logger.debug("[API] %s response received (status=%s, length=%s)", call_name, r.status_code, len(r.text))
         r.raise_for_status()
         return r.text
@@ -256,6 +335,39 @@ def post_trading(
         raise
 
 
+def post_trading_parsed(
+    call_name: str,
+    oauth_token: str,
+    xml_body: str,
+    site_id: int = 77,
+    compatibility_level: int = 1231,
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """Post request to eBay Trading API and parse the item response (parse_item_stream) while it downloads."""
+    headers = _trading_headers(call_name, oauth_token, site_id, compatibility_level)
+    logger.debug("[API] %s streamed request starting (site_id=%s, timeout=30s)...", call_name, site_id)
+    try:
+        with get_session().post(
+            TRADING_ENDPOINT, data=xml_body.encode("utf-8"), headers=headers, timeout=30, stream=True
+        ) as r:
+            logger.debug("[API] %s response headers received (status=%s)", call_name, r.status_code)
+            r.raise_for_status()
+            r.raw.decode_content = True  # undo gzip/deflate transfer encoding
+            return parse_item_stream(r.raw, call_name)
+    except requests.Timeout:
+        logger.error("[API] %s timed out after 30s", call_name)
+        raise
+    except requests.RequestException as e:
+        logger.error("[API] %s request failed: %s", call_name, e)
+        raise
+
+
+def _raise_call_failed(call_name: str, ack: str, code: str, short_msg: str, long_msg: str) -> None:
+    raise RuntimeError(
+        f"{call_name} failed (Ack={ack}, ErrorCode={code}).\n"
+        f"ShortMessage: {short_msg}\nLongMessage: {long_msg}"
+    )
+
+
 def ensure_success(root: ET.Element, call_name: str) -> None:
     """Check if eBay API call was successful."""
     ack = root.findtext("e:Ack", default="", namespaces=NS)
@@ -263,103 +375,144 @@ def ensure_success(root: ET.Element, call_name: str) -> None:
         short_msg = root.findtext(".//e:Errors/e:ShortMessage", default="", namespaces=NS)
         long_msg = root.findtext(".//e:Errors/e:LongMessage", default="", namespaces=NS)
         code = root.findtext(".//e:Errors/e:ErrorCode", default="", namespaces=NS)
-        raise RuntimeError(
-            f"{call_name} failed (Ack={ack}, ErrorCode={code}).\n"
-            f"ShortMessage: {short_msg}\nLongMessage: {long_msg}"
+        _raise_call_failed(call_name, ack, code, short_msg, long_msg)
+
+
+def _fetch_listing_page(
+    call_name: str,
+    xml_body: str,
+    oauth_token: str,
+    page: int,
+    site_id: int,
+    log_tag: str,
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """Post one page of a paginated listing call; returns (total_pages, payloads)."""
+    logger.info("[%s] Calling post_trading %s for page %s...", log_tag, call_name, page)
+    try:
+        total_pages, payloads = post_trading_parsed(call_name, oauth_token, xml_body, site_id=site_id)
+        logger.info("[%s] Parsed page %s: %s items", log_tag, page, len(payloads))
+    except Exception as api_err:
+        logger.error("[%s] post_trading failed for page %s: %s", log_tag, page, api_err, exc_info=True)
+        raise
+    return total_pages, payloads
+
+
+def _fetch_active_list_page(
+    oauth_token: str,
+    page: int,
+    site_id: int,
+    entries_per_page: int,
+    log_tag: str,
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """Fetch one GetMyeBaySelling ActiveList page; returns (total_pages, payloads)."""
+    return _fetch_listing_page(
+        "GetMyeBaySelling",
+        build_active_list_request(oauth_token, page, entries_per_page),
+        oauth_token,
+        page,
+        site_id,
+        log_tag,
+    )
+
+
+class DeltaWindowOverflow(RuntimeError):
+    """A GetSellerEvents window hit the item limit; the delta may be incomplete."""
+
+
+def _fetch_seller_events_window(
+    oauth_token: str,
+    site_id: int,
+    mod_time_from: str,
+    mod_time_to: str,
+) -> List[Dict[str, Any]]:
+    """Fetch the GetSellerEvents items modified in one window; returns payloads."""
+    _, payloads = _fetch_listing_page(
+        "GetSellerEvents",
+        build_seller_events_request(oauth_token, mod_time_from, mod_time_to),
+        oauth_token,
+        1,
+        site_id,
+        "DELTA-FETCH",
+    )
+    if len(payloads) >= SELLER_EVENTS_MAX_ITEMS:
+        raise DeltaWindowOverflow(
+            f"GetSellerEvents returned {len(payloads)} items for {mod_time_from}..{mod_time_to} (limit {SELLER_EVENTS_MAX_ITEMS})"
         )
+    return payloads
+
+
+def _delta_windows(mod_time_from, mod_time_to) -> List[Tuple[Any, Any]]:
+    """Split [mod_time_from, mod_time_to] (datetimes) into SELLER_EVENTS_MAX_WINDOW sized windows."""
+    windows = []
+    start = mod_time_from
+    while True:
+        end = min(start + SELLER_EVENTS_MAX_WINDOW, mod_time_to)
+        windows.append((start, end))
+        if end >= mod_time_to:
+            return windows
+        start = end
+
+
+def _in_page_order(pages: Dict[int, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    return [payload for page in sorted(pages) for payload in pages[page]]
 
 
 def fetch_ebay_listings_fast(oauth_token: str) -> Generator[Dict, None, None]:
     """
     Fast fetch - only GetMyeBaySelling data, no detail lookups.
+
+    Page 1 is fetched first; the remaining pages are fetched concurrently
+    (MAX_PARALLEL_PAGE_FETCHES) and reported as they arrive, so "page" in
+    progress events is the number of pages received so far.
     
     Yields:
         Progress dicts with keys: status, page, total_pages, count, listings (on complete)
     """
     site_id = 77  # Germany
     entries_per_page = 200
-    page = 1
-    all_listings = []
+    pages: Dict[int, List[Dict[str, Any]]] = {}
+    count = 0
+    total_pages = 1
     logger.info(
         "[FAST-FETCH] Start GetMyeBaySelling: site_id=%s, entries_per_page=%s",
         site_id,
         entries_per_page,
     )
-    
-    while True:
-        logger.info("[FETCH] Preparing GetMyeBaySelling request: page=%s", page)
-        xml_body = f"""<?xml version="1.0" encoding="utf-8"?>
-<GetMyeBaySellingRequest xmlns="urn:ebay:apis:eBLBaseComponents">
-  <RequesterCredentials>
-    <eBayAuthToken>{oauth_token}</eBayAuthToken>
-  </RequesterCredentials>
-  <ActiveList>
-    <Include>true</Include>
-    <Pagination>
-      <EntriesPerPage>{entries_per_page}</EntriesPerPage>
-      <PageNumber>{page}</PageNumber>
-    </Pagination>
-  </ActiveList>
-  <DetailLevel>ReturnAll</DetailLevel>
-</GetMyeBaySellingRequest>
-"""
-        logger.info("[FETCH] Calling post_trading for page %s...", page)
-        try:
-            raw = post_trading("GetMyeBaySelling", oauth_token, xml_body, site_id=site_id)
-            logger.info("[FETCH] Received response for page %s, parsing XML...", page)
-        except Exception as api_err:
-            logger.error("[FETCH] post_trading failed for page %s: %s", page, api_err, exc_info=True)
-            raise
-        
-        root = ET.fromstring(raw)
-        ensure_success(root, "GetMyeBaySelling")
-        
-        items = root.findall(".//e:ActiveList/e:ItemArray/e:Item", namespaces=NS)
-        
-        logger.info("[FAST-FETCH] Processing %s items from page %s (no detail lookups)...", len(items), page)
-        for item in items:
-            payload = _extract_item_payload(item)
-            all_listings.append(payload)
-        
-        total_pages_text = root.findtext(
-            ".//e:ActiveList/e:PaginationResult/e:TotalNumberOfPages",
-            default="1",
-            namespaces=NS,
-        )
-        try:
-            total_pages = int(total_pages_text)
-        except ValueError:
-            total_pages = 1
 
+    def fetch_page(page: int) -> Tuple[int, List[Dict[str, Any]]]:
+        return _fetch_active_list_page(oauth_token, page, site_id, entries_per_page, "FETCH")
+
+    for page, total_pages, payloads in iter_pages(fetch_page):
+        pages[page] = payloads
+        count += len(payloads)
         logger.info(
-            "[FAST-FETCH] Page %s/%s processed, page_items=%s, accumulated=%s",
+            "[FAST-FETCH] Page %s/%s processed (%s received), page_items=%s, accumulated=%s",
             page,
             total_pages,
-            len(items),
-            len(all_listings),
+            len(pages),
+            len(payloads),
+            count,
         )
-        
+
         # Yield progress
         yield {
             "status": "progress",
-            "page": page,
+            "page": len(pages),
             "total_pages": total_pages,
-            "count": len(all_listings)
+            "count": count
         }
-        
-        if page >= total_pages:
-            break
-        page += 1
-    
+
+    all_listings = _in_page_order(pages)
+
     # Yield completion
     logger.info(
         "[FAST-FETCH] Completed: total_pages=%s, total_listings=%s",
-        page,
+        len(pages),
         len(all_listings),
     )
     yield {
         "status": "complete",
-        "total_pages": page,
+        "total_pages": len(pages),
         "count": len(all_listings),
         "listings": all_listings
     }
@@ -368,14 +521,18 @@ def fetch_ebay_listings_fast(oauth_token: str) -> Generator[Dict, None, None]:
 def fetch_ebay_listings_detailed(oauth_token: str) -> Generator[Dict, None, None]:
     """
     Detailed fetch - GetMyeBaySelling + parallel GetItem detail lookups for missing fields.
+
+    Pages are fetched concurrently as in fetch_ebay_listings_fast; detail
+    lookups for a page start as soon as that page has arrived.
     
     Yields:
         Progress dicts with keys: status, page, total_pages, count, detail_lookups, listings (on complete)
     """
     site_id = 77  # Germany
     entries_per_page = 200
-    page = 1
-    all_listings = []
+    pages: Dict[int, List[Dict[str, Any]]] = {}
+    count = 0
+    total_pages = 1
     total_detail_lookups = 0
     logger.info(
         "[DETAILED-FETCH] Start GetMyeBaySelling with parallel detail lookups: site_id=%s, entries_per_page=%s, parallel=%s",
@@ -383,139 +540,244 @@ def fetch_ebay_listings_detailed(oauth_token: str) -> Generator[Dict, None, None
         entries_per_page,
         MAX_PARALLEL_DETAIL_LOOKUPS,
     )
-    
-    while True:
-        logger.info("[DETAILED-FETCH] Preparing GetMyeBaySelling request: page=%s", page)
-        xml_body = f"""<?xml version="1.0" encoding="utf-8"?>
-<GetMyeBaySellingRequest xmlns="urn:ebay:apis:eBLBaseComponents">
-  <RequesterCredentials>
-    <eBayAuthToken>{oauth_token}</eBayAuthToken>
-  </RequesterCredentials>
-  <ActiveList>
-    <Include>true</Include>
-    <Pagination>
-      <EntriesPerPage>{entries_per_page}</EntriesPerPage>
-      <PageNumber>{page}</PageNumber>
-    </Pagination>
-  </ActiveList>
-  <DetailLevel>ReturnAll</DetailLevel>
-</GetMyeBaySellingRequest>
-"""
-        logger.info("[DETAILED-FETCH] Calling post_trading for page %s...", page)
-        try:
-            raw = post_trading("GetMyeBaySelling", oauth_token, xml_body, site_id=site_id)
-            logger.info("[DETAILED-FETCH] Received response for page %s, parsing XML...", page)
-        except Exception as api_err:
-            logger.error("[DETAILED-FETCH] post_trading failed for page %s: %s", page, api_err, exc_info=True)
-            raise
-        
-        root = ET.fromstring(raw)
-        ensure_success(root, "GetMyeBaySelling")
-        
-        items = root.findall(".//e:ActiveList/e:ItemArray/e:Item", namespaces=NS)
-        
-        # Extract base payloads
-        logger.info("[DETAILED-FETCH] Processing %s items from page %s...", len(items), page)
-        page_payloads = []
-        items_needing_details = []
-        
-        for item in items:
-            payload = _extract_item_payload(item)
-            item_id = payload.get("item_id", "")
-            
-            if item_id and _needs_detail_lookup(payload):
-                items_needing_details.append((item_id, payload))
-            
-            page_payloads.append(payload)
-        
-        # Parallel detail lookups for this page
-        if items_needing_details:
-            logger.info(
-                "[DETAILED-FETCH] Starting parallel detail lookups for %s items (page %s)...",
-                len(items_needing_details),
-                page,
+
+    def fetch_page(page: int) -> Tuple[int, List[Dict[str, Any]]]:
+        return _fetch_active_list_page(oauth_token, page, site_id, entries_per_page, "DETAILED-FETCH")
+
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_DETAIL_LOOKUPS) as detail_executor:
+        for page, total_pages, page_payloads in iter_pages(fetch_page):
+            logger.info("[DETAILED-FETCH] Processing %s items from page %s...", len(page_payloads), page)
+            # Parallel detail lookups for this page (payloads are enriched in place)
+            total_detail_lookups += _lookup_missing_details(
+                oauth_token, page_payloads, site_id=site_id, executor=detail_executor, log_tag="DETAILED-FETCH"
             )
-            
-            def fetch_detail(item_data):
-                item_id, payload = item_data
-                try:
-                    details = _fetch_item_details(oauth_token, item_id, site_id=site_id)
-                    return (item_id, _merge_missing_fields(payload, details), None)
-                except Exception as e:
-                    return (item_id, payload, str(e))
-            
-            with ThreadPoolExecutor(max_workers=MAX_PARALLEL_DETAIL_LOOKUPS) as executor:
-                futures = {executor.submit(fetch_detail, item_data): item_data[0] for item_data in items_needing_details}
-                
-                for future in as_completed(futures):
-                    item_id, enriched_payload, error = future.result()
-                    if error:
-                        logger.warning("[DETAILED-FETCH] Detail lookup failed for %s: %s", item_id, error)
-                    else:
-                        total_detail_lookups += 1
-                        # Update the payload in page_payloads
-                        for i, p in enumerate(page_payloads):
-                            if p.get("item_id") == item_id:
-                                page_payloads[i] = enriched_payload
-                                break
-            
+
+            pages[page] = page_payloads
+            count += len(page_payloads)
+
             logger.info(
-                "[DETAILED-FETCH] Completed %s detail lookups for page %s",
-                len(items_needing_details),
+                "[DETAILED-FETCH] Page %s/%s processed (%s received), page_items=%s, accumulated=%s, total_detail_lookups=%s",
                 page,
+                total_pages,
+                len(pages),
+                len(page_payloads),
+                count,
+                total_detail_lookups,
             )
-        
-        all_listings.extend(page_payloads)
-        
-        total_pages_text = root.findtext(
-            ".//e:ActiveList/e:PaginationResult/e:TotalNumberOfPages",
-            default="1",
-            namespaces=NS,
-        )
-        try:
-            total_pages = int(total_pages_text)
-        except ValueError:
-            total_pages = 1
 
-        logger.info(
-            "[DETAILED-FETCH] Page %s/%s processed, page_items=%s, accumulated=%s, total_detail_lookups=%s",
-            page,
-            total_pages,
-            len(items),
-            len(all_listings),
-            total_detail_lookups,
-        )
-        
-        # Yield progress
-        yield {
-            "status": "progress",
-            "page": page,
-            "total_pages": total_pages,
-            "count": len(all_listings),
-            "detail_lookups": total_detail_lookups
-        }
-        
-        if page >= total_pages:
-            break
-        page += 1
-    
+            # Yield progress
+            yield {
+                "status": "progress",
+                "page": len(pages),
+                "total_pages": total_pages,
+                "count": count,
+                "detail_lookups": total_detail_lookups
+            }
+
+    all_listings = _in_page_order(pages)
+
     # Yield completion
     logger.info(
         "[DETAILED-FETCH] Completed: total_pages=%s, total_listings=%s, total_detail_lookups=%s",
-        page,
+        len(pages),
         len(all_listings),
         total_detail_lookups,
     )
     yield {
         "status": "complete",
-        "total_pages": page,
+        "total_pages": len(pages),
         "count": len(all_listings),
         "detail_lookups": total_detail_lookups,
         "listings": all_listings
     }
 
 
-def _enrich_listings_with_profit(listings: list) -> list:
+def fetch_ebay_listings_changed(oauth_token: str, mod_time_from, mod_time_to) -> Generator[Dict, None, None]:
+    """
+    Delta fetch - GetSellerEvents for items modified in [mod_time_from, mod_time_to] (UTC datetimes).
+
+    The range is split into SELLER_EVENTS_MAX_WINDOW windows, fetched like pages
+    (one call per window, bounded parallelism). Returns active as well as ended
+    items, one per item_id (the latest window wins); the caller decides what to
+    keep. A window hitting SELLER_EVENTS_MAX_ITEMS raises DeltaWindowOverflow.
+    
+    Yields:
+        Progress dicts with keys: status, page, total_pages, count, listings (on complete)
+    """
+    site_id = 77  # Germany
+    windows = [(_ebay_time(start), _ebay_time(end)) for start, end in _delta_windows(mod_time_from, mod_time_to)]
+    pages: Dict[int, List[Dict[str, Any]]] = {}
+    count = 0
+    logger.info(
+        "[DELTA-FETCH] Start GetSellerEvents: ModTimeFrom=%s, ModTimeTo=%s, windows=%s",
+        windows[0][0],
+        windows[-1][1],
+        len(windows),
+    )
+
+    def fetch_window(page: int) -> Tuple[int, List[Dict[str, Any]]]:
+        window_from, window_to = windows[page - 1]
+        return len(windows), _fetch_seller_events_window(oauth_token, site_id, window_from, window_to)
+
+    for page, total_pages, payloads in iter_pages(fetch_window):
+        for payload in payloads:
+            # GetSellerEvents has no QuantityAvailable
+            if payload.get("quantity_available") is None and payload.get("quantity_total") is not None:
+                payload["quantity_available"] = payload["quantity_total"] - (payload.get("quantity_sold") or 0)
+        pages[page] = payloads
+        count += len(payloads)
+        logger.info("[DELTA-FETCH] Window %s/%s processed, window_items=%s, accumulated=%s", page, total_pages, len(payloads), count)
+        yield {
+            "status": "progress",
+            "page": len(pages),
+            "total_pages": total_pages,
+            "count": count
+        }
+
+    # Windows share their boundary timestamps, so an item can come back twice
+    latest: Dict[str, Dict[str, Any]] = {}
+    for payload in _in_page_order(pages):
+        key = _listing_cache_key(payload)
+        latest.pop(key, None)
+        latest[key] = payload
+    all_listings = list(latest.values())
+    logger.info("[DELTA-FETCH] Completed: windows=%s, changed_items=%s", len(pages), len(all_listings))
+    yield {
+        "status": "complete",
+        "total_pages": len(pages),
+        "count": len(all_listings),
+        "listings": all_listings
+    }
+
+
+def _apply_listing_changes(
+    existing_listings: List[Dict[str, Any]],
+    changed_listings: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Merge changed listings into the cached ones by item_id.
+
+    Active items replace their cached row (keeping cached values for fields the
+    change lacks, like _merge_fast_with_existing_cache) or are appended; items
+    no longer active are dropped from the cache.
+
+    Returns:
+        (listings, touched rows (same dict objects as in listings), counts)
+    """
+    listings = list(existing_listings or [])
+    position = {_listing_cache_key(listing): i for i, listing in enumerate(listings)}
+    touched: Dict[str, None] = {}
+    removed = set()
+    counts = {"added": 0, "updated": 0, "removed": 0}
+
+    for payload in changed_listings or []:
+        key = _listing_cache_key(payload)
+        status = payload.get("listing_status")
+        if status and status != "Active":
+            if key in position and key not in removed:
+                removed.add(key)
+                counts["removed"] += 1
+            touched.pop(key, None)
+            continue
+
+        removed.discard(key)
+        pos = position.get(key)
+        if pos is None:
+            position[key] = len(listings)
+            listings.append(payload)
+            counts["added"] += 1
+        else:
+            listings[pos] = _merge_preserve_existing_when_missing(payload, listings[pos])
+            if key not in touched:
+                counts["updated"] += 1
+        touched[key] = None
+
+    if removed:
+        listings = [listing for listing in listings if _listing_cache_key(listing) not in removed]
+    touched_rows = [listing for listing in listings if _listing_cache_key(listing) in touched]
+    return listings, touched_rows, counts
+
+
+def _lookup_missing_details(
+    oauth_token: str,
+    payloads: List[Dict[str, Any]],
+    site_id: int = 77,
+    executor: ThreadPoolExecutor | None = None,
+    log_tag: str = "DETAIL",
+) -> int:
+    """
+    GetItem for payloads still missing fields, MAX_PARALLEL_DETAIL_LOOKUPS at a time.
+
+    Results are merged into the payload dicts in place (each future maps back
+    to its payload, so no search by item_id). Returns the successful lookups.
+    """
+    pending = [payload for payload in payloads if payload.get("item_id") and _needs_detail_lookup(payload)]
+    if not pending:
+        return 0
+    logger.info("[%s] Starting parallel detail lookups for %s items...", log_tag, len(pending))
+
+    def fetch_detail(payload):
+        return _fetch_item_details(oauth_token, payload["item_id"], site_id=site_id)
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_DETAIL_LOOKUPS)
+    lookups = 0
+    try:
+        futures = {executor.submit(fetch_detail, payload): payload for payload in pending}
+        for future in as_completed(futures):
+            payload = futures[future]
+            try:
+                details = future.result()
+            except Exception as e:
+                logger.warning("[%s] Detail lookup failed for %s: %s", log_tag, payload.get("item_id"), e)
+                continue
+            payload.update(_merge_missing_fields(payload, details))
+            lookups += 1
+    finally:
+        if own_executor:
+            executor.shutdown(wait=True)
+    logger.info("[%s] Completed %s/%s detail lookups", log_tag, lookups, len(pending))
+    return lookups
+
+
+def _empty_profit_analysis(listing: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'selling_price_brutto': listing.get('price', 0.0),
+        'selling_price_netto': 0.0,
+        'payment_fee': 0.0,
+        'sales_commission': 0.0,
+        'sales_commission_percentage': 0.0,
+        'shipping_costs_net': 0.0,
+        'total_cost_net': 0.0,
+        'net_profit': 0.0,
+        'net_profit_margin_percent': 0.0
+    }
+
+
+def _enrich_listing_with_profit_scalar(listing: Dict[str, Any]) -> None:
+    """Reference path: calculate_listing_profit for a single listing."""
+    try:
+        # Calculate profit with minimal data from eBay API
+        profit_analysis = calculate_listing_profit(
+            listing,
+            category_fees=None,  # Would need to look up from category_id
+            total_cost_net=None,
+            lookup_total_cost_net=True
+        )
+        listing['profit_analysis'] = profit_analysis
+        logger.debug("[PROFIT] Calculated for item_id=%s: profit=€%s, margin=%s%%",
+                    listing.get('item_id'),
+                    profit_analysis['net_profit'],
+                    profit_analysis['net_profit_margin_percent'])
+    except Exception as e:
+        logger.warning("[PROFIT] Failed to calculate profit for item_id=%s: %s",
+                      listing.get('item_id'), e)
+        # Add empty profit data
+        listing['profit_analysis'] = _empty_profit_analysis(listing)
+
+
+def _enrich_listings_with_profit(listings: list, vectorized: bool = True) -> list:
     """
     Enrich listings with profit calculations.
     
@@ -528,36 +790,23 @@ def _enrich_listings_with_profit(listings: list) -> list:
     - net_profit_margin_percent
     
     Note: Profit calculations use inventory Total Cost Net when SKU exists.
+    The columnar engine is used by default; listings it cannot vectorize
+    (non-numeric price) and vectorized=False go through the scalar reference.
     """
-    for listing in listings:
+    analyses: List[Any] = [None] * len(listings)
+    if vectorized and listings:
         try:
-            # Calculate profit with minimal data from eBay API
-            profit_analysis = calculate_listing_profit(
-                listing,
-                category_fees=None,  # Would need to look up from category_id
-                total_cost_net=None,
-                lookup_total_cost_net=True
-            )
-            listing['profit_analysis'] = profit_analysis
-            logger.debug("[PROFIT] Calculated for item_id=%s: profit=€%s, margin=%s%%",
-                        listing.get('item_id'),
-                        profit_analysis['net_profit'],
-                        profit_analysis['net_profit_margin_percent'])
+            from app.services.ebay_profit_engine import compute_profit_analyses
+            analyses = compute_profit_analyses(listings)
         except Exception as e:
-            logger.warning("[PROFIT] Failed to calculate profit for item_id=%s: %s",
-                          listing.get('item_id'), e)
-            # Add empty profit data
-            listing['profit_analysis'] = {
-                'selling_price_brutto': listing.get('price', 0.0),
-                'selling_price_netto': 0.0,
-                'payment_fee': 0.0,
-                'sales_commission': 0.0,
-                'sales_commission_percentage': 0.0,
-                'shipping_costs_net': 0.0,
-                'total_cost_net': 0.0,
-                'net_profit': 0.0,
-                'net_profit_margin_percent': 0.0
-            }
+            logger.warning("[PROFIT] Vectorized profit engine failed, using scalar path: %s", e)
+            analyses = [None] * len(listings)
+
+    for listing, profit_analysis in zip(listings, analyses):
+        if profit_analysis is None:
+            _enrich_listing_with_profit_scalar(listing)
+        else:
+            listing['profit_analysis'] = profit_analysis
     
     return listings
 
@@ -569,8 +818,10 @@ def compute_ebay_listings_fast() -> Generator[Dict, None, None]:
     Yields:
         Progress dicts with SSE-compatible format
     """
-    from datetime import datetime
+    from datetime import datetime, timezone
     from . import ebay_listings_cache
+
+    sync_started = datetime.now(timezone.utc)
     
     # Get OAuth token (auto-refresh)
     try:
@@ -614,6 +865,7 @@ def compute_ebay_listings_fast() -> Generator[Dict, None, None]:
                 # Enrich with profit calculations
                 listings = _enrich_listings_with_profit(listings)
                 ebay_listings_cache.write_cache(listings)
+                ebay_listings_cache.write_sync_state(sync_started, "fast")
                 logger.info("[SSE-FAST] Cache updated successfully: listings=%s with profit analysis", len(listings))
                 
                 # Yield completion
@@ -639,8 +891,10 @@ def compute_ebay_listings_detailed() -> Generator[Dict, None, None]:
     Yields:
         Progress dicts with SSE-compatible format
     """
-    from datetime import datetime
+    from datetime import datetime, timezone
     from . import ebay_listings_cache
+
+    sync_started = datetime.now(timezone.utc)
     
     # Get OAuth token (auto-refresh)
     try:
@@ -683,6 +937,7 @@ def compute_ebay_listings_detailed() -> Generator[Dict, None, None]:
                 # Enrich with profit calculations
                 listings = _enrich_listings_with_profit(listings)
                 ebay_listings_cache.write_cache(listings)
+                ebay_listings_cache.write_sync_state(sync_started, "detailed")
                 logger.info(
                     "[SSE-DETAILED] Cache updated successfully: listings=%s with profit analysis, detail_lookups=%s",
                     len(listings),
@@ -706,6 +961,128 @@ def compute_ebay_listings_detailed() -> Generator[Dict, None, None]:
         }
 
 
+def _ebay_time(value) -> str:
+    """UTC datetime -> eBay API timestamp (2024-01-31T12:00:00.000Z)."""
+    from datetime import timezone
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def compute_ebay_listings_delta() -> Generator[Dict, None, None]:
+    """
+    Delta compute - only listings modified since the last successful sync.
+
+    Asks GetSellerEvents for items modified since the last sync (minus
+    DELTA_SYNC_OVERLAP for clock skew, in SELLER_EVENTS_MAX_WINDOW windows),
+    merges them into the cache by item_id, drops ended items, runs GetItem only
+    for changed rows still missing fields and recomputes profit only for the
+    changed rows. Without a previous sync, an empty cache, a sync older than
+    DELTA_SYNC_MAX_AGE or a window with more changes than GetSellerEvents
+    returns this falls back to the fast full fetch.
+    
+    Yields:
+        Progress dicts with SSE-compatible format; the completion event has
+        mode 'delta' (with changed/added/updated/removed) or 'full'
+    """
+    from datetime import datetime, timezone
+    from . import ebay_listings_cache
+
+    sync_started = datetime.now(timezone.utc)
+    state = ebay_listings_cache.read_sync_state() or {}
+    cache = ebay_listings_cache.read_cache() or {}
+    existing_listings = cache.get("listings", []) or []
+
+    last_sync = None
+    try:
+        last_sync = datetime.fromisoformat(state["synced_at"]) if state.get("synced_at") else None
+    except ValueError:
+        pass
+    if last_sync is not None and last_sync.tzinfo is None:
+        last_sync = last_sync.replace(tzinfo=timezone.utc)
+
+    if last_sync is None or not existing_listings or sync_started - last_sync > DELTA_SYNC_MAX_AGE:
+        logger.info(
+            "[SSE-DELTA] No usable previous sync (last_sync=%s, cached=%s) - running full fast fetch",
+            state.get("synced_at"),
+            len(existing_listings),
+        )
+        for progress in compute_ebay_listings_fast():
+            if progress["status"] == "complete":
+                progress["mode"] = "full"
+            yield progress
+        return
+
+    # Get OAuth token (auto-refresh)
+    try:
+        from app.services.ebay_oauth import get_access_token
+        oauth_token = get_access_token()
+        logger.info("[SSE-DELTA] Delta sync triggered - OAuth token acquired, last_sync=%s", last_sync.isoformat())
+    except Exception as e:
+        logger.exception("[SSE-DELTA] Failed to acquire OAuth token for eBay listings delta sync")
+        yield {
+            "status": "error",
+            "message": str(e),
+            "timestamp": datetime.now().isoformat()
+        }
+        return
+
+    mod_time_from = last_sync - DELTA_SYNC_OVERLAP
+    try:
+        for progress in fetch_ebay_listings_changed(oauth_token, mod_time_from, sync_started):
+            if progress['status'] == 'progress':
+                yield {
+                    "status": "progress",
+                    "page": progress['page'],
+                    "total_pages": progress['total_pages'],
+                    "count": progress['count'],
+                    "timestamp": datetime.now().isoformat()
+                }
+            elif progress['status'] == 'complete':
+                listings, touched, counts = _apply_listing_changes(existing_listings, progress['listings'])
+                detail_lookups = _lookup_missing_details(oauth_token, touched)
+                # Ensure recalculation uses latest schema fee + inventory cost values
+                invalidate_profit_caches()
+                # Only changed rows need new profit figures; touched shares dicts with listings
+                _enrich_listings_with_profit(touched)
+                ebay_listings_cache.write_cache(listings)
+                ebay_listings_cache.write_sync_state(sync_started, "delta")
+                logger.info(
+                    "[SSE-DELTA] Cache updated: listings=%s, changed=%s, added=%s, updated=%s, removed=%s, detail_lookups=%s",
+                    len(listings),
+                    len(progress['listings']),
+                    counts["added"],
+                    counts["updated"],
+                    counts["removed"],
+                    detail_lookups,
+                )
+
+                yield {
+                    "status": "complete",
+                    "mode": "delta",
+                    "total_pages": progress['total_pages'],
+                    "count": len(listings),
+                    "changed": len(progress['listings']),
+                    "added": counts["added"],
+                    "updated": counts["updated"],
+                    "removed": counts["removed"],
+                    "detail_lookups": detail_lookups,
+                    "since": _ebay_time(mod_time_from),
+                    "timestamp": datetime.now().isoformat()
+                }
+    except DeltaWindowOverflow as e:
+        logger.info("[SSE-DELTA] %s - running full fast fetch", e)
+        for progress in compute_ebay_listings_fast():
+            if progress["status"] == "complete":
+                progress["mode"] = "full"
+            yield progress
+    except Exception as e:
+        logger.exception("[SSE-DELTA] Delta sync of eBay listings failed")
+        yield {
+            "status": "error",
+            "message": str(e),
+            "timestamp": datetime.now().isoformat()
+        }
+
+
 def recompute_cached_profit_analysis() -> Dict[str, Any]:
     """Recalculate profit_analysis for all listings currently in cache."""
     from . import ebay_listings_cache
@@ -725,3 +1102,25 @@ def recompute_cached_profit_analysis() -> Dict[str, Any]:
         "message": "Profit analysis recalculated from cache listings",
         "count": len(enriched),
     }
+
+
+def simulate_cached_repricing(
+    price_multiplier: float = 1.0,
+    price_delta: float = 0.0,
+    include_listings: bool = False,
+) -> Dict[str, Any]:
+    """Repricing what-if over all cached listings; the cache is not modified."""
+    from . import ebay_listings_cache
+    from app.services.ebay_profit_engine import simulate_repricing
+
+    cache = ebay_listings_cache.read_cache() or {}
+    listings = cache.get("listings", []) or []
+    if not isinstance(listings, list):
+        listings = []
+
+    return simulate_repricing(
+        listings,
+        price_multiplier=price_multiplier,
+        price_delta=price_delta,
+        include_listings=include_listings,
+    )
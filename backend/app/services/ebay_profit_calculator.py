@@ -1,11 +1,18 @@
 """eBay profit calculation service for listings cache."""
 import logging
 import json
+import re
 import sys
 import sqlite3
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Iterable, Optional, Tuple
 from pathlib import Path
 
+from app.repositories import cache_coordination
+from app.repositories.sqlite_db import connection
+from app.services import ebay_category_fees
+from app.services.excel_inventory import excel_inventory
+
 logger = logging.getLogger(__name__)
 
 # Shipping costs (net) by marketplace
@@ -27,138 +34,125 @@ VAT_RATES = {
 DEFAULT_VAT_RATE = 0.19  # Default to Germany VAT
 NON_GERMANY_SURCHARGE = 4.99  # Extra charge for non-Germany customers
 
-# Cache for schema fees
-_SCHEMA_FEES_CACHE = {}
-
-# Fallback cache for fees from category_mapping.json
-_CATEGORY_MAPPING_FEES_CACHE = {}
-
 # Cache for Total Cost Net by SKU
 _TOTAL_COST_NET_CACHE = None
 
+INVENTORY_DB_PATH = Path(__file__).resolve().parents[2] / "legacy" / "cache" / "inventory.db"
+PRODUCTS_DIR = Path(__file__).resolve().parents[2] / "legacy" / "products"
+
+# Listing SKU string -> resolved Total Cost Net (average for multi-SKU listings).
+# Built once per inventory version; see _ensure_cost_index_current().
+_SKU_COST_INDEX: Dict[str, float] = {}
+
+# Product JSON "Total Cost Net" for SKUs missing from inventory (None = no value).
+# Dropped together with _SKU_COST_INDEX whenever sku_json_repo writes a product JSON.
+_JSON_COST_FALLBACKS: Dict[str, Optional[float]] = {}
+
+# Inventory table version the cost caches were built from (excel_inventory.version())
+_COST_INDEX_VERSION: Optional[Tuple[Any, ...]] = None
+
+# Fee indexes (ebay_category_fees) are dropped when any worker calls invalidate_profit_caches();
+# the cost caches follow the inventory table's change counter, see _ensure_cost_index_current
+_PROFIT_CACHES_WATCH = cache_coordination.GenerationWatch(cache_coordination.EBAY_PROFIT)
+_PRODUCT_JSON_WATCH = cache_coordination.GenerationWatch(cache_coordination.PRODUCT_JSON)
+
+_RANGE_SKU_RE = re.compile(r'[A-Z]\d+-[A-Z]?\d+')
+_RANGE_PART_RE = re.compile(r"^([A-Za-z]*)(\d+)$")
+
 
 def invalidate_profit_caches() -> None:
-    """Clear in-memory caches so profit calculation reloads latest DB/schema values."""
-    global _SCHEMA_FEES_CACHE, _CATEGORY_MAPPING_FEES_CACHE, _TOTAL_COST_NET_CACHE
-    _SCHEMA_FEES_CACHE = {}
-    _CATEGORY_MAPPING_FEES_CACHE = {}
+    """Clear in-memory caches (in every worker) so profit calculation reloads latest DB/schema values."""
+    global _TOTAL_COST_NET_CACHE
+    global _SKU_COST_INDEX, _JSON_COST_FALLBACKS, _COST_INDEX_VERSION
+    ebay_category_fees.invalidate()
     _TOTAL_COST_NET_CACHE = None
+    _SKU_COST_INDEX = {}
+    _JSON_COST_FALLBACKS = {}
+    _COST_INDEX_VERSION = None
+    cache_coordination.bump(cache_coordination.EBAY_PROFIT)
 
 
-def _load_schema_fees_cache() -> Dict[str, Dict[str, float]]:
-    """Load fees from schema files into memory."""
-    global _SCHEMA_FEES_CACHE
-    
-    if _SCHEMA_FEES_CACHE:
-        return _SCHEMA_FEES_CACHE
-    
-    schemas_dir = Path(__file__).resolve().parents[2] / "schemas"
-    
-    try:
-        # Load each schema file and extract fees
-        for schema_file in schemas_dir.glob("EbayCat_*.json"):
-            try:
-                with open(schema_file, 'r', encoding='utf-8') as f:
-                    schema_data = json.load(f)
-                
-                # Extract category ID from filename: EbayCat_{id}_EBAY_DE.json
-                parts = schema_file.stem.split('_')
-                if len(parts) >= 2:
-                    cat_id = parts[1]
-                    metadata = schema_data.get('_metadata', {})
-                    fees = metadata.get('fees', {})
-                    
-                    if fees:
-                        # Handle None values in fees
-                        payment_fee = fees.get('payment_fee', 0.0)
-                        commission = fees.get('sales_commission_percentage', 0.0)
-                        
-                        _SCHEMA_FEES_CACHE[str(cat_id)] = {
-                            'payment_fee': float(payment_fee) if payment_fee is not None else 0.0,
-                            'sales_commission_percentage': float(commission) if commission is not None else 0.0
-                        }
-            except Exception as e:
-                logger.warning(f"[FEES] Error loading fees from {schema_file.name}: {e}")
-        
-        logger.info(f"[FEES] Loaded fees cache for {len(_SCHEMA_FEES_CACHE)} categories")
-    except Exception as e:
-        logger.warning(f"[FEES] Error loading schema fees cache: {e}")
-    
-    return _SCHEMA_FEES_CACHE
+def _ensure_fee_caches_current() -> None:
+    """Drop the fee indexes when another worker invalidated the profit caches."""
+    if _PROFIT_CACHES_WATCH.changed():
+        generation = _PROFIT_CACHES_WATCH.current()
+        ebay_category_fees.invalidate()
+        _PROFIT_CACHES_WATCH.sync(generation)
 
 
-def _load_category_mapping_fees_cache() -> Dict[str, Dict[str, float]]:
-    """Load fallback fees from schemas/category_mapping.json."""
-    global _CATEGORY_MAPPING_FEES_CACHE
+def _inventory_version() -> Optional[Tuple[Any, ...]]:
+    """
+    Version of the inventory table, or None if it cannot be read.
 
-    if _CATEGORY_MAPPING_FEES_CACHE:
-        return _CATEGORY_MAPPING_FEES_CACHE
+    The trigger-maintained change counter of excel_inventory, not the file's
+    mtime/size: in WAL mode commits land in inventory.db-wal and the main
+    file only changes at the next checkpoint.
+    """
+    try:
+        return excel_inventory.version()
+    except Exception as e:
+        logger.warning("[COST] Could not read inventory version: %s", e)
+        return None
 
-    mapping_path = Path(__file__).resolve().parents[2] / "schemas" / "category_mapping.json"
-    if not mapping_path.exists():
-        return _CATEGORY_MAPPING_FEES_CACHE
 
-    try:
-        with open(mapping_path, "r", encoding="utf-8") as f:
-            payload = json.load(f)
+def _ensure_cost_index_current() -> None:
+    """Drop cost caches when the inventory table or a product JSON changed."""
+    global _TOTAL_COST_NET_CACHE, _SKU_COST_INDEX, _JSON_COST_FALLBACKS, _COST_INDEX_VERSION
 
-        for entry in (payload.get("categoryMappings") or []):
-            if not isinstance(entry, dict):
-                continue
-            cat_id = str(entry.get("categoryId") or "").strip()
-            if not cat_id:
-                continue
+    version = _inventory_version()
+    if version != _COST_INDEX_VERSION:
+        if _COST_INDEX_VERSION is not None:
+            logger.info("[COST] inventory table changed, rebuilding SKU cost index")
+        _TOTAL_COST_NET_CACHE = None
+        _SKU_COST_INDEX = {}
+        _JSON_COST_FALLBACKS = {}
+        _COST_INDEX_VERSION = version
 
-            fees = entry.get("fees") or {}
-            if not isinstance(fees, dict):
-                continue
+    if _PRODUCT_JSON_WATCH.changed():
+        # Resolved costs may include a fallback read from the rewritten file
+        generation = _PRODUCT_JSON_WATCH.current()
+        _SKU_COST_INDEX = {}
+        _JSON_COST_FALLBACKS = {}
+        _PRODUCT_JSON_WATCH.sync(generation)
 
-            payment_fee_raw = fees.get("payment_fee")
-            commission_raw = fees.get("sales_commission_percentage")
-            if commission_raw is None:
-                commission_raw = fees.get("sales_commission_up_to")
 
-            try:
-                payment_fee = float(payment_fee_raw) if payment_fee_raw is not None else 0.0
-            except (TypeError, ValueError):
-                payment_fee = 0.0
+def _with_default_fees(fees: Dict[str, float]) -> Dict[str, float]:
+    """Resolver fees with 0.0 for a missing payment fee or commission."""
+    return {
+        "payment_fee": fees.get("payment_fee", 0.0),
+        "sales_commission_percentage": fees.get("sales_commission_percentage", 0.0),
+    }
 
-            try:
-                commission = float(commission_raw) if commission_raw is not None else 0.0
-            except (TypeError, ValueError):
-                commission = 0.0
 
-            _CATEGORY_MAPPING_FEES_CACHE[cat_id] = {
-                "payment_fee": payment_fee,
-                "sales_commission_percentage": commission,
-            }
+def _load_schema_fees_cache() -> Dict[str, Dict[str, float]]:
+    """Fees from the schema files by category id (shared resolver index)."""
+    _ensure_fee_caches_current()
+    return ebay_category_fees.fees_by_category(ebay_category_fees.SCHEMA)
 
-        logger.info("[FEES] Loaded category_mapping fallback fees for %s categories", len(_CATEGORY_MAPPING_FEES_CACHE))
-    except Exception as e:
-        logger.warning("[FEES] Error loading category_mapping fallback fees: %s", e)
 
-    return _CATEGORY_MAPPING_FEES_CACHE
+def _load_category_mapping_fees_cache() -> Dict[str, Dict[str, float]]:
+    """Fees from schemas/category_mapping.json by category id (shared resolver index)."""
+    _ensure_fee_caches_current()
+    return ebay_category_fees.fees_by_category(ebay_category_fees.MAPPING)
 
 
 def _load_total_cost_net_cache() -> Dict[str, float]:
     """Load Total Cost Net by SKU from inventory database."""
     global _TOTAL_COST_NET_CACHE
 
+    _ensure_cost_index_current()
     if _TOTAL_COST_NET_CACHE is not None:
         return _TOTAL_COST_NET_CACHE
 
     try:
         # Use the correct database location: legacy/cache/inventory.db
-        legacy_dir = Path(__file__).resolve().parents[2] / "legacy"
-        db_path = legacy_dir / "cache" / "inventory.db"
+        db_path = INVENTORY_DB_PATH
         
         # Column names in the database
         sku_col = "SKU (Old)"
         cost_col = "Total Cost Net"
 
-        conn = sqlite3.connect(str(db_path))
-        conn.row_factory = sqlite3.Row
-        try:
+        with connection(db_path, row_factory=sqlite3.Row) as conn:
             # Verify columns exist in DB
             columns = [row[1] for row in conn.execute("PRAGMA table_info(inventory)").fetchall()]
             if sku_col not in columns or cost_col not in columns:
@@ -167,8 +161,6 @@ def _load_total_cost_net_cache() -> Dict[str, float]:
             rows = conn.execute(
                 f'SELECT "{sku_col}", "{cost_col}" FROM inventory'
             ).fetchall()
-        finally:
-            conn.close()
 
         cost_map: Dict[str, float] = {}
         for row in rows:
@@ -204,13 +196,105 @@ def get_total_cost_net_for_sku(sku: Optional[str]) -> float:
     - Hybrid = mix of both
     
     For multi-SKU, returns the average cost across all SKUs.
+    Results are served from the SKU cost index (one dict lookup once built).
     """
     if not sku:
         return 0.0
 
     normalized_sku = str(sku).strip()
-    
-    # Check if this is a multi-SKU listing
+
+    _ensure_cost_index_current()
+    cached = _SKU_COST_INDEX.get(normalized_sku)
+    if cached is not None:
+        return cached
+
+    build_sku_cost_index([normalized_sku])
+    return _SKU_COST_INDEX.get(normalized_sku, 0.0)
+
+
+def build_sku_cost_index(sku_strings: Iterable[Optional[str]]) -> Dict[str, float]:
+    """
+    Resolve Total Cost Net for many listing SKU strings at once.
+
+    Parses each string into its component SKUs (memoized), preloads the product
+    JSON fallbacks for every component missing from inventory in one pass, and
+    stores the resolved cost per listing SKU string in the index.
+    """
+    _ensure_cost_index_current()
+    cost_map = _load_total_cost_net_cache()
+
+    pending: Dict[str, Optional[Tuple[str, ...]]] = {}
+    for sku in sku_strings:
+        if not sku:
+            continue
+        normalized_sku = str(sku).strip()
+        if normalized_sku in _SKU_COST_INDEX or normalized_sku in pending:
+            continue
+        pending[normalized_sku] = _parse_listing_skus(normalized_sku)
+
+    if not pending:
+        return _SKU_COST_INDEX
+
+    # Bulk-load JSON fallbacks for every SKU the inventory does not know about
+    missing = set()
+    for normalized_sku, components in pending.items():
+        for single_sku in (components if components is not None else (normalized_sku,)):
+            if single_sku not in cost_map and single_sku not in _JSON_COST_FALLBACKS:
+                missing.add(single_sku)
+    _preload_json_cost_fallbacks(missing)
+
+    for normalized_sku, components in pending.items():
+        if components is None:
+            # Single SKU
+            if normalized_sku in cost_map:
+                cost = float(cost_map.get(normalized_sku, 0.0))
+            else:
+                fallback = _JSON_COST_FALLBACKS.get(normalized_sku)
+                cost = fallback if fallback is not None else 0.0
+        else:
+            cost = _average_cost_for_components(normalized_sku, components, cost_map)
+        _SKU_COST_INDEX[normalized_sku] = cost
+
+    return _SKU_COST_INDEX
+
+
+def _read_json_total_cost_net(single_sku: str) -> Optional[float]:
+    """Read Price Data / Total Cost Net from a product JSON (None if unavailable)."""
+    json_path = PRODUCTS_DIR / f"{single_sku}.json"
+    if not json_path.exists():
+        return None
+    try:
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        product = data.get(single_sku, data)
+        price_data = product.get("Price Data", {})
+        value = price_data.get("Total Cost Net", 0.0)
+        return float(value) if value is not None else 0.0
+    except Exception as e:
+        logger.warning("[COST] Failed to read product JSON for SKU=%s: %s", single_sku, e)
+        return None
+
+
+def _preload_json_cost_fallbacks(skus: Iterable[str]) -> None:
+    """Load JSON-only Total Cost Net values for SKUs missing from inventory."""
+    loaded = 0
+    for single_sku in skus:
+        if not single_sku or single_sku in _JSON_COST_FALLBACKS:
+            continue
+        _JSON_COST_FALLBACKS[single_sku] = _read_json_total_cost_net(single_sku)
+        loaded += 1
+    if loaded:
+        logger.debug("[COST] Preloaded %d product JSON cost fallbacks", loaded)
+
+
+@lru_cache(maxsize=65536)
+def _parse_listing_skus(normalized_sku: str) -> Optional[Tuple[str, ...]]:
+    """
+    Split a listing SKU string into component SKUs.
+
+    Returns None for a plain single SKU, otherwise the tuple of components
+    (possibly empty when a multi-SKU string cannot be parsed).
+    """
     is_multi_sku = False
     
     if "," in normalized_sku or " - " in normalized_sku:
@@ -218,38 +302,17 @@ def get_total_cost_net_for_sku(sku: Optional[str]) -> float:
         is_multi_sku = True
     elif "-" in normalized_sku:
         # Could be a range like "P0010036-P0010040" - check with regex
-        import re
-        if re.search(r'[A-Z]\d+-[A-Z]?\d+', normalized_sku):
+        if _RANGE_SKU_RE.search(normalized_sku):
             is_multi_sku = True
-    
-    if is_multi_sku:
-        return _get_average_cost_for_multi_sku(normalized_sku)
-    
-    # Single SKU - use original logic
-    cost_map = _load_total_cost_net_cache()
-    if normalized_sku in cost_map:
-        return float(cost_map.get(normalized_sku, 0.0))
-
-    # Fallback: try to read from product JSON if available
-    try:
-        products_dir = Path(__file__).resolve().parents[2] / "legacy" / "products"
-        json_path = products_dir / f"{normalized_sku}.json"
-        if json_path.exists():
-            with open(json_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            product = data.get(normalized_sku, data)
-            price_data = product.get("Price Data", {})
-            value = price_data.get("Total Cost Net", 0.0)
-            return float(value) if value is not None else 0.0
-    except Exception as e:
-        logger.warning("[COST] Failed to read product JSON for SKU=%s: %s", normalized_sku, e)
 
-    return 0.0
+    if not is_multi_sku:
+        return None
+    return tuple(_split_multi_sku(normalized_sku))
 
 
-def _get_average_cost_for_multi_sku(sku_string: str) -> float:
+def _split_multi_sku(sku_string: str) -> list:
     """
-    Calculate average Total Cost Net for multi-SKU listings.
+    Parse SKUs from a multi-SKU listing string.
     
     Supports:
     - Comma-separated: "SKU1,SKU2,SKU3"
@@ -257,10 +320,6 @@ def _get_average_cost_for_multi_sku(sku_string: str) -> float:
     - Range format: "P0010482-P0010490" (expands to P0010482...P0010490)
     - Hybrid: "SKU1,SKU2 - SKU3"
     """
-    if not sku_string:
-        return 0.0
-    
-    # Parse SKUs from different formats
     skus = []
     
     # First split by comma if it exists
@@ -299,45 +358,35 @@ def _get_average_cost_for_multi_sku(sku_string: str) -> float:
             skus.append(sku_string)
     
     # Remove empty strings
-    skus = [s for s in skus if s]
-    
+    return [s.strip() for s in skus if s]
+
+
+def _average_cost_for_components(sku_string: str, skus: Tuple[str, ...], cost_map: Dict[str, float]) -> float:
+    """Average Total Cost Net over component SKUs that have a positive cost."""
     if not skus:
         logger.warning("[COST] Could not parse multi-SKU string: %s", sku_string)
         return 0.0
     
-    logger.info("[COST] Multi-SKU detected with %d SKUs: %s (from: %s)", len(skus), skus[:3] if len(skus) > 3 else skus, sku_string)
+    logger.info("[COST] Multi-SKU detected with %d SKUs: %s (from: %s)", len(skus), list(skus[:3]), sku_string)
     
-    # Get cost for each SKU
     costs = []
-    cost_map = _load_total_cost_net_cache()
     found_count = 0
     
     for single_sku in skus:
-        single_sku = single_sku.strip()
         cost = 0.0
         
         # Try cost map first
         if single_sku in cost_map:
             cost = float(cost_map.get(single_sku, 0.0))
             found_count += 1
-            logger.debug("[COST] Found %s in cache: €%.2f", single_sku, cost)
         else:
-            # Try product JSON
-            try:
-                products_dir = Path(__file__).resolve().parents[2] / "legacy" / "products"
-                json_path = products_dir / f"{single_sku}.json"
-                if json_path.exists():
-                    with open(json_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                    product = data.get(single_sku, data)
-                    price_data = product.get("Price Data", {})
-                    cost_value = price_data.get("Total Cost Net", 0.0)
-                    cost = float(cost_value) if cost_value is not None else 0.0
-                    if cost > 0:
-                        found_count += 1
-                        logger.debug("[COST] Found %s in JSON: €%.2f", single_sku, cost)
-            except Exception as e:
-                logger.debug("[COST] Failed to read product JSON for SKU=%s: %s", single_sku, e)
+            # Product JSON fallback (preloaded in bulk)
+            fallback = _JSON_COST_FALLBACKS.get(single_sku)
+            if fallback is None and single_sku not in _JSON_COST_FALLBACKS:
+                fallback = _JSON_COST_FALLBACKS.setdefault(single_sku, _read_json_total_cost_net(single_sku))
+            cost = fallback or 0.0
+            if cost > 0:
+                found_count += 1
         
         if cost > 0:
             costs.append(cost)
@@ -355,6 +404,21 @@ def _get_average_cost_for_multi_sku(sku_string: str) -> float:
     return average_cost
 
 
+def _get_average_cost_for_multi_sku(sku_string: str) -> float:
+    """
+    Calculate average Total Cost Net for multi-SKU listings.
+    
+    See _split_multi_sku for the supported formats.
+    """
+    if not sku_string:
+        return 0.0
+    return _average_cost_for_components(
+        sku_string,
+        tuple(_split_multi_sku(sku_string)),
+        _load_total_cost_net_cache(),
+    )
+
+
 def _expand_sku_range(sku_range: str) -> list:
     """
     Expand a SKU range like 'P0010482-P0010490' into individual SKUs.
@@ -378,9 +442,8 @@ def _expand_sku_range(sku_range: str) -> list:
     
     # Extract prefix and numeric parts
     # E.g., "P0010482" -> prefix="P", number=10482
-    import re
-    start_match = re.match(r"^([A-Za-z]*)(\d+)$", start_sku)
-    end_match = re.match(r"^([A-Za-z]*)(\d+)$", end_sku)
+    start_match = _RANGE_PART_RE.match(start_sku)
+    end_match = _RANGE_PART_RE.match(end_sku)
     
     if not start_match or not end_match:
         # Not a valid range format
@@ -472,7 +535,7 @@ def _get_marketplace_shipping_cost(marketplace: str) -> float:
 
 def get_category_fees(category_id: Optional[str]) -> Optional[Dict[str, float]]:
     """
-    Get fees for a category from the schema files.
+    Get fees for a category from category_mapping.json, falling back to the schema files.
     
     Args:
         category_id: eBay category ID
@@ -482,21 +545,17 @@ def get_category_fees(category_id: Optional[str]) -> Optional[Dict[str, float]]:
     """
     if not category_id:
         return None
-    
-    cat_id = str(category_id).strip()
 
-    # category_mapping is authoritative (refreshed from inventory.db/ebay_categories)
-    mapping_fees_cache = _load_category_mapping_fees_cache()
-    if cat_id in mapping_fees_cache:
-        return mapping_fees_cache[cat_id]
-
-    # Schema fees are fallback only
-    fees_cache = _load_schema_fees_cache()
-    if cat_id in fees_cache:
-        return fees_cache[cat_id]
-    
-    logger.debug(f"[FEES] No fees found for category {category_id}")
-    return None
+    _ensure_fee_caches_current()
+    # category_mapping is authoritative (refreshed from inventory.db/ebay_categories),
+    # schema fees are fallback only
+    source, fees = ebay_category_fees.resolve(
+        category_id, (ebay_category_fees.MAPPING, ebay_category_fees.SCHEMA)
+    )
+    if source is None:
+        logger.debug(f"[FEES] No fees found for category {category_id}")
+        return None
+    return _with_default_fees(fees)
 
 
 def calculate_listing_profit(
@@ -0,0 +1,258 @@
+"""Columnar (NumPy) profit engine for the eBay listings cache.
+
+`calculate_listing_profit` in ebay_profit_calculator stays the reference
+implementation. This module computes the same numbers for a whole list of
+listings at once: marketplace, fee and cost lookups are resolved once per
+distinct key, then every profit field is computed in one vectorized pass
+using the exact same floating-point operation order as the scalar function,
+so results are identical.
+"""
+import logging
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.services.ebay_profit_calculator import (
+    NON_GERMANY_SURCHARGE,
+    _get_marketplace_shipping_cost,
+    _get_vat_rate_for_marketplace,
+    _is_germany_marketplace,
+    build_sku_cost_index,
+    get_category_fees,
+    get_total_cost_net_for_sku,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHIPPING_LISTING = 4.99
+
+
+def _shipping_listing_value(listing: Dict[str, Any]) -> float:
+    """Mirror of the shipping_listing parsing in calculate_listing_profit."""
+    try:
+        return float(listing.get("shipping_listing", DEFAULT_SHIPPING_LISTING) or DEFAULT_SHIPPING_LISTING)
+    except (TypeError, ValueError):
+        return DEFAULT_SHIPPING_LISTING
+
+
+def _is_numeric_price(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, complex)
+
+
+def _empty_profit(total_cost_net: Optional[float] = None) -> Dict[str, Any]:
+    return {
+        "selling_price_brutto": 0.0,
+        "shipping_listing": 0.0,
+        "selling_price_netto": 0.0,
+        "payment_fee": 0.0,
+        "sales_commission": 0.0,
+        "sales_commission_percentage": 0.0,
+        "shipping_costs_net": 0.0,
+        "total_cost_net": total_cost_net,
+        "net_profit": 0.0,
+        "net_profit_margin_percent": 0.0,
+    }
+
+
+class ListingColumns:
+    """Listings loaded into column arrays with fees and costs joined in bulk."""
+
+    def __init__(self, listings: List[Dict[str, Any]]):
+        self.size = len(listings)
+
+        # Rows whose price is not a plain number are left to the scalar reference
+        self.vectorizable = np.array([_is_numeric_price(l.get("price")) for l in listings], dtype=bool)
+
+        self.price = np.array(
+            [float(l.get("price")) if ok else 0.0 for l, ok in zip(listings, self.vectorizable)],
+            dtype=np.float64,
+        )
+        self.shipping_listing = np.array([_shipping_listing_value(l) for l in listings], dtype=np.float64)
+
+        # Marketplace-dependent values: resolved once per distinct marketplace
+        marketplaces = [l.get("site") or l.get("marketplace", "") for l in listings]
+        market_values: Dict[Any, tuple] = {}
+        for market in set(marketplaces):
+            market_values[market] = (
+                _is_germany_marketplace(market),
+                _get_vat_rate_for_marketplace(market),
+                _get_marketplace_shipping_cost(market),
+            )
+        self.is_germany = np.array([market_values[m][0] for m in marketplaces], dtype=bool)
+        self.vat_rate = np.array([market_values[m][1] for m in marketplaces], dtype=np.float64)
+        self.shipping_costs_net = np.array([market_values[m][2] for m in marketplaces], dtype=np.float64)
+
+        # Fees joined by category_id
+        category_ids = [l.get("category_id") for l in listings]
+        fee_values: Dict[Any, tuple] = {}
+        for category_id in set(category_ids):
+            payment_fee, commission = 0.0, 0.0
+            if category_id:
+                resolved = get_category_fees(category_id)
+                if resolved:
+                    payment_fee = float(resolved.get("payment_fee") or 0.0)
+                    commission = float(resolved.get("sales_commission_percentage") or 0.0)
+            fee_values[category_id] = (payment_fee, commission)
+        self.payment_fee = np.array([fee_values[c][0] for c in category_ids], dtype=np.float64)
+        self.sales_commission_percentage = np.array([fee_values[c][1] for c in category_ids], dtype=np.float64)
+
+        # Total Cost Net joined by SKU (index built in bulk, then O(1) lookups)
+        skus = [l.get("sku") for l in listings]
+        build_sku_cost_index(set(skus))
+        cost_values: Dict[Any, float] = {}
+        for sku in set(skus):
+            cost = get_total_cost_net_for_sku(sku)
+            try:
+                cost_values[sku] = float(cost) if cost else 0.0
+            except (TypeError, ValueError):
+                cost_values[sku] = 0.0
+        self.total_cost_net = np.array([cost_values[s] for s in skus], dtype=np.float64)
+
+
+def compute_profit_columns(
+    columns: ListingColumns,
+    price: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Compute all profit fields in one vectorized pass.
+
+    Args:
+        columns: Listings loaded via ListingColumns
+        price: Optional replacement price column (for repricing what-ifs)
+
+    Returns:
+        Dict of unrounded float64 arrays plus a boolean "has_price" mask
+    """
+    price = columns.price if price is None else price
+    # `price is None or price <= 0` in the scalar path; NaN compares False
+    has_price = ~(price <= 0)
+
+    selling_price_brutto = np.where(columns.is_germany, price, price + NON_GERMANY_SURCHARGE)
+    customer_payment_brutto = selling_price_brutto + columns.shipping_listing
+    selling_price_netto = customer_payment_brutto / (1 + columns.vat_rate)
+    sales_commission = customer_payment_brutto * columns.sales_commission_percentage
+
+    net_profit = (
+        selling_price_netto
+        - sales_commission
+        - columns.payment_fee
+        - columns.shipping_costs_net
+        - columns.total_cost_net
+    )
+
+    has_cost = columns.total_cost_net > 0
+    safe_cost = np.where(has_cost, columns.total_cost_net, 1.0)
+    net_profit_margin_percent = np.where(has_cost, (net_profit / safe_cost) * 100, 0.0)
+
+    return {
+        "has_price": has_price,
+        "selling_price_brutto": selling_price_brutto,
+        "shipping_listing": columns.shipping_listing,
+        "selling_price_netto": selling_price_netto,
+        "payment_fee": columns.payment_fee,
+        "sales_commission": sales_commission,
+        "sales_commission_percentage": columns.sales_commission_percentage,
+        "shipping_costs_net": columns.shipping_costs_net,
+        "total_cost_net": columns.total_cost_net,
+        "net_profit": net_profit,
+        "net_profit_margin_percent": net_profit_margin_percent,
+    }
+
+
+def _rows_from_columns(result: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """Build per-listing dicts rounded exactly like calculate_listing_profit."""
+    # tolist() yields Python floats so round() matches the scalar rounding
+    cols = {key: value.tolist() for key, value in result.items()}
+    rows = []
+    for i, has_price in enumerate(cols["has_price"]):
+        if not has_price:
+            rows.append(_empty_profit())
+            continue
+        rows.append({
+            "selling_price_brutto": round(cols["selling_price_brutto"][i], 2),
+            "shipping_listing": round(cols["shipping_listing"][i], 2),
+            "selling_price_netto": round(cols["selling_price_netto"][i], 2),
+            "payment_fee": round(cols["payment_fee"][i], 2),
+            "sales_commission": round(cols["sales_commission"][i], 2),
+            "sales_commission_percentage": round(cols["sales_commission_percentage"][i], 4),
+            "shipping_costs_net": round(cols["shipping_costs_net"][i], 2),
+            "total_cost_net": round(cols["total_cost_net"][i], 2),
+            "net_profit": round(cols["net_profit"][i], 2),
+            "net_profit_margin_percent": round(cols["net_profit_margin_percent"][i], 2),
+        })
+    return rows
+
+
+def compute_profit_analyses(listings: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Compute profit_analysis for every listing.
+
+    Returns one dict per listing, or None where the listing has a non-numeric
+    price and must go through the scalar reference implementation.
+    """
+    if not listings:
+        return []
+
+    columns = ListingColumns(listings)
+    rows = _rows_from_columns(compute_profit_columns(columns))
+    vectorizable = columns.vectorizable.tolist()
+    for i, ok in enumerate(vectorizable):
+        if not ok:
+            rows[i] = None
+    return rows
+
+
+def simulate_repricing(
+    listings: List[Dict[str, Any]],
+    price_multiplier: float = 1.0,
+    price_delta: float = 0.0,
+    include_listings: bool = False,
+) -> Dict[str, Any]:
+    """
+    Repricing what-if over the whole listings cache (nothing is written).
+
+    New price per listing = price * price_multiplier + price_delta.
+    """
+    columns = ListingColumns(listings)
+    mask = columns.vectorizable & (columns.price > 0)
+
+    current = compute_profit_columns(columns)
+    new_price = columns.price * price_multiplier + price_delta
+    simulated = compute_profit_columns(columns, price=new_price)
+
+    def summarize(result: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        valid = mask & result["has_price"]
+        profit = result["net_profit"][valid]
+        margins = result["net_profit_margin_percent"][valid & (columns.total_cost_net > 0)]
+        return {
+            "total_net_profit": round(float(profit.sum()), 2) if profit.size else 0.0,
+            "avg_net_profit": round(float(profit.mean()), 2) if profit.size else 0.0,
+            "avg_margin_percent": round(float(margins.mean()), 2) if margins.size else 0.0,
+            "loss_making_count": int((profit < 0).sum()),
+        }
+
+    response: Dict[str, Any] = {
+        "success": True,
+        "count": int(mask.sum()),
+        "price_multiplier": price_multiplier,
+        "price_delta": price_delta,
+        "current": summarize(current),
+        "simulated": summarize(simulated),
+    }
+
+    if include_listings:
+        simulated_rows = _rows_from_columns(simulated)
+        new_prices = new_price.tolist()
+        response["listings"] = [
+            {
+                "item_id": listings[i].get("item_id"),
+                "sku": listings[i].get("sku"),
+                "price": listings[i].get("price"),
+                "new_price": round(new_prices[i], 2) if not math.isnan(new_prices[i]) else None,
+                "profit_analysis": simulated_rows[i],
+            }
+            for i in np.flatnonzero(mask).tolist()
+        ]
+
+    return response
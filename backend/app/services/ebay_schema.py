@@ -1,11 +1,11 @@
 """
 eBay category schema management service
 """
-import json
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+import sys
+from typing import Dict, Any, Iterator, List, Optional
 import requests
-import pandas as pd
 from pathlib import Path
 
 from app.config.ebay_config import (
@@ -13,17 +13,26 @@ from app.config.ebay_config import (
     MARKETPLACE_ID,
     EBAY_SITE_ID
 )
-from app.repositories import ebay_schema_repo
+from app.repositories import ebay_schema_repo, ebay_schema_catalog_repo
 from app.repositories.sku_json_repo import read_sku_json
-from app.services.excel_inventory import load_inventory_dataframe
+from app.services import ebay_category_fees
 from app.services.ebay_oauth import get_access_token
 
+LEGACY = Path(__file__).resolve().parents[2] / "legacy"
+sys.path.insert(0, str(LEGACY))
+import ebay_schema_fetch  # type: ignore
+
+try:
+    import httpx
+except ImportError:  # async path falls back to requests on a worker thread
+    httpx = None
+
 logger = logging.getLogger(__name__)
 
+EBAY_API_TIMEOUT_SECONDS = 30
+
 # Cache for eBay API responses
 _ebay_api_cache: Dict[str, Any] = {}
-_category_mapping_by_id_cache: Optional[Dict[str, Dict[str, Any]]] = None
-_category_mapping_mtime_cache: Optional[float] = None
 
 
 def get_ebay_token() -> str:
@@ -31,95 +40,15 @@ def get_ebay_token() -> str:
     return get_access_token()
 
 
-def _load_category_mapping_by_id() -> Dict[str, Dict[str, Any]]:
-    global _category_mapping_by_id_cache, _category_mapping_mtime_cache
-
-    mapping_file = ebay_schema_repo.SCHEMAS_DIR / "category_mapping.json"
-    if not mapping_file.exists():
-        logger.warning(f"Category mapping file not found: {mapping_file}")
-        _category_mapping_by_id_cache = {}
-        _category_mapping_mtime_cache = None
-        return _category_mapping_by_id_cache
-
-    try:
-        current_mtime = mapping_file.stat().st_mtime
-    except Exception:
-        current_mtime = None
-
-    if (
-        _category_mapping_by_id_cache is not None
-        and _category_mapping_mtime_cache is not None
-        and current_mtime is not None
-        and _category_mapping_mtime_cache == current_mtime
-    ):
-        return _category_mapping_by_id_cache
-
-    try:
-        with mapping_file.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        rows = data.get("categoryMappings", []) if isinstance(data, dict) else []
-        lookup: Dict[str, Dict[str, Any]] = {}
-        for row in rows:
-            cat_id = str((row or {}).get("categoryId") or "").strip()
-            if cat_id:
-                lookup[cat_id] = row or {}
-        _category_mapping_by_id_cache = lookup
-        _category_mapping_mtime_cache = current_mtime
-        logger.info(f"Loaded {len(lookup)} category mappings from category_mapping.json")
-        return _category_mapping_by_id_cache
-    except Exception as e:
-        logger.error(f"Failed to load category mapping: {e}")
-        _category_mapping_by_id_cache = {}
-        _category_mapping_mtime_cache = None
-        return _category_mapping_by_id_cache
-
-
-def _coerce_optional_float(value: Any) -> Optional[float]:
-    if value is None:
-        return None
-    if isinstance(value, str) and not value.strip():
-        return None
-    try:
-        numeric = float(value)
-        if pd.isna(numeric):
-            return None
-        return numeric
-    except Exception:
-        return None
-
-
-def _normalize_mapping_fees(raw_fees: Dict[str, Any]) -> Dict[str, float]:
-    fees = raw_fees if isinstance(raw_fees, dict) else {}
-    payment_fee = _coerce_optional_float(fees.get("payment_fee"))
-    sales_commission = _coerce_optional_float(fees.get("sales_commission_up_to"))
-    if sales_commission is None:
-        sales_commission = _coerce_optional_float(fees.get("sales_commission_percentage"))
-
-    normalized: Dict[str, float] = {}
-    if payment_fee is not None:
-        normalized["payment_fee"] = payment_fee
-    if sales_commission is not None:
-        normalized["sales_commission_percentage"] = sales_commission
-    return normalized
-
-
 def _has_effective_fees(fees: Any) -> bool:
     if not isinstance(fees, dict):
         return False
     return (
-        _coerce_optional_float(fees.get("payment_fee")) is not None
-        or _coerce_optional_float(fees.get("sales_commission_percentage")) is not None
+        ebay_category_fees.coerce_fee(fees.get("payment_fee")) is not None
+        or ebay_category_fees.coerce_fee(fees.get("sales_commission_percentage")) is not None
     )
 
 
-def _get_category_fees_from_mapping(category_id: str) -> Dict[str, float]:
-    lookup = _load_category_mapping_by_id()
-    entry = lookup.get(str(category_id).strip())
-    if not entry:
-        return {}
-    return _normalize_mapping_fees(entry.get("fees", {}))
-
-
 def _ensure_cached_schema_fees(category_id: str, cached: Dict[str, Any]) -> Dict[str, Any]:
     if not isinstance(cached, dict):
         return cached
@@ -182,22 +111,7 @@ def fetch_category_tree_id() -> str:
         return _ebay_api_cache[cache_key]
     
     try:
-        base_url = get_taxonomy_endpoint()
-        headers = {
-            "Authorization": f"Bearer {get_ebay_token()}",
-            "Accept": "application/json",
-        }
-        
-        url = f"{base_url}/get_default_category_tree_id"
-        params = {"marketplace_id": MARKETPLACE_ID}
-        
-        response = requests.get(url, headers=headers, params=params, timeout=30)
-        response.raise_for_status()
-        
-        tree_id = response.json().get("categoryTreeId")
-        if not tree_id:
-            raise ValueError(f"Could not find categoryTreeId for marketplace {MARKETPLACE_ID}")
-        
+        tree_id = ebay_schema_fetch.fetch_category_tree_id(get_taxonomy_endpoint(), get_ebay_token(), MARKETPLACE_ID)
         _ebay_api_cache[cache_key] = tree_id
         logger.info(f"Fetched category tree ID: {tree_id}")
         return tree_id
@@ -210,6 +124,43 @@ def fetch_category_tree_id() -> str:
         raise
 
 
+def _parse_aspects_response(category_id: str, data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """Split a get_item_aspects_for_category response into required/optional field specs"""
+    required_fields: List[Dict[str, Any]] = []
+    optional_fields: List[Dict[str, Any]] = []
+    
+    aspects_list = data.get("aspects", [])
+    if not aspects_list:
+        logger.warning(f"No aspects found for category {category_id}")
+        return {"required": [], "optional": []}
+    
+    for aspect in aspects_list:
+        name = aspect.get("localizedAspectName", "N/A")
+        constraint = aspect.get("aspectConstraint", {})
+        is_required = constraint.get("aspectRequired", False)
+        
+        # Extract allowed values
+        allowed_values = []
+        values_list = aspect.get("aspectValues", [])
+        for val in values_list:
+            value_text = val.get("localizedValue")
+            if value_text:
+                allowed_values.append(value_text)
+        
+        field_data = {
+            "name": name,
+            "values": sorted(allowed_values) if allowed_values else None,
+        }
+        
+        if is_required:
+            required_fields.append(field_data)
+        else:
+            optional_fields.append(field_data)
+    
+    logger.info(f"Fetched {len(required_fields)} required and {len(optional_fields)} optional fields for category {category_id}")
+    return {"required": required_fields, "optional": optional_fields}
+
+
 def fetch_ebay_aspects_from_api(category_id: str) -> Dict[str, List[Dict[str, Any]]]:
     """
     Fetch required/optional item specifics from eBay Taxonomy API
@@ -224,53 +175,8 @@ def fetch_ebay_aspects_from_api(category_id: str) -> Dict[str, List[Dict[str, An
     
     try:
         tree_id = fetch_category_tree_id()
-        base_url = get_taxonomy_endpoint()
-        headers = {
-            "Authorization": f"Bearer {get_ebay_token()}",
-            "Accept": "application/json",
-        }
-        
-        url = f"{base_url}/category_tree/{tree_id}/get_item_aspects_for_category"
-        params = {"category_id": category_id}
-        
-        response = requests.get(url, headers=headers, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        
-        # Parse aspects
-        required_fields: List[Dict[str, Any]] = []
-        optional_fields: List[Dict[str, Any]] = []
-        
-        aspects_list = data.get("aspects", [])
-        if not aspects_list:
-            logger.warning(f"No aspects found for category {category_id}")
-            return {"required": [], "optional": []}
-        
-        for aspect in aspects_list:
-            name = aspect.get("localizedAspectName", "N/A")
-            constraint = aspect.get("aspectConstraint", {})
-            is_required = constraint.get("aspectRequired", False)
-            
-            # Extract allowed values
-            allowed_values = []
-            values_list = aspect.get("aspectValues", [])
-            for val in values_list:
-                value_text = val.get("localizedValue")
-                if value_text:
-                    allowed_values.append(value_text)
-            
-            field_data = {
-                "name": name,
-                "values": sorted(allowed_values) if allowed_values else None,
-            }
-            
-            if is_required:
-                required_fields.append(field_data)
-            else:
-                optional_fields.append(field_data)
-        
-        logger.info(f"Fetched {len(required_fields)} required and {len(optional_fields)} optional fields for category {category_id}")
-        return {"required": required_fields, "optional": optional_fields}
+        fetched = ebay_schema_fetch.fetch_aspects(get_taxonomy_endpoint(), tree_id, category_id, get_ebay_token())
+        return _parse_aspects_response(category_id, fetched.data)
         
     except requests.HTTPError as e:
         logger.error(f"eBay API error: {e.response.status_code} - {e.response.text}")
@@ -280,57 +186,87 @@ def fetch_ebay_aspects_from_api(category_id: str) -> Dict[str, List[Dict[str, An
         raise
 
 
+async def _taxonomy_get_async(client: Any, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """GET a Taxonomy API URL without blocking the event loop"""
+    token = await asyncio.to_thread(get_ebay_token)
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Accept": "application/json",
+    }
+    if client is None:
+        # httpx not installed: run the blocking call on a worker thread
+        def _get() -> Dict[str, Any]:
+            response = requests.get(url, headers=headers, params=params, timeout=EBAY_API_TIMEOUT_SECONDS)
+            response.raise_for_status()
+            return response.json()
+        return await asyncio.to_thread(_get)
+
+    response = await client.get(url, headers=headers, params=params)
+    response.raise_for_status()
+    return response.json()
+
+
+def _async_client() -> Any:
+    if httpx is None:
+        return None
+    return httpx.AsyncClient(timeout=EBAY_API_TIMEOUT_SECONDS)
+
+
+async def fetch_category_tree_id_async(client: Any = None) -> str:
+    """Async version of fetch_category_tree_id (shares the same cache)"""
+    cache_key = f"tree_id_{MARKETPLACE_ID}"
+    if cache_key in _ebay_api_cache:
+        return _ebay_api_cache[cache_key]
+    
+    url = f"{get_taxonomy_endpoint()}/get_default_category_tree_id"
+    data = await _taxonomy_get_async(client, url, {"marketplace_id": MARKETPLACE_ID})
+    tree_id = data.get("categoryTreeId")
+    if not tree_id:
+        raise ValueError(f"Could not find categoryTreeId for marketplace {MARKETPLACE_ID}")
+    
+    _ebay_api_cache[cache_key] = tree_id
+    logger.info(f"Fetched category tree ID: {tree_id}")
+    return tree_id
+
+
+async def fetch_ebay_aspects_from_api_async(category_id: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Async version of fetch_ebay_aspects_from_api using a non-blocking HTTP client"""
+    logger.info(f"Fetching eBay aspects for category {category_id} (async)")
+    
+    client = _async_client()
+    try:
+        tree_id = await fetch_category_tree_id_async(client)
+        url = f"{get_taxonomy_endpoint()}/category_tree/{tree_id}/get_item_aspects_for_category"
+        data = await _taxonomy_get_async(client, url, {"category_id": category_id})
+        return _parse_aspects_response(category_id, data)
+    except Exception as e:
+        logger.error(f"Error fetching aspects for category {category_id}: {e}")
+        raise
+    finally:
+        if client is not None:
+            await client.aclose()
+
+
 def get_category_fees(category_id: str) -> Dict[str, float]:
     """
-    Get fees for category from inventory Excel file
+    Get fees for category: category_mapping.json first, then the inventory table
     
     Args:
         category_id: eBay category ID
     
     Returns:
-        Dict with payment_fee and sales_commission_percentage
+        Dict with payment_fee and sales_commission_percentage ({} if neither has fees)
     """
-    mapping_fees = _get_category_fees_from_mapping(category_id)
-    if mapping_fees:
-        logger.info(f"Using category_mapping fees for category {category_id}: {mapping_fees}")
-        return mapping_fees
-
-    try:
-        df = load_inventory_dataframe()
-
-        if "eBay Category ID" not in df.columns:
-            logger.warning("Inventory dataframe is missing 'eBay Category ID'; skipping inventory fee lookup")
-            return {}
-        
-        # Look for category in eBay Category ID column
-        category_row = df[df["eBay Category ID"] == int(category_id)]
-        
-        if category_row.empty:
-            logger.warning(f"Category {category_id} not found in inventory")
-            return {}
-        
-        fees = {}
-        
-        # Extract fees if columns exist
-        if "Payment Fee €" in df.columns:
-            payment_fee = category_row["Payment Fee €"].iloc[0]
-            if pd.notna(payment_fee):
-                fees["payment_fee"] = float(payment_fee)
-        
-        if "Sales Commission % up to 7500€" in df.columns:
-            commission = category_row["Sales Commission % up to 7500€"].iloc[0]
-            if pd.notna(commission):
-                fees["sales_commission_percentage"] = float(commission)
-        
-        if fees:
-            logger.info(f"Using inventory fees for category {category_id}: {fees}")
-        else:
-            logger.warning(f"No fees found in inventory for category {category_id}")
-        return fees
-        
-    except Exception as e:
-        logger.error(f"Error fetching fees for category {category_id}: {e}")
-        return {}
+    source, fees = ebay_category_fees.resolve(
+        category_id, (ebay_category_fees.MAPPING, ebay_category_fees.INVENTORY)
+    )
+    if source == ebay_category_fees.MAPPING:
+        logger.info(f"Using category_mapping fees for category {category_id}: {fees}")
+    elif source == ebay_category_fees.INVENTORY:
+        logger.info(f"Using inventory fees for category {category_id}: {fees}")
+    else:
+        logger.warning(f"No fees found for category {category_id} in category_mapping or inventory")
+    return fees
 
 
 def fetch_and_cache_schema(category_id: str, category_name: str = "") -> Dict[str, Any]:
@@ -346,7 +282,16 @@ def fetch_and_cache_schema(category_id: str, category_name: str = "") -> Dict[st
     """
     # Fetch schema from API
     schema_data = fetch_ebay_aspects_from_api(category_id)
-    
+    return _save_fetched_schema(category_id, category_name, schema_data)
+
+
+async def fetch_and_cache_schema_async(category_id: str, category_name: str = "") -> Dict[str, Any]:
+    """Async version of fetch_and_cache_schema: HTTP is non-blocking, fees and file writes run on a thread"""
+    schema_data = await fetch_ebay_aspects_from_api_async(category_id)
+    return await asyncio.to_thread(_save_fetched_schema, category_id, category_name, schema_data)
+
+
+def _save_fetched_schema(category_id: str, category_name: str, schema_data: Dict[str, Any]) -> Dict[str, Any]:
     # Fetch fees
     fees = get_category_fees(category_id)
     
@@ -517,46 +462,135 @@ def list_all_schemas() -> List[Dict[str, Any]]:
     return schemas
 
 
+def _schema_content(metadata: Dict[str, Any], schema_data: Any) -> str:
+    """Hash of what a schema file says (metadata minus the ETag, plus the schema)."""
+    metadata = {k: v for k, v in (metadata or {}).items() if k != "etag"}
+    return ebay_schema_fetch.content_hash({"_metadata": metadata, "schema": schema_data})
+
+
+def _refresh_schema(category_id: str, tree_id: str, token: str, force: bool) -> Dict[str, Any]:
+    """
+    Re-fetch one cached schema; the file is rewritten only if its content changed.
+
+    Sends the stored ETag as If-None-Match; force skips that and always
+    rewrites. Returns {"category_id", "category_name", "status": "changed" | "unchanged"}.
+    """
+    cached = ebay_schema_repo.get_schema(category_id)
+    cached = cached if isinstance(cached, dict) else {}
+    old_metadata = cached.get("_metadata") if isinstance(cached.get("_metadata"), dict) else {}
+    old_schema = cached.get("schema")
+    category_name = old_metadata.get("category_name", "")
+
+    etag = old_metadata.get("etag") if old_schema is not None and not force else None
+    fetched = ebay_schema_fetch.fetch_aspects(get_taxonomy_endpoint(), tree_id, category_id, token, etag=etag)
+    schema_data = old_schema if fetched.not_modified else _parse_aspects_response(category_id, fetched.data)
+
+    metadata = {
+        "category_name": category_name,
+        "category_id": category_id,
+        "marketplace": MARKETPLACE_ID,
+        "fees": get_category_fees(category_id),
+    }
+    changed = _schema_content(old_metadata, old_schema) != _schema_content(metadata, schema_data)
+    if fetched.etag:
+        metadata["etag"] = fetched.etag
+    # Also write once to store a first ETag, so the next refresh can ask for a 304
+    if changed or force or (fetched.etag and not old_metadata.get("etag")):
+        if not ebay_schema_repo.save_schema(category_id, schema_data, metadata):
+            raise OSError(f"Failed to save schema for category {category_id}")
+
+    return {
+        "category_id": category_id,
+        "category_name": category_name,
+        "status": "changed" if changed else "unchanged",
+    }
+
+
+def iter_refresh_schemas(
+    category_ids: Optional[List[str]] = None,
+    force: bool = False,
+    max_workers: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Refresh schemas concurrently, yielding progress events.
+
+    Yields:
+        {"type": "start", "total"}, one {"type": "result", "done", "total",
+        "category_id", "category_name", "status", ["error"]} per category in
+        completion order, then {"type": "complete", "changed", "unchanged",
+        "failed"} (category id lists).
+    """
+    if category_ids is None:
+        category_ids = ebay_schema_repo.list_cached_schemas()
+    category_ids = list(dict.fromkeys(str(c).strip() for c in category_ids))
+    total = len(category_ids)
+    yield {"type": "start", "total": total}
+
+    summary: Dict[str, List[str]] = {"changed": [], "unchanged": [], "failed": []}
+    if total:
+        try:
+            token = get_ebay_token()
+            tree_id = fetch_category_tree_id()
+        except Exception as e:
+            for cat_id in category_ids:
+                summary["failed"].append(cat_id)
+                yield {"type": "result", "done": len(summary["failed"]), "total": total,
+                       "category_id": cat_id, "category_name": "", "status": "failed", "error": str(e)}
+            yield {"type": "complete", **summary}
+            return
+
+        done = 0
+        for cat_id, result, error in ebay_schema_fetch.run(
+            category_ids, lambda c: _refresh_schema(c, tree_id, token, force), max_workers
+        ):
+            done += 1
+            if error is not None:
+                logger.error(f"Failed to refresh schema for category {cat_id}: {error}")
+                result = {"category_id": cat_id, "category_name": "", "status": "failed", "error": str(error)}
+            summary[result["status"]].append(cat_id)
+            yield {"type": "result", "done": done, "total": total, **result}
+
+    logger.info(
+        f"Schema refresh: {len(summary['changed'])} changed, {len(summary['unchanged'])} unchanged, "
+        f"{len(summary['failed'])} failed"
+    )
+    yield {"type": "complete", **summary}
+
+
 def refresh_schemas(category_ids: Optional[List[str]] = None, force: bool = False) -> Dict[str, Any]:
     """
     Refresh schemas (re-fetch from eBay API)
     
     Args:
         category_ids: List of category IDs to refresh (None = all cached)
-        force: If True, refresh even if cached
+        force: If True, skip the conditional request and rewrite every schema
     
     Returns:
-        Dict with refresh results
+        Dict with refresh results ("changed" lists the category IDs whose schema file changed)
     """
-    if category_ids is None:
-        category_ids = ebay_schema_repo.list_cached_schemas()
-    
     results = {
         "refreshed": [],
-        "failed": []
+        "failed": [],
+        "changed": [],
     }
     
-    for cat_id in category_ids:
-        try:
-            # Get category name from existing schema
-            metadata = ebay_schema_repo.get_schema_metadata(cat_id)
-            category_name = metadata.get("category_name", "") if metadata else ""
-            
-            # Fetch fresh schema
-            schema = fetch_and_cache_schema(cat_id, category_name)
-            
-            results["refreshed"].append({
-                "category_id": cat_id,
-                "category_name": category_name,
-                "status": "success"
-            })
-            
-        except Exception as e:
-            logger.error(f"Failed to refresh schema for category {cat_id}: {e}")
+    for event in iter_refresh_schemas(category_ids, force):
+        if event["type"] != "result":
+            continue
+        if event["status"] == "failed":
             results["failed"].append({
-                "category_id": cat_id,
-                "error": str(e)
+                "category_id": event["category_id"],
+                "error": event["error"],
             })
+            continue
+        results["refreshed"].append({
+            "category_id": event["category_id"],
+            "category_name": event["category_name"],
+            "status": "success",
+            "changed": event["status"] == "changed",
+        })
+        if event["status"] == "changed":
+            results["changed"].append(event["category_id"])
     
     return results
 
@@ -569,6 +603,9 @@ async def get_schema_by_category_name(category_name: str) -> dict:
     3. Fetches schema from eBay API if needed
     4. Caches the schema for future use
     
+    Index lookups and file I/O run on a worker thread and the eBay API is
+    called with an async HTTP client, so the event loop is never blocked.
+    
     Args:
         category_name: Category name or full path (e.g., "/Kleidung & Accessoires/Damen/.../BHs & BH-Sets")
     
@@ -576,11 +613,6 @@ async def get_schema_by_category_name(category_name: str) -> dict:
         Dictionary with schema data or error message
     """
     try:
-        # Get all available schemas
-        schemas_dir = ebay_schema_repo.SCHEMAS_DIR
-        if not schemas_dir.exists():
-            schemas_dir.mkdir(parents=True, exist_ok=True)
-        
         # Extract simple category name from path if it's a full path
         simple_category = category_name
         if "/" in category_name:
@@ -588,69 +620,17 @@ async def get_schema_by_category_name(category_name: str) -> dict:
         
         logger.info(f"Looking for schema for category: {category_name} (simple: {simple_category})")
         
-        # Step 1: Search for existing schema files
-        schema_files = list(schemas_dir.glob("EbayCat_*.json"))
-        
-        for schema_file in schema_files:
-            try:
-                with open(schema_file, 'r', encoding='utf-8') as f:
-                    import json
-                    schema_data = json.load(f)
-                    
-                # Check if this schema matches the category
-                # Handle both old format (_metadata.category_name) and new format
-                metadata = schema_data.get("_metadata", {})
-                schema_cat_name = metadata.get("category_name") or schema_data.get("categoryName") or schema_data.get("name") or ""
-                
-                if schema_cat_name == category_name or \
-                   schema_cat_name.endswith(simple_category) or \
-                   schema_cat_name == simple_category:
-                    logger.info(f"Found existing schema file: {schema_file.name}")
-                    cat_id = str(metadata.get("category_id") or schema_data.get("categoryId") or "").strip()
-                    if cat_id:
-                        schema_data = _ensure_cached_schema_fees(cat_id, schema_data)
-                    return {
-                        "categoryId": metadata.get("category_id") or schema_data.get("categoryId"),
-                        "categoryName": simple_category,
-                        "schema": schema_data
-                    }
-            except Exception as e:
-                logger.debug(f"Error reading schema file {schema_file}: {e}")
-                continue
-        
-        # Step 2: Look up category ID from mapping
-        logger.info(f"Schema file not found, looking up category ID from mapping")
-        category_data = _get_category_id_from_mapping(category_name)
-        
-        if not category_data:
-            logger.warning(f"Could not find eBay category ID for: {category_name}")
-            return {"error": f"No category mapping found for: {category_name}"}
-        
-        category_id = category_data.get("categoryId")
-        fees_data = category_data.get("fees", {})
-        logger.info(f"Found category ID {category_id} in mapping with fees: {fees_data}")
-        
-        # Step 3: Check if schema already exists for this category ID
-        schema_file_pattern = f"EbayCat_{category_id}_*.json"
-        existing_schema = list(schemas_dir.glob(schema_file_pattern))
-        
-        if existing_schema:
-            logger.info(f"Found existing schema for category ID {category_id}")
-            with open(existing_schema[0], 'r', encoding='utf-8') as f:
-                import json
-                schema_data = json.load(f)
-                schema_data = _ensure_cached_schema_fees(str(category_id), schema_data)
-                return {
-                    "categoryId": category_id,
-                    "categoryName": simple_category,
-                    "schema": schema_data
-                }
+        cached_result, category_id = await asyncio.to_thread(
+            _find_cached_schema_by_category_name, category_name, simple_category
+        )
+        if cached_result is not None:
+            return cached_result
         
         # Step 4: Fetch schema from eBay API
         logger.info(f"Fetching eBay schema for category ID: {category_id}")
         try:
-            schema_to_save = fetch_and_cache_schema(category_id, category_name)
-            schema_to_save = _ensure_cached_schema_fees(category_id, schema_to_save)
+            schema_to_save = await fetch_and_cache_schema_async(category_id, category_name)
+            schema_to_save = await asyncio.to_thread(_ensure_cached_schema_fees, category_id, schema_to_save)
             
             return {
                 "categoryId": category_id,
@@ -667,6 +647,62 @@ async def get_schema_by_category_name(category_name: str) -> dict:
         return {"error": str(e)}
 
 
+def _find_cached_schema_by_category_name(category_name: str, simple_category: str) -> tuple[Optional[dict], Optional[str]]:
+    """
+    Blocking part of get_schema_by_category_name (steps 1-3).
+    
+    Returns (result, None) when a cached schema or an error result is found,
+    or (None, category_id) when the schema must be fetched from eBay.
+    """
+    # Get all available schemas
+    schemas_dir = ebay_schema_repo.SCHEMAS_DIR
+    if not schemas_dir.exists():
+        schemas_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Step 1: Look up an existing schema file in the catalogue index
+    entry = ebay_schema_catalog_repo.find_schema_entry(category_name)
+    if entry:
+        schema_data = ebay_schema_catalog_repo.load_schema_body(entry)
+        if isinstance(schema_data, dict):
+            logger.info(f"Found existing schema file: {entry['file']}")
+            metadata = schema_data.get("_metadata", {})
+            cat_id = str(metadata.get("category_id") or schema_data.get("categoryId") or "").strip()
+            if cat_id:
+                schema_data = _ensure_cached_schema_fees(cat_id, schema_data)
+            return {
+                "categoryId": metadata.get("category_id") or schema_data.get("categoryId"),
+                "categoryName": simple_category,
+                "schema": schema_data
+            }, None
+    
+    # Step 2: Look up category ID from mapping
+    logger.info(f"Schema file not found, looking up category ID from mapping")
+    category_data = _get_category_id_from_mapping(category_name)
+    
+    if not category_data:
+        logger.warning(f"Could not find eBay category ID for: {category_name}")
+        return {"error": f"No category mapping found for: {category_name}"}, None
+    
+    category_id = category_data.get("categoryId")
+    fees_data = category_data.get("fees", {})
+    logger.info(f"Found category ID {category_id} in mapping with fees: {fees_data}")
+    
+    # Step 3: Check if schema already exists for this category ID
+    entry = ebay_schema_catalog_repo.get_schema_entry_by_id(category_id)
+    schema_data = ebay_schema_catalog_repo.load_schema_body(entry) if entry else None
+    
+    if isinstance(schema_data, dict):
+        logger.info(f"Found existing schema for category ID {category_id}")
+        schema_data = _ensure_cached_schema_fees(str(category_id), schema_data)
+        return {
+            "categoryId": category_id,
+            "categoryName": simple_category,
+            "schema": schema_data
+        }, None
+    
+    return None, category_id
+
+
 def _get_category_id_from_mapping(category_name: str) -> Optional[dict]:
     """
     Load category data from category_mapping.json file
@@ -679,40 +715,12 @@ def _get_category_id_from_mapping(category_name: str) -> Optional[dict]:
         Dict with categoryId and fees if found in mapping, None otherwise
     """
     try:
-        mapping_file = ebay_schema_repo.SCHEMAS_DIR / "category_mapping.json"
-        
-        if not mapping_file.exists():
-            logger.debug(f"Category mapping file not found: {mapping_file}")
-            return None
-        
-        with open(mapping_file, 'r', encoding='utf-8') as f:
-            import json
-            mapping_data = json.load(f)
-        
-        mappings = mapping_data.get("categoryMappings", [])
-        logger.debug(f"Loaded {len(mappings)} category mappings from {mapping_file}")
-        
-        # Extract simple name from full path
-        simple_name = category_name
-        if "/" in category_name:
-            simple_name = category_name.split("/")[-1].strip()
-        
-        # Strategy 1: Try exact full path match first
-        for entry in mappings:
-            full_path = entry.get("fullPath", "")
-            if full_path == category_name:
-                cat_id = entry.get("categoryId")
-                fees = entry.get("fees", {})
-                logger.info(f"Found category ID {cat_id} (full path match) for '{category_name}'")
-                return {"categoryId": cat_id, "fees": fees}
-        
-        # Strategy 2: Try simple name exact match
-        for entry in mappings:
-            if entry.get("categoryName", "").lower() == simple_name.lower():
-                cat_id = entry.get("categoryId")
-                fees = entry.get("fees", {})
-                logger.info(f"Found category ID {cat_id} (simple name match) for '{simple_name}'")
-                return {"categoryId": cat_id, "fees": fees}
+        entry = ebay_schema_catalog_repo.find_mapping_entry(category_name)
+        if entry:
+            cat_id = entry.get("categoryId")
+            fees = entry.get("fees", {})
+            logger.info(f"Found category ID {cat_id} in mapping for '{category_name}'")
+            return {"categoryId": cat_id, "fees": fees}
         
         logger.debug(f"No mapping found for category: {category_name}")
         return None
@@ -733,23 +741,16 @@ async def _search_ebay_category_id(category_name: str) -> Optional[str]:
     Returns:
         Category ID if found, None otherwise
     """
+    client = _async_client()
     try:
-        tree_id = fetch_category_tree_id()
+        tree_id = await fetch_category_tree_id_async(client)
         base_url = get_taxonomy_endpoint()
-        headers = {
-            "Authorization": f"Bearer {get_ebay_token()}",
-            "Accept": "application/json",
-        }
         
         # Strategy 1: Try exact search with category suggestions
         logger.info(f"Strategy 1: Searching for category '{category_name}' using suggestions API")
         try:
             url = f"{base_url}/category_tree/{tree_id}/get_category_suggestions"
-            params = {"q": category_name}
-            
-            response = requests.get(url, headers=headers, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
+            data = await _taxonomy_get_async(client, url, {"q": category_name})
             
             suggestions = data.get("categorySuggestions", [])
             logger.info(f"Got {len(suggestions)} suggestions for '{category_name}'")
@@ -768,11 +769,7 @@ async def _search_ebay_category_id(category_name: str) -> Optional[str]:
         try:
             first_word = category_name.split()[0]
             url = f"{base_url}/category_tree/{tree_id}/get_category_suggestions"
-            params = {"q": first_word}
-            
-            response = requests.get(url, headers=headers, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
+            data = await _taxonomy_get_async(client, url, {"q": first_word})
             
             suggestions = data.get("categorySuggestions", [])
             logger.info(f"Got {len(suggestions)} suggestions for '{first_word}'")
@@ -793,11 +790,7 @@ async def _search_ebay_category_id(category_name: str) -> Optional[str]:
         try:
             clean_name = category_name.replace("&", "and").replace(" - ", " ")
             url = f"{base_url}/category_tree/{tree_id}/get_category_suggestions"
-            params = {"q": clean_name}
-            
-            response = requests.get(url, headers=headers, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
+            data = await _taxonomy_get_async(client, url, {"q": clean_name})
             
             suggestions = data.get("categorySuggestions", [])
             if suggestions:
@@ -811,13 +804,9 @@ async def _search_ebay_category_id(category_name: str) -> Optional[str]:
         logger.warning(f"No eBay category found for: {category_name} after all strategies")
         return None
         
-    except requests.HTTPError as e:
-        logger.error(f"eBay API error searching categories: {e.response.status_code} - {e.response.text}")
-        return None
     except Exception as e:
         logger.error(f"Error searching eBay categories: {e}")
         return None
-
-
-# Import pandas at module level to avoid issues
-import pandas as pd
+    finally:
+        if client is not None:
+            await client.aclose()
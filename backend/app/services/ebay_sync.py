@@ -3,9 +3,8 @@ eBay listing synchronization service
 """
 import logging
 import re
-import requests
 import xml.etree.ElementTree as ET
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from urllib.parse import urlparse
 
@@ -18,6 +17,7 @@ from app.config.ebay_config import (
 from app.repositories import ebay_cache_repo
 from app.services import ebay_listings_cache
 from app.services.ebay_oauth import get_access_token
+from app.services.ebay_trading_client import build_active_list_request, get_session, iter_pages
 
 logger = logging.getLogger(__name__)
 
@@ -137,9 +137,38 @@ def _ensure_success(root: ET.Element, call_name: str) -> None:
         )
 
 
+def _fetch_active_listings_page(token: str, endpoint: str, page: int, entries_per_page: int) -> Tuple[int, List[Dict[str, Any]]]:
+    """Fetch one GetMyeBaySelling ActiveList page; returns (total_pages, listings)."""
+    xml_body = build_active_list_request(token, page, entries_per_page)
+    headers = _build_headers("GetMyeBaySelling", token)
+    response = get_session().post(endpoint, headers=headers, data=xml_body.encode("utf-8"), timeout=60)
+    response.raise_for_status()
+
+    root = ET.fromstring(response.text)
+    _ensure_success(root, "GetMyeBaySelling")
+
+    # Parse items
+    items = root.findall(".//e:ActiveList/e:ItemArray/e:Item", namespaces=NS)
+    listings = [_extract_listing_from_item(item) for item in items]
+
+    # Check pagination
+    total_pages_text = root.findtext(
+        ".//e:ActiveList/e:PaginationResult/e:TotalNumberOfPages",
+        default="1",
+        namespaces=NS,
+    )
+    try:
+        total_pages = int(total_pages_text)
+    except ValueError:
+        total_pages = 1
+    return total_pages, listings
+
+
 def fetch_active_listings_from_ebay(entries_per_page: int = 200) -> List[Dict[str, Any]]:
     """
     Fetch all active eBay listings from API
+
+    Pages after the first are fetched concurrently; the result keeps page order.
     
     Returns:
         List of listing dicts
@@ -148,56 +177,16 @@ def fetch_active_listings_from_ebay(entries_per_page: int = 200) -> List[Dict[st
     
     token = get_ebay_token()
     endpoint = get_api_endpoint()
-    results: List[Dict[str, Any]] = []
-    page = 1
-    
-    while True:
-        xml_body = f"""<?xml version="1.0" encoding="utf-8"?>
-<GetMyeBaySellingRequest xmlns="urn:ebay:apis:eBLBaseComponents">
-  <RequesterCredentials>
-    <eBayAuthToken>{token}</eBayAuthToken>
-  </RequesterCredentials>
-  <ActiveList>
-    <Include>true</Include>
-    <Pagination>
-      <EntriesPerPage>{entries_per_page}</EntriesPerPage>
-      <PageNumber>{page}</PageNumber>
-    </Pagination>
-  </ActiveList>
-  <DetailLevel>ReturnAll</DetailLevel>
-</GetMyeBaySellingRequest>
-"""
-        
-        headers = _build_headers("GetMyeBaySelling", token)
-        response = requests.post(endpoint, headers=headers, data=xml_body.encode("utf-8"), timeout=60)
-        response.raise_for_status()
-        
-        root = ET.fromstring(response.text)
-        _ensure_success(root, "GetMyeBaySelling")
-        
-        # Parse items
-        items = root.findall(".//e:ActiveList/e:ItemArray/e:Item", namespaces=NS)
-        
-        for item in items:
-            results.append(_extract_listing_from_item(item))
-        
-        # Check pagination
-        total_pages_text = root.findtext(
-            ".//e:ActiveList/e:PaginationResult/e:TotalNumberOfPages",
-            default="1",
-            namespaces=NS,
-        )
-        try:
-            total_pages = int(total_pages_text)
-        except ValueError:
-            total_pages = 1
-        
-        logger.debug(f"Fetched page {page} of {total_pages} ({len(items)} items)")
-        
-        if page >= total_pages:
-            break
-        page += 1
-    
+    pages: Dict[int, List[Dict[str, Any]]] = {}
+
+    def fetch_page(page: int) -> Tuple[int, List[Dict[str, Any]]]:
+        return _fetch_active_listings_page(token, endpoint, page, entries_per_page)
+
+    for page, total_pages, listings in iter_pages(fetch_page):
+        pages[page] = listings
+        logger.debug(f"Fetched page {page} of {total_pages} ({len(listings)} items)")
+
+    results = [listing for page in sorted(pages) for listing in pages[page]]
     logger.info(f"Fetched {len(results)} active listings from eBay")
     return results
 
@@ -0,0 +1,109 @@
+"""
+Shared HTTP plumbing for eBay Trading API calls.
+
+- One keep-alive requests.Session (legacy/http_pool.KeepAliveSession) reused
+  by every Trading call instead of a fresh TCP/TLS handshake per request.
+- iter_pages(): fetches page 1, reads the total page count from it and then
+  fetches the remaining pages concurrently with bounded parallelism
+  (http_pool.run_bounded), yielding each page as soon as it arrives.
+"""
+from __future__ import annotations
+
+import logging
+import sys
+from contextlib import closing
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Tuple, TypeVar
+
+import requests
+
+LEGACY = Path(__file__).resolve().parents[2] / "legacy"
+sys.path.insert(0, str(LEGACY))
+import http_pool  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+MAX_PARALLEL_PAGE_FETCHES = 4  # GetMyeBaySelling pages in flight at once
+HTTP_POOL_SIZE = 16            # >= page fetches + detail lookups running together
+
+T = TypeVar("T")
+
+_session = http_pool.KeepAliveSession(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE)
+
+
+def get_session() -> requests.Session:
+    """Process-wide keep-alive session for Trading API calls."""
+    return _session.get()
+
+
+def build_active_list_request(oauth_token: str, page: int, entries_per_page: int = 200) -> str:
+    """GetMyeBaySelling request body for one ActiveList page."""
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+<GetMyeBaySellingRequest xmlns="urn:ebay:apis:eBLBaseComponents">
+  <RequesterCredentials>
+    <eBayAuthToken>{oauth_token}</eBayAuthToken>
+  </RequesterCredentials>
+  <ActiveList>
+    <Include>true</Include>
+    <Pagination>
+      <EntriesPerPage>{entries_per_page}</EntriesPerPage>
+      <PageNumber>{page}</PageNumber>
+    </Pagination>
+  </ActiveList>
+  <DetailLevel>ReturnAll</DetailLevel>
+</GetMyeBaySellingRequest>
+"""
+
+
+def build_seller_events_request(oauth_token: str, mod_time_from: str, mod_time_to: str) -> str:
+    """
+    GetSellerEvents request body for items modified in [mod_time_from, mod_time_to] (eBay UTC timestamps).
+
+    GetSellerEvents is not paginated; keep the window within 48 hours (eBay may
+    return incomplete results for longer ones). IncludeNewItem adds listings
+    created in the window.
+    """
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+<GetSellerEventsRequest xmlns="urn:ebay:apis:eBLBaseComponents">
+  <RequesterCredentials>
+    <eBayAuthToken>{oauth_token}</eBayAuthToken>
+  </RequesterCredentials>
+  <ModTimeFrom>{mod_time_from}</ModTimeFrom>
+  <ModTimeTo>{mod_time_to}</ModTimeTo>
+  <IncludeNewItem>true</IncludeNewItem>
+  <DetailLevel>ReturnAll</DetailLevel>
+</GetSellerEventsRequest>
+"""
+
+
+def iter_pages(
+    fetch_page: Callable[[int], Tuple[int, T]],
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[int, int, T]]:
+    """
+    Fetch all pages of a paginated call.
+
+    Args:
+        fetch_page: fetch_page(page) -> (total_pages, result); runs in worker threads
+        max_workers: pages fetched concurrently after page 1 (default MAX_PARALLEL_PAGE_FETCHES)
+
+    Yields:
+        (page, total_pages, result) in completion order. Page 1 always comes first.
+        The first failing page cancels the pages not yet started and re-raises.
+    """
+    total_pages, result = fetch_page(1)
+    total_pages = max(int(total_pages or 1), 1)
+    yield 1, total_pages, result
+    if total_pages <= 1:
+        return
+
+    if max_workers is None:
+        max_workers = MAX_PARALLEL_PAGE_FETCHES
+    workers = min(max_workers, total_pages - 1)
+    # Only `workers` requests are queued, so closing on a failure stops the rest quickly
+    pages = http_pool.run_bounded(range(2, total_pages + 1), fetch_page, workers, thread_name_prefix="trading-page")
+    with closing(pages):
+        for page, page_result, error in pages:
+            if error is not None:
+                raise error
+            yield page, total_pages, page_result[1]
@@ -0,0 +1,114 @@
+"""
+Debug guard that logs event-loop stalls.
+
+A heartbeat coroutine ticks on the event loop; a watchdog thread notices when
+the heartbeat falls behind by more than the threshold and logs the stack of
+the event-loop thread, naming the coroutine that is currently blocking it.
+
+Enabled by setting EVENT_LOOP_STALL_THRESHOLD_MS (e.g. 100).
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+STALL_THRESHOLD_ENV = "EVENT_LOOP_STALL_THRESHOLD_MS"
+
+
+def _describe_blocking_frames(thread_id: int) -> tuple[str, str]:
+    """Return (innermost coroutine name, formatted stack) for the loop thread."""
+    frame = sys._current_frames().get(thread_id)
+    if frame is None:
+        return "<unknown>", ""
+
+    stack = traceback.extract_stack(frame)
+    coroutine = "<no coroutine>"
+    current = frame
+    while current is not None:
+        if current.f_code.co_flags & inspect.CO_COROUTINE:
+            code = current.f_code
+            coroutine = f"{code.co_name} ({code.co_filename}:{current.f_lineno})"
+            break
+        current = current.f_back
+    return coroutine, "".join(traceback.format_list(stack[-12:]))
+
+
+class EventLoopStallMonitor:
+    """Heartbeat + watchdog thread that reports event-loop stalls."""
+
+    def __init__(self, threshold_seconds: float = 0.1):
+        self.threshold_seconds = threshold_seconds
+        self.interval_seconds = max(threshold_seconds / 4, 0.01)
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._stop = threading.Event()
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+
+    async def _heartbeat(self) -> None:
+        while not self._stop.is_set():
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self.interval_seconds)
+
+    def _watch(self) -> None:
+        reported_for = None
+        while not self._stop.wait(self.interval_seconds):
+            last_beat = self._last_beat
+            lag = time.monotonic() - last_beat
+            if lag < self.threshold_seconds or self._loop_thread_id is None:
+                continue
+            # One report per stall
+            if reported_for == last_beat:
+                continue
+            reported_for = last_beat
+            coroutine, stack = _describe_blocking_frames(self._loop_thread_id)
+            logger.warning(
+                "[EVENT-LOOP] Stall of %.0f ms (threshold %.0f ms) in coroutine %s\n%s",
+                lag * 1000,
+                self.threshold_seconds * 1000,
+                coroutine,
+                stack,
+            )
+
+    def start(self) -> None:
+        """Start monitoring the running event loop (call from a coroutine)."""
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._heartbeat_task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info("[EVENT-LOOP] Stall monitor started (threshold %.0f ms)", self.threshold_seconds * 1000)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+
+
+def start_monitor_from_env() -> Optional[EventLoopStallMonitor]:
+    """Start the stall monitor if EVENT_LOOP_STALL_THRESHOLD_MS is set."""
+    raw = os.getenv(STALL_THRESHOLD_ENV)
+    if not raw:
+        return None
+    try:
+        threshold_ms = float(raw)
+    except ValueError:
+        logger.warning("[EVENT-LOOP] Ignoring invalid %s=%r", STALL_THRESHOLD_ENV, raw)
+        return None
+    if threshold_ms <= 0:
+        return None
+
+    monitor = EventLoopStallMonitor(threshold_seconds=threshold_ms / 1000)
+    monitor.start()
+    return monitor
@@ -1,8 +1,10 @@
 from __future__ import annotations
+import logging
 import os
-import time
-from typing import Optional
 import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import pandas as pd
 from openpyxl import load_workbook
@@ -17,6 +19,9 @@ LEGACY = Path(__file__).resolve().parents[2] / "legacy"
 sys.path.insert(0, str(LEGACY))
 import config  # type: ignore
 
+from app.repositories import cache_coordination
+from app.repositories.sqlite_db import connection
+
 
 def _get_inventory_path() -> str:
     # Env override wins (recommended)
@@ -36,36 +41,192 @@ def _get_db_path() -> str:
     return str(LEGACY / "cache" / "inventory.db")
 
 
-class ExcelInventoryCache:
-    def __init__(self, ttl_seconds: int = 300):
-        self.ttl_seconds = ttl_seconds
-        self._df: Optional[pd.DataFrame] = None
-        self._loaded_at: float = 0.0
+# Snapshot layout: text columns whose distinct values are at most this share of
+# their non-empty values are stored as category (codes + one copy per value)
+CATEGORY_MAX_DISTINCT_RATIO = 0.5
+# How often load() checks whether the inventory table changed
+VERSION_CHECK_SECONDS = 1.0
+
+# Change counter of the inventory table, bumped by triggers on every
+# INSERT/UPDATE/DELETE, whichever process or script writes it
+_VERSION_TABLE = "inventory_data_version"
+_VERSION_TRIGGERS = {
+    "inventory_data_version_ai": "AFTER INSERT",
+    "inventory_data_version_au": "AFTER UPDATE",
+    "inventory_data_version_ad": "AFTER DELETE",
+}
+
+logger = logging.getLogger(__name__)
+
+
+def _quote_ident(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _ensure_version_triggers(conn: sqlite3.Connection) -> None:
+    installed = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'inventory' AND name IN (?, ?, ?)",
+        tuple(_VERSION_TRIGGERS),
+    ).fetchone()[0]
+    if installed == len(_VERSION_TRIGGERS):
+        return
+    # First use, or the inventory table was recreated (its triggers went with it)
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {_VERSION_TABLE} (id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL)"
+    )
+    conn.execute(f"INSERT OR IGNORE INTO {_VERSION_TABLE} (id, version) VALUES (1, 0)")
+    for name, event in _VERSION_TRIGGERS.items():
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {name} {event} ON inventory "
+            f"BEGIN UPDATE {_VERSION_TABLE} SET version = version + 1 WHERE id = 1; END"
+        )
+    conn.execute(f"UPDATE {_VERSION_TABLE} SET version = version + 1 WHERE id = 1")
+    conn.commit()
+
+
+def _data_version(conn: sqlite3.Connection, db_path: str) -> Tuple[Any, ...]:
+    """(db file inode, change counter, inventory columns) - changes whenever the table does."""
+    row = conn.execute(f"SELECT version FROM {_VERSION_TABLE} WHERE id = 1").fetchone()
+    columns = tuple(str(r[1]) for r in conn.execute("PRAGMA table_info(inventory)").fetchall())
+    return (os.stat(db_path).st_ino, row[0] if row else None, columns)
+
+
+def _compact_column(series: pd.Series) -> pd.Series:
+    """Numeric dtype for number-only columns, category for repetitive text, unchanged otherwise."""
+    if pd.api.types.is_numeric_dtype(series.dtype) or isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    present = series.dropna()
+    if present.empty:
+        return series
+    kind = pd.api.types.infer_dtype(present, skipna=True)
+    if kind in ("integer", "floating", "mixed-integer-float"):
+        return pd.to_numeric(series)
+    if kind == "string" and present.nunique() <= len(present) * CATEGORY_MAX_DISTINCT_RATIO:
+        return series.astype("category")
+    return series
 
-    def load(self) -> pd.DataFrame:
-        now = time.time()
-        if self._df is not None and (now - self._loaded_at) < self.ttl_seconds:
-            return self._df
 
-        # Read from SQLite database instead of Excel for better performance
+class ExcelInventoryCache:
+    """
+    Compact in-memory snapshot of the inventory table.
+
+    - Column projection: load(columns=[...]) reads only the columns not held
+      yet; columns are kept individually and shared by all callers.
+    - Number-only columns are stored numeric and repetitive text columns as
+      category (see _compact_column); memory_usage() reports the footprint.
+    - Refreshed on change, not on a timer: a trigger-maintained change counter
+      of the inventory table is checked at most every VERSION_CHECK_SECONDS,
+      and invalidate() drops the snapshot at once in every worker.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._columns: Dict[str, pd.Series] = {}
+        self._version: Optional[Tuple[Any, ...]] = None
+        self._checked_at = float("-inf")
+        self._watch = cache_coordination.GenerationWatch(cache_coordination.INVENTORY)
+
+    def _read(self, columns: List[str]) -> Tuple[Tuple[Any, ...], pd.DataFrame]:
+        """Version and the given columns, read in one transaction (rowid order)."""
         db_path = _get_db_path()
-        conn = sqlite3.connect(db_path)
-        try:
-            df = pd.read_sql("SELECT * FROM inventory", conn)
-        finally:
-            conn.close()
-
-        self._df = df
-        self._loaded_at = now
-        return df
+        with connection(db_path) as conn:
+            _ensure_version_triggers(conn)
+            conn.execute("BEGIN")
+            version = _data_version(conn, db_path)
+            select = ", ".join(_quote_ident(c) for c in columns if c in version[2])
+            frame = pd.read_sql(f"SELECT {select} FROM inventory ORDER BY rowid", conn) if select else pd.DataFrame()
+            conn.commit()
+        return version, frame
+
+    def _reset(self, version: Optional[Tuple[Any, ...]]) -> None:
+        self._columns = {}
+        self._version = version
+
+    def _ensure_current(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < VERSION_CHECK_SECONDS:
+            return
+        self._checked_at = now
+        changed_elsewhere = self._watch.changed()
+        db_path = _get_db_path()
+        with connection(db_path) as conn:
+            _ensure_version_triggers(conn)
+            version = _data_version(conn, db_path)
+        if changed_elsewhere or version != self._version:
+            self._reset(version)
+            self._watch.sync()
+
+    def load(self, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Inventory rows as a DataFrame.
+
+        Args:
+            columns: Columns to include (unknown names are skipped); all columns if None
+        """
+        with self._lock:
+            self._ensure_current()
+            loaded: List[str] = []
+            while True:
+                available = self._version[2] if self._version else ()
+                wanted = list(available) if columns is None else [c for c in dict.fromkeys(columns) if c in available]
+                missing = [c for c in wanted if c not in self._columns]
+                if not missing and self._version is not None:
+                    break
+                version, frame = self._read(missing or wanted)
+                if version != self._version:
+                    # Changed since the last check: start a new snapshot
+                    self._reset(version)
+                    loaded = []
+                for col in frame.columns:
+                    self._columns[col] = _compact_column(frame[col])
+                    loaded.append(col)
+                if not missing:
+                    break
+
+            if loaded:
+                size = sum(int(self._columns[c].memory_usage(deep=True, index=False)) for c in loaded)
+                logger.info(
+                    "[INVENTORY] Loaded %s columns x %s rows into the snapshot (%.2f MB)",
+                    len(loaded), len(self._columns[loaded[0]]), size / 1024 / 1024,
+                )
+            return pd.DataFrame({c: self._columns[c] for c in wanted}, copy=False)
+
+    def columns(self) -> List[str]:
+        """Column names of the inventory table (no data is loaded)."""
+        with self._lock:
+            self._ensure_current()
+            return list(self._version[2]) if self._version else []
+
+    def version(self) -> Optional[Tuple[Any, ...]]:
+        """Version of the inventory table the snapshot follows (changes with every write)."""
+        with self._lock:
+            self._ensure_current()
+            return self._version
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """Rows, loaded columns, dtypes and bytes (deep) of the snapshot."""
+        with self._lock:
+            by_column = {c: int(s.memory_usage(deep=True, index=False)) for c, s in self._columns.items()}
+            return {
+                "rows": len(next(iter(self._columns.values()))) if self._columns else 0,
+                "columns_loaded": len(self._columns),
+                "columns_total": len(self._version[2]) if self._version else 0,
+                "bytes": sum(by_column.values()),
+                "dtypes": {c: str(s.dtype) for c, s in self._columns.items()},
+                "bytes_by_column": by_column,
+            }
 
     def invalidate(self) -> None:
-        self._df = None
+        """Drop the snapshot here and in every other worker (inventory table changed)."""
+        with self._lock:
+            self._reset(None)
+            self._checked_at = float("-inf")
+        cache_coordination.bump(cache_coordination.INVENTORY)
 
 
 excel_inventory = ExcelInventoryCache()
 
 
-def load_inventory_dataframe() -> pd.DataFrame:
-    """Load inventory dataframe (with caching)"""
-    return excel_inventory.load()
+def load_inventory_dataframe(columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Load inventory dataframe (with caching); columns limits it to those columns"""
+    return excel_inventory.load(columns)
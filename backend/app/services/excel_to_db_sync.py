@@ -9,6 +9,8 @@ from typing import Any, Dict, List, Optional
 import pandas as pd
 from openpyxl import load_workbook
 
+from app.repositories import cache_coordination
+from app.repositories.sqlite_db import connection
 from app.services.excel_inventory import excel_inventory, _get_db_path
 
 LEGACY = Path(__file__).resolve().parents[2] / "legacy"
@@ -134,9 +136,7 @@ def refresh_category_mapping_from_excel(sheet_name: str = "Ebay Categories") ->
     """
     try:
         db_path = _get_db_path()
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        try:
+        with connection(db_path, row_factory=sqlite3.Row) as conn:
             table_exists = conn.execute(
                 "SELECT name FROM sqlite_master WHERE type='table' AND name='ebay_categories'"
             ).fetchone()
@@ -159,8 +159,6 @@ def refresh_category_mapping_from_excel(sheet_name: str = "Ebay Categories") ->
                 }
 
             rows = conn.execute('SELECT * FROM "ebay_categories"').fetchall()
-        finally:
-            conn.close()
 
         mapping_path = Path(__file__).resolve().parents[2] / "schemas" / "category_mapping.json"
         existing_payload: Dict[str, Any] = {"categoryMappings": []}
@@ -292,10 +290,7 @@ def sync_excel_to_db(sheet_name: str, columns: List[str]) -> Dict[str, Any]:
 
         # Connect to database
         db_path = _get_db_path()
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-
-        try:
+        with connection(db_path, row_factory=sqlite3.Row) as conn:
             # Check if table exists
             table_check = conn.execute(
                 "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
@@ -560,6 +555,8 @@ def sync_excel_to_db(sheet_name: str, columns: List[str]) -> Dict[str, Any]:
             # Invalidate cache
             if table_name == "inventory":
                 excel_inventory.invalidate()
+            elif table_name == "ebay_categories":
+                cache_coordination.bump(cache_coordination.EBAY_CATEGORIES)
 
             return {
                 "success": True,
@@ -570,8 +567,6 @@ def sync_excel_to_db(sheet_name: str, columns: List[str]) -> Dict[str, Any]:
                 "rows_skipped_insert": rows_skipped_insert,
                 "columns_synced": available_cols,
             }
-        finally:
-            conn.close()
 
     except Exception as e:
         print(f"[SYNC EXCEPTION] Error syncing Excel to DB: {e}")
@@ -599,10 +594,7 @@ def add_missing_sku_rows_from_excel() -> Dict[str, Any]:
             return {"success": False, "message": f"Column '{sku_col}' not found in sheet '{sheet_name}'"}
 
         db_path = _get_db_path()
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-
-        try:
+        with connection(db_path, row_factory=sqlite3.Row) as conn:
             table_check = conn.execute(
                 "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
                 (table_name,)
@@ -703,8 +695,6 @@ def add_missing_sku_rows_from_excel() -> Dict[str, Any]:
                 "sheet": sheet_name,
                 "table": table_name,
             }
-        finally:
-            conn.close()
     except Exception as e:
         print(f"[ADD MISSING SKU] Error: {e}")
         import traceback
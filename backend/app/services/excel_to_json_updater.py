@@ -18,6 +18,7 @@ import sys
 sys.path.insert(0, str(LEGACY))
 import config  # type: ignore
 
+from app.repositories.sku_json_repo import sku_lock, write_sku_json
 # Import category mapping function
 from app.services.json_generation import get_category_id_for_path
 
@@ -131,68 +132,66 @@ def update_jsons_from_excel(skus: Optional[List[str]] = None) -> Dict[str, Any]:
             continue
 
         try:
-            data = json.loads(json_path.read_text(encoding="utf-8"))
-            if sku not in data or not isinstance(data[sku], dict):
-                results.append(UpdateResult(
-                    sku=sku,
-                    updated=False,
-                    fields_changed=[],
-                    error="Invalid JSON structure"
-                ))
-                continue
-
-            payload = data[sku]
-            fields_changed = []
-
-            # Update Category in "Ebay Category" section
-            if category_idx:
-                if "Ebay Category" not in payload:
-                    payload["Ebay Category"] = {}
-                if payload["Ebay Category"].get("Category") != category_val:
-                    payload["Ebay Category"]["Category"] = category_val
-                    fields_changed.append("Category")
-                    
-                    # Also look up and update eBay Category ID
-                    if category_val:
-                        category_id = get_category_id_for_path(category_val)
-                        if category_id:
-                            payload["Ebay Category"]["eBay Category ID"] = category_id
-                            if "eBay Category ID" not in fields_changed:
-                                fields_changed.append("eBay Category ID")
-
-            # Update Status in "Status" section
-            if status_idx:
-                if "Status" not in payload:
-                    payload["Status"] = {}
-                if payload["Status"].get("Status") != status_val:
-                    payload["Status"]["Status"] = status_val
-                    fields_changed.append("Status")
-
-            # Update Lager in "Warehouse" section
-            if lager_idx:
-                if "Warehouse" not in payload:
-                    payload["Warehouse"] = {}
-                if payload["Warehouse"].get("Lager") != lager_val:
-                    payload["Warehouse"]["Lager"] = lager_val
-                    fields_changed.append("Lager")
-
-            # Save if changed
-            if fields_changed:
-                json_path.write_text(
-                    json.dumps(data, indent=2, ensure_ascii=False),
-                    encoding="utf-8"
-                )
-                results.append(UpdateResult(
-                    sku=sku,
-                    updated=True,
-                    fields_changed=fields_changed
-                ))
-            else:
-                results.append(UpdateResult(
-                    sku=sku,
-                    updated=False,
-                    fields_changed=[]
-                ))
+            with sku_lock(sku):
+                data = json.loads(json_path.read_text(encoding="utf-8"))
+                if sku not in data or not isinstance(data[sku], dict):
+                    results.append(UpdateResult(
+                        sku=sku,
+                        updated=False,
+                        fields_changed=[],
+                        error="Invalid JSON structure"
+                    ))
+                    continue
+
+                payload = data[sku]
+                fields_changed = []
+
+                # Update Category in "Ebay Category" section
+                if category_idx:
+                    if "Ebay Category" not in payload:
+                        payload["Ebay Category"] = {}
+                    if payload["Ebay Category"].get("Category") != category_val:
+                        payload["Ebay Category"]["Category"] = category_val
+                        fields_changed.append("Category")
+                        
+                        # Also look up and update eBay Category ID
+                        if category_val:
+                            category_id = get_category_id_for_path(category_val)
+                            if category_id:
+                                payload["Ebay Category"]["eBay Category ID"] = category_id
+                                if "eBay Category ID" not in fields_changed:
+                                    fields_changed.append("eBay Category ID")
+
+                # Update Status in "Status" section
+                if status_idx:
+                    if "Status" not in payload:
+                        payload["Status"] = {}
+                    if payload["Status"].get("Status") != status_val:
+                        payload["Status"]["Status"] = status_val
+                        fields_changed.append("Status")
+
+                # Update Lager in "Warehouse" section
+                if lager_idx:
+                    if "Warehouse" not in payload:
+                        payload["Warehouse"] = {}
+                    if payload["Warehouse"].get("Lager") != lager_val:
+                        payload["Warehouse"]["Lager"] = lager_val
+                        fields_changed.append("Lager")
+
+                # Save if changed
+                if fields_changed:
+                    write_sku_json(sku, payload)
+                    results.append(UpdateResult(
+                        sku=sku,
+                        updated=True,
+                        fields_changed=fields_changed
+                    ))
+                else:
+                    results.append(UpdateResult(
+                        sku=sku,
+                        updated=False,
+                        fields_changed=[]
+                    ))
 
         except Exception as e:
             results.append(UpdateResult(
@@ -1,6 +1,5 @@
 """Folder Images cache management"""
 from __future__ import annotations
-import json
 import sys
 from pathlib import Path
 from typing import Dict, Any
@@ -9,6 +8,7 @@ from datetime import datetime
 LEGACY = Path(__file__).resolve().parents[2] / "legacy"
 sys.path.insert(0, str(LEGACY))
 import config  # type: ignore
+import json_codec  # type: ignore
 
 
 def _get_cache_path() -> Path:
@@ -25,8 +25,7 @@ def read_cache() -> Dict[str, Any]:
         return {"timestamp": None, "counts": {}}
     
     try:
-        with cache_path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        return json_codec.read_file(cache_path)
     except Exception:
         return {"timestamp": None, "counts": {}}
 
@@ -42,8 +41,7 @@ def write_cache(counts: Dict[str, int], timestamp: str | None = None) -> None:
         "counts": counts
     }
     
-    with cache_path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    json_codec.write_file(cache_path, data)
 
 
 def get_folder_image_count(sku: str) -> int | None:
@@ -27,7 +27,7 @@ def compute_folder_images_for_all_skus() -> Iterator[Dict[str, any]]:
         "timestamp": str (only for complete)
     }
     """
-    df = excel_inventory.load()
+    df = excel_inventory.load(["SKU (Old)", "SKU"])
     
     # Get SKU column
     sku_col = None
@@ -7,7 +7,7 @@ from typing import Any, Dict
 
 from PIL import Image
 
-from app.repositories.sku_json_repo import read_sku_json, write_sku_json
+from app.repositories.sku_json_repo import read_sku_json, sku_lock, write_sku_json
 from app.services.image_listing import _find_sku_dir
 from app.services.image_enhancement import _ensure_images_section, _update_images_summary
 
@@ -75,24 +75,25 @@ def remove_background(sku: str, filename: str, model: str = "isnet-general-use")
 
     # Update metadata
     try:
-        product_json = read_sku_json(sku) or {}
-        images_section = _ensure_images_section(product_json)
-        enhanced = list(images_section.get("enhanced", []) or [])
-        existing = {e.get("filename") for e in enhanced if isinstance(e, dict)}
-
-        if output_filename not in existing:
-            enhanced.append({
-                "filename": output_filename,
-                "source": filename,
-                "method": f"rembg/{model}",
-                "generated": True,
-                "upscaled": False,
-            })
-
-        images_section["enhanced"] = enhanced
-        _update_images_summary(images_section)
-        product_json["Images"] = images_section
-        write_sku_json(sku, product_json)
+        with sku_lock(sku):
+            product_json = read_sku_json(sku) or {}
+            images_section = _ensure_images_section(product_json)
+            enhanced = list(images_section.get("enhanced", []) or [])
+            existing = {e.get("filename") for e in enhanced if isinstance(e, dict)}
+
+            if output_filename not in existing:
+                enhanced.append({
+                    "filename": output_filename,
+                    "source": filename,
+                    "method": f"rembg/{model}",
+                    "generated": True,
+                    "upscaled": False,
+                })
+
+            images_section["enhanced"] = enhanced
+            _update_images_summary(images_section)
+            product_json["Images"] = images_section
+            write_sku_json(sku, product_json)
     except Exception as exc:
         logger.warning("Metadata update failed after bg removal for %s: %s", sku, exc)
 
@@ -12,6 +12,8 @@ LEGACY = Path(__file__).resolve().parents[2] / "legacy"
 sys.path.insert(0, str(LEGACY))
 import config  # type: ignore
 
+from app.repositories.sku_json_repo import sku_lock, write_sku_json
+
 
 def load_product_json(sku: str) -> dict:
     """Load product JSON for a SKU."""
@@ -28,10 +30,7 @@ def load_product_json(sku: str) -> dict:
 
 def save_product_json(sku: str, product_data: dict) -> None:
     """Save product JSON for a SKU."""
-    product_path = Path(config.PRODUCTS_FOLDER_PATH) / f"{sku}.json"
-    product_path.parent.mkdir(parents=True, exist_ok=True)
-    with product_path.open("w", encoding="utf-8") as f:
-        json.dump({sku: product_data}, f, ensure_ascii=False, indent=2)
+    write_sku_json(sku, product_data)
 
 
 def build_images_summary(stock: List[dict], phone: List[dict], enhanced: List[dict], main_images: Optional[List[dict]] = None) -> dict:
@@ -119,38 +118,39 @@ def classify_images(sku: str, filenames: List[str], classification_type: str) ->
     
     try:
         # Load product data
-        product_data = load_product_json(sku) or {}
-        images_section = product_data.get("Images", {})
-        if not isinstance(images_section, dict):
-            images_section = {}
-        
-        # Get existing classifications
-        stock = list(images_section.get("stock", []) or [])
-        phone = list(images_section.get("phone", []) or [])
-        enhanced = list(images_section.get("enhanced", []) or [])
-        main_images = list(images_section.get("main_images", []) or [])
-        
-        # Remove these filenames from all categories first (avoid duplicates)
-        filenames_set = set(filenames)
-        stock = [r for r in stock if r.get("filename") not in filenames_set and r.get("file") not in filenames_set]
-        phone = [r for r in phone if r.get("filename") not in filenames_set and r.get("file") not in filenames_set]
-        enhanced = [r for r in enhanced if r.get("filename") not in filenames_set and r.get("file") not in filenames_set]
-        
-        # Add to target category
-        for filename in filenames:
-            record = {"filename": filename}
-            if classification_type == "phone":
-                phone.append(record)
-            elif classification_type == "stock":
-                stock.append(record)
-            elif classification_type == "enhanced":
-                enhanced.append(record)
-        
-        # Update Images section with summary
-        product_data["Images"] = build_images_summary(stock, phone, enhanced, main_images)
-        
-        # Save
-        save_product_json(sku, product_data)
+        with sku_lock(sku):
+            product_data = load_product_json(sku) or {}
+            images_section = product_data.get("Images", {})
+            if not isinstance(images_section, dict):
+                images_section = {}
+            
+            # Get existing classifications
+            stock = list(images_section.get("stock", []) or [])
+            phone = list(images_section.get("phone", []) or [])
+            enhanced = list(images_section.get("enhanced", []) or [])
+            main_images = list(images_section.get("main_images", []) or [])
+            
+            # Remove these filenames from all categories first (avoid duplicates)
+            filenames_set = set(filenames)
+            stock = [r for r in stock if r.get("filename") not in filenames_set and r.get("file") not in filenames_set]
+            phone = [r for r in phone if r.get("filename") not in filenames_set and r.get("file") not in filenames_set]
+            enhanced = [r for r in enhanced if r.get("filename") not in filenames_set and r.get("file") not in filenames_set]
+            
+            # Add to target category
+            for filename in filenames:
+                record = {"filename": filename}
+                if classification_type == "phone":
+                    phone.append(record)
+                elif classification_type == "stock":
+                    stock.append(record)
+                elif classification_type == "enhanced":
+                    enhanced.append(record)
+            
+            # Update Images section with summary
+            product_data["Images"] = build_images_summary(stock, phone, enhanced, main_images)
+            
+            # Save
+            save_product_json(sku, product_data)
         
         return {
             "success": True,
@@ -9,7 +9,7 @@ from typing import Any, Dict, List, Tuple
 
 from PIL import Image
 
-from app.repositories.sku_json_repo import read_sku_json, write_sku_json
+from app.repositories.sku_json_repo import read_sku_json, update_sku_json
 from app.services.image_listing import _find_sku_dir
 
 logger = logging.getLogger(__name__)
@@ -293,6 +293,7 @@ def enhance_images_for_sku(
     product_json = read_sku_json(sku) or {}
     images_section = _ensure_images_section(product_json)
     enhanced = list(images_section.get("enhanced", []) or [])
+    known_count = len(enhanced)
     existing = {e.get("filename") for e in enhanced if isinstance(e, dict)}
 
     generated: List[str] = []
@@ -362,10 +363,19 @@ def enhance_images_for_sku(
                 existing.add(output_path.name)
                 generated.append(output_path.name)
 
-    images_section["enhanced"] = enhanced
-    _update_images_summary(images_section)
-    product_json["Images"] = images_section
-    write_sku_json(sku, product_json)
+    # Generation takes a while: add the new entries to the current file, not the copy read above
+    added = enhanced[known_count:]
+
+    def _add_enhanced(latest: Dict[str, Any]) -> None:
+        latest_images = _ensure_images_section(latest)
+        latest_enhanced = list(latest_images.get("enhanced", []) or [])
+        latest_names = {e.get("filename") for e in latest_enhanced if isinstance(e, dict)}
+        latest_enhanced.extend(e for e in added if e["filename"] not in latest_names)
+        latest_images["enhanced"] = latest_enhanced
+        _update_images_summary(latest_images)
+        latest["Images"] = latest_images
+
+    update_sku_json(sku, _add_enhanced)
 
     return {
         "success": len(generated) > 0,
@@ -442,13 +452,7 @@ def upscale_images_for_sku(sku: str, filenames: List[str], scale: int = 4) -> Di
             "errors": [f"Images folder not found for SKU {sku}"]
         }
 
-    product_json = read_sku_json(sku) or {}
-    images_section = _ensure_images_section(product_json)
-    enhanced = list(images_section.get("enhanced", []) or [])
-    enhanced_by_filename = {
-        e.get("filename"): e for e in enhanced if isinstance(e, dict) and e.get("filename")
-    }
-
+    renamed: List[Tuple[str, str]] = []
     upscaled: List[str] = []
     errors: List[str] = []
 
@@ -468,19 +472,7 @@ def upscale_images_for_sku(sku: str, filenames: List[str], scale: int = 4) -> Di
             continue
 
         new_name = output_path.name
-        if filename in enhanced_by_filename:
-            entry = enhanced_by_filename[filename]
-            entry["filename"] = new_name
-            entry["upscaled"] = True
-            entry["scale"] = scale
-        else:
-            enhanced.append({
-                "filename": new_name,
-                "source": filename,
-                "upscaled": True,
-                "scale": scale,
-            })
-
+        renamed.append((filename, new_name))
         upscaled.append(new_name)
 
         try:
@@ -489,10 +481,31 @@ def upscale_images_for_sku(sku: str, filenames: List[str], scale: int = 4) -> Di
         except Exception:
             pass
 
-    images_section["enhanced"] = enhanced
-    _update_images_summary(images_section)
-    product_json["Images"] = images_section
-    write_sku_json(sku, product_json)
+    # Record the upscaled files on the current file (upscaling takes a while)
+    def _record_upscaled(product_json: Dict[str, Any]) -> None:
+        images_section = _ensure_images_section(product_json)
+        enhanced = list(images_section.get("enhanced", []) or [])
+        enhanced_by_filename = {
+            e.get("filename"): e for e in enhanced if isinstance(e, dict) and e.get("filename")
+        }
+        for filename, new_name in renamed:
+            if filename in enhanced_by_filename:
+                entry = enhanced_by_filename[filename]
+                entry["filename"] = new_name
+                entry["upscaled"] = True
+                entry["scale"] = scale
+            else:
+                enhanced.append({
+                    "filename": new_name,
+                    "source": filename,
+                    "upscaled": True,
+                    "scale": scale,
+                })
+        images_section["enhanced"] = enhanced
+        _update_images_summary(images_section)
+        product_json["Images"] = images_section
+
+    update_sku_json(sku, _record_upscaled)
 
     return {
         "success": len(upscaled) > 0,
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import logging
 import os
+import shutil
+import struct
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 from PIL import Image
 
 import sys
@@ -10,6 +17,29 @@ LEGACY = Path(__file__).resolve().parents[2] / "legacy"
 sys.path.insert(0, str(LEGACY))
 import config  # type: ignore
 
+logger = logging.getLogger(__name__)
+
+MAX_PARALLEL_ROTATIONS = 4  # Worker pool size for batch rotation
+JPEGTRAN_TIMEOUT_SECONDS = 60
+
+# EXIF orientation values that are pure clockwise rotations (no mirroring)
+_ORIENTATION_TO_DEGREES = {1: 0, 6: 90, 3: 180, 8: 270}
+_EXIF_ORIENTATION_TAG = 0x0112
+VALID_DEGREES = (90, 180, 270)
+
+# One lock per image file: two rotations of the same file must not interleave
+_registry_lock = threading.Lock()
+_rotation_locks: Dict[str, threading.Lock] = {}
+
+
+def _rotation_lock(image_path: Path) -> threading.Lock:
+    key = os.path.normcase(os.path.abspath(image_path))
+    with _registry_lock:
+        file_lock = _rotation_locks.get(key)
+        if file_lock is None:
+            file_lock = _rotation_locks[key] = threading.Lock()
+        return file_lock
+
 
 def _image_base_dirs() -> list[Path]:
     env_dirs = os.getenv("IMAGE_BASE_DIRS")
@@ -28,6 +58,142 @@ def _find_image_path(sku: str, filename: str) -> Optional[Path]:
     return None
 
 
+def _find_exif_orientation_offset(data: bytes) -> Optional[tuple[int, str]]:
+    """
+    Locate the IFD0 Orientation value inside a JPEG's APP1/Exif segment.
+
+    Returns (absolute byte offset of the SHORT value, struct byte-order prefix)
+    or None if the file has no Exif Orientation tag.
+    """
+    if data[:2] != b"\xff\xd8":
+        return None
+
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        # Start of scan / end of image: no more metadata segments
+        if marker in (0xDA, 0xD9):
+            return None
+        seg_len = struct.unpack(">H", data[pos + 2:pos + 4])[0]
+        seg_start = pos + 4
+        if marker == 0xE1 and data[seg_start:seg_start + 6] == b"Exif\x00\x00":
+            tiff = seg_start + 6
+            byte_order = data[tiff:tiff + 2]
+            if byte_order == b"II":
+                endian = "<"
+            elif byte_order == b"MM":
+                endian = ">"
+            else:
+                return None
+            ifd0 = tiff + struct.unpack(endian + "I", data[tiff + 4:tiff + 8])[0]
+            if ifd0 + 2 > len(data):
+                return None
+            entry_count = struct.unpack(endian + "H", data[ifd0:ifd0 + 2])[0]
+            for i in range(entry_count):
+                entry = ifd0 + 2 + i * 12
+                if entry + 12 > len(data):
+                    return None
+                tag, typ, count = struct.unpack(endian + "HHI", data[entry:entry + 8])
+                if tag == _EXIF_ORIENTATION_TAG and typ == 3 and count == 1:
+                    return entry + 8, endian
+            return None
+        pos = seg_start + seg_len - 2
+    return None
+
+
+def _read_exif_orientation(image_path: Path) -> Optional[int]:
+    """Read the EXIF Orientation value of a JPEG without decoding pixels."""
+    try:
+        data = image_path.read_bytes()
+    except OSError:
+        return None
+    located = _find_exif_orientation_offset(data)
+    if not located:
+        return None
+    offset, endian = located
+    return struct.unpack(endian + "H", data[offset:offset + 2])[0]
+
+
+def _rotate_jpeg_lossless(image_path: Path, degrees: int) -> bool:
+    """
+    Rotate a JPEG losslessly in the DCT domain using jpegtran.
+
+    Uses -perfect so the transform fails (instead of trimming edge blocks)
+    when the dimensions are not a multiple of the MCU size. Returns False when
+    jpegtran is unavailable or refuses the transform.
+    """
+    jpegtran = shutil.which("jpegtran")
+    if not jpegtran:
+        return False
+
+    # Mirrored orientations do not commute with rotation; let the caller fall back
+    orientation = _read_exif_orientation(image_path)
+    if orientation is not None and orientation not in _ORIENTATION_TO_DEGREES:
+        return False
+
+    # Unique name so concurrent rotations never share a temp file
+    fd, tmp_name = tempfile.mkstemp(dir=image_path.parent, prefix=f".{image_path.name}.", suffix=".rotate.tmp")
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    try:
+        result = subprocess.run(
+            [jpegtran, "-copy", "all", "-perfect", "-rotate", str(degrees), "-outfile", str(tmp_path), str(image_path)],
+            capture_output=True,
+            timeout=JPEGTRAN_TIMEOUT_SECONDS,
+        )
+        if result.returncode != 0 or not tmp_path.exists() or tmp_path.stat().st_size == 0:
+            logger.info(f"jpegtran could not rotate {image_path} losslessly: {result.stderr.decode(errors='ignore').strip()}")
+            return False
+        # mkstemp creates 0600; keep the mode of the file being replaced
+        os.chmod(tmp_path, image_path.stat().st_mode & 0o777)
+        os.replace(tmp_path, image_path)
+        return True
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"jpegtran failed for {image_path}: {e}")
+        return False
+    finally:
+        if tmp_path.exists():
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+
+def _rotate_pixels(image_path: Path, degrees: int) -> None:
+    """Decode, rotate and re-encode the image (lossy for JPEG/WebP)."""
+    with Image.open(image_path) as img:
+        # Try to preserve EXIF data
+        exif_data = img.getexif() if hasattr(img, 'getexif') else None
+        
+        # Convert rotation degrees to PIL format
+        # PIL rotates counter-clockwise, so we need to negate for clockwise rotation
+        rotated = img.rotate(-degrees, expand=True)
+        
+        # Save rotated image with appropriate format
+        # Determine format from extension
+        fmt = image_path.suffix.lower()
+        if fmt in ['.jpg', '.jpeg']:
+            save_kwargs = {'quality': 95, 'optimize': True}
+            save_format = 'JPEG'
+        elif fmt == '.png':
+            save_kwargs = {'optimize': True}
+            save_format = 'PNG'
+        elif fmt == '.webp':
+            save_kwargs = {'quality': 95}
+            save_format = 'WEBP'
+        else:
+            save_kwargs = {}
+            save_format = None
+        
+        # Save the rotated image
+        if save_format:
+            rotated.save(image_path, format=save_format, **save_kwargs)
+        else:
+            rotated.save(image_path, **save_kwargs)
+
+
 def rotate_image(sku: str, filename: str, degrees: int) -> dict:
     """
     Rotate an image by the specified degrees (90, 180, or 270) and save it.
@@ -41,7 +207,7 @@ def rotate_image(sku: str, filename: str, degrees: int) -> dict:
         Dictionary with success status and message
     """
     # Validate degrees
-    if degrees not in [90, 180, 270]:
+    if degrees not in VALID_DEGREES:
         return {
             "success": False,
             "message": f"Invalid rotation degrees: {degrees}. Must be 90, 180, or 270.",
@@ -62,36 +228,15 @@ def rotate_image(sku: str, filename: str, degrees: int) -> dict:
         }
     
     try:
-        # Open and rotate image
-        with Image.open(image_path) as img:
-            # Try to preserve EXIF data
-            exif_data = img.getexif() if hasattr(img, 'getexif') else None
-            
-            # Convert rotation degrees to PIL format
-            # PIL rotates counter-clockwise, so we need to negate for clockwise rotation
-            rotated = img.rotate(-degrees, expand=True)
-            
-            # Save rotated image with appropriate format
-            # Determine format from extension
-            fmt = image_path.suffix.lower()
-            if fmt in ['.jpg', '.jpeg']:
-                save_kwargs = {'quality': 95, 'optimize': True}
-                save_format = 'JPEG'
-            elif fmt == '.png':
-                save_kwargs = {'optimize': True}
-                save_format = 'PNG'
-            elif fmt == '.webp':
-                save_kwargs = {'quality': 95}
-                save_format = 'WEBP'
-            else:
-                save_kwargs = {}
-                save_format = None
-            
-            # Save the rotated image
-            if save_format:
-                rotated.save(image_path, format=save_format, **save_kwargs)
-            else:
-                rotated.save(image_path, **save_kwargs)
+        # Fast path for JPEG: lossless DCT rotation. Pixel rotation is the
+        # fallback (not an EXIF Orientation rewrite: enhancement and background
+        # removal read the raw pixels and would lose the rotation).
+        with _rotation_lock(image_path):
+            method = "pixels"
+            if image_path.suffix.lower() in (".jpg", ".jpeg") and _rotate_jpeg_lossless(image_path, degrees):
+                method = "lossless"
+            if method == "pixels":
+                _rotate_pixels(image_path, degrees)
         
         return {
             "success": True,
@@ -99,6 +244,7 @@ def rotate_image(sku: str, filename: str, degrees: int) -> dict:
             "sku": sku,
             "filename": filename,
             "degrees": degrees,
+            "method": method,
         }
     
     except Exception as e:
@@ -143,3 +289,87 @@ def clear_image_cache(sku: str, filename: str) -> None:
                 sku_cache_dir.rmdir()
         except Exception:
             pass
+
+
+def rotate_images_batch(images: List[Dict[str, Any]], degrees: int) -> Dict[str, Any]:
+    """
+    Rotate many images on a worker pool.
+
+    References to the same image are merged into one rotation (their degrees
+    summed mod 360), so no file is rotated by two workers at once.
+
+    Args:
+        images: List of {"sku", "filename", optional "degrees"} references
+        degrees: Default rotation for references without their own degrees
+
+    Returns:
+        Dictionary with one result per image, in the order the images first
+        appear; only the thumbnails of images that were actually rotated are
+        invalidated.
+    """
+    jobs: Dict[Tuple[str, str], int] = {}
+    invalid: Dict[Tuple[str, str], int] = {}
+    for img in images:
+        sku = img.get("sku")
+        filename = img.get("filename")
+        if not sku or not filename:
+            continue
+        key = (sku, filename)
+        deg = img.get("degrees") or degrees
+        if deg not in VALID_DEGREES:
+            invalid.setdefault(key, deg)
+        jobs[key] = (jobs.get(key, 0) + deg) % 360
+
+    def run(key: Tuple[str, str]) -> Dict[str, Any]:
+        sku, filename = key
+        if key in invalid:
+            # rotate_image reports the invalid value
+            return rotate_image(sku, filename, invalid[key])
+        deg = jobs[key]
+        if deg == 0:
+            if not _find_image_path(sku, filename):
+                return {
+                    "success": False,
+                    "message": f"Image not found: {sku}/{filename}",
+                    "sku": sku,
+                    "filename": filename,
+                    "degrees": 0,
+                }
+            return {
+                "success": True,
+                "message": "Rotations cancel out, image unchanged",
+                "sku": sku,
+                "filename": filename,
+                "degrees": 0,
+                "method": "none",
+            }
+        result = rotate_image(sku, filename, deg)
+        if result["success"]:
+            clear_image_cache(sku, filename)
+        return result
+
+    results: List[Dict[str, Any]] = []
+    if jobs:
+        keys = list(jobs)
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_ROTATIONS, len(keys))) as executor:
+            futures = [executor.submit(run, key) for key in keys]
+            for (sku, filename), future in zip(keys, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append({
+                        "success": False,
+                        "message": f"Error rotating image: {str(e)}",
+                        "sku": sku,
+                        "filename": filename,
+                        "degrees": jobs[(sku, filename)],
+                    })
+
+    processed_count = sum(1 for r in results if r["success"])
+    sku_count = len({sku for sku, _ in jobs})
+    return {
+        "success": processed_count > 0,
+        "message": f"Rotated {processed_count}/{len(jobs)} images across {sku_count} SKUs",
+        "processed_count": processed_count,
+        "results": results,
+    }
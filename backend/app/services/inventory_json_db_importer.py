@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import sqlite3
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from app.services.folder_images_cache import get_folder_image_count
+from app.repositories.sqlite_db import connection
+from app.services.folder_images_cache import read_cache as read_folder_images_cache
 from app.services.excel_inventory import excel_inventory, _get_db_path
 from app.services.inventory_json_importer import (
     _load_json_products,
@@ -20,6 +22,8 @@ import sys
 sys.path.insert(0, str(LEGACY))
 import config  # type: ignore
 
+PRELOAD_CHUNK = 900  # stays under SQLite's default 999 bound-parameter limit
+
 
 def _coerce_to_float_2digits(value: Any) -> Optional[float]:
     """Convert any value to float with 2 decimal places.
@@ -89,22 +93,67 @@ def _get_inventory_columns(conn: sqlite3.Connection) -> List[str]:
     return [r[1] for r in rows]
 
 
+def _preload_rows(
+    conn: sqlite3.Connection,
+    sku_col: str,
+    read_cols: List[str],
+    skus: Optional[List[str]],
+) -> Dict[str, Dict[str, Any]]:
+    """Current values of read_cols per SKU (first row wins for duplicate SKUs)."""
+    col_list = ", ".join([f"\"{c}\"" for c in [sku_col] + read_cols])
+    if skus is None:
+        batches = [None]
+    else:
+        batches = [skus[i:i + PRELOAD_CHUNK] for i in range(0, len(skus), PRELOAD_CHUNK)]
+
+    rows: Dict[str, Dict[str, Any]] = {}
+    for batch in batches:
+        if batch is None:
+            cursor = conn.execute(f"SELECT {col_list} FROM inventory")
+        else:
+            placeholders = ",".join(["?"] * len(batch))
+            cursor = conn.execute(
+                f"SELECT {col_list} FROM inventory WHERE \"{sku_col}\" IN ({placeholders})",
+                batch,
+            )
+        for values in cursor:
+            if values[0] is None:
+                continue
+            rows.setdefault(str(values[0]), dict(zip(read_cols, values[1:])))
+    return rows
+
+
 def update_db_from_jsons(
     skus: Optional[List[str]] = None,
     append_missing: bool = False,
 ) -> Dict[str, Any]:
+    """Import per-SKU JSON values into the inventory table as one bulk write.
+
+    Current rows and folder image counts are loaded once, changes are diffed in
+    memory and written with executemany (UPDATEs grouped by changed column set,
+    INSERTs by column set) inside a single transaction.
+    """
+    started = time.perf_counter()
+    timings: Dict[str, float] = {}
+
     products_dir = Path(getattr(config, "PRODUCTS_FOLDER_PATH"))
     if not products_dir.exists():
         return {"success": False, "message": f"Products directory not found: {products_dir}"}
 
     incoming = _load_json_products(products_dir, skus=skus)
+    timings["load_jsons"] = time.perf_counter() - started
     if not incoming:
         return {"success": False, "message": "No product JSON files found to import."}
 
+    folder_counts = read_folder_images_cache().get("counts", {}) or {}
+
+    price_net_col = getattr(config, "PRICE_NET_COLUMN", "Price Net")
+    shipping_net_col = getattr(config, "SHIPPING_NET_COLUMN", "Shipping Net")
+    total_cost_net_col = getattr(config, "TOTAL_COST_NET_COLUMN", "Total Cost Net")
+    op_col = getattr(config, "OP_COLUMN", "OP")
+
     db_path = _get_db_path()
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    try:
+    with connection(db_path) as conn:
         columns = _get_inventory_columns(conn)
         sku_col = getattr(config, "SKU_COLUMN")
         if sku_col not in columns:
@@ -118,16 +167,32 @@ def update_db_from_jsons(
 
         update_cols = [c for c in update_cols if c in columns and c != sku_col]
 
+        # Everything that can end up in `updates` (for the diff) plus the Total Cost Net inputs
+        read_cols = list(update_cols)
+        for col in (price_net_col, shipping_net_col, total_cost_net_col):
+            if col in columns and col not in read_cols:
+                read_cols.append(col)
+
+        # Lock out other writers between the preload and the write
+        phase = time.perf_counter()
+        conn.execute("BEGIN IMMEDIATE")
+        existing = _preload_rows(conn, sku_col, read_cols, list(incoming) if skus else None)
+        timings["preload"] = time.perf_counter() - phase
+
+        phase = time.perf_counter()
         processed = 0
         updated = 0
         appended = 0
+        column_changes: Dict[str, int] = {}
+        update_groups: Dict[Tuple[str, ...], List[List[Any]]] = {}
+        insert_groups: Dict[Tuple[str, ...], List[List[Any]]] = {}
 
         for sku, flat in incoming.items():
             updates: Dict[str, Any] = {c: flat.get(c, None) for c in update_cols if c in flat}
             if JSON_COLUMN in columns:
                 updates[JSON_COLUMN] = "Yes"
 
-            folder_count = get_folder_image_count(sku)
+            folder_count = folder_counts.get(sku)
             if folder_count is not None:
                 if FOLDER_IMAGES_COLUMN in columns:
                     updates[FOLDER_IMAGES_COLUMN] = int(folder_count)
@@ -135,35 +200,26 @@ def update_db_from_jsons(
                     updates[IMAGES_COLUMN] = int(folder_count)
             
             # Coerce financial columns to float with 2 decimal places
-            price_net_col = getattr(config, "PRICE_NET_COLUMN", "Price Net")
-            shipping_net_col = getattr(config, "SHIPPING_NET_COLUMN", "Shipping Net")
-            total_cost_net_col = getattr(config, "TOTAL_COST_NET_COLUMN", "Total Cost Net")
-            op_col = getattr(config, "OP_COLUMN", "OP")
-            
             if price_net_col in updates:
                 updates[price_net_col] = _coerce_to_float_2digits(updates[price_net_col])
             if shipping_net_col in updates:
                 updates[shipping_net_col] = _coerce_to_float_2digits(updates[shipping_net_col])
             if op_col in updates:
                 updates[op_col] = _coerce_to_float_2digits(updates[op_col])
+
+            row = existing.get(sku)
             
             # Calculate Total Cost Net if Price Net & Shipping Net are available
             if total_cost_net_col in columns:
                 price_net_val = updates.get(price_net_col)
                 shipping_net_val = updates.get(shipping_net_col)
                 
-                if price_net_val is None or shipping_net_val is None:
-                    # Try to get from existing row if not in updates
-                    row_check = conn.execute(
-                        f"SELECT \"{price_net_col}\", \"{shipping_net_col}\" FROM inventory WHERE \"{sku_col}\" = ?",
-                        (sku,),
-                    ).fetchone()
-                    
-                    if row_check:
-                        if price_net_val is None:
-                            price_net_val = row_check[price_net_col]
-                        if shipping_net_val is None:
-                            shipping_net_val = row_check[shipping_net_col]
+                # Fall back to the existing row if not in updates
+                if row is not None:
+                    if price_net_val is None:
+                        price_net_val = row.get(price_net_col)
+                    if shipping_net_val is None:
+                        shipping_net_val = row.get(shipping_net_col)
                 
                 if price_net_val is not None and shipping_net_val is not None:
                     calculated_total = _calculate_total_cost_net(
@@ -175,29 +231,18 @@ def update_db_from_jsons(
             if not updates:
                 continue
 
-            row = conn.execute(
-                f"SELECT * FROM inventory WHERE \"{sku_col}\" = ?",
-                (sku,),
-            ).fetchone()
-
             if row is None:
                 if not append_missing:
                     continue
-                insert_cols = [sku_col] + list(updates.keys())
-                placeholders = ",".join(["?"] * len(insert_cols))
-                col_list = ", ".join([f"\"{c}\"" for c in insert_cols])
-                values = [sku] + [updates[c] for c in updates]
-                conn.execute(
-                    f"INSERT INTO inventory ({col_list}) VALUES ({placeholders})",
-                    values,
-                )
+                insert_cols = (sku_col,) + tuple(updates.keys())
+                insert_groups.setdefault(insert_cols, []).append([sku] + list(updates.values()))
                 appended += 1
                 processed += 1
                 continue
 
             changed: Dict[str, Any] = {}
             for col, val in updates.items():
-                old = row[col] if col in row.keys() else None
+                old = row.get(col)
                 # Skip Status updates if current value in DB is already "OK"
                 if col == "Status" and old == "OK":
                     continue
@@ -205,26 +250,41 @@ def update_db_from_jsons(
                     changed[col] = val
 
             if changed:
-                set_clause = ", ".join([f"\"{col}\" = ?" for col in changed.keys()])
-                conn.execute(
-                    f"UPDATE inventory SET {set_clause} WHERE \"{sku_col}\" = ?",
-                    list(changed.values()) + [sku],
-                )
+                update_groups.setdefault(tuple(changed.keys()), []).append(list(changed.values()) + [sku])
+                for col in changed:
+                    column_changes[col] = column_changes.get(col, 0) + 1
                 updated += 1
 
             processed += 1
+        timings["diff"] = time.perf_counter() - phase
 
+        phase = time.perf_counter()
+        for changed_cols, params in update_groups.items():
+            set_clause = ", ".join([f"\"{col}\" = ?" for col in changed_cols])
+            conn.executemany(
+                f"UPDATE inventory SET {set_clause} WHERE \"{sku_col}\" = ?",
+                params,
+            )
+        for insert_cols, params in insert_groups.items():
+            placeholders = ",".join(["?"] * len(insert_cols))
+            col_list = ", ".join([f"\"{c}\"" for c in insert_cols])
+            conn.executemany(
+                f"INSERT INTO inventory ({col_list}) VALUES ({placeholders})",
+                params,
+            )
         conn.commit()
-    finally:
-        conn.close()
+        timings["write"] = time.perf_counter() - phase
 
     if updated or appended:
         excel_inventory.invalidate()
 
+    timings["total"] = time.perf_counter() - started
     return {
         "success": True,
         "processed": processed,
         "updated": updated,
         "appended": appended,
+        "column_changes": dict(sorted(column_changes.items(), key=lambda item: (-item[1], item[0]))),
+        "timings": {name: round(seconds, 3) for name, seconds in timings.items()},
         "message": f"Processed {processed} SKUs | Updated {updated} | Appended {appended}",
     }
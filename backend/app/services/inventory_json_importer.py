@@ -5,7 +5,6 @@ Optionally appends missing SKUs and updates folder image counters.
 """
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -21,6 +20,7 @@ LEGACY = Path(__file__).resolve().parents[2] / "legacy"
 import sys
 sys.path.insert(0, str(LEGACY))
 import config  # type: ignore
+import product_corpus  # type: ignore
 
 
 JSON_COLUMN = getattr(config, "JSON_COLUMN", "JSON")
@@ -42,68 +42,26 @@ class UpdateResult:
 
 
 def _load_json_products(products_dir: Path, skus: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
-    """Load per-SKU JSON files into a mapping {sku: flat_fields}."""
-    result: Dict[str, Dict[str, Any]] = {}
-    sku_filter = {s.strip() for s in skus} if skus else None
-
-    for path in products_dir.glob("*.json"):
-        try:
-            data = json.loads(path.read_text(encoding="utf-8"))
-        except Exception:
-            continue
-        if not isinstance(data, dict) or len(data) != 1:
-            continue
-        sku = next(iter(data)).strip()
-        if sku_filter is not None and sku not in sku_filter:
-            continue
-        payload = data[sku]
-        if not isinstance(payload, dict):
-            continue
+    """Load per-SKU JSON files into a mapping {sku: flat_fields}.
 
+    Goes through the product corpus snapshot: only the requested SKUs' files are
+    touched and unchanged files are not re-parsed.
+    """
+    result: Dict[str, Dict[str, Any]] = {}
+    for sku, entry in product_corpus.load_flat_products(products_dir, skus=skus).items():
         flat: Dict[str, Any] = {}
-        flat.update(_extract_image_counts(payload))
-
-        for _, section in payload.items():
-            if not isinstance(section, dict):
-                continue
-            for col, val in section.items():
-                if isinstance(val, (str, int, float)) or val is None:
-                    flat[col] = val
-
-        result[sku] = flat
+        flat.update(_image_count_columns(entry["image_counts"]))
+        flat.update(entry["fields"])
+        result[sku.strip()] = flat
     return result
 
 
-def _extract_image_counts(payload: Dict[str, Any]) -> Dict[str, Optional[int]]:
-    counts: Dict[str, Optional[int]] = {}
-    images_section = payload.get("Images") if isinstance(payload.get("Images"), dict) else None
-    if not isinstance(images_section, dict):
-        return counts
-
-    summary = images_section.get("summary") if isinstance(images_section.get("summary"), dict) else None
-
-    def _len_list(key: str) -> Optional[int]:
-        val = images_section.get(key)
-        if isinstance(val, list):
-            return len(val)
-        return None
-
-    def _summary_count(key: str) -> Optional[int]:
-        if not summary:
-            return None
-        val = summary.get(key)
-        if isinstance(val, (int, float)):
-            return int(val)
-        return None
-
-    for key, column_name in IMAGE_COUNT_SOURCES:
-        list_len = _len_list(key)
-        count = list_len if list_len is not None else _summary_count(f"count_{key}")
-        if count is None:
-            continue
-        counts[column_name] = int(count)
-
-    return counts
+def _image_count_columns(image_counts: Dict[str, int]) -> Dict[str, Optional[int]]:
+    return {
+        column_name: int(image_counts[key])
+        for key, column_name in IMAGE_COUNT_SOURCES
+        if key in image_counts
+    }
 
 
 def _normalize_for_compare(value: Any) -> Any:
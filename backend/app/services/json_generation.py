@@ -17,6 +17,8 @@ LEGACY = Path(__file__).resolve().parents[2] / "legacy"
 sys.path.insert(0, str(LEGACY))
 import config  # type: ignore
 
+from app.repositories.sku_json_repo import sku_lock, write_sku_json
+
 # Load category mapping once at import time
 _CATEGORY_MAPPING_CACHE = None
 
@@ -230,34 +232,34 @@ def create_json_from_inventory(sku: str) -> dict:
         output_file = products_path / f"{sku}.json"
         
         # Merge with existing if exists (preserves Images and other sections)
-        to_write = payload
-        if output_file.exists():
-            try:
-                with output_file.open("r", encoding="utf-8") as f:
-                    existing = json.load(f)
-                existing_data = existing.get(sku, {}) if isinstance(existing, dict) else {}
-                merged = existing_data.copy()
-                
-                # Update inventory sections
-                for cat, cat_data in payload.get(sku, {}).items():
-                    merged[cat] = cat_data
-                
-                # Reorder categories: follow CATEGORY_COLUMNS order, then others (e.g., Images)
-                ordered = {}
-                for cat in CATEGORY_COLUMNS.keys():
-                    if cat in merged:
-                        ordered[cat] = merged[cat]
-                for cat in merged.keys():
-                    if cat not in ordered:
-                        ordered[cat] = merged[cat]
-                
-                to_write = {sku: ordered}
-            except Exception:
-                to_write = payload
-        
-        # Write file
-        with output_file.open("w", encoding="utf-8") as f:
-            json.dump(to_write, f, ensure_ascii=False, indent=2)
+        with sku_lock(sku):
+            to_write = payload
+            if output_file.exists():
+                try:
+                    with output_file.open("r", encoding="utf-8") as f:
+                        existing = json.load(f)
+                    existing_data = existing.get(sku, {}) if isinstance(existing, dict) else {}
+                    merged = existing_data.copy()
+                    
+                    # Update inventory sections
+                    for cat, cat_data in payload.get(sku, {}).items():
+                        merged[cat] = cat_data
+                    
+                    # Reorder categories: follow CATEGORY_COLUMNS order, then others (e.g., Images)
+                    ordered = {}
+                    for cat in CATEGORY_COLUMNS.keys():
+                        if cat in merged:
+                            ordered[cat] = merged[cat]
+                    for cat in merged.keys():
+                        if cat not in ordered:
+                            ordered[cat] = merged[cat]
+                    
+                    to_write = {sku: ordered}
+                except Exception:
+                    to_write = payload
+            
+            # Write file
+            write_sku_json(sku, to_write[sku])
         
         return {
             "success": True,
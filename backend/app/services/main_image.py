@@ -11,6 +11,8 @@ LEGACY = Path(__file__).resolve().parents[2] / "legacy"
 sys.path.insert(0, str(LEGACY))
 import config
 
+from app.repositories.sku_json_repo import sku_lock, write_sku_json
+
 
 def _ensure_images_section(images_section: Dict[str, Any]) -> Dict[str, Any]:
     if not isinstance(images_section, dict):
@@ -56,11 +58,7 @@ def _load_product_json(sku: str) -> Dict[str, Any]:
 
 def _save_product_json(sku: str, product_detail: Dict[str, Any]) -> None:
     """Save product JSON file for a SKU."""
-    product_path = Path(config.PRODUCTS_FOLDER_PATH) / f"{sku}.json"
-    product_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    with product_path.open("w", encoding="utf-8") as f:
-        json.dump({sku: product_detail}, f, ensure_ascii=False, indent=2)
+    write_sku_json(sku, product_detail)
 
 
 def mark_main_images(sku: str, filenames: List[str]) -> Dict[str, Any]:
@@ -75,34 +73,35 @@ def mark_main_images(sku: str, filenames: List[str]) -> Dict[str, Any]:
         Dict with success, message, sku, processed_count
     """
     try:
-        product_detail = _load_product_json(sku) or {}
-        images_section = _ensure_images_section(product_detail.get("Images", {}))
-        
-        # Get existing main_images or initialize
-        main_images = list(images_section.get("main_images", []) or [])
-        
-        # Get existing filenames to avoid duplicates
-        existing_filenames = {
-            entry.get("filename") for entry in main_images 
-            if isinstance(entry, dict) and entry.get("filename")
-        }
-        
-        # Add new images
-        processed = 0
-        for filename in filenames:
-            if filename not in existing_filenames:
-                main_images.append({"filename": filename})
-                existing_filenames.add(filename)
-                processed += 1
-        
-        # Update Images section
-        images_section["main_images"] = main_images
-        _update_images_summary(images_section)
-        
-        product_detail["Images"] = images_section
-        
-        # Save JSON
-        _save_product_json(sku, product_detail)
+        with sku_lock(sku):
+            product_detail = _load_product_json(sku) or {}
+            images_section = _ensure_images_section(product_detail.get("Images", {}))
+            
+            # Get existing main_images or initialize
+            main_images = list(images_section.get("main_images", []) or [])
+            
+            # Get existing filenames to avoid duplicates
+            existing_filenames = {
+                entry.get("filename") for entry in main_images 
+                if isinstance(entry, dict) and entry.get("filename")
+            }
+            
+            # Add new images
+            processed = 0
+            for filename in filenames:
+                if filename not in existing_filenames:
+                    main_images.append({"filename": filename})
+                    existing_filenames.add(filename)
+                    processed += 1
+            
+            # Update Images section
+            images_section["main_images"] = main_images
+            _update_images_summary(images_section)
+            
+            product_detail["Images"] = images_section
+            
+            # Save JSON
+            _save_product_json(sku, product_detail)
         
         return {
             "success": True,
@@ -132,29 +131,30 @@ def unmark_main_images(sku: str, filenames: List[str]) -> Dict[str, Any]:
         Dict with success, message, sku, processed_count
     """
     try:
-        product_detail = _load_product_json(sku) or {}
-        images_section = _ensure_images_section(product_detail.get("Images", {}))
-        
-        # Get existing main_images
-        main_images = list(images_section.get("main_images", []) or [])
-        
-        # Remove specified filenames
-        filenames_set = set(filenames)
-        before_count = len(main_images)
-        main_images = [
-            entry for entry in main_images
-            if isinstance(entry, dict) and entry.get("filename") not in filenames_set
-        ]
-        processed = before_count - len(main_images)
-        
-        # Update Images section
-        images_section["main_images"] = main_images
-        _update_images_summary(images_section)
-        
-        product_detail["Images"] = images_section
-        
-        # Save JSON
-        _save_product_json(sku, product_detail)
+        with sku_lock(sku):
+            product_detail = _load_product_json(sku) or {}
+            images_section = _ensure_images_section(product_detail.get("Images", {}))
+            
+            # Get existing main_images
+            main_images = list(images_section.get("main_images", []) or [])
+            
+            # Remove specified filenames
+            filenames_set = set(filenames)
+            before_count = len(main_images)
+            main_images = [
+                entry for entry in main_images
+                if isinstance(entry, dict) and entry.get("filename") not in filenames_set
+            ]
+            processed = before_count - len(main_images)
+            
+            # Update Images section
+            images_section["main_images"] = main_images
+            _update_images_summary(images_section)
+            
+            product_detail["Images"] = images_section
+            
+            # Save JSON
+            _save_product_json(sku, product_detail)
         
         return {
             "success": True,
@@ -8,6 +8,7 @@ import json
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+from app.repositories.sku_json_repo import write_sku_json
 # Import the category lookup function
 from .json_generation import get_category_id_for_path
 
@@ -82,9 +83,8 @@ def migrate_all_category_ids() -> Tuple[int, int, int]:
                 # Add it to the JSON
                 data[sku]["Ebay Category"]["eBay Category ID"] = looked_up_id
                 
-                # Write back
-                with open(json_file, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
+                # Write back (locked, atomic)
+                write_sku_json(sku, data[sku])
                 
                 print(f"[ADD]  {sku}: Added Category ID {looked_up_id}")
                 updated_files += 1
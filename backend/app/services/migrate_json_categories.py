@@ -22,6 +22,8 @@ LEGACY = Path(__file__).resolve().parents[2] / "legacy"
 sys.path.insert(0, str(LEGACY))
 import config  # type: ignore
 
+from app.repositories.sku_json_repo import write_sku_json
+
 
 # Category columns mapping (must match json_generation.py)
 CATEGORY_COLUMNS = {
@@ -192,8 +194,7 @@ def migrate_all_jsons():
             
             # Write back if changes were made
             if made_changes:
-                with json_file.open("w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
+                write_sku_json(sku, data[sku])
                 updated_count += 1
                 print(f"[UPDATED] {sku}")
             else:
@@ -5,9 +5,6 @@ Reads JSON storage and transforms to stable API models.
 
 from __future__ import annotations
 
-import json
-import sys
-from pathlib import Path
 from typing import Dict, List, Optional
 
 from app.models.product_detail import (
@@ -15,12 +12,7 @@ from app.models.product_detail import (
     ProductDetailField,
     ProductDetailResponse,
 )
-from app.repositories.sku_json_repo import read_sku_json
-
-# Load config for products directory
-LEGACY = Path(__file__).resolve().parents[2] / "legacy"
-sys.path.insert(0, str(LEGACY))
-import config  # type: ignore
+from app.repositories.sku_json_repo import read_sku_json, sku_lock, write_sku_json
 
 
 # Fields that should be highlighted in UI as important
@@ -121,51 +113,47 @@ def update_product_detail(sku: str, updates: Dict[str, Dict[str, str]]) -> tuple
     from app.services.json_generation import get_category_id_for_path
     
     # Read current product data
-    product_json = read_sku_json(sku)
-    
-    if not product_json:
-        # Create new product structure if it doesn't exist
-        product_json = {}
-    
-    updated_count = 0
-    
-    # Apply updates
-    for category_name, fields in updates.items():
-        # Skip Images category
-        if category_name == "Images":
-            continue
+    with sku_lock(sku):
+        product_json = read_sku_json(sku)
         
-        # Ensure category exists
-        if category_name not in product_json:
-            product_json[category_name] = {}
+        if not product_json:
+            # Create new product structure if it doesn't exist
+            product_json = {}
         
-        # Ensure category is a dict
-        if not isinstance(product_json[category_name], dict):
-            product_json[category_name] = {}
+        updated_count = 0
         
-        # Update fields
-        for field_name, new_value in fields.items():
-            product_json[category_name][field_name] = new_value
-            updated_count += 1
+        # Apply updates
+        for category_name, fields in updates.items():
+            # Skip Images category
+            if category_name == "Images":
+                continue
+            
+            # Ensure category exists
+            if category_name not in product_json:
+                product_json[category_name] = {}
+            
+            # Ensure category is a dict
+            if not isinstance(product_json[category_name], dict):
+                product_json[category_name] = {}
+            
+            # Update fields
+            for field_name, new_value in fields.items():
+                product_json[category_name][field_name] = new_value
+                updated_count += 1
+            
+            # If this is Ebay Category and Category field was updated, add CategoryID
+            if category_name == "Ebay Category" and "Category" in fields:
+                category_path = fields["Category"]
+                if category_path:
+                    category_id = get_category_id_for_path(category_path)
+                    if category_id:
+                        product_json[category_name]["eBay Category ID"] = category_id
         
-        # If this is Ebay Category and Category field was updated, add CategoryID
-        if category_name == "Ebay Category" and "Category" in fields:
-            category_path = fields["Category"]
-            if category_path:
-                category_id = get_category_id_for_path(category_path)
-                if category_id:
-                    product_json[category_name]["eBay Category ID"] = category_id
-    
-    # Save back to JSON file
-    products_dir = Path(getattr(config, "PRODUCTS_FOLDER_PATH"))
-    sku_file = products_dir / f"{sku}.json"
-    
-    try:
-        sku_file.parent.mkdir(parents=True, exist_ok=True)
-        with sku_file.open("w", encoding="utf-8") as f:
-            json.dump({sku: product_json}, f, ensure_ascii=False, indent=2)
+        # Save back to JSON file
+        try:
+            write_sku_json(sku, product_json)
+            
+            return True, f"Successfully updated {updated_count} field(s)", updated_count
         
-        return True, f"Successfully updated {updated_count} field(s)", updated_count
-    
-    except Exception as e:
-        return False, f"Failed to save: {str(e)}", 0
+        except Exception as e:
+            return False, f"Failed to save: {str(e)}", 0
@@ -6,11 +6,23 @@ import json
 import sqlite3
 import threading
 import time
+import base64
+import hashlib
+import math
+import re
+from bisect import bisect_left
+from collections import Counter, OrderedDict
 from functools import lru_cache
 
+from app.repositories import cache_coordination, product_doc_store
+from app.repositories.sqlite_db import connection
 from app.services.excel_inventory import excel_inventory
-from app.services.folder_images_cache import get_folder_image_count, read_cache as read_folder_images_cache
-from app.services.ebay_listings_cache import get_sku_has_listing, read_cache as read_ebay_listings_cache
+from app.services.folder_images_cache import read_cache as read_folder_images_cache
+from app.services.ebay_listings_cache import (
+    build_listing_sku_index,
+    read_cache as read_ebay_listings_cache,
+    sku_in_listing_index,
+)
 from app.repositories.sku_json_repo import _sku_json_path
 import config  # type: ignore
 import pandas as pd
@@ -34,6 +46,30 @@ _JSON_FILE_SET_LOCK = threading.Lock()
 _JSON_FILE_SET: set[str] = set()
 _JSON_FILE_SET_LOADED_AT = 0.0
 _JSON_FILE_SET_TTL_SECONDS = 120.0
+# Reload early when another worker's doc store refresh found new/removed files
+_JSON_FILE_SET_WATCH = cache_coordination.GenerationWatch(cache_coordination.PRODUCT_DOCS)
+
+# Typed shadow columns of inventory_fast ("__norm__Brand", "__num__Price Net", ...)
+_SHADOW_PREFIX = "__"
+_FAST_TABLE_COLUMN_TYPES: Dict[str, str] = {}
+# Per-column statistics of the last inventory_fast build (see _column_facets)
+_FAST_TABLE_FACETS: Dict[str, Dict[str, Any]] = {}
+_FACET_ENUM_VALUES_LIMIT = 50
+# Bumped on every inventory_fast build in this worker; keys cached totals
+# (page cursors carry _fast_table_build_id(), which other workers can match)
+_FAST_TABLE_VERSION = 0
+# Shared generation (cache_coordination.INVENTORY_FAST) the local facets belong to;
+# one worker rebuilds inventory_fast, the others adopt its facets
+_FAST_TABLE_GENERATION = 0
+_FAST_TABLE_WATCH = cache_coordination.GenerationWatch(cache_coordination.INVENTORY_FAST)
+_FILTERED_TOTALS_LOCK = threading.Lock()
+_FILTERED_TOTALS: "OrderedDict[tuple[int, str], int]" = OrderedDict()
+_FILTERED_TOTALS_MAX = 256
+_WORD_BOUNDARY_RE = re.compile(r"[\s/,;|()\-]+")
+_ENUM_MAX_DISTINCT = 30
+_BOOL_TRUE_VALUES = {"true", "1", "yes"}
+_BOOL_FALSE_VALUES = {"false", "0", "no"}
+_DATE_LIKE_RE = re.compile(r"^\d{1,4}[-./]\d{1,2}[-./]\d{1,4}")
 
 
 def _find_json_like_column(columns: tuple[str, ...] | list[str] | set[str]) -> str | None:
@@ -50,12 +86,9 @@ def _quote_ident(name: str) -> str:
 @lru_cache(maxsize=1)
 def _get_inventory_db_columns() -> tuple[str, ...]:
     try:
-        conn = sqlite3.connect(DB_PATH)
-        try:
+        with connection(DB_PATH) as conn:
             rows = conn.execute("PRAGMA table_info(inventory)").fetchall()
             return tuple(str(r[1]) for r in rows)
-        finally:
-            conn.close()
     except Exception:
         return tuple()
 
@@ -84,14 +117,11 @@ def _ensure_sqlite_indexes() -> None:
         to_index = [c for c in preferred if c in db_cols]
 
         try:
-            conn = sqlite3.connect(DB_PATH)
-            try:
+            with connection(DB_PATH) as conn:
                 for col in to_index:
                     idx = "idx_inventory_" + "".join(ch.lower() if ch.isalnum() else "_" for ch in col).strip("_")
                     conn.execute(f"CREATE INDEX IF NOT EXISTS {_quote_ident(idx)} ON inventory({_quote_ident(col)})")
                 conn.commit()
-            finally:
-                conn.close()
         except Exception:
             pass
 
@@ -157,155 +187,361 @@ def _get_ebay_listed_skus_set() -> set[str]:
     return result
 
 
+def _shadow_col(col: str, kind: str) -> str:
+    return f"{_SHADOW_PREFIX}{kind}__{col}"
+
+
+def _norm_text(value: Any) -> str:
+    if value is None:
+        return ""
+    return str(value).strip().lower()
+
+
+def _parse_number(value: str) -> float | None:
+    try:
+        num = float(value)
+    except (TypeError, ValueError):
+        return None
+    return num if math.isfinite(num) else None
+
+
+def _infer_fast_column_type(norm_values: list[str]) -> str:
+    """Infer number/date/boolean/enum/string from the normalized values of one column."""
+    non_empty = [v for v in norm_values if v]
+    if not non_empty:
+        return "string"
+
+    distinct = set(non_empty)
+    if distinct <= (_BOOL_TRUE_VALUES | _BOOL_FALSE_VALUES) and distinct - {"0", "1"}:
+        return "boolean"
+    if all(_parse_number(v) is not None for v in distinct):
+        return "number"
+    if all(_DATE_LIKE_RE.match(v) for v in distinct):
+        parsed = pd.to_datetime(pd.Series(list(distinct)), errors="coerce", format="mixed")
+        if parsed.notna().all():
+            return "date"
+    if len(distinct) <= _ENUM_MAX_DISTINCT:
+        return "enum"
+    return "string"
+
+
+def _iso_dates(norm_values: list[str]) -> list[str | None]:
+    parsed = pd.to_datetime(pd.Series(norm_values, dtype=object).replace("", None), errors="coerce", format="mixed")
+    return [None if pd.isna(ts) else ts.strftime("%Y-%m-%dT%H:%M:%S") for ts in parsed]
+
+
+def _column_facets(raw_values: list[Any], ctype: str, numbers: list[float | None] | None) -> Dict[str, Any]:
+    """
+    Statistics for one column: type, distinct count, distinct values ordered
+    by frequency (trimmed display text, as get_distinct_values returns them)
+    and min/max for number columns.
+    """
+    counter = Counter(text for text in (str(v).strip() for v in raw_values if v is not None) if text)
+    facets: Dict[str, Any] = {
+        "type": ctype,
+        "distinct_count": len(counter),
+        "values": [value for value, _ in counter.most_common()],
+        "min": None,
+        "max": None,
+    }
+    if numbers is not None:
+        present = [n for n in numbers if n is not None]
+        if present:
+            facets["min"] = min(present)
+            facets["max"] = max(present)
+    return facets
+
+
+def _add_typed_shadow_columns(
+    conn: sqlite3.Connection, col_names: list[str], index_cols: list[str]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Infer each column's type once and store normalized shadow columns next to it.
+
+    Every column gets a lowercase-trimmed TEXT shadow (used for string, enum and
+    boolean filters); number columns also get a REAL shadow and date columns an
+    ISO-8601 TEXT shadow, so filters compare plain indexed values instead of
+    casting every row. Returns the per-column facets computed on the way.
+    """
+    quoted_cols = ", ".join(_quote_ident(c) for c in col_names)
+    rows = conn.execute(f"SELECT rowid, {quoted_cols} FROM {_quote_ident(FAST_TABLE_NAME)}").fetchall()
+    rowids = [r[0] for r in rows]
+
+    facets: Dict[str, Dict[str, Any]] = {}
+    shadow_defs: list[tuple[str, str]] = []
+    shadow_values: list[list[Any]] = []
+    for pos, col in enumerate(col_names, start=1):
+        raw_values = [r[pos] for r in rows]
+        norm_values = [_norm_text(v) for v in raw_values]
+        ctype = _infer_fast_column_type(norm_values)
+        numbers = [_parse_number(v) if v else None for v in norm_values] if ctype == "number" else None
+        facets[col] = _column_facets(raw_values, ctype, numbers)
+
+        shadow_defs.append((_shadow_col(col, "norm"), "TEXT"))
+        shadow_values.append(norm_values)
+        if ctype == "number":
+            shadow_defs.append((_shadow_col(col, "num"), "REAL"))
+            shadow_values.append(numbers)
+        elif ctype == "date":
+            shadow_defs.append((_shadow_col(col, "date"), "TEXT"))
+            shadow_values.append(_iso_dates(norm_values))
+
+    for name, sql_type in shadow_defs:
+        conn.execute(f"ALTER TABLE {_quote_ident(FAST_TABLE_NAME)} ADD COLUMN {_quote_ident(name)} {sql_type}")
+
+    if rows:
+        set_sql = ", ".join(f"{_quote_ident(name)} = ?" for name, _ in shadow_defs)
+        conn.executemany(
+            f"UPDATE {_quote_ident(FAST_TABLE_NAME)} SET {set_sql} WHERE rowid = ?",
+            [(*row_values, rid) for *row_values, rid in zip(*shadow_values, rowids)],
+        )
+
+    # Index the typed shadows of numeric/date columns and the text shadow of
+    # frequently filtered or low-cardinality columns.
+    to_index: list[str] = []
+    for col, col_facets in facets.items():
+        ctype = col_facets["type"]
+        if ctype == "number":
+            to_index.append(_shadow_col(col, "num"))
+        elif ctype == "date":
+            to_index.append(_shadow_col(col, "date"))
+        if ctype in ("enum", "boolean") or col in index_cols:
+            to_index.append(_shadow_col(col, "norm"))
+    for shadow in to_index:
+        idx = "idx_inventory_fast_" + "".join(ch.lower() if ch.isalnum() else "_" for ch in shadow).strip("_")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {_quote_ident(idx)} ON {_quote_ident(FAST_TABLE_NAME)}({_quote_ident(shadow)})")
+
+    return facets
+
+
+def _fast_table_exists() -> bool:
+    try:
+        with connection(DB_PATH) as conn:
+            row = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FAST_TABLE_NAME,)
+            ).fetchone()
+            return row is not None
+    except sqlite3.Error:
+        return False
+
+
+def _usable_shared_fast_table(now: float) -> cache_coordination.CacheState | None:
+    """The inventory_fast build of another worker, if it is recent and matches the current inventory."""
+    shared = cache_coordination.state(cache_coordination.INVENTORY_FAST)
+    if shared is None or not shared.generation or not isinstance(shared.meta, dict):
+        return None
+    if now - (shared.built_at or 0.0) >= _FAST_TABLE_REFRESH_SECONDS:
+        return None
+    if shared.meta.get("inventory_generation") != cache_coordination.generation(cache_coordination.INVENTORY):
+        return None
+    if not _fast_table_exists():
+        return None
+    return shared
+
+
+def _install_fast_table_state(facets: Dict[str, Dict[str, Any]], generation: int, built_at: float) -> None:
+    """Use the facets of inventory_fast generation `generation` (built here or by another worker)."""
+    global _FAST_TABLE_LAST_REFRESH, _FAST_TABLE_COLUMN_TYPES, _FAST_TABLE_FACETS, _FAST_TABLE_VERSION
+    global _FAST_TABLE_GENERATION
+    _get_fast_table_columns_cached.cache_clear()
+    _FAST_TABLE_FACETS = facets
+    _FAST_TABLE_COLUMN_TYPES = {col: f["type"] for col, f in facets.items()}
+    if not generation or generation != _FAST_TABLE_GENERATION:
+        _FAST_TABLE_VERSION += 1
+        with _FILTERED_TOTALS_LOCK:
+            _FILTERED_TOTALS.clear()
+    _FAST_TABLE_GENERATION = generation
+    _FAST_TABLE_WATCH.sync(generation)
+    _FAST_TABLE_LAST_REFRESH = built_at
+
+
 def _ensure_fast_table(refreshed_recently_ok: bool = True) -> None:
+    """
+    Rebuild inventory_fast when it is older than _FAST_TABLE_REFRESH_SECONDS
+    (always when refreshed_recently_ok is False).
+
+    Workers share the table: the one holding the INVENTORY_FAST rebuild lease
+    rebuilds it and publishes the facets; the others wait for it and adopt
+    that build instead of dropping and recreating the table themselves.
+    """
     global _FAST_TABLE_LAST_REFRESH
     now = time.time()
-    if refreshed_recently_ok and (now - _FAST_TABLE_LAST_REFRESH) < _FAST_TABLE_REFRESH_SECONDS:
+    if (
+        refreshed_recently_ok
+        and (now - _FAST_TABLE_LAST_REFRESH) < _FAST_TABLE_REFRESH_SECONDS
+        and not _FAST_TABLE_WATCH.changed()
+    ):
         return
 
     with _FAST_TABLE_LOCK:
         now = time.time()
-        if refreshed_recently_ok and (now - _FAST_TABLE_LAST_REFRESH) < _FAST_TABLE_REFRESH_SECONDS:
+        if (
+            refreshed_recently_ok
+            and (now - _FAST_TABLE_LAST_REFRESH) < _FAST_TABLE_REFRESH_SECONDS
+            and not _FAST_TABLE_WATCH.changed()
+        ):
             return
 
         if not DB_PATH.exists():
             _FAST_TABLE_LAST_REFRESH = now
             return
 
-        _ensure_sqlite_indexes()
-        db_columns_tuple = _get_inventory_db_columns()
-        if not db_columns_tuple:
-            _FAST_TABLE_LAST_REFRESH = now
-            return
+        if refreshed_recently_ok:
+            shared = _usable_shared_fast_table(now)
+            if shared is not None:
+                _install_fast_table_state(shared.meta["facets"], shared.generation, shared.built_at)
+                return
 
-        sku_key = "SKU (Old)" if "SKU (Old)" in db_columns_tuple else ("SKU" if "SKU" in db_columns_tuple else None)
-        quoted_inv_cols = ", ".join(_quote_ident(c) for c in db_columns_tuple)
+        with cache_coordination.rebuild_lease(cache_coordination.INVENTORY_FAST) as acquired:
+            if not acquired:
+                # Another worker rebuilt it while we waited
+                shared = cache_coordination.state(cache_coordination.INVENTORY_FAST)
+                if shared is not None and isinstance(shared.meta, dict) and _fast_table_exists():
+                    _install_fast_table_state(shared.meta["facets"], shared.generation, shared.built_at)
+                    return
+            _rebuild_fast_table(now)
 
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        try:
-            conn.execute(f"DROP TABLE IF EXISTS {_quote_ident(FAST_TABLE_NAME)}")
-
-            existing_cols = set(db_columns_tuple)
-            existing_cols_lower = {c.lower() for c in existing_cols}
-            json_source_col = _find_json_like_column(db_columns_tuple)
-
-            # Build create columns with case-insensitive de-duplication.
-            create_col_names: list[str] = []
-            seen_lower: set[str] = set()
-            for col in db_columns_tuple:
-                col_name = str(col)
-                lower = col_name.lower()
-                if lower in seen_lower:
-                    continue
-                create_col_names.append(col_name)
-                seen_lower.add(lower)
-
-            # Always expose canonical "Json" for frontend consistency.
-            if "json" not in seen_lower:
-                create_col_names.append("Json")
-                seen_lower.add("json")
-
-            if "folder images" not in seen_lower:
-                create_col_names.append("Folder Images")
-                seen_lower.add("folder images")
-
-            if "ebay listing" not in seen_lower:
-                create_col_names.append("Ebay Listing")
-                seen_lower.add("ebay listing")
-
-            create_cols = []
-            for c in create_col_names:
-                c_lower = c.lower()
-                if c_lower == "folder images":
-                    create_cols.append(f"{_quote_ident(c)} INTEGER")
-                else:
-                    create_cols.append(f"{_quote_ident(c)} TEXT")
-            conn.execute(f"CREATE TABLE {_quote_ident(FAST_TABLE_NAME)} ({', '.join(create_cols)})")
 
+def _rebuild_fast_table(now: float) -> None:
+    global _FAST_TABLE_LAST_REFRESH
+    _ensure_sqlite_indexes()
+    db_columns_tuple = _get_inventory_db_columns()
+    if not db_columns_tuple:
+        _FAST_TABLE_LAST_REFRESH = now
+        return
+
+    inventory_generation = cache_coordination.generation(cache_coordination.INVENTORY)
+
+    sku_key = "SKU (Old)" if "SKU (Old)" in db_columns_tuple else ("SKU" if "SKU" in db_columns_tuple else None)
+    quoted_inv_cols = ", ".join(_quote_ident(c) for c in db_columns_tuple)
+
+    with connection(DB_PATH, row_factory=sqlite3.Row) as conn:
+        # One write transaction for the whole rebuild: with WAL, readers keep
+        # seeing the previous inventory_fast until the commit below.
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(f"DROP TABLE IF EXISTS {_quote_ident(FAST_TABLE_NAME)}")
+
+        existing_cols = set(db_columns_tuple)
+        existing_cols_lower = {c.lower() for c in existing_cols}
+        json_source_col = _find_json_like_column(db_columns_tuple)
+
+        # Build create columns with case-insensitive de-duplication.
+        create_col_names: list[str] = []
+        seen_lower: set[str] = set()
+        for col in db_columns_tuple:
+            col_name = str(col)
+            lower = col_name.lower()
+            if lower in seen_lower:
+                continue
+            create_col_names.append(col_name)
+            seen_lower.add(lower)
+
+        # Always expose canonical "Json" for frontend consistency.
+        if "json" not in seen_lower:
+            create_col_names.append("Json")
+            seen_lower.add("json")
+
+        if "folder images" not in seen_lower:
+            create_col_names.append("Folder Images")
+            seen_lower.add("folder images")
+
+        if "ebay listing" not in seen_lower:
+            create_col_names.append("Ebay Listing")
+            seen_lower.add("ebay listing")
+
+        create_cols = []
+        for c in create_col_names:
+            c_lower = c.lower()
+            if c_lower == "folder images":
+                create_cols.append(f"{_quote_ident(c)} INTEGER")
+            else:
+                create_cols.append(f"{_quote_ident(c)} TEXT")
+        conn.execute(f"CREATE TABLE {_quote_ident(FAST_TABLE_NAME)} ({', '.join(create_cols)})")
+
+        conn.execute(
+            f"INSERT INTO {_quote_ident(FAST_TABLE_NAME)} ({quoted_inv_cols}) "
+            f"SELECT {quoted_inv_cols} FROM inventory"
+        )
+
+        # If source JSON column exists but canonical Json differs by casing/name, copy it.
+        if json_source_col and json_source_col != "Json":
             conn.execute(
-                f"INSERT INTO {_quote_ident(FAST_TABLE_NAME)} ({quoted_inv_cols}) "
-                f"SELECT {quoted_inv_cols} FROM inventory"
+                f"UPDATE {_quote_ident(FAST_TABLE_NAME)} "
+                f"SET {_quote_ident('Json')} = {_quote_ident(json_source_col)}"
             )
 
-            # If source JSON column exists but canonical Json differs by casing/name, copy it.
-            if json_source_col and json_source_col != "Json":
-                conn.execute(
-                    f"UPDATE {_quote_ident(FAST_TABLE_NAME)} "
-                    f"SET {_quote_ident('Json')} = {_quote_ident(json_source_col)}"
-                )
-
-            folder_cache = read_folder_images_cache() or {}
-            folder_counts = folder_cache.get("counts", {}) or {}
-            json_set = _get_json_file_set()
-            ebay_listed_skus = _get_ebay_listed_skus_set()
-
-            if sku_key:
-                rows = conn.execute(
-                    f"SELECT rowid AS rid, {_quote_ident(sku_key)} AS sku FROM {_quote_ident(FAST_TABLE_NAME)}"
-                ).fetchall()
-                updates = []
-                for r in rows:
-                    sku = str(r["sku"] or "").strip()
-                    has_json = "TRUE" if sku and sku in json_set else "FALSE"
-                    folder_count = folder_counts.get(sku)
-                    ebay_listing = "TRUE" if sku and sku in ebay_listed_skus else "FALSE"
-                    updates.append((has_json, folder_count, ebay_listing, int(r["rid"])))
-
-                conn.executemany(
-                    f"UPDATE {_quote_ident(FAST_TABLE_NAME)} "
-                    f"SET {_quote_ident('Json')} = ?, {_quote_ident('Folder Images')} = ?, {_quote_ident('Ebay Listing')} = ? "
-                    f"WHERE rowid = ?",
-                    updates,
-                )
-
-            fast_idx_cols = [c for c in [sku_key, "Lager", "Status", "Category", "Brand", "Ebay Listing", "Json", "Folder Images"] if c]
-            for col in fast_idx_cols:
-                if col in set(db_columns_tuple) or col in {"Json", "Folder Images", "Ebay Listing"}:
-                    idx = "idx_inventory_fast_" + "".join(ch.lower() if ch.isalnum() else "_" for ch in col).strip("_")
-                    conn.execute(f"CREATE INDEX IF NOT EXISTS {_quote_ident(idx)} ON {_quote_ident(FAST_TABLE_NAME)}({_quote_ident(col)})")
-
-            conn.commit()
-        finally:
-            conn.close()
-
-        _get_fast_table_columns_cached.cache_clear()
-        _FAST_TABLE_LAST_REFRESH = now
+        folder_cache = read_folder_images_cache() or {}
+        folder_counts = folder_cache.get("counts", {}) or {}
+        json_set = _get_json_file_set()
+        ebay_listed_skus = _get_ebay_listed_skus_set()
+
+        if sku_key:
+            rows = conn.execute(
+                f"SELECT rowid AS rid, {_quote_ident(sku_key)} AS sku FROM {_quote_ident(FAST_TABLE_NAME)}"
+            ).fetchall()
+            updates = []
+            for r in rows:
+                sku = str(r["sku"] or "").strip()
+                has_json = "TRUE" if sku and sku in json_set else "FALSE"
+                folder_count = folder_counts.get(sku)
+                ebay_listing = "TRUE" if sku and sku in ebay_listed_skus else "FALSE"
+                updates.append((has_json, folder_count, ebay_listing, int(r["rid"])))
+
+            conn.executemany(
+                f"UPDATE {_quote_ident(FAST_TABLE_NAME)} "
+                f"SET {_quote_ident('Json')} = ?, {_quote_ident('Folder Images')} = ?, {_quote_ident('Ebay Listing')} = ? "
+                f"WHERE rowid = ?",
+                updates,
+            )
+
+        fast_idx_cols = [c for c in [sku_key, "Lager", "Status", "Category", "Brand", "Ebay Listing", "Json", "Folder Images"] if c]
+        for col in fast_idx_cols:
+            if col in set(db_columns_tuple) or col in {"Json", "Folder Images", "Ebay Listing"}:
+                idx = "idx_inventory_fast_" + "".join(ch.lower() if ch.isalnum() else "_" for ch in col).strip("_")
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {_quote_ident(idx)} ON {_quote_ident(FAST_TABLE_NAME)}({_quote_ident(col)})")
+
+        facets = _add_typed_shadow_columns(conn, create_col_names, fast_idx_cols)
+
+        conn.commit()
+
+    generation = cache_coordination.bump(
+        cache_coordination.INVENTORY_FAST,
+        meta={"facets": facets, "inventory_generation": inventory_generation},
+    )
+    _install_fast_table_state(facets, generation, now)
 
 
 def _json_column_counts_from_fast_table() -> Dict[str, int]:
     if not DB_PATH.exists():
         return {"json_true": 0, "json_false": 0, "json_empty": 0, "total": 0}
 
-    conn = sqlite3.connect(DB_PATH)
     try:
-        cols = [str(r[1]) for r in conn.execute(f"PRAGMA table_info({_quote_ident(FAST_TABLE_NAME)})").fetchall()]
-        json_col = _find_json_like_column(cols)
-        if not json_col:
-            return {"json_true": 0, "json_false": 0, "json_empty": 0, "total": 0}
-
-        row = conn.execute(
-            f"""
-            SELECT
-                SUM(CASE WHEN LOWER(TRIM(COALESCE(CAST({_quote_ident(json_col)} AS TEXT), ''))) IN ('true','1','yes') THEN 1 ELSE 0 END) AS json_true,
-                SUM(CASE WHEN LOWER(TRIM(COALESCE(CAST({_quote_ident(json_col)} AS TEXT), ''))) IN ('false','0','no') THEN 1 ELSE 0 END) AS json_false,
-                SUM(CASE WHEN TRIM(COALESCE(CAST({_quote_ident(json_col)} AS TEXT), '')) = '' THEN 1 ELSE 0 END) AS json_empty,
-                COUNT(*) AS total
-            FROM {_quote_ident(FAST_TABLE_NAME)}
-            """
-        ).fetchone()
-        if not row:
-            return {"json_true": 0, "json_false": 0, "json_empty": 0, "total": 0}
-        return {
-            "json_true": int(row[0] or 0),
-            "json_false": int(row[1] or 0),
-            "json_empty": int(row[2] or 0),
-            "total": int(row[3] or 0),
-        }
+        with connection(DB_PATH) as conn:
+            cols = [str(r[1]) for r in conn.execute(f"PRAGMA table_info({_quote_ident(FAST_TABLE_NAME)})").fetchall()]
+            json_col = _find_json_like_column(cols)
+            if not json_col:
+                return {"json_true": 0, "json_false": 0, "json_empty": 0, "total": 0}
+
+            row = conn.execute(
+                f"""
+                SELECT
+                    SUM(CASE WHEN LOWER(TRIM(COALESCE(CAST({_quote_ident(json_col)} AS TEXT), ''))) IN ('true','1','yes') THEN 1 ELSE 0 END) AS json_true,
+                    SUM(CASE WHEN LOWER(TRIM(COALESCE(CAST({_quote_ident(json_col)} AS TEXT), ''))) IN ('false','0','no') THEN 1 ELSE 0 END) AS json_false,
+                    SUM(CASE WHEN TRIM(COALESCE(CAST({_quote_ident(json_col)} AS TEXT), '')) = '' THEN 1 ELSE 0 END) AS json_empty,
+                    COUNT(*) AS total
+                FROM {_quote_ident(FAST_TABLE_NAME)}
+                """
+            ).fetchone()
+            if not row:
+                return {"json_true": 0, "json_false": 0, "json_empty": 0, "total": 0}
+            return {
+                "json_true": int(row[0] or 0),
+                "json_false": int(row[1] or 0),
+                "json_empty": int(row[2] or 0),
+                "total": int(row[3] or 0),
+            }
     except Exception:
         return {"json_true": 0, "json_false": 0, "json_empty": 0, "total": 0}
-    finally:
-        conn.close()
 
 
 def get_json_column_status() -> Dict[str, Any]:
@@ -337,16 +573,19 @@ def compute_json_column_for_all_skus() -> Dict[str, Any]:
 @lru_cache(maxsize=1)
 def _get_fast_table_columns_cached(cache_key: int = 0) -> tuple[str, ...]:
     try:
-        conn = sqlite3.connect(DB_PATH)
-        try:
+        with connection(DB_PATH) as conn:
             rows = conn.execute(f"PRAGMA table_info({_quote_ident(FAST_TABLE_NAME)})").fetchall()
-            return tuple(str(r[1]) for r in rows)
-        finally:
-            conn.close()
+            return tuple(str(r[1]) for r in rows if not str(r[1]).startswith(_SHADOW_PREFIX))
     except Exception:
         return tuple()
 
 
+def _get_fast_table_column_types() -> Dict[str, str]:
+    """Column types inferred at the last inventory_fast build (empty if unknown)."""
+    _ensure_fast_table(refreshed_recently_ok=True)
+    return _FAST_TABLE_COLUMN_TYPES
+
+
 def _get_fast_table_columns() -> tuple[str, ...]:
     _ensure_fast_table(refreshed_recently_ok=True)
     cols = _get_fast_table_columns_cached(0)
@@ -358,10 +597,20 @@ def _get_fast_table_columns() -> tuple[str, ...]:
     return _get_fast_table_columns_cached(0)
 
 
-def _build_sql_where(filters: List[Dict[str, Any]] | None, db_columns: set[str]) -> tuple[str, list[Any]] | None:
+def _date_bound(value: Any) -> pd.Timestamp | None:
+    ts = pd.to_datetime(value, errors="coerce")
+    return None if pd.isna(ts) else ts
+
+
+def _build_sql_where(
+    filters: List[Dict[str, Any]] | None,
+    db_columns: set[str],
+    column_types: Dict[str, str] | None = None,
+) -> tuple[str, list[Any]] | None:
     if not filters:
         return "", []
 
+    column_types = column_types or {}
     clauses: list[str] = []
     params: list[Any] = []
 
@@ -372,14 +621,24 @@ def _build_sql_where(filters: List[Dict[str, Any]] | None, db_columns: set[str])
 
         ftype = (f.get("type") or "string").lower()
         op = (f.get("operator") or "contains").lower()
-        col_text = f"LOWER(TRIM(COALESCE(CAST({_quote_ident(col)} AS TEXT), '')))"
+        col_type = column_types.get(col)
+        if col_type:
+            col_text = _quote_ident(_shadow_col(col, "norm"))
+        else:
+            col_text = f"LOWER(TRIM(COALESCE(CAST({_quote_ident(col)} AS TEXT), '')))"
 
         if op == "is_empty":
-            clauses.append(f"TRIM(COALESCE(CAST({_quote_ident(col)} AS TEXT), '')) = ''")
+            if col_type:
+                clauses.append(f"{col_text} = ''")
+            else:
+                clauses.append(f"TRIM(COALESCE(CAST({_quote_ident(col)} AS TEXT), '')) = ''")
             continue
 
         if ftype == "number":
-            col_num = f"CAST({_quote_ident(col)} AS REAL)"
+            if col_type == "number":
+                col_num = _quote_ident(_shadow_col(col, "num"))
+            else:
+                col_num = f"CAST({_quote_ident(col)} AS REAL)"
             v = f.get("value")
             v2 = f.get("value2")
             if op == "equals" and v is not None:
@@ -402,6 +661,35 @@ def _build_sql_where(filters: List[Dict[str, Any]] | None, db_columns: set[str])
                 params.extend([float(v), float(v2)])
             continue
 
+        if ftype == "date":
+            # Only columns inferred as dates have a comparable ISO shadow column
+            if col_type != "date":
+                return None
+            col_date = _quote_ident(_shadow_col(col, "date"))
+            dv = _date_bound(f.get("value"))
+            dv2 = _date_bound(f.get("value2"))
+            iso = "%Y-%m-%dT%H:%M:%S"
+            if op == "equals" and dv is not None:
+                day = dv.normalize()
+                clauses.append(f"{col_date} >= ? AND {col_date} < ?")
+                params.extend([day.strftime(iso), (day + pd.Timedelta(days=1)).strftime(iso)])
+            elif op == "lt" and dv is not None:
+                clauses.append(f"{col_date} < ?")
+                params.append(dv.strftime(iso))
+            elif op == "lte" and dv is not None:
+                clauses.append(f"{col_date} <= ?")
+                params.append(dv.strftime(iso))
+            elif op == "gt" and dv is not None:
+                clauses.append(f"{col_date} > ?")
+                params.append(dv.strftime(iso))
+            elif op == "gte" and dv is not None:
+                clauses.append(f"{col_date} >= ?")
+                params.append(dv.strftime(iso))
+            elif op == "between" and dv is not None and dv2 is not None:
+                clauses.append(f"{col_date} BETWEEN ? AND ?")
+                params.extend([dv.strftime(iso), dv2.strftime(iso)])
+            continue
+
         if ftype == "boolean":
             if op == "is_true":
                 clauses.append(f"{col_text} IN ('true', '1', 'yes')")
@@ -431,8 +719,13 @@ def _build_sql_where(filters: List[Dict[str, Any]] | None, db_columns: set[str])
             clauses.append(f"{col_text} = ?")
             params.append(v)
         elif op == "starts_with":
-            clauses.append(f"{col_text} LIKE ?")
-            params.append(f"{v}%")
+            if col_type:
+                # Range scan on the normalized shadow (index-friendly, no LIKE wildcards)
+                clauses.append(f"{col_text} >= ? AND {col_text} < ?")
+                params.extend([v, v + "\U0010ffff"])
+            else:
+                clauses.append(f"{col_text} LIKE ?")
+                params.append(f"{v}%")
         elif op == "ends_with":
             clauses.append(f"{col_text} LIKE ?")
             params.append(f"%{v}")
@@ -445,6 +738,83 @@ def _build_sql_where(filters: List[Dict[str, Any]] | None, db_columns: set[str])
     return " WHERE " + " AND ".join(clauses), params
 
 
+def _sort_expression(col: str, column_types: Dict[str, str]) -> str:
+    """ORDER BY expression: typed shadow for numbers/dates, case-insensitive text otherwise."""
+    col_type = column_types.get(col)
+    if col_type == "number":
+        return _quote_ident(_shadow_col(col, "num"))
+    if col_type == "date":
+        return _quote_ident(_shadow_col(col, "date"))
+    if col_type:
+        return _quote_ident(_shadow_col(col, "norm"))
+    return _quote_ident(col)
+
+
+def _filter_signature(where_sql: str, params: list[Any]) -> str:
+    """Stable signature of a normalized WHERE clause and its parameters."""
+    payload = json.dumps([where_sql, params], ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _cached_filtered_total(conn: sqlite3.Connection, where_sql: str, params: list[Any], signature: str) -> int:
+    key = (_FAST_TABLE_VERSION, signature)
+    with _FILTERED_TOTALS_LOCK:
+        total = _FILTERED_TOTALS.get(key)
+        if total is not None:
+            _FILTERED_TOTALS.move_to_end(key)
+            return total
+
+    total = int(conn.execute(f"SELECT COUNT(*) AS c FROM {_quote_ident(FAST_TABLE_NAME)}{where_sql}", params).fetchone()["c"])
+    with _FILTERED_TOTALS_LOCK:
+        _FILTERED_TOTALS[key] = total
+        while len(_FILTERED_TOTALS) > _FILTERED_TOTALS_MAX:
+            _FILTERED_TOTALS.popitem(last=False)
+    return total
+
+
+def _fast_table_build_id() -> int | str:
+    """
+    Identity of the inventory_fast build this worker serves, valid across workers.
+
+    The shared generation when cache coordination works; otherwise the local
+    build counter tied to this process (another worker's cursor never matches).
+    """
+    if _FAST_TABLE_GENERATION:
+        return _FAST_TABLE_GENERATION
+    return f"{os.getpid()}:{_FAST_TABLE_VERSION}"
+
+
+def _encode_cursor(payload: Dict[str, Any]) -> str:
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str | None) -> Dict[str, Any] | None:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except Exception:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _keyset_clause(sort_expr: str, sort_desc: bool, last_value: Any, last_rowid: int) -> tuple[str, list[Any]]:
+    """
+    Rows after (last_value, last_rowid) in `ORDER BY sort_expr <dir> NULLS LAST, rowid <dir>`.
+    """
+    cmp = "<" if sort_desc else ">"
+    if last_value is None:
+        # Already inside the trailing NULL block
+        return f"({sort_expr} IS NULL AND rowid {cmp} ?)", [last_rowid]
+    return (
+        f"(({sort_expr} IS NOT NULL AND ({sort_expr} {cmp} ? OR ({sort_expr} = ? AND rowid {cmp} ?))) "
+        f"OR {sort_expr} IS NULL)",
+        [last_value, last_value, last_rowid],
+    )
+
+
 def _list_skus_sql_fast(
     page: int,
     page_size: int,
@@ -452,6 +822,7 @@ def _list_skus_sql_fast(
     columns: List[str] | None,
     sort_by: str | None,
     sort_dir: str,
+    cursor: str | None = None,
 ) -> Dict[str, Any] | None:
     if not DB_PATH.exists():
         return None
@@ -469,10 +840,9 @@ def _list_skus_sql_fast(
     json_count_cols = {"Json Stock Images", "Json Phone Images", "Json Enhanced Images"}
     if filters and any((f.get("column") in json_count_cols) for f in filters):
         return None
-    if filters and any((f.get("type") == "date") for f in filters):
-        return None
 
-    sql_filter = _build_sql_where(filters, fast_columns)
+    column_types = _get_fast_table_column_types()
+    sql_filter = _build_sql_where(filters, fast_columns, column_types)
     if sql_filter is None:
         return None
     where_sql, params = sql_filter
@@ -506,21 +876,37 @@ def _list_skus_sql_fast(
     if requested_sort_col == "Json" and requested_sort_col not in fast_columns and json_like_fast_col:
         requested_sort_col = json_like_fast_col
     sort_col = requested_sort_col if requested_sort_col in fast_columns else default_sort_col
-    order_sql = f"{_quote_ident(sort_col)} {'DESC' if sort_desc else 'ASC'}"
+    sort_expr = _sort_expression(sort_col, column_types)
+    direction = "DESC" if sort_desc else "ASC"
+    order_sql = f"{sort_expr} {direction} NULLS LAST, rowid {direction}"
     offset = max(0, (page - 1) * page_size)
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    try:
-        total = conn.execute(f"SELECT COUNT(*) AS c FROM {_quote_ident(FAST_TABLE_NAME)}{where_sql}", params).fetchone()["c"]
+    # Keyset pagination: a cursor is only honoured for the same table build,
+    # filter and sort; anything else falls back to OFFSET for the given page.
+    signature = _filter_signature(where_sql, params)
+    cursor_state = {"g": _fast_table_build_id(), "f": signature, "s": sort_col, "d": direction}
+    page_where_sql, page_params = where_sql, list(params)
+    decoded = _decode_cursor(cursor)
+    if decoded and all(decoded.get(k) == v for k, v in cursor_state.items()) and isinstance(decoded.get("r"), int):
+        keyset_sql, keyset_params = _keyset_clause(sort_expr, sort_desc, decoded.get("k"), decoded["r"])
+        page_where_sql = f"{where_sql} AND {keyset_sql}" if where_sql else f" WHERE {keyset_sql}"
+        page_params.extend(keyset_params)
+        offset = 0
+
+    with connection(DB_PATH, row_factory=sqlite3.Row) as conn:
+        total = _cached_filtered_total(conn, where_sql, params, signature)
         rows = conn.execute(
-            f"SELECT {select_sql} FROM {_quote_ident(FAST_TABLE_NAME)}{where_sql} ORDER BY {order_sql} LIMIT ? OFFSET ?",
-            [*params, int(page_size), int(offset)],
+            f"SELECT {select_sql}, rowid AS __rowid, {sort_expr} AS __sort_key "
+            f"FROM {_quote_ident(FAST_TABLE_NAME)}{page_where_sql} ORDER BY {order_sql} LIMIT ? OFFSET ?",
+            [*page_params, int(page_size), int(offset)],
         ).fetchall()
-    finally:
-        conn.close()
 
-    page_df = pd.DataFrame([dict(r) for r in rows])
+    next_cursor = None
+    if len(rows) == int(page_size):
+        last = rows[-1]
+        next_cursor = _encode_cursor({**cursor_state, "k": last["__sort_key"], "r": int(last["__rowid"])})
+
+    page_df = pd.DataFrame([{k: r[k] for k in r.keys() if k not in ("__rowid", "__sort_key")} for r in rows])
     if page_df.empty:
         page_df = pd.DataFrame(columns=selected_cols_for_query)
 
@@ -593,9 +979,34 @@ def _list_skus_sql_fast(
         "total": int(total),
         "items": items,
         "available_columns": available_columns,
+        "next_cursor": next_cursor,
     }
 
 
+def _as_text(series: pd.Series) -> pd.Series:
+    """Values as str, missing as "" (category columns of the inventory snapshot included)."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(object)
+    return series.fillna("").astype(str)
+
+
+def _fallback_columns(
+    filters: List[Dict[str, Any]] | None, columns: List[str] | None, sort_by: str | None
+) -> List[str] | None:
+    """Inventory columns the pandas fallback of list_skus needs (None = all)."""
+    if not columns or not isinstance(columns, list):
+        return None
+    available = set(excel_inventory.columns())
+    if not any(c in available for c in columns):
+        # list_skus returns every column when none of the requested ones exist
+        return None
+    needed = list(columns) + ["SKU (Old)", "SKU"]
+    needed += [f.get("column") for f in filters or [] if f.get("column")]
+    if sort_by:
+        needed.append(str(sort_by).strip())
+    return needed
+
+
 def _get_sku_series(df: pd.DataFrame) -> pd.Series | None:
     if "SKU (Old)" in df.columns:
         return df["SKU (Old)"]
@@ -604,6 +1015,50 @@ def _get_sku_series(df: pd.DataFrame) -> pd.Series | None:
     return None
 
 
+class _VirtualCacheSnapshot:
+    """
+    Folder-image counts and eBay listing SKUs for one list_skus request.
+
+    Each cache file is read at most once per request; values are then joined
+    onto SKU series with Series.map instead of re-reading the cache per row.
+    """
+
+    def __init__(self) -> None:
+        self._folder_counts: Dict[str, Any] | None = None
+        self._listing_index: Dict[str, Any] | None = None
+        self._listing_index_loaded = False
+
+    def folder_image_counts(self, sku_series: pd.Series) -> pd.Series:
+        if self._folder_counts is None:
+            self._folder_counts = (read_folder_images_cache() or {}).get("counts", {}) or {}
+        counts = _as_text(sku_series).map(self._folder_counts)
+        return counts.where(~_blank_sku_mask(sku_series), None)
+
+    def ebay_listing_flags(self, sku_series: pd.Series) -> pd.Series:
+        """True/False per SKU, None for blank SKUs or when there is no listings cache."""
+        if not self._listing_index_loaded:
+            self._listing_index = build_listing_sku_index(read_ebay_listings_cache())
+            self._listing_index_loaded = True
+
+        index = self._listing_index
+        if index is None:
+            return pd.Series([None] * len(sku_series), index=sku_series.index, dtype=object)
+
+        keys = _as_text(sku_series).str.strip()
+        flags = keys.isin(index["exact"])
+        if index["ranges"]:
+            pending = ~flags
+            if pending.any():
+                flags[pending] = keys[pending].map(lambda sku: sku_in_listing_index(index, sku)).astype(bool)
+        flags = flags.astype(object)
+        flags[_blank_sku_mask(sku_series)] = None
+        return flags
+
+
+def _blank_sku_mask(sku_series: pd.Series) -> pd.Series:
+    return sku_series.isna() | (_as_text(sku_series).str.strip() == "")
+
+
 @lru_cache(maxsize=50000)
 def _json_counts_for_sku_cached(sku: str) -> tuple[int | None, int | None, int | None]:
     try:
@@ -630,12 +1085,12 @@ def _json_counts_for_sku_cached(sku: str) -> tuple[int | None, int | None, int |
 def _get_json_file_set() -> set[str]:
     global _JSON_FILE_SET, _JSON_FILE_SET_LOADED_AT
     now = time.time()
-    if _JSON_FILE_SET and (now - _JSON_FILE_SET_LOADED_AT) < _JSON_FILE_SET_TTL_SECONDS:
+    if _JSON_FILE_SET and (now - _JSON_FILE_SET_LOADED_AT) < _JSON_FILE_SET_TTL_SECONDS and not _JSON_FILE_SET_WATCH.changed():
         return _JSON_FILE_SET
 
     with _JSON_FILE_SET_LOCK:
         now = time.time()
-        if _JSON_FILE_SET and (now - _JSON_FILE_SET_LOADED_AT) < _JSON_FILE_SET_TTL_SECONDS:
+        if _JSON_FILE_SET and (now - _JSON_FILE_SET_LOADED_AT) < _JSON_FILE_SET_TTL_SECONDS and not _JSON_FILE_SET_WATCH.changed():
             return _JSON_FILE_SET
 
         products_dir = Path(config.PRODUCTS_FOLDER_PATH)
@@ -644,7 +1099,12 @@ def _get_json_file_set() -> set[str]:
             _JSON_FILE_SET_LOADED_AT = now
             return _JSON_FILE_SET
 
-        _JSON_FILE_SET = {p.stem for p in products_dir.glob("*.json")}
+        if product_doc_store.is_enabled():
+            generation = _JSON_FILE_SET_WATCH.current()
+            _JSON_FILE_SET = product_doc_store.list_skus()
+            _JSON_FILE_SET_WATCH.sync(generation)
+        else:
+            _JSON_FILE_SET = {p.stem for p in products_dir.glob("*.json")}
         _JSON_FILE_SET_LOADED_AT = now
         return _JSON_FILE_SET
 
@@ -675,7 +1135,14 @@ def _add_json_virtual_columns(df: pd.DataFrame, sku_series: pd.Series | None, re
         df["Json"] = sku_series.apply(_json_exists_for_sku)
 
     if need_counts:
-        counts = sku_series.apply(_json_counts_for_sku)
+        if product_doc_store.is_enabled():
+            counts_by_sku = product_doc_store.image_counts()
+            missing = (None, None, None)
+            counts = sku_series.apply(
+                lambda sku: counts_by_sku.get(str(sku).strip(), missing) if sku is not None else missing
+            )
+        else:
+            counts = sku_series.apply(_json_counts_for_sku)
         if "Json Stock Images" in normalized_required:
             df["Json Stock Images"] = counts.apply(lambda x: x[0])
         if "Json Phone Images" in normalized_required:
@@ -720,8 +1187,7 @@ def get_available_columns() -> List[str]:
     _ensure_fast_table(refreshed_recently_ok=True)
     cols = list(_get_fast_table_columns())
     if not cols:
-        df = excel_inventory.load()
-        cols = list(df.columns)
+        cols = excel_inventory.columns()
     # Remove internal/metadata columns that shouldn't be displayed
     excluded = [
         "BGN Price",
@@ -775,8 +1241,7 @@ def _infer_column_type(series: pd.Series) -> str:
     return "string"
 
 
-def get_columns_meta() -> List[Dict[str, Any]]:
-    df = excel_inventory.load()
+def _columns_meta_from_dataframe(df: pd.DataFrame) -> List[Dict[str, Any]]:
     meta: List[Dict[str, Any]] = []
     for col in df.columns:
         s = df[col]
@@ -803,7 +1268,85 @@ def get_columns_meta() -> List[Dict[str, Any]]:
             "operators": operators,
             "enum_values": enum_values,
         })
-    
+    return meta
+
+
+def _get_fast_table_facets() -> Dict[str, Dict[str, Any]]:
+    """Column facets of the last inventory_fast build (empty if unavailable)."""
+    _ensure_fast_table(refreshed_recently_ok=True)
+    return _FAST_TABLE_FACETS
+
+
+def _facet_prefix_index(col_facets: Dict[str, Any]) -> tuple[list[str], list[int]]:
+    """
+    Sorted (key, rank) arrays for prefix lookups over a column's distinct values.
+
+    Keys are the lowercased value and every suffix starting at a word boundary,
+    so "max" finds "Air Max 90". Built lazily on the first lookup per build.
+    """
+    index = col_facets.get("prefix_index")
+    if index is None:
+        entries: list[tuple[str, int]] = []
+        for rank, value in enumerate(col_facets["values"]):
+            lower = value.lower()
+            entries.append((lower, rank))
+            for match in _WORD_BOUNDARY_RE.finditer(lower):
+                if match.end() < len(lower):
+                    entries.append((lower[match.end():], rank))
+        entries.sort()
+        index = ([key for key, _ in entries], [rank for _, rank in entries])
+        col_facets["prefix_index"] = index
+    return index
+
+
+def _facet_values_with_prefix(col_facets: Dict[str, Any], q_norm: str) -> list[str]:
+    """Distinct values matching the prefix, most frequent first."""
+    keys, ranks = _facet_prefix_index(col_facets)
+    matched: set[int] = set()
+    pos = bisect_left(keys, q_norm)
+    while pos < len(keys) and keys[pos].startswith(q_norm):
+        matched.add(ranks[pos])
+        pos += 1
+    values = col_facets["values"]
+    return [values[rank] for rank in sorted(matched)]
+
+
+def _operators_for_type(ctype: str) -> List[str]:
+    if ctype in ("number", "date"):
+        return NUM_DATE_OPS
+    if ctype == "boolean":
+        return BOOL_OPS
+    if ctype == "enum":
+        return ENUM_OPS
+    return STRING_OPS
+
+
+def _columns_meta_from_facets(facets: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    meta: List[Dict[str, Any]] = []
+    for col, col_facets in facets.items():
+        # Virtual columns are appended with fixed types by get_columns_meta
+        if col == "Json" or col in VIRTUAL_CACHE_COLUMNS:
+            continue
+        ctype = col_facets["type"]
+        meta.append({
+            "name": col,
+            "type": ctype,
+            "operators": _operators_for_type(ctype),
+            "enum_values": col_facets["values"][:_FACET_ENUM_VALUES_LIMIT] if ctype == "enum" else None,
+            "distinct_count": col_facets["distinct_count"],
+            "min_value": col_facets["min"],
+            "max_value": col_facets["max"],
+        })
+    return meta
+
+
+def get_columns_meta() -> List[Dict[str, Any]]:
+    facets = _get_fast_table_facets() if DB_PATH.exists() else {}
+    if facets:
+        meta = _columns_meta_from_facets(facets)
+    else:
+        meta = _columns_meta_from_dataframe(excel_inventory.load())
+
     # Add virtual column metadata
     if not any(m["name"] == "Json" for m in meta):
         meta.append({
@@ -840,8 +1383,25 @@ def get_columns_meta() -> List[Dict[str, Any]]:
 
 
 def get_distinct_values(column: str, limit: int = 200, q: str | None = None) -> Dict[str, Any]:
-    """Return distinct non-empty string values for a column with optional substring filter and limit."""
-    _ensure_fast_table(refreshed_recently_ok=True)
+    """
+    Return distinct non-empty string values for a column, most frequent first.
+
+    With inventory_fast available, values come from the build-time facets and
+    `q` is matched as a prefix of the value or of any word in it (prefix
+    index); otherwise `q` is a substring filter.
+    """
+    col_facets = _get_fast_table_facets().get(column) if DB_PATH.exists() else None
+    if col_facets is not None:
+        q_norm = str(q or "").strip().lower()
+        values = _facet_values_with_prefix(col_facets, q_norm) if q_norm else col_facets["values"]
+        total_unique = len(values)
+        return {
+            "column": column,
+            "values": values[:limit],
+            "total_unique": total_unique,
+            "limited": total_unique > limit,
+        }
+
     fast_cols = set(_get_fast_table_columns())
     if column in fast_cols and DB_PATH.exists():
         col_text = f"TRIM(COALESCE(CAST({_quote_ident(column)} AS TEXT), ''))"
@@ -853,8 +1413,7 @@ def get_distinct_values(column: str, limit: int = 200, q: str | None = None) ->
                 where_sql += f" AND INSTR(LOWER({col_text}), ?) > 0"
                 params.append(q_norm)
 
-        conn = sqlite3.connect(DB_PATH)
-        try:
+        with connection(DB_PATH) as conn:
             total_unique = conn.execute(
                 f"SELECT COUNT(*) FROM (SELECT DISTINCT {col_text} AS v FROM {_quote_ident(FAST_TABLE_NAME)} {where_sql})",
                 params,
@@ -864,8 +1423,6 @@ def get_distinct_values(column: str, limit: int = 200, q: str | None = None) ->
                 [*params, int(limit)],
             ).fetchall()
             values = [str(r[0]) for r in rows]
-        finally:
-            conn.close()
 
         return {
             "column": column,
@@ -875,7 +1432,7 @@ def get_distinct_values(column: str, limit: int = 200, q: str | None = None) ->
         }
 
     # Fallback to in-memory path
-    df = excel_inventory.load()
+    df = excel_inventory.load([column])
     if column not in df.columns:
         return {"column": column, "values": [], "total_unique": 0, "limited": False}
     s = df[column].dropna().astype(str)
@@ -904,6 +1461,7 @@ def list_skus(
     columns: List[str] | None = None,
     sort_by: str | None = None,
     sort_dir: str = "asc",
+    cursor: str | None = None,
 ) -> Dict[str, Any]:
     """
     List SKUs with column-level filtering support.
@@ -914,6 +1472,8 @@ def list_skus(
         filters: List of filter dicts with keys: column, value, operator
                  operator can be: contains, equals, starts_with, ends_with
         columns: List of columns to return (if None, returns all columns)
+        cursor: next_cursor of the previous page (keyset pagination); ignored
+                if stale, in which case `page` is used
     """
     sql_fast = _list_skus_sql_fast(
         page=page,
@@ -922,11 +1482,13 @@ def list_skus(
         columns=columns,
         sort_by=sort_by,
         sort_dir=sort_dir,
+        cursor=cursor,
     )
     if sql_fast is not None:
         return sql_fast
 
-    df = excel_inventory.load()
+    df = excel_inventory.load(_fallback_columns(filters, columns, sort_by))
+    virtual_caches = _VirtualCacheSnapshot()
 
     # Separate virtual column filters for later
     virtual_json_filters: List[Dict[str, Any]] = []
@@ -1021,7 +1583,7 @@ def list_skus(
                 continue
 
             # Typed string filters (and legacy fallback)
-            col_norm = df[col].fillna("").astype(str).str.strip().str.lower()
+            col_norm = _as_text(df[col]).str.strip().str.lower()
             
             # Handle is_empty operator
             if operator == "is_empty":
@@ -1071,13 +1633,7 @@ def list_skus(
 
     # Apply Folder Images filter if present (read from cache)
     if folder_images_filter and sku_series is not None:
-        # Read from cache
-        def get_cached_count(sku: str | None) -> int | None:
-            if not sku or str(sku).strip() == "":
-                return None
-            return get_folder_image_count(str(sku))
-        
-        folder_counts = sku_series.apply(get_cached_count)
+        folder_counts = virtual_caches.folder_image_counts(sku_series)
 
         # Apply the filter
         ftype = folder_images_filter.get("type", "number")
@@ -1103,13 +1659,7 @@ def list_skus(
 
     # Apply Ebay Listing filter if present (read from cache)
     if ebay_listing_filter and sku_series is not None:
-        # Read from cache
-        def get_cached_listing(sku: str | None) -> bool | None:
-            if not sku or str(sku).strip() == "":
-                return None
-            return get_sku_has_listing(str(sku))
-        
-        ebay_listing_values = sku_series.apply(get_cached_listing)
+        ebay_listing_values = virtual_caches.ebay_listing_flags(sku_series)
         
         # Apply the filter
         operator = ebay_listing_filter.get("operator", "is_true")
@@ -1141,14 +1691,10 @@ def list_skus(
                 df = _add_json_virtual_columns(df, sku_series, needed)
 
         if effective_sort_by == "Folder Images" and effective_sort_by not in df.columns and sku_series is not None:
-            df["Folder Images"] = sku_series.apply(
-                lambda sku: get_folder_image_count(str(sku)) if sku and str(sku).strip() else None
-            )
+            df["Folder Images"] = virtual_caches.folder_image_counts(sku_series)
 
         if effective_sort_by == "Ebay Listing" and effective_sort_by not in df.columns and sku_series is not None:
-            df["Ebay Listing"] = sku_series.apply(
-                lambda sku: get_sku_has_listing(str(sku)) if sku and str(sku).strip() else None
-            )
+            df["Ebay Listing"] = virtual_caches.ebay_listing_flags(sku_series)
 
         if effective_sort_by in df.columns:
             s = df[effective_sort_by]
@@ -1159,7 +1705,7 @@ def list_skus(
                     df = df.sort_values(by=effective_sort_by, ascending=not sort_desc, na_position="last", kind="mergesort")
                 else:
                     tmp_col = "__sort_tmp_text__"
-                    df[tmp_col] = s.fillna("").astype(str).str.lower()
+                    df[tmp_col] = _as_text(s).str.lower()
                     df = df.sort_values(by=tmp_col, ascending=not sort_desc, na_position="last", kind="mergesort")
                     df = df.drop(columns=[tmp_col])
             except Exception:
@@ -1190,23 +1736,13 @@ def list_skus(
 
     # Compute Folder Images column (virtual) from cache
     if requested_columns is None or "Folder Images" in requested_columns:
-        def get_cached_count(sku: str | None) -> int | None:
-            if not sku or str(sku).strip() == "":
-                return None
-            return get_folder_image_count(str(sku))
-
         if sku_series is not None:
-            page_df["Folder Images"] = sku_series.loc[page_df.index].apply(get_cached_count)
+            page_df["Folder Images"] = virtual_caches.folder_image_counts(sku_series.loc[page_df.index])
 
     # Compute Ebay Listing column (virtual) from cache
     if requested_columns is None or "Ebay Listing" in requested_columns:
-        def get_cached_listing(sku: str | None) -> bool | None:
-            if not sku or str(sku).strip() == "":
-                return None
-            return get_sku_has_listing(str(sku))
-
         if sku_series is not None:
-            page_df["Ebay Listing"] = sku_series.loc[page_df.index].apply(get_cached_listing)
+            page_df["Ebay Listing"] = virtual_caches.ebay_listing_flags(sku_series.loc[page_df.index])
 
     # Replace NaN / +/-Inf with None so JSON serialization is safe
     page_df = page_df.replace([float("inf"), float("-inf")], None)
@@ -1242,3 +1778,37 @@ def list_skus(
         "items": items,
         "available_columns": available_columns,
     }
+
+
+def iter_skus(
+    filters: List[Dict[str, Any]] | None = None,
+    columns: List[str] | None = None,
+    sort_by: str | None = None,
+    sort_dir: str = "asc",
+    batch_size: int = 1000,
+):
+    """
+    Yield every row matching the filters, batch by batch, in list order.
+
+    Uses the same filtering, sorting and virtual columns as list_skus and
+    follows next_cursor between batches, so each batch is a keyset seek on
+    inventory_fast instead of a growing OFFSET.
+    """
+    page = 1
+    cursor = None
+    while True:
+        data = list_skus(
+            page=page,
+            page_size=batch_size,
+            filters=filters,
+            columns=columns,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            cursor=cursor,
+        )
+        items = data.get("items") or []
+        yield from items
+        if len(items) < batch_size or page * batch_size >= int(data.get("total") or 0):
+            return
+        cursor = data.get("next_cursor")
+        page += 1
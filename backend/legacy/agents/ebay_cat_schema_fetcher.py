@@ -15,13 +15,19 @@ from dotenv import load_dotenv
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 import config  # noqa: E402
+import ebay_schema_fetch  # noqa: E402
 
 # Load environment variables from .env in project root
 load_dotenv(ROOT / ".env")
 
+TAXONOMY_BASE_URL = "https://api.ebay.com/commerce/taxonomy/v1"
+
 # Global cache for eBay schemas
 EBAY_SCHEMA_CACHE: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
 
+# ETag of the last aspects response per category (stored in the schema metadata)
+EBAY_SCHEMA_ETAGS: Dict[str, str] = {}
+
 
 def load_category_mapping() -> dict:
     """Load category name to ID mapping from the categories sheet."""
@@ -80,14 +86,19 @@ def fetch_ebay_fees(category_id: str, category_mapping: dict, inventory_df: pd.D
     """
     Fetch fees from the eBay Categories sheet in the inventory file.
     Returns payment fee and sales commission percentage.
+
+    inventory_df: the eBay Categories sheet if already loaded (read from the
+    inventory file otherwise).
     """
 
     try:
         # Load the eBay Categories sheet
-        categories_df = pd.read_excel(
-            config.INVENTORY_FILE_PATH,
-            sheet_name=config.CATEGORY_SHEET_NAME
-        )
+        categories_df = inventory_df
+        if categories_df is None:
+            categories_df = pd.read_excel(
+                config.INVENTORY_FILE_PATH,
+                sheet_name=config.CATEGORY_SHEET_NAME
+            )
 
         # Find the row with matching category ID
         cat_row = categories_df[categories_df[config.CATEGORY_ID_COLUMN] == int(category_id)]
@@ -145,31 +156,18 @@ def fetch_ebay_aspects(category_id: str) -> Dict[str, List[Dict[str, Any]]]:
         return {"required": [], "optional": []}
 
     try:
-        base_url = "https://api.ebay.com/commerce/taxonomy/v1"
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Accept": "application/json",
-        }
-
-        # Step A: Get the categoryTreeId for the marketplace
-        tree_id_url = f"{base_url}/get_default_category_tree_id"
-        tree_id_params = {"marketplace_id": config.MARKETPLACE_DE_ID}
-
-        resp_tree = requests.get(tree_id_url, headers=headers, params=tree_id_params, timeout=30)
-        resp_tree.raise_for_status()
-        tree_id = resp_tree.json().get("categoryTreeId")
-
-        if not tree_id:
-            print(f"  ERROR: Could not find categoryTreeId for marketplace {config.MARKETPLACE_DE_ID}")
+        # Step A: Get the categoryTreeId for the marketplace (fetched once per run)
+        try:
+            tree_id = ebay_schema_fetch.fetch_category_tree_id(TAXONOMY_BASE_URL, access_token, config.MARKETPLACE_DE_ID)
+        except ValueError as e:
+            print(f"  ERROR: {e}")
             return {"required": [], "optional": []}
 
-        # Step B: Get the aspects (specifics) for the category ID
-        aspects_url = f"{base_url}/category_tree/{tree_id}/get_item_aspects_for_category"
-        aspects_params = {"category_id": category_id}
-
-        response = requests.get(aspects_url, headers=headers, params=aspects_params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+        # Step B: Get the aspects (specifics) for the category ID (shared keep-alive session)
+        fetched = ebay_schema_fetch.fetch_aspects(TAXONOMY_BASE_URL, tree_id, str(category_id), access_token)
+        data = fetched.data
+        if fetched.etag:
+            EBAY_SCHEMA_ETAGS[str(category_id)] = fetched.etag
 
         # Step C: Parse the Response
         required_fields: List[Dict[str, Any]] = []
@@ -246,6 +244,10 @@ def save_schema(category_id: str, schema_data: Dict[str, Any], category_name: st
         },
         "schema": schema_data,
     }
+    # Lets the backend's schema refresh ask for a 304 next time
+    etag = EBAY_SCHEMA_ETAGS.get(str(category_id))
+    if etag:
+        payload["_metadata"]["etag"] = etag
 
     with schema_path.open("w", encoding="utf-8") as f:
         json.dump(payload, f, ensure_ascii=False, indent=2)
@@ -260,15 +262,25 @@ def main() -> None:
     category_ids = map_categories_to_ids(category_mapping, unique_categories)
 
     print(f"\nProcessing {len(category_ids)} unique categories for eBay schemas:")
+    missing = []
     for category, cat_id in sorted(category_ids.items()):
-        print(f"\nCategory: {category} (ID: {cat_id})")
-
         if schema_file_exists(cat_id):
-            print(f"  Schema already exists; skipped")
+            print(f"\nCategory: {category} (ID: {cat_id})\n  Schema already exists; skipped")
+        else:
+            missing.append((category, cat_id))
+    if not missing:
+        return
+
+    categories_df = pd.read_excel(config.INVENTORY_FILE_PATH, sheet_name=config.CATEGORY_SHEET_NAME)
+
+    # Aspects are fetched concurrently; results are printed and saved as they arrive
+    for (category, cat_id), schema, error in ebay_schema_fetch.run(missing, lambda item: fetch_ebay_aspects(item[1])):
+        print(f"\nCategory: {category} (ID: {cat_id})")
+        if error is not None:
+            print(f"  Unexpected error: {error}")
             continue
 
-        schema = fetch_ebay_aspects(cat_id)
-        fees = fetch_ebay_fees(str(cat_id), category_mapping, None)
+        fees = fetch_ebay_fees(str(cat_id), category_mapping, categories_df)
 
         if schema["required"] or schema["optional"]:
             save_schema(cat_id, schema, category_name=category, fees_data=fees)
@@ -24,6 +24,7 @@ from dotenv import load_dotenv
 from openai import OpenAI
 
 import config
+import product_files
 
 
 # ---------------------------------------------------------
@@ -121,10 +122,7 @@ else:
 # ---------------------------------------------------------
 
 def _atomic_dump(path: Path, payload: dict) -> None:
-	tmp = path.with_suffix(".tmp.json")
-	with tmp.open("w", encoding="utf-8") as f:
-		json.dump(payload, f, ensure_ascii=False, indent=2)
-	tmp.replace(path)
+	product_files.write_json(path, payload)
 
 
 def _image_to_data_uri(image_path: Path) -> str:
@@ -13,6 +13,7 @@ import os
 from dotenv import load_dotenv
 import re
 import config
+import product_files
 from openai import OpenAI
 
 # Load environment variables from project root
@@ -315,6 +316,7 @@ def upload_pictures_for_listing(
     sorted_images = sorted(ebay_images, key=lambda x: x.get('order', 999))
     
     urls: List[str] = []
+    uploaded_urls: Dict[str, str] = {}
     updated = False
     
     for img_data in sorted_images[:max_images]:
@@ -343,6 +345,7 @@ def upload_pictures_for_listing(
             for item in ebay_images_section:
                 if item.get('filename') == filename:
                     item['eBay URL'] = url
+                    uploaded_urls[filename] = url
                     updated = True
                     break
             
@@ -350,11 +353,16 @@ def upload_pictures_for_listing(
             print(f"  ✗ Failed to upload {filename}: {e}")
             continue
     
-    # Save updated JSON with eBay URLs
+    # Save eBay URLs into the latest JSON (the file may have changed during the uploads)
     if updated:
+        def _store_urls(latest: Dict[str, Any]) -> None:
+            latest_images = latest.setdefault(sku, {}).setdefault("Images", {}).setdefault("eBay Images", [])
+            for item in latest_images:
+                if isinstance(item, dict) and item.get('filename') in uploaded_urls:
+                    item['eBay URL'] = uploaded_urls[item['filename']]
+
         try:
-            with json_path.open("w", encoding="utf-8") as f:
-                json.dump(product_data, f, ensure_ascii=False, indent=2)
+            product_files.update_json(json_path, _store_urls, default={})
             print(f"  💾 Saved eBay URLs to JSON")
         except Exception as e:
             print(f"  ⚠️  Failed to save eBay URLs: {e}")
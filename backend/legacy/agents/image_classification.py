@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Set
 
 import config
+import product_files
 from data_manager import load_all_products
 
 
@@ -76,29 +77,29 @@ def classify_images_core(image_paths: List[str], classification_type: str) -> Tu
 
     for sku, images in sku_images.items():
         try:
-            product_detail = load_product_detail(sku) or {}
-            images_section = product_detail.get("Images", {})
-            if not isinstance(images_section, dict):
-                images_section = {}
-
-            stock = list(images_section.get("stock", []) or [])
-            phone = list(images_section.get("phone", []) or [])
-            enhanced = list(images_section.get("enhanced", []) or [])
-
-            for img_path in images:
-                record = {"filename": img_path.name}
-                if classification_type == "phone":
-                    phone.append(record)
-                elif classification_type == "stock":
-                    stock.append(record)
-                elif classification_type == "enhanced":
-                    enhanced.append(record)
-
-            product_detail["Images"] = build_images_summary(stock, phone, enhanced)
-            product_path = config.PRODUCTS_FOLDER_PATH / f"{sku}.json"
-            product_path.parent.mkdir(parents=True, exist_ok=True)
-            with product_path.open("w", encoding="utf-8") as f:
-                json.dump({sku: product_detail}, f, ensure_ascii=False, indent=2)
+            with product_files.lock(product_files.product_path(sku)):
+                product_detail = load_product_detail(sku) or {}
+                images_section = product_detail.get("Images", {})
+                if not isinstance(images_section, dict):
+                    images_section = {}
+
+                stock = list(images_section.get("stock", []) or [])
+                phone = list(images_section.get("phone", []) or [])
+                enhanced = list(images_section.get("enhanced", []) or [])
+
+                for img_path in images:
+                    record = {"filename": img_path.name}
+                    if classification_type == "phone":
+                        phone.append(record)
+                    elif classification_type == "stock":
+                        stock.append(record)
+                    elif classification_type == "enhanced":
+                        enhanced.append(record)
+
+                product_detail["Images"] = build_images_summary(stock, phone, enhanced)
+                product_path = config.PRODUCTS_FOLDER_PATH / f"{sku}.json"
+                product_path.parent.mkdir(parents=True, exist_ok=True)
+                product_files.write_json(product_path, {sku: product_detail})
 
             updated_skus.append(sku)
             processed += len(images)
@@ -120,26 +121,26 @@ def remove_image_refs_from_json(filenames: List[str]) -> Tuple[int, int, List[st
 
     for sku in skus:
         try:
-            product_detail = load_product_detail(sku)
-            images_section = product_detail.get("Images", {}) or {}
-            stock = list(images_section.get("stock", []) or [])
-            phone = list(images_section.get("phone", []) or [])
-            enhanced = list(images_section.get("enhanced", []) or [])
-
-            before = len(stock) + len(phone) + len(enhanced)
-            stock = [r for r in stock if r.get("filename") not in filenames and r.get("file") not in filenames]
-            phone = [r for r in phone if r.get("filename") not in filenames and r.get("file") not in filenames]
-            enhanced = [r for r in enhanced if r.get("filename") not in filenames and r.get("file") not in filenames]
-            after = len(stock) + len(phone) + len(enhanced)
-
-            if before != after:
-                product_detail["Images"] = build_images_summary(stock, phone, enhanced)
-                product_path = config.PRODUCTS_FOLDER_PATH / f"{sku}.json"
-                product_path.parent.mkdir(parents=True, exist_ok=True)
-                with product_path.open("w", encoding="utf-8") as f:
-                    json.dump({sku: product_detail}, f, ensure_ascii=False, indent=2)
-                updated_skus += 1
-                removed_total += before - after
+            with product_files.lock(product_files.product_path(sku)):
+                product_detail = load_product_detail(sku)
+                images_section = product_detail.get("Images", {}) or {}
+                stock = list(images_section.get("stock", []) or [])
+                phone = list(images_section.get("phone", []) or [])
+                enhanced = list(images_section.get("enhanced", []) or [])
+
+                before = len(stock) + len(phone) + len(enhanced)
+                stock = [r for r in stock if r.get("filename") not in filenames and r.get("file") not in filenames]
+                phone = [r for r in phone if r.get("filename") not in filenames and r.get("file") not in filenames]
+                enhanced = [r for r in enhanced if r.get("filename") not in filenames and r.get("file") not in filenames]
+                after = len(stock) + len(phone) + len(enhanced)
+
+                if before != after:
+                    product_detail["Images"] = build_images_summary(stock, phone, enhanced)
+                    product_path = config.PRODUCTS_FOLDER_PATH / f"{sku}.json"
+                    product_path.parent.mkdir(parents=True, exist_ok=True)
+                    product_files.write_json(product_path, {sku: product_detail})
+                    updated_skus += 1
+                    removed_total += before - after
         except Exception as ex:
             errors.append(f"{sku}: {ex}")
 
@@ -236,12 +237,12 @@ def set_contains_ean_flag(
 
     for sku, filenames in sku_to_filenames.items():
         try:
-            changed, updated_detail = _set_contains_ean_for_sku(sku, filenames, value)
-            if changed and updated_detail is not None:
-                product_path = config.PRODUCTS_FOLDER_PATH / f"{sku}.json"
-                product_path.parent.mkdir(parents=True, exist_ok=True)
-                with product_path.open("w", encoding="utf-8") as f:
-                    json.dump({sku: updated_detail}, f, ensure_ascii=False, indent=2)
+            with product_files.lock(product_files.product_path(sku)):
+                changed, updated_detail = _set_contains_ean_for_sku(sku, filenames, value)
+                if changed and updated_detail is not None:
+                    product_path = config.PRODUCTS_FOLDER_PATH / f"{sku}.json"
+                    product_path.parent.mkdir(parents=True, exist_ok=True)
+                    product_files.write_json(product_path, {sku: updated_detail})
                 total_changed += changed
                 updated_skus.append(sku)
         except Exception as ex:
@@ -16,6 +16,7 @@ import google.generativeai as genai
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 import config  # noqa: E402
+import product_files  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
@@ -214,58 +215,58 @@ def add_generated_image_to_json(
     try:
         product_path = config.PRODUCTS_FOLDER_PATH / f"{sku}.json"
         
-        # Load existing JSON
-        if product_path.exists():
-            with product_path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            product_detail = data.get(sku, {})
-        else:
-            product_detail = {}
-        
-        # Ensure Images section exists
-        if "Images" not in product_detail:
-            product_detail["Images"] = {
-                "schema_version": "1.0",
-                "summary": {
-                    "has_stock": False,
-                    "has_phone": False,
-                    "has_enhanced": False,
-                    "count_stock": 0,
-                    "count_phone": 0,
-                    "count_enhanced": 0,
-                },
-                "stock": [],
-                "phone": [],
-                "enhanced": [],
+        with product_files.lock(product_path):
+            # Load existing JSON
+            if product_path.exists():
+                with product_path.open("r", encoding="utf-8") as f:
+                    data = json.load(f)
+                product_detail = data.get(sku, {})
+            else:
+                product_detail = {}
+            
+            # Ensure Images section exists
+            if "Images" not in product_detail:
+                product_detail["Images"] = {
+                    "schema_version": "1.0",
+                    "summary": {
+                        "has_stock": False,
+                        "has_phone": False,
+                        "has_enhanced": False,
+                        "count_stock": 0,
+                        "count_phone": 0,
+                        "count_enhanced": 0,
+                    },
+                    "stock": [],
+                    "phone": [],
+                    "enhanced": [],
+                }
+            
+            images_section = product_detail["Images"]
+            
+            # Add to enhanced if not already there
+            enhanced = images_section.get("enhanced", []) or []
+            if not any(r.get("filename") == image_filename for r in enhanced):
+                enhanced.append({"filename": image_filename})
+            
+            # Update summary
+            stock = images_section.get("stock", []) or []
+            phone = images_section.get("phone", []) or []
+            
+            images_section["summary"] = {
+                "has_stock": bool(stock),
+                "has_phone": bool(phone),
+                "has_enhanced": bool(enhanced),
+                "count_stock": len(stock),
+                "count_phone": len(phone),
+                "count_enhanced": len(enhanced),
             }
-        
-        images_section = product_detail["Images"]
-        
-        # Add to enhanced if not already there
-        enhanced = images_section.get("enhanced", []) or []
-        if not any(r.get("filename") == image_filename for r in enhanced):
-            enhanced.append({"filename": image_filename})
-        
-        # Update summary
-        stock = images_section.get("stock", []) or []
-        phone = images_section.get("phone", []) or []
-        
-        images_section["summary"] = {
-            "has_stock": bool(stock),
-            "has_phone": bool(phone),
-            "has_enhanced": bool(enhanced),
-            "count_stock": len(stock),
-            "count_phone": len(phone),
-            "count_enhanced": len(enhanced),
-        }
-        images_section["enhanced"] = enhanced
-        
-        # Save back to JSON
-        product_detail["Images"] = images_section
-        
-        product_path.parent.mkdir(parents=True, exist_ok=True)
-        with product_path.open("w", encoding="utf-8") as f:
-            json.dump({sku: product_detail}, f, ensure_ascii=False, indent=2)
+            images_section["enhanced"] = enhanced
+            
+            # Save back to JSON
+            product_detail["Images"] = images_section
+            
+            product_path.parent.mkdir(parents=True, exist_ok=True)
+            product_files.write_json(product_path, {sku: product_detail})
         
         return True, None
     
@@ -44,6 +44,7 @@ except ImportError:
 	pass
 
 import config  # noqa: E402
+import product_files  # noqa: E402
 from utils import (  # noqa: E402
 	aspect_ratio,
 	brightness_contrast_entropy,
@@ -548,18 +549,18 @@ def process_single_sku(
 		json.dump(summary, f, ensure_ascii=False, indent=2)
 	
 	product_path = config.PRODUCTS_FOLDER_PATH / f"{sku}.json"
-	try:
-		with product_path.open("r", encoding="utf-8") as pf:
-			existing_product = json.load(pf)
-	except Exception:
-		existing_product = {sku: {}}
+	with product_files.lock(product_path):
+		try:
+			with product_path.open("r", encoding="utf-8") as pf:
+				existing_product = json.load(pf)
+		except Exception:
+			existing_product = {sku: {}}
 
-	if sku not in existing_product or not isinstance(existing_product.get(sku), dict):
-		existing_product[sku] = {}
-	existing_product[sku]["Images"] = summary
+		if sku not in existing_product or not isinstance(existing_product.get(sku), dict):
+			existing_product[sku] = {}
+		existing_product[sku]["Images"] = summary
 
-	with product_path.open("w", encoding="utf-8") as pf:
-		json.dump(existing_product, pf, ensure_ascii=False, indent=2)
+		product_files.write_json(product_path, existing_product)
 
 	total_time = time.time() - sku_start
 	print(f"  ✓ Complete: {len(records)} records in {total_time:.2f}s total")
@@ -11,6 +11,7 @@ import sys
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 import config  # noqa: E402
+import product_files  # noqa: E402
 
 
 def load_product_detail(sku: str) -> dict:
@@ -52,39 +53,39 @@ def select_main_images_core(image_paths: List[str]) -> Tuple[int, List[str], Lis
 
     for sku, images in sku_images.items():
         try:
-            product_detail = load_product_detail(sku) or {}
-            images_section = product_detail.get("Images", {})
-            if not isinstance(images_section, dict):
-                images_section = {}
-
-            # Get existing main_images or initialize
-            main_images = list(images_section.get("main_images", []) or [])
-
-            # Add new images (avoid duplicates)
-            existing_filenames = {entry.get("filename") for entry in main_images if isinstance(entry, dict)}
-            
-            for img_path in images:
-                filename = img_path.name
-                if filename not in existing_filenames:
-                    main_images.append({"filename": filename})
-                    existing_filenames.add(filename)
-                    processed += 1
-
-            # Update Images section
-            images_section["main_images"] = main_images
-            
-            # Update summary counts if schema_version exists
-            if "schema_version" in images_section and "summary" in images_section:
-                images_section["summary"]["has_main_images"] = bool(main_images)
-                images_section["summary"]["count_main_images"] = len(main_images)
-
-            product_detail["Images"] = images_section
-
-            # Save JSON
-            product_path = config.PRODUCTS_FOLDER_PATH / f"{sku}.json"
-            product_path.parent.mkdir(parents=True, exist_ok=True)
-            with product_path.open("w", encoding="utf-8") as f:
-                json.dump({sku: product_detail}, f, ensure_ascii=False, indent=2)
+            with product_files.lock(product_files.product_path(sku)):
+                product_detail = load_product_detail(sku) or {}
+                images_section = product_detail.get("Images", {})
+                if not isinstance(images_section, dict):
+                    images_section = {}
+
+                # Get existing main_images or initialize
+                main_images = list(images_section.get("main_images", []) or [])
+
+                # Add new images (avoid duplicates)
+                existing_filenames = {entry.get("filename") for entry in main_images if isinstance(entry, dict)}
+                
+                for img_path in images:
+                    filename = img_path.name
+                    if filename not in existing_filenames:
+                        main_images.append({"filename": filename})
+                        existing_filenames.add(filename)
+                        processed += 1
+
+                # Update Images section
+                images_section["main_images"] = main_images
+                
+                # Update summary counts if schema_version exists
+                if "schema_version" in images_section and "summary" in images_section:
+                    images_section["summary"]["has_main_images"] = bool(main_images)
+                    images_section["summary"]["count_main_images"] = len(main_images)
+
+                product_detail["Images"] = images_section
+
+                # Save JSON
+                product_path = config.PRODUCTS_FOLDER_PATH / f"{sku}.json"
+                product_path.parent.mkdir(parents=True, exist_ok=True)
+                product_files.write_json(product_path, {sku: product_detail})
 
             updated_skus.append(sku)
 
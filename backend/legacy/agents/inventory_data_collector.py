@@ -11,6 +11,8 @@ import pandas as pd
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 import config  # noqa: E402
+import json_codec  # noqa: E402
+import product_files  # noqa: E402
 
 
 # Columns organized by category for JSON export
@@ -228,46 +230,46 @@ def export_sku_records(skus: list[str], inventory_df: pd.DataFrame) -> None:
 
         output_path = products_dir / f"{sku}.json"
 
-        # Merge with existing JSON to preserve other sections (e.g., Images)
-        to_write = payload
-        if output_path.exists():
+        with product_files.lock(output_path):
+            # Merge with existing JSON to preserve other sections (e.g., Images)
+            to_write = payload
+            if output_path.exists():
+                try:
+                    with output_path.open("r", encoding="utf-8") as f:
+                        existing = json.load(f)
+                    existing_data = existing.get(sku, {}) if isinstance(existing, dict) else {}
+                    merged = existing_data.copy()
+                    for cat, cat_data in payload.get(sku, {}).items():
+                        merged[cat] = cat_data
+
+                    # Reorder categories: first follow CATEGORY_COLUMNS order, then others (e.g., Images)
+                    ordered: dict[str, dict] = {}
+                    desired_order = list(CATEGORY_COLUMNS.keys())
+                    for cat in desired_order:
+                        if cat in merged:
+                            ordered[cat] = merged[cat]
+                    # Append remaining categories preserving their existing order
+                    for cat in merged.keys():
+                        if cat not in ordered:
+                            ordered[cat] = merged[cat]
+
+                    to_write = {sku: ordered}
+                except Exception:
+                    to_write = payload
+
+            # Skip write only if identical INCLUDING ordering (compare JSON strings)
             try:
-                with output_path.open("r", encoding="utf-8") as f:
-                    existing = json.load(f)
-                existing_data = existing.get(sku, {}) if isinstance(existing, dict) else {}
-                merged = existing_data.copy()
-                for cat, cat_data in payload.get(sku, {}).items():
-                    merged[cat] = cat_data
-
-                # Reorder categories: first follow CATEGORY_COLUMNS order, then others (e.g., Images)
-                ordered: dict[str, dict] = {}
-                desired_order = list(CATEGORY_COLUMNS.keys())
-                for cat in desired_order:
-                    if cat in merged:
-                        ordered[cat] = merged[cat]
-                # Append remaining categories preserving their existing order
-                for cat in merged.keys():
-                    if cat not in ordered:
-                        ordered[cat] = merged[cat]
-
-                to_write = {sku: ordered}
+                if output_path.exists():
+                    with output_path.open("r", encoding="utf-8") as f:
+                        current_text = f.read()
+                    new_text = json_codec.dumps(to_write)
+                    if current_text.strip() == new_text.strip():
+                        print(f"No changes for {output_path.name}; skipped")
+                        continue
             except Exception:
-                to_write = payload
-
-        # Skip write only if identical INCLUDING ordering (compare JSON strings)
-        try:
-            if output_path.exists():
-                with output_path.open("r", encoding="utf-8") as f:
-                    current_text = f.read()
-                new_text = json.dumps(to_write, ensure_ascii=False, indent=2)
-                if current_text.strip() == new_text.strip():
-                    print(f"No changes for {output_path.name}; skipped")
-                    continue
-        except Exception:
-            pass
+                pass
 
-        with output_path.open("w", encoding="utf-8") as f:
-            json.dump(to_write, f, ensure_ascii=False, indent=2)
+            product_files.write_json(output_path, to_write)
 
         print(f"Saved {output_path.name}")
 
@@ -19,7 +19,6 @@ Assumptions:
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from dataclasses import dataclass
 from datetime import datetime
@@ -34,6 +33,7 @@ from openpyxl.worksheet.worksheet import Worksheet
 ROOT = Path(__file__).resolve().parent
 sys.path.insert(0, str(ROOT.parent))  # allow importing project modules at repo root
 import config  # type: ignore
+import product_corpus  # type: ignore
 
 JSON_COLUMN = getattr(config, "JSON_COLUMN", "JSON")
 
@@ -87,34 +87,15 @@ def load_json_products(products_dir: Path) -> Dict[str, Dict[str, Any]]:
     """Load all per-SKU JSON files into a mapping {sku: flat_fields}.
 
     The exporter groups fields under human-readable category keys; we flatten those
-    back to a {column_name: value} dict here.
+    back to a {column_name: value} dict here. Parsing and the mtime-keyed snapshot
+    live in product_corpus, so reruns only re-read files that changed.
     """
     result: Dict[str, Dict[str, Any]] = {}
-    for path in products_dir.glob("*.json"):
-        try:
-            data = json.loads(path.read_text(encoding="utf-8"))
-        except Exception as exc:
-            print(f"Skipping {path.name}: invalid JSON ({exc})")
-            continue
-        if not isinstance(data, dict) or len(data) != 1:
-            print(f"Skipping {path.name}: unexpected JSON structure")
-            continue
-        sku = next(iter(data))
-        payload = data[sku]
-        if not isinstance(payload, dict):
-            print(f"Skipping {path.name}: payload not a dict")
-            continue
-
+    for sku, entry in product_corpus.load_flat_products(products_dir).items():
         flat: Dict[str, Any] = {}
-        flat.update(extract_image_counts(payload))
-        # Walk categories and copy known columns only
-        for category, section in payload.items():
-            if not isinstance(section, dict):
-                continue
-            for col, val in section.items():
-                # Keep only scalar values that correspond to columns in inventory
-                if isinstance(val, (str, int, float)) or val is None:
-                    flat[col] = val
+        flat.update(image_count_columns(entry["image_counts"]))
+        # Keep only scalar values that correspond to columns in inventory
+        flat.update(entry["fields"])
         result[sku] = flat
     return result
 
@@ -125,40 +106,16 @@ def extract_image_counts(payload: Dict[str, Any]) -> Dict[str, Optional[int]]:
     Prefers list lengths (phone/stock/enhanced) and falls back to Images.summary.
     Missing keys are skipped entirely to keep blanks in Excel.
     """
-    counts: Dict[str, Optional[int]] = {}
-    images_section = None
-    if isinstance(payload.get("Images"), dict):
-        images_section = payload["Images"]
-    elif isinstance(payload.get("images"), dict):
-        images_section = payload["images"]
-
-    if not isinstance(images_section, dict):
-        return counts
-
-    summary = images_section.get("summary") if isinstance(images_section.get("summary"), dict) else None
-
-    def _len_list(key: str) -> Optional[int]:
-        val = images_section.get(key)
-        if isinstance(val, list):
-            return len(val)
-        return None
-
-    def _summary_count(key: str) -> Optional[int]:
-        if not summary:
-            return None
-        val = summary.get(key)
-        if isinstance(val, (int, float)):
-            return int(val)
-        return None
-
-    for key, column_name in IMAGE_COUNT_SOURCES:
-        list_len = _len_list(key)
-        count = list_len if list_len is not None else _summary_count(key)
-        if count is None:
-            continue
-        counts[column_name] = int(count)
+    return image_count_columns(product_corpus.extract_image_counts(payload))
+
 
-    return counts
+def image_count_columns(image_counts: Dict[str, int]) -> Dict[str, Optional[int]]:
+    """Map product_corpus image counts (phone/stock/enhanced) to inventory column names."""
+    return {
+        column_name: int(image_counts[key])
+        for key, column_name in IMAGE_COUNT_SOURCES
+        if key in image_counts
+    }
 
 
 def normalize_for_compare(value: Any) -> Any:
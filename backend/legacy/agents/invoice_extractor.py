@@ -1,11 +1,15 @@
 import os
 import re
 import shutil
+import sys
 import datetime
+import hashlib
 import json
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 
 import pandas as pd
 import pdfplumber
@@ -21,6 +25,11 @@ INVOICES_DIR = PROJECT_ROOT.parent / "Invoices"
 EXTRACTED_DIR = INVOICES_DIR / "Extracted"
 EXCEL_PATH = PROJECT_ROOT / "Invoices.xlsx"
 ENV_PATH = PROJECT_ROOT / ".env"
+# Gemini results per PDF content hash, so re-runs skip invoices already parsed
+EXTRACTION_CACHE_DIR = PROJECT_ROOT / "cache" / "invoice_extractions"
+
+sys.path.insert(0, str(PROJECT_ROOT))
+import json_codec  # noqa: E402
 
 # Load Environment Variables from .env
 if ENV_PATH.exists():
@@ -37,6 +46,11 @@ if not API_KEY:
 else:
     genai.configure(api_key=API_KEY)
 
+# Pipeline sizes: PDF text extraction is CPU-bound (processes), Gemini is remote (threads)
+PDF_TEXT_WORKERS = int(os.getenv("INVOICE_PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+GEMINI_WORKERS = int(os.getenv("INVOICE_GEMINI_WORKERS", "3"))
+GEMINI_REQUESTS_PER_MINUTE = float(os.getenv("INVOICE_GEMINI_RPM", "30"))
+
 # Column Definitions
 COLUMNS_INVENTORY = [
     "SKU (Old)", "Buying Entity", "Supplier", "Invoice", "Invoice Date",
@@ -144,8 +158,54 @@ def parse_with_gemini(text_content: str) -> dict:
         print(f"  Gemini Error ({MODEL_NAME}): {e}")
         return {}
 
+class RateLimiter:
+    """Spaces calls at least 60/requests_per_minute seconds apart (shared by all threads)."""
+
+    def __init__(self, requests_per_minute: float):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self.lock = threading.Lock()
+        self.next_at = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            start_at = max(now, self.next_at)
+            self.next_at = start_at + self.interval
+        if start_at > now:
+            time.sleep(start_at - now)
+
+
+def pdf_content_hash(pdf_path: Path) -> str:
+    """sha256 of the PDF bytes (same invoice under another name hits the same cache entry)."""
+    digest = hashlib.sha256()
+    with open(pdf_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_cached_extraction(content_hash: str) -> Optional[dict]:
+    """Gemini result cached for this PDF content and MODEL_NAME, or None."""
+    path = EXTRACTION_CACHE_DIR / f"{content_hash}.json"
+    try:
+        cached = json_codec.read_file(path)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("model") != MODEL_NAME or not cached.get("ai_data"):
+        return None
+    return cached["ai_data"]
+
+
+def save_cached_extraction(content_hash: str, pdf_path: Path, ai_data: dict):
+    EXTRACTION_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    json_codec.write_file(
+        EXTRACTION_CACHE_DIR / f"{content_hash}.json",
+        {"model": MODEL_NAME, "pdf_filename": pdf_path.name, "ai_data": ai_data},
+    )
+
+
 def extract_invoice_data(pdf_path: Path) -> InvoiceData:
-    """Orchestrates the extraction process."""
+    """Orchestrates the extraction process for a single PDF."""
     data = InvoiceData(pdf_path)
     
     # 1. Read PDF Text
@@ -158,10 +218,16 @@ def extract_invoice_data(pdf_path: Path) -> InvoiceData:
     print(f"  Analyzing {pdf_path.name}...")
     ai_data = parse_with_gemini(raw_text)
     
+    return invoice_from_ai_data(pdf_path, ai_data)
+
+
+def invoice_from_ai_data(pdf_path: Path, ai_data: dict) -> InvoiceData:
+    """Maps Gemini's JSON onto InvoiceData (empty InvoiceData if there is none)."""
+    data = InvoiceData(pdf_path)
     if not ai_data:
         return data
 
-    # 3. Map JSON to InvoiceData
+    # Map JSON to InvoiceData
     data.supplier = ai_data.get("supplier_name", "Unknown")
     data.invoice_number = ai_data.get("invoice_number", "Unknown")
     data.buying_entity = ai_data.get("buying_entity", "")
@@ -189,6 +255,72 @@ def extract_invoice_data(pdf_path: Path) -> InvoiceData:
 
     return data
 
+
+def extract_invoices(pdf_files: List[Path]) -> List[Tuple[Path, Optional[InvoiceData], Optional[Exception]]]:
+    """
+    Pipelined extraction of many PDFs: (pdf, InvoiceData, None) or (pdf, None, error) in input order.
+
+    Cached PDFs (same content, same model) skip both stages. The others
+    have their text extracted on a process pool and are handed to a
+    rate-limited Gemini thread pool as soon as their text is ready, so
+    parsing invoice 1 overlaps reading invoice 2.
+    """
+    results: Dict[int, Tuple[Optional[InvoiceData], Optional[Exception]]] = {}
+    hashes: Dict[int, str] = {}
+    pending: List[int] = []
+
+    for index, pdf in enumerate(pdf_files):
+        try:
+            hashes[index] = pdf_content_hash(pdf)
+        except OSError as e:
+            results[index] = (None, e)
+            continue
+        ai_data = load_cached_extraction(hashes[index])
+        if ai_data:
+            print(f"  [Cache] {pdf.name}")
+            results[index] = (invoice_from_ai_data(pdf, ai_data), None)
+        else:
+            pending.append(index)
+
+    if pending:
+        limiter = RateLimiter(GEMINI_REQUESTS_PER_MINUTE)
+
+        def parse(index: int, raw_text: str) -> dict:
+            limiter.wait()
+            print(f"  Analyzing {pdf_files[index].name}...")
+            return parse_with_gemini(raw_text)
+
+        with ProcessPoolExecutor(max_workers=max(1, PDF_TEXT_WORKERS)) as text_pool, \
+                ThreadPoolExecutor(max_workers=max(1, GEMINI_WORKERS), thread_name_prefix="invoice-gemini") as gemini_pool:
+            in_flight: Dict[Future, Tuple[int, str]] = {
+                text_pool.submit(extract_text_from_pdf, pdf_files[index]): (index, "text") for index in pending
+            }
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, stage = in_flight.pop(future)
+                    pdf = pdf_files[index]
+                    try:
+                        value = future.result()
+                    except Exception as e:
+                        results[index] = (None, e)
+                        continue
+                    if stage == "text":
+                        if not value.strip():
+                            print(f"  [Warn] No text found in {pdf.name} (image-based?). Skipping.")
+                            results[index] = (InvoiceData(pdf), None)
+                        else:
+                            in_flight[gemini_pool.submit(parse, index, value)] = (index, "gemini")
+                        continue
+                    if value:
+                        try:
+                            save_cached_extraction(hashes[index], pdf, value)
+                        except OSError as e:
+                            print(f"  [Warn] Could not cache extraction for {pdf.name}: {e}")
+                    results[index] = (invoice_from_ai_data(pdf, value), None)
+
+    return [(pdf, *results[index]) for index, pdf in enumerate(pdf_files)]
+
 def get_next_sku(df_inventory: pd.DataFrame, prefix: str) -> str:
     """Finds the next sequential SKU based on the prefix."""
     if df_inventory.empty or "SKU (Old)" not in df_inventory.columns:
@@ -251,10 +383,11 @@ def main():
     
     print(f"Found {len(pdf_files)} PDFs.")
     
-    for pdf in pdf_files:
+    for pdf, data, error in extract_invoices(pdf_files):
+        if error is not None:
+            print(f"  [Error] Failed to process {pdf.name}: {error}")
+            continue
         try:
-            data = extract_invoice_data(pdf)
-            
             # Deduplication Check
             key = (str(data.supplier), str(data.invoice_number))
             if key in existing_records:
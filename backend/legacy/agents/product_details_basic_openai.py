@@ -23,6 +23,7 @@ from dotenv import load_dotenv
 from openai import OpenAI
 
 import config  # PROJECT_ROOT, MODEL_FIELD_COMPLETION, etc.
+import product_files
 
 # ---------------------------------------------------------
 # Environment & client
@@ -68,10 +69,7 @@ def _image_to_data_uri(image_path: Path) -> str:
 
 
 def _atomic_dump(path: Path, payload: dict) -> None:
-    tmp = path.with_suffix(".tmp.json")
-    with tmp.open("w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
-    tmp.replace(path)
+    product_files.write_json(path, payload)
 
 
 def _only_known_keys(d: Dict[str, str]) -> Dict[str, str]:
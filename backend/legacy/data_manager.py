@@ -8,6 +8,8 @@ import sys
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 import config
+import product_corpus
+import product_files
 
 
 def load_all_products() -> List[Dict[str, Any]]:
@@ -19,11 +21,13 @@ def load_all_products() -> List[Dict[str, Any]]:
     if not products_dir.exists():
         return products
     
-    for json_file in sorted(products_dir.glob("*.json")):
+    json_files = sorted(products_dir.glob("*.json"))
+    for path, data, error in product_corpus.read_product_files(json_files):
+        json_file = Path(path)
+        if error is not None:
+            print(f"Error loading {json_file.name}: {error}")
+            continue
         try:
-            with json_file.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            
             # Extract SKU and product data
             for sku, sku_data in data.items():
                 if isinstance(sku_data, dict):
@@ -49,11 +53,7 @@ def save_product(sku: str, product_data: Dict[str, Any]) -> bool:
     """Save a product back to its JSON file."""
     
     try:
-        products_dir = config.PRODUCTS_FOLDER_PATH
-        file_path = products_dir / f"{sku}.json"
-        
-        with file_path.open("w", encoding="utf-8") as f:
-            json.dump({sku: product_data}, f, ensure_ascii=False, indent=2)
+        product_files.write_product(sku, product_data)
         
         return True
     
@@ -0,0 +1,117 @@
+"""Concurrent eBay Taxonomy fetches for category schemas (item aspects).
+
+Shared by app/services/ebay_schema.refresh_schemas and
+agents/ebay_cat_schema_fetcher:
+
+- one keep-alive requests.Session (http_pool.KeepAliveSession) for every
+  Taxonomy call instead of a TLS handshake per category
+- conditional GETs: the ETag of the last response is sent as If-None-Match
+  and a 304 means the cached schema is still current
+- content_hash(): stable hash of a schema payload, so callers can skip
+  rewriting unchanged schemas even when the API sends no ETag
+- run(): bounded worker pool over categories (http_pool.run_bounded), each
+  result yielded as soon as it finishes
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple, TypeVar
+
+import requests
+
+import http_pool
+
+MAX_PARALLEL_SCHEMA_FETCHES = int(os.getenv("EBAY_SCHEMA_FETCH_WORKERS", "6"))
+HTTP_TIMEOUT_SECONDS = 30
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_session = http_pool.KeepAliveSession(pool_connections=2, pool_maxsize=MAX_PARALLEL_SCHEMA_FETCHES)
+_tree_ids: Dict[Tuple[str, str], str] = {}
+
+
+class AspectsFetch(NamedTuple):
+    data: Optional[Dict[str, Any]]   # None when not_modified
+    etag: Optional[str]
+    not_modified: bool
+
+
+def get_session() -> requests.Session:
+    """Process-wide keep-alive session for Taxonomy API calls."""
+    return _session.get()
+
+
+def _headers(token: str) -> Dict[str, str]:
+    return {
+        "Authorization": f"Bearer {token}",
+        "Accept": "application/json",
+    }
+
+
+def fetch_category_tree_id(base_url: str, token: str, marketplace_id: str) -> str:
+    """Default category tree id of a marketplace (cached per process)."""
+    key = (base_url, marketplace_id)
+    tree_id = _tree_ids.get(key)
+    if tree_id:
+        return tree_id
+    response = get_session().get(
+        f"{base_url}/get_default_category_tree_id",
+        headers=_headers(token),
+        params={"marketplace_id": marketplace_id},
+        timeout=HTTP_TIMEOUT_SECONDS,
+    )
+    response.raise_for_status()
+    tree_id = response.json().get("categoryTreeId")
+    if not tree_id:
+        raise ValueError(f"Could not find categoryTreeId for marketplace {marketplace_id}")
+    _tree_ids[key] = tree_id
+    return tree_id
+
+
+def fetch_aspects(
+    base_url: str,
+    tree_id: str,
+    category_id: str,
+    token: str,
+    etag: Optional[str] = None,
+) -> AspectsFetch:
+    """get_item_aspects_for_category; with etag, a 304 returns not_modified instead of the body."""
+    headers = _headers(token)
+    if etag:
+        headers["If-None-Match"] = etag
+    response = get_session().get(
+        f"{base_url}/category_tree/{tree_id}/get_item_aspects_for_category",
+        headers=headers,
+        params={"category_id": category_id},
+        timeout=HTTP_TIMEOUT_SECONDS,
+    )
+    if response.status_code == 304:
+        return AspectsFetch(None, response.headers.get("ETag") or etag, True)
+    response.raise_for_status()
+    return AspectsFetch(response.json(), response.headers.get("ETag"), False)
+
+
+def content_hash(payload: Any) -> str:
+    """sha256 of payload as canonical JSON (key order does not matter)."""
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def run(
+    items: Iterable[T],
+    work: Callable[[T], R],
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[T, Optional[R], Optional[BaseException]]]:
+    """
+    Run work(item) for every item on a bounded thread pool.
+
+    Yields (item, result, None) or (item, None, error) in completion order.
+    Only max_workers items are in flight at once, so closing the iterator
+    early leaves at most that many requests to finish.
+    """
+    if max_workers is None:
+        max_workers = MAX_PARALLEL_SCHEMA_FETCHES
+    return http_pool.run_bounded(items, work, max_workers, thread_name_prefix="schema-fetch")
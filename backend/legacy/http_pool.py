@@ -0,0 +1,81 @@
+"""Shared HTTP plumbing for concurrent eBay API calls.
+
+Used by app/services/ebay_trading_client (Trading API pages) and
+ebay_schema_fetch (Taxonomy schemas):
+
+- KeepAliveSession: one process-wide requests.Session (urllib3 connection
+  pool) per API, created on first use, instead of a TLS handshake per call
+- run_bounded(): bounded worker pool over items, each result yielded as soon
+  as it finishes
+"""
+from __future__ import annotations
+
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class KeepAliveSession:
+    """Lazily created, process-wide keep-alive session with its own connection pool."""
+
+    def __init__(self, pool_connections: int, pool_maxsize: int):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._session: Optional[requests.Session] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> requests.Session:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=max(self.pool_maxsize, 1))
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+
+def run_bounded(
+    items: Iterable[T],
+    work: Callable[[T], R],
+    max_workers: int,
+    thread_name_prefix: str = "",
+) -> Iterator[Tuple[T, Optional[R], Optional[BaseException]]]:
+    """
+    Run work(item) for every item on a bounded thread pool.
+
+    Yields (item, result, None) or (item, None, error) in completion order.
+    Only max_workers items are in flight at once, so closing the iterator
+    early cancels the rest and leaves at most that many requests to finish.
+    """
+    pending = iter(items)
+    workers = max(1, max_workers)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=thread_name_prefix) as executor:
+        in_flight: Dict[Future, T] = {}
+
+        def submit_next() -> None:
+            for item in pending:
+                in_flight[executor.submit(work, item)] = item
+                return
+
+        for _ in range(workers):
+            submit_next()
+
+        try:
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = in_flight.pop(future)
+                    submit_next()
+                    error = future.exception()
+                    yield item, (None if error else future.result()), error
+        finally:
+            for future in in_flight:
+                future.cancel()
@@ -19,6 +19,7 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 import config
+import product_files
 from agents.image_classification import (
     classify_images_core,
     remove_image_refs_from_json,
@@ -103,28 +104,28 @@ def unmark_main_images_operation(
             continue
         
         try:
-            with product_path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            
-            product_detail = data.get(sku, {}) or {}
-            images_section = product_detail.get("Images", {}) or {}
-            main_images = images_section.get("main_images", []) or []
-
-            # Filter out entries whose filename is in filenames
-            new_main = []
-            for entry in main_images:
-                fname = entry.get("filename") if isinstance(entry, dict) else None
-                if not fname or fname not in filenames:
-                    new_main.append(entry)
-                else:
-                    removed_count += 1
-
-            images_section["main_images"] = new_main
-            product_detail["Images"] = images_section
-            data[sku] = product_detail
+            with product_files.lock(product_path):
+                with product_path.open("r", encoding="utf-8") as f:
+                    data = json.load(f)
+                
+                product_detail = data.get(sku, {}) or {}
+                images_section = product_detail.get("Images", {}) or {}
+                main_images = images_section.get("main_images", []) or []
+
+                # Filter out entries whose filename is in filenames
+                new_main = []
+                for entry in main_images:
+                    fname = entry.get("filename") if isinstance(entry, dict) else None
+                    if not fname or fname not in filenames:
+                        new_main.append(entry)
+                    else:
+                        removed_count += 1
+
+                images_section["main_images"] = new_main
+                product_detail["Images"] = images_section
+                data[sku] = product_detail
 
-            with product_path.open("w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+                product_files.write_json(product_path, data)
 
             updated_skus.append(sku)
         except Exception as ex:
@@ -249,33 +250,33 @@ def upscale_images_operation(
                     errors.append(f"{sku}: JSON not found")
                     continue
                 
-                with product_path.open("r", encoding="utf-8") as f:
-                    data = json.load(f)
-                
-                product_detail = data.get(sku, {})
-                images_section = product_detail.get("Images", {})
-                enhanced = images_section.get("enhanced", []) or []
-                
-                # Find entry and replace filename with upscaled; mark upscaled: true
-                found = False
-                for i, entry in enumerate(enhanced):
-                    if entry.get("filename") == original_path.name:
-                        enhanced[i]["filename"] = upscaled_filename
-                        enhanced[i]["upscaled"] = True
-                        found = True
-                        break
-                
-                if not found:
-                    errors.append(f"{original_path.name}: Not found in enhanced array")
-                    continue
-                
-                # Save updated JSON
-                images_section["enhanced"] = enhanced
-                product_detail["Images"] = images_section
-                data[sku] = product_detail
-                
-                with product_path.open("w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
+                with product_files.lock(product_path):
+                    with product_path.open("r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    
+                    product_detail = data.get(sku, {})
+                    images_section = product_detail.get("Images", {})
+                    enhanced = images_section.get("enhanced", []) or []
+                    
+                    # Find entry and replace filename with upscaled; mark upscaled: true
+                    found = False
+                    for i, entry in enumerate(enhanced):
+                        if entry.get("filename") == original_path.name:
+                            enhanced[i]["filename"] = upscaled_filename
+                            enhanced[i]["upscaled"] = True
+                            found = True
+                            break
+                    
+                    if not found:
+                        errors.append(f"{original_path.name}: Not found in enhanced array")
+                        continue
+                    
+                    # Save updated JSON
+                    images_section["enhanced"] = enhanced
+                    product_detail["Images"] = images_section
+                    data[sku] = product_detail
+                    
+                    product_files.write_json(product_path, data)
                 
                 upscaled_count += 1
                 upscaled_files.append((original_path, upscaled_filename))
@@ -474,40 +475,40 @@ def set_ebay_image_order_operation(image_paths: List[str], order_num: int) -> Tu
                 errors.append(f"No JSON found for SKU {sku}")
                 continue
             
-            with json_path.open("r", encoding="utf-8") as f:
-                product_data = json.load(f)
-            
-            if sku not in product_data:
-                product_data[sku] = {}
-            
-            # Initialize Images section if needed
-            if "Images" not in product_data[sku]:
-                product_data[sku]["Images"] = {}
-            
-            # Initialize eBay Images array if needed
-            if "eBay Images" not in product_data[sku]["Images"]:
-                product_data[sku]["Images"]["eBay Images"] = []
-            
-            # Get filename
-            filename = image_path.name
-            
-            # Check if this filename already exists in eBay Images
-            ebay_images = product_data[sku]["Images"]["eBay Images"]
-            existing_idx = next((i for i, img in enumerate(ebay_images) if img.get("filename") == filename), None)
-            
-            # Create or update the image record
-            image_record = {"filename": filename, "order": order_num}
-            
-            if existing_idx is not None:
-                # Update existing record
-                ebay_images[existing_idx] = image_record
-            else:
-                # Add new record
-                ebay_images.append(image_record)
-            
-            # Save back
-            with json_path.open("w", encoding="utf-8") as f:
-                json.dump(product_data, f, ensure_ascii=False, indent=2)
+            with product_files.lock(json_path):
+                with json_path.open("r", encoding="utf-8") as f:
+                    product_data = json.load(f)
+                
+                if sku not in product_data:
+                    product_data[sku] = {}
+                
+                # Initialize Images section if needed
+                if "Images" not in product_data[sku]:
+                    product_data[sku]["Images"] = {}
+                
+                # Initialize eBay Images array if needed
+                if "eBay Images" not in product_data[sku]["Images"]:
+                    product_data[sku]["Images"]["eBay Images"] = []
+                
+                # Get filename
+                filename = image_path.name
+                
+                # Check if this filename already exists in eBay Images
+                ebay_images = product_data[sku]["Images"]["eBay Images"]
+                existing_idx = next((i for i, img in enumerate(ebay_images) if img.get("filename") == filename), None)
+                
+                # Create or update the image record
+                image_record = {"filename": filename, "order": order_num}
+                
+                if existing_idx is not None:
+                    # Update existing record
+                    ebay_images[existing_idx] = image_record
+                else:
+                    # Add new record
+                    ebay_images.append(image_record)
+                
+                # Save back
+                product_files.write_json(json_path, product_data)
             
             changed += 1
             updated_skus.add(sku)
@@ -0,0 +1,97 @@
+"""JSON serialization for product files and caches.
+
+- orjson when it is installed, the stdlib json module otherwise (orjson
+  writes NaN/Infinity as null, the stdlib as NaN/Infinity).
+- Writes are compact by default; pretty=True (or JSON_PRETTY=1 in the
+  environment) writes 2-space indented JSON for files read by hand.
+- Readers accept both layouts (and anything else the stdlib parser reads,
+  e.g. NaN written by older code).
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback, same output apart from whitespace
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+PRETTY_DEFAULT = os.getenv("JSON_PRETTY", "0").strip().lower() in {"1", "true", "yes", "on"}
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _resolve_pretty(pretty: Optional[bool]) -> bool:
+    return PRETTY_DEFAULT if pretty is None else pretty
+
+
+def _stdlib_dumps(obj: Any, pretty: bool) -> str:
+    if pretty:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps_bytes(obj: Any, pretty: Optional[bool] = None) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes (compact unless pretty)."""
+    pretty = _resolve_pretty(pretty)
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if pretty else 0))
+        except TypeError:
+            # e.g. ints beyond 64 bit or types orjson does not know; let the stdlib decide
+            pass
+    return _stdlib_dumps(obj, pretty).encode("utf-8")
+
+
+def dumps(obj: Any, pretty: Optional[bool] = None) -> str:
+    """Serialize obj to a JSON string (compact unless pretty)."""
+    return dumps_bytes(obj, pretty).decode("utf-8")
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """Parse JSON text or bytes, compact or indented."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity and other stdlib-only extensions; genuine errors re-raise below
+            pass
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def read_file(path: Union[str, Path]) -> Any:
+    """Parse a JSON file."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def write_file(path: Union[str, Path], obj: Any, pretty: Optional[bool] = None) -> None:
+    """Write obj to path atomically (unique temp file in the same folder, then replace)."""
+    path = Path(path)
+    data = dumps_bytes(obj, pretty)
+    # Unique name so concurrent writers never share a temp file; not *.json so folder scans skip it
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp creates 0600; keep the mode of the file being replaced
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(temp_name, mode)
+        os.replace(temp_name, path)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,228 @@
+"""Product corpus loader for the per-SKU JSON files in products/.
+
+- SKU filters are resolved to <SKU>.json paths before anything is parsed.
+- Full loads parse on a process pool (small loads stay in-process).
+- A flattened snapshot {file -> sku, scalar fields, image counts} is kept in
+  memory and in cache/product_corpus_snapshot.json, keyed by each file's
+  mtime and size, so repeated imports only re-parse files that changed.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+import config  # type: ignore
+import json_codec  # type: ignore
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FILENAME = "product_corpus_snapshot.json"
+PARALLEL_MIN_FILES = 256          # below this a process pool costs more than it saves
+MAX_PARSE_WORKERS = min(8, os.cpu_count() or 1)
+PARSE_CHUNKSIZE = 64
+
+IMAGE_COUNT_KEYS = ("phone", "stock", "enhanced")
+
+_lock = threading.Lock()
+_snapshots: Dict[str, Dict[str, Any]] = {}  # resolved products dir -> snapshot
+
+
+def extract_image_counts(payload: Dict[str, Any]) -> Dict[str, int]:
+    """Image counts per source key (phone/stock/enhanced).
+
+    Prefers list lengths and falls back to Images.summary count_<key>.
+    Missing sources are left out so they stay blank downstream.
+    """
+    counts: Dict[str, int] = {}
+    images_section = payload.get("Images")
+    if not isinstance(images_section, dict):
+        images_section = payload.get("images")
+    if not isinstance(images_section, dict):
+        return counts
+
+    summary = images_section.get("summary") if isinstance(images_section.get("summary"), dict) else {}
+    for key in IMAGE_COUNT_KEYS:
+        val = images_section.get(key)
+        if isinstance(val, list):
+            counts[key] = len(val)
+            continue
+        val = summary.get(f"count_{key}")
+        if isinstance(val, (int, float)):
+            counts[key] = int(val)
+    return counts
+
+
+def flatten_product_file(path: str) -> Dict[str, Any]:
+    """Parse one <SKU>.json into {"sku", "fields", "image_counts"} (or {"sku": None, "error"}).
+
+    Module-level so it can run in pool worker processes.
+    """
+    try:
+        data = json_codec.read_file(path)
+    except Exception as exc:
+        return {"sku": None, "error": f"invalid JSON ({exc})"}
+    if not isinstance(data, dict) or len(data) != 1:
+        return {"sku": None, "error": "unexpected JSON structure"}
+    sku = next(iter(data))
+    payload = data[sku]
+    if not isinstance(payload, dict):
+        return {"sku": None, "error": "payload not a dict"}
+
+    fields: Dict[str, Any] = {}
+    for section in payload.values():
+        if not isinstance(section, dict):
+            continue
+        for col, val in section.items():
+            # Keep only scalar values that correspond to inventory columns
+            if isinstance(val, (str, int, float)) or val is None:
+                fields[col] = val
+    return {"sku": sku, "fields": fields, "image_counts": extract_image_counts(payload)}
+
+
+def _read_json_file(path: str) -> Tuple[str, Any, Optional[str]]:
+    try:
+        return path, json_codec.read_file(path), None
+    except Exception as exc:
+        return path, None, str(exc)
+
+
+def _map_files(fn, paths: List[str]) -> List[Any]:
+    """fn over paths, on a process pool when there are enough of them."""
+    workers = min(MAX_PARSE_WORKERS, max(1, len(paths) // PARSE_CHUNKSIZE))
+    if len(paths) < PARALLEL_MIN_FILES or workers <= 1:
+        return [fn(path) for path in paths]
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(fn, paths, chunksize=PARSE_CHUNKSIZE))
+    except Exception as exc:  # e.g. no process support in this environment
+        print(f"[CORPUS] Process pool unavailable ({exc}); parsing serially")
+        return [fn(path) for path in paths]
+
+
+def read_product_files(paths: Iterable[Path]) -> List[Tuple[str, Any, Optional[str]]]:
+    """Raw JSON for each path as (path, data, error), in the given order."""
+    return _map_files(_read_json_file, [str(p) for p in paths])
+
+
+def _snapshot_path(products_dir: Path) -> Path:
+    return products_dir.parent / "cache" / SNAPSHOT_FILENAME
+
+
+def _load_snapshot(products_dir: Path) -> Dict[str, Any]:
+    key = str(products_dir.resolve())
+    snapshot = _snapshots.get(key)
+    if snapshot is not None:
+        return snapshot
+
+    snapshot = {"version": SNAPSHOT_VERSION, "products_dir": key, "files": {}}
+    path = _snapshot_path(products_dir)
+    if path.exists():
+        try:
+            stored = json_codec.read_file(path)
+            if stored.get("version") == SNAPSHOT_VERSION and stored.get("products_dir") == key:
+                snapshot = stored
+        except Exception as exc:
+            print(f"[CORPUS] Ignoring unreadable snapshot {path.name}: {exc}")
+    _snapshots[key] = snapshot
+    return snapshot
+
+
+def _save_snapshot(products_dir: Path, snapshot: Dict[str, Any]) -> None:
+    path = _snapshot_path(products_dir)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        json_codec.write_file(path, snapshot, pretty=False)
+    except Exception as exc:
+        print(f"[CORPUS] Failed to save snapshot: {exc}")
+
+
+def _stat_files(products_dir: Path, skus: Optional[Iterable[str]]) -> Dict[str, Tuple[int, int]]:
+    """{file name: (mtime_ns, size)} for the whole folder or only the wanted SKUs."""
+    stats: Dict[str, Tuple[int, int]] = {}
+    if skus is None:
+        with os.scandir(products_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    st = entry.stat()
+                    stats[entry.name] = (st.st_mtime_ns, st.st_size)
+        return stats
+
+    for sku in skus:
+        name = f"{sku}.json"
+        try:
+            st = (products_dir / name).stat()
+        except OSError:
+            continue
+        stats[name] = (st.st_mtime_ns, st.st_size)
+    return stats
+
+
+def load_flat_products(
+    products_dir: Optional[Path] = None,
+    skus: Optional[Iterable[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Flattened products {sku: {"fields": {...}, "image_counts": {...}}}.
+
+    Args:
+        products_dir: folder with <SKU>.json files (default config.PRODUCTS_FOLDER_PATH)
+        skus: only these SKUs; their files are looked up by name, nothing else is read
+              (None or empty: all SKUs)
+
+    Files are returned in file name order. Unchanged files come from the
+    snapshot; changed or new ones are parsed (in parallel for large batches).
+    """
+    products_dir = Path(products_dir or getattr(config, "PRODUCTS_FOLDER_PATH"))
+    sku_filter = {str(s).strip() for s in skus if str(s).strip()} if skus else None
+    if not products_dir.exists():
+        return {}
+
+    with _lock:
+        snapshot = _load_snapshot(products_dir)
+        files: Dict[str, Any] = snapshot["files"]
+        stats = _stat_files(products_dir, sku_filter)
+
+        stale = [
+            name for name, (mtime_ns, size) in stats.items()
+            if (files.get(name) or {}).get("mtime_ns") != mtime_ns or files[name].get("size") != size
+        ]
+        removed = [name for name in files if name not in stats] if sku_filter is None else []
+
+        if stale:
+            parsed = _map_files(flatten_product_file, [str(products_dir / name) for name in stale])
+            for name, entry in zip(stale, parsed):
+                mtime_ns, size = stats[name]
+                entry.update(mtime_ns=mtime_ns, size=size)
+                if entry.get("error"):
+                    print(f"Skipping {name}: {entry['error']}")
+                files[name] = entry
+        for name in removed:
+            del files[name]
+        if stale or removed:
+            _save_snapshot(products_dir, snapshot)
+
+        result: Dict[str, Dict[str, Any]] = {}
+        for name in sorted(stats):
+            entry = files[name]
+            sku = entry.get("sku")
+            if not sku:
+                continue
+            if sku_filter is not None and sku.strip() not in sku_filter:
+                continue
+            result[sku] = {"fields": entry["fields"], "image_counts": entry["image_counts"]}
+        return result
+
+
+def invalidate_snapshot(products_dir: Optional[Path] = None) -> None:
+    """Drop the in-memory and on-disk snapshot (next load re-parses every file)."""
+    products_dir = Path(products_dir or getattr(config, "PRODUCTS_FOLDER_PATH"))
+    with _lock:
+        _snapshots.pop(str(products_dir.resolve()), None)
+        try:
+            _snapshot_path(products_dir).unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,225 @@
+"""Locked, versioned writes for products/<SKU>.json (and other shared JSON files).
+
+Several uvicorn workers, batch jobs and the legacy agents write the same
+product files, so every writer goes through here:
+
+- lock(path): per-file lock that is reentrant within a thread. It combines
+  an in-process lock (threads of one worker) with an OS file lock on
+  <folder>/.locks/<file>.lock (other processes): fcntl.flock on POSIX,
+  msvcrt.locking on Windows.
+- write_json(path, data): atomic write through a unique temp file, under
+  the lock. With expected_version it is an optimistic write and raises
+  VersionConflict if the file changed since it was read.
+- update_json(path, mutate): locked read-modify-write for short edits.
+
+A version is (inode, mtime_ns, size) of the file; every atomic replace
+creates a new inode, so two writes in the same clock tick still differ.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+import config  # type: ignore
+import json_codec  # type: ignore
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LOCK_DIRNAME = ".locks"
+LOCK_TIMEOUT_SECONDS = float(os.getenv("PRODUCT_LOCK_TIMEOUT", "30"))
+LOCK_POLL_SECONDS = 0.02
+
+Version = Tuple[int, int, int]
+PathLike = Union[str, Path]
+
+
+class VersionConflict(RuntimeError):
+    """The file changed between reading it and writing it back."""
+
+    def __init__(self, path: Path, expected: Optional[Version], actual: Optional[Version]):
+        super().__init__(f"{path.name} was modified concurrently (expected version {expected}, found {actual})")
+        self.path = path
+        self.expected = expected
+        self.actual = actual
+
+
+class _FileLock:
+    """In-process RLock plus the OS lock, taken on the outermost acquire only."""
+
+    def __init__(self, lock_path: Path):
+        self.lock_path = lock_path
+        self.rlock = threading.RLock()
+        self.depth = 0
+        self.fd: Optional[int] = None
+
+    def _acquire_os_lock(self) -> None:
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + LOCK_TIMEOUT_SECONDS
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise TimeoutError(f"Timed out waiting for lock on {self.lock_path.name}")
+                time.sleep(LOCK_POLL_SECONDS)
+        self.fd = fd
+
+    def _release_os_lock(self) -> None:
+        fd, self.fd = self.fd, None
+        if fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+
+_registry_lock = threading.Lock()
+_locks: Dict[str, _FileLock] = {}
+
+
+def product_path(sku: str, products_dir: Optional[PathLike] = None) -> Path:
+    """products/<SKU>.json (default folder config.PRODUCTS_FOLDER_PATH)."""
+    return Path(products_dir or getattr(config, "PRODUCTS_FOLDER_PATH")) / f"{sku}.json"
+
+
+def file_version(path: PathLike) -> Optional[Version]:
+    """(inode, mtime_ns, size) of path, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+@contextmanager
+def lock(path: PathLike) -> Iterator[None]:
+    """Hold the write lock for path (reentrant within the current thread)."""
+    path = Path(os.path.abspath(path))
+    key = os.path.normcase(str(path))
+    with _registry_lock:
+        file_lock = _locks.get(key)
+        if file_lock is None:
+            file_lock = _locks[key] = _FileLock(path.parent / LOCK_DIRNAME / f"{path.name}.lock")
+
+    with file_lock.rlock:
+        if file_lock.depth == 0:
+            file_lock._acquire_os_lock()
+        file_lock.depth += 1
+        try:
+            yield
+        finally:
+            file_lock.depth -= 1
+            if file_lock.depth == 0:
+                file_lock._release_os_lock()
+
+
+def read_json(path: PathLike, default: Any = None) -> Tuple[Any, Optional[Version]]:
+    """(parsed file, version); (default, None) if the file does not exist."""
+    path = Path(path)
+    with lock(path):
+        version = file_version(path)
+        if version is None:
+            return default, None
+        return json_codec.read_file(path), version
+
+
+def write_json(
+    path: PathLike,
+    data: Any,
+    expected_version: Optional[Version] = None,
+    pretty: Optional[bool] = None,
+) -> Optional[Version]:
+    """Atomically replace path with data under its lock; returns the new version.
+
+    expected_version: version returned by read_json when the data was read;
+    raises VersionConflict if the file has been rewritten since.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with lock(path):
+        if expected_version is not None:
+            actual = file_version(path)
+            if actual != expected_version:
+                raise VersionConflict(path, expected_version, actual)
+        json_codec.write_file(path, data, pretty=pretty)
+        return file_version(path)
+
+
+def update_json(
+    path: PathLike,
+    mutate: Callable[[Any], Any],
+    default: Any = None,
+    pretty: Optional[bool] = None,
+) -> Any:
+    """Locked read-modify-write.
+
+    mutate receives the current content (default if the file is missing) and
+    either changes it in place (returns None) or returns the new content.
+    Returns what was written.
+    """
+    path = Path(path)
+    with lock(path):
+        data, _ = read_json(path, default)
+        result = mutate(data)
+        if result is not None:
+            data = result
+        write_json(path, data, pretty=pretty)
+        return data
+
+
+def read_product(sku: str, products_dir: Optional[PathLike] = None) -> Tuple[Dict[str, Any], Optional[Version]]:
+    """(product detail under the SKU key, version); ({}, None) if there is no file."""
+    data, version = read_json(product_path(sku, products_dir), {})
+    if isinstance(data, dict) and isinstance(data.get(sku), dict):
+        return data[sku], version
+    return (data if isinstance(data, dict) else {}), version
+
+
+def write_product(
+    sku: str,
+    product_detail: Dict[str, Any],
+    products_dir: Optional[PathLike] = None,
+    expected_version: Optional[Version] = None,
+    pretty: Optional[bool] = None,
+) -> Optional[Version]:
+    """Write {sku: product_detail} to products/<SKU>.json (see write_json)."""
+    return write_json(product_path(sku, products_dir), {sku: product_detail}, expected_version, pretty)
+
+
+def update_product(
+    sku: str,
+    mutate: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+    products_dir: Optional[PathLike] = None,
+    pretty: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """Locked read-modify-write of one product detail; returns what was written."""
+    path = product_path(sku, products_dir)
+    with lock(path):
+        product_detail, _ = read_product(sku, products_dir)
+        result = mutate(product_detail)
+        if result is not None:
+            product_detail = result
+        write_json(path, {sku: product_detail}, pretty=pretty)
+        return product_detail
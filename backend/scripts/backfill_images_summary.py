@@ -3,10 +3,13 @@
 
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
 from typing import Any, Dict, List
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "legacy"))
+import json_codec  # type: ignore
+
 
 def _safe_list(value: Any) -> List[Dict[str, Any]]:
     if not isinstance(value, list):
@@ -57,8 +60,7 @@ def main() -> int:
     for file_path in files:
         scanned += 1
         try:
-            with file_path.open("r", encoding="utf-8") as f:
-                payload = json.load(f)
+            payload = json_codec.read_file(file_path)
 
             if not isinstance(payload, dict) or len(payload) != 1:
                 skipped += 1
@@ -82,10 +84,7 @@ def main() -> int:
 
             product["Images"] = new_images
 
-            tmp_path = file_path.with_suffix(".tmp.json")
-            with tmp_path.open("w", encoding="utf-8") as f:
-                json.dump(payload, f, ensure_ascii=False, indent=2)
-            tmp_path.replace(file_path)
+            json_codec.write_file(file_path, payload)
             updated += 1
         except Exception as e:
             errors += 1
@@ -6,13 +6,17 @@ One-time backfill: copy fees from schemas/category_mapping.json into cached sche
 Usage:
   python backend/scripts/backfill_schema_fees_from_mapping.py
   python backend/scripts/backfill_schema_fees_from_mapping.py --overwrite
+  python backend/scripts/backfill_schema_fees_from_mapping.py --pretty
 """
 
 import argparse
-import json
+import sys
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "legacy"))
+import json_codec  # type: ignore
+
 
 def _coerce_float(value: Any) -> Optional[float]:
     if value is None:
@@ -68,6 +72,7 @@ def _merge_missing_fee_fields(current_fees: Any, mapping_fees: Dict[str, float])
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--overwrite", action="store_true", help="Also overwrite non-empty schema fees")
+    parser.add_argument("--pretty", action="store_true", help="Write indented JSON instead of compact")
     args = parser.parse_args()
 
     backend_dir = Path(__file__).resolve().parents[1]
@@ -78,8 +83,7 @@ def main() -> int:
         print(f"[ERROR] Mapping file not found: {mapping_path}")
         return 1
 
-    with mapping_path.open("r", encoding="utf-8") as f:
-        mapping_data = json.load(f)
+    mapping_data = json_codec.read_file(mapping_path)
 
     mapping_lookup: Dict[str, Dict[str, float]] = {}
     for row in mapping_data.get("categoryMappings", []):
@@ -112,8 +116,7 @@ def main() -> int:
             continue
 
         try:
-            with schema_file.open("r", encoding="utf-8") as f:
-                schema_data = json.load(f)
+            schema_data = json_codec.read_file(schema_file)
 
             metadata = schema_data.setdefault("_metadata", {})
             current_fees = metadata.get("fees", {})
@@ -127,10 +130,7 @@ def main() -> int:
                     continue
                 metadata["fees"] = merged_fees
 
-            tmp_path = schema_file.with_suffix(".tmp.json")
-            with tmp_path.open("w", encoding="utf-8") as f:
-                json.dump(schema_data, f, ensure_ascii=False, indent=2)
-            tmp_path.replace(schema_file)
+            json_codec.write_file(schema_file, schema_data, pretty=args.pretty or None)
             updated += 1
         except Exception as e:
             parse_errors += 1
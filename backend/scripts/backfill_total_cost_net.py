@@ -4,15 +4,19 @@
 Usage:
   python backend/scripts/backfill_total_cost_net.py
   python backend/scripts/backfill_total_cost_net.py --dry-run
+  python backend/scripts/backfill_total_cost_net.py --pretty
 """
 
 from __future__ import annotations
 
 import argparse
-import json
+import sys
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "legacy"))
+import json_codec  # type: ignore
+
 
 def _coerce_float(value: Any) -> Optional[float]:
     if value is None:
@@ -50,6 +54,7 @@ def _is_missing_total_cost(value: Any) -> bool:
 def main() -> int:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--dry-run", action="store_true", help="Report changes without writing files")
+    parser.add_argument("--pretty", action="store_true", help="Write indented JSON instead of compact")
     args = parser.parse_args()
 
     backend_dir = Path(__file__).resolve().parents[1]
@@ -65,7 +70,7 @@ def main() -> int:
 
     for product_file in sorted(products_dir.glob("*.json")):
         try:
-            payload = json.loads(product_file.read_text(encoding="utf-8"))
+            payload = json_codec.read_file(product_file)
         except Exception as exc:
             print(f"ERROR reading {product_file.name}: {exc}")
             skipped_products += 1
@@ -101,10 +106,7 @@ def main() -> int:
         if file_changed:
             updated_files += 1
             if not args.dry_run:
-                product_file.write_text(
-                    json.dumps(payload, ensure_ascii=False, indent=2) + "\n",
-                    encoding="utf-8",
-                )
+                json_codec.write_file(product_file, payload, pretty=args.pretty or None)
 
     mode = "DRY RUN" if args.dry_run else "DONE"
     print(
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+Benchmark json_codec against the previous stdlib indent=2 writes.
+
+Corpus (read-only, nothing is written back):
+  - every products/<SKU>.json
+  - products/cache/ebay_listings_cache.json (if present)
+  - cache/folder_images_cache.json (if present)
+
+For each format it reports total dump time, parse time and size:
+  - old:              json.dumps(indent=2, ensure_ascii=False) / json.loads
+  - stdlib compact:   json_codec without orjson
+  - stdlib pretty
+  - orjson compact:   json_codec default when orjson is installed
+  - orjson pretty
+and checks every document round-trips unchanged, and that json_codec reads
+both the old indented and the new compact files.
+
+Usage:
+    python scripts/benchmark_json_codec.py [--repeat 3]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(backend_dir / "legacy"))
+
+import config  # type: ignore
+import json_codec  # type: ignore
+
+
+def _load_corpus():
+    products_dir = Path(config.PRODUCTS_FOLDER_PATH)
+    docs = {path.name: json.loads(path.read_text(encoding="utf-8")) for path in sorted(products_dir.glob("*.json"))}
+    for path in (products_dir / "cache" / "ebay_listings_cache.json", products_dir.parent / "cache" / "folder_images_cache.json"):
+        if path.exists():
+            docs[path.name] = json.loads(path.read_text(encoding="utf-8"))
+    return docs
+
+
+def _formats():
+    formats = {
+        "old": (lambda obj: json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8"), json.loads),
+        "stdlib compact": (lambda obj: json_codec._stdlib_dumps(obj, False).encode("utf-8"), json.loads),
+        "stdlib pretty": (lambda obj: json_codec._stdlib_dumps(obj, True).encode("utf-8"), json.loads),
+    }
+    if json_codec.orjson is not None:
+        formats["orjson compact"] = (lambda obj: json_codec.dumps_bytes(obj, pretty=False), json_codec.loads)
+        formats["orjson pretty"] = (lambda obj: json_codec.dumps_bytes(obj, pretty=True), json_codec.loads)
+    return formats
+
+
+def _bench(docs, dump, load, repeat):
+    dump_seconds = load_seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encoded = {name: dump(doc) for name, doc in docs.items()}
+        dump_seconds = min(dump_seconds, time.perf_counter() - start)
+        start = time.perf_counter()
+        decoded = {name: load(data) for name, data in encoded.items()}
+        load_seconds = min(load_seconds, time.perf_counter() - start)
+    return encoded, decoded, dump_seconds, load_seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    docs = _load_corpus()
+    print(f"Corpus: {len(docs)} documents, json_codec backend: {json_codec.BACKEND}")
+    failures = 0
+    results = {}
+    for label, (dump, load) in _formats().items():
+        encoded, decoded, dump_seconds, load_seconds = _bench(docs, dump, load, args.repeat)
+        size = sum(len(data) for data in encoded.values())
+        results[label] = encoded
+        print(f"{label:<15} dump {dump_seconds:.3f}s  parse {load_seconds:.3f}s  size {size / 1024 / 1024:.2f} MB")
+        bad = [name for name in docs if decoded[name] != docs[name]]
+        if bad:
+            failures += 1
+            print(f"  round trip differs for {len(bad)} documents, e.g. {bad[:3]}")
+
+    # Readers accept both layouts
+    for label in ("old", "stdlib compact"):
+        bad = [name for name, data in results[label].items() if json_codec.loads(data) != docs[name]]
+        if bad:
+            failures += 1
+            print(f"  json_codec.loads cannot read '{label}' output for {len(bad)} documents")
+
+    print(f"Failures: {failures}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""
+Benchmark / check the pipelined batch listing creation.
+
+The four listing stages in ebay_listing are replaced with sleeps of the given
+latencies (no JSON, OpenAI or eBay access). Compares:
+  - serial:    ebay_listing.create_listing per SKU (the old batch loop)
+  - pipelined: ebay_listing_batch.run_listing_batch
+and checks stop_on_error: with one SKU failing in the image stage, no SKU
+after it may enter any stage (no AI output written, no pictures uploaded,
+nothing submitted) and every SKU before it must be submitted.
+
+Usage:
+    python scripts/benchmark_listing_batch_pipeline.py [--skus 20] [--prepare 0.05] [--ai 1.0] [--images 1.5] [--submit 0.8]
+"""
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(backend_dir / "legacy"))
+
+from app.services import ebay_listing, ebay_listing_batch
+
+
+def _install_fake_stages(latency, fail_images_for=None, started=None):
+    """Fake stages; returns the submitted SKUs. started collects (stage, sku) as stages begin."""
+    submitted = []
+    lock = threading.Lock()
+    started = started if started is not None else []
+
+    def prepare(sku, price, **_):
+        started.append(("prepare", sku))
+        time.sleep(latency["prepare"])
+        return {"sku": sku, "price": price}
+
+    def ai(draft, generate_condition_note=False):
+        started.append(("ai", draft["sku"]))
+        time.sleep(latency["ai"])
+        return draft
+
+    def images(draft):
+        started.append(("images", draft["sku"]))
+        time.sleep(latency["images"])
+        if draft["sku"] == fail_images_for:
+            raise ValueError(f"No images uploaded for SKU {draft['sku']}")
+        draft["image_urls"] = ["https://i.ebayimg.com/fake.jpg"]
+        return draft
+
+    def submit(draft):
+        started.append(("submit", draft["sku"]))
+        time.sleep(latency["submit"])
+        with lock:
+            submitted.append(draft["sku"])
+        return {"success": True, "sku": draft["sku"], "item_id": f"1{len(submitted):011d}", "message": "ok"}
+
+    ebay_listing.prepare_listing_draft = prepare
+    ebay_listing.resolve_listing_ai_fields = ai
+    ebay_listing.upload_listing_images = images
+    ebay_listing.submit_listing_draft = submit
+    return submitted
+
+
+def _run_pipeline(listings, stop_on_error=False):
+    events = list(ebay_listing_batch.run_listing_batch(listings, stop_on_error=stop_on_error, batch_id="bench"))
+    return events[-1], [e for e in events if e["type"] == "result"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--skus", type=int, default=20)
+    parser.add_argument("--prepare", type=float, default=0.05)
+    parser.add_argument("--ai", type=float, default=1.0)
+    parser.add_argument("--images", type=float, default=1.5)
+    parser.add_argument("--submit", type=float, default=0.8)
+    args = parser.parse_args()
+
+    latency = {"prepare": args.prepare, "ai": args.ai, "images": args.images, "submit": args.submit}
+    listings = [{"sku": f"JAL{i:05d}", "price": 19.99} for i in range(args.skus)]
+    skus = [listing["sku"] for listing in listings]
+    failures = 0
+
+    # Serial reference
+    submitted = _install_fake_stages(latency)
+    start = time.perf_counter()
+    for listing in listings:
+        ebay_listing.create_listing(sku=listing["sku"], price=listing["price"])
+    serial_seconds = time.perf_counter() - start
+    print(f"serial:    {len(submitted)} listings in {serial_seconds:.2f}s")
+
+    # Pipelined
+    submitted = _install_fake_stages(latency)
+    start = time.perf_counter()
+    complete, streamed = _run_pipeline(listings)
+    seconds = time.perf_counter() - start
+    print(f"pipelined: {complete['successful']} listings in {seconds:.2f}s (workers {ebay_listing_batch.STAGE_WORKERS})")
+    if sorted(submitted) != skus or [r["sku"] for r in complete["results"]] != skus or len(streamed) != len(skus):
+        failures += 1
+        print("  pipelined run did not submit / report every SKU once in input order")
+
+    # stop_on_error: SKU 5 fails while uploading images
+    failing = skus[5]
+    started = []
+    submitted = _install_fake_stages(latency, fail_images_for=failing, started=started)
+    complete, _ = _run_pipeline(listings, stop_on_error=True)
+    print(f"stop_on_error: submitted={len(submitted)} failed={complete['failed']} skipped={complete['skipped']}")
+    if submitted != skus[:5]:
+        failures += 1
+        print(f"  expected exactly {skus[:5]} submitted in order, got {submitted}")
+    touched_later = sorted({sku for _, sku in started if sku > failing})
+    if touched_later:
+        failures += 1
+        print(f"  SKUs after the failing one entered a stage: {touched_later}")
+    expected_order = [(stage, sku) for sku in skus[:5] for stage in ebay_listing_batch.STAGES]
+    expected_order += [("prepare", failing), ("ai", failing), ("images", failing)]
+    if started != expected_order:
+        failures += 1
+        print("  stop_on_error did not run the SKUs one after another")
+    if [r["sku"] for r in complete["results"]] != skus[:6] or complete["results"][-1]["success"]:
+        failures += 1
+        print("  expected results for the SKUs up to and including the failing one")
+
+    print(f"Failures: {failures}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
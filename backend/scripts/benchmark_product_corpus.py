@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Benchmark the product corpus loader against the old glob-and-parse loop.
+
+Works on a temp copy of products/ (the real folder and snapshot are not touched):
+  - old:       parse every file, filter SKUs afterwards (previous _load_json_products)
+  - cold:      product_corpus.load_flat_products without a snapshot
+  - warm:      second load, nothing changed
+  - touched:   after rewriting --touch files
+  - filtered:  5 SKUs only, fresh snapshot-less process state
+and checks the corpus output matches the old loader for every file.
+
+Usage:
+    python scripts/benchmark_product_corpus.py [--copies 1] [--touch 20]
+"""
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(backend_dir / "legacy"))
+
+import config  # type: ignore
+import product_corpus  # type: ignore
+
+from app.services.inventory_json_importer import IMAGE_COUNT_SOURCES, _load_json_products
+
+
+def _old_extract_image_counts(payload):
+    counts = {}
+    images_section = payload.get("Images") if isinstance(payload.get("Images"), dict) else None
+    if not isinstance(images_section, dict):
+        return counts
+    summary = images_section.get("summary") if isinstance(images_section.get("summary"), dict) else None
+    for key, column_name in IMAGE_COUNT_SOURCES:
+        val = images_section.get(key)
+        count = len(val) if isinstance(val, list) else None
+        if count is None and summary and isinstance(summary.get(f"count_{key}"), (int, float)):
+            count = int(summary[f"count_{key}"])
+        if count is not None:
+            counts[column_name] = int(count)
+    return counts
+
+
+def old_load_json_products(products_dir, skus=None):
+    result = {}
+    sku_filter = {s.strip() for s in skus} if skus else None
+    for path in products_dir.glob("*.json"):
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            continue
+        if not isinstance(data, dict) or len(data) != 1:
+            continue
+        sku = next(iter(data)).strip()
+        if sku_filter is not None and sku not in sku_filter:
+            continue
+        payload = data[sku]
+        if not isinstance(payload, dict):
+            continue
+        flat = dict(_old_extract_image_counts(payload))
+        for section in payload.values():
+            if isinstance(section, dict):
+                for col, val in section.items():
+                    if isinstance(val, (str, int, float)) or val is None:
+                        flat[col] = val
+        result[sku] = flat
+    return result
+
+
+def _timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<10} {len(result):>6} SKUs in {time.perf_counter() - start:.3f}s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--copies", type=int, default=1, help="copies of the corpus (renamed SKUs) to enlarge it")
+    parser.add_argument("--touch", type=int, default=20)
+    args = parser.parse_args()
+
+    source = Path(getattr(config, "PRODUCTS_FOLDER_PATH"))
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        products_dir = Path(tmp) / "products"
+        products_dir.mkdir()
+        for copy in range(args.copies):
+            for path in source.glob("*.json"):
+                if copy == 0:
+                    shutil.copy2(path, products_dir / path.name)
+                    continue
+                data = json.loads(path.read_text(encoding="utf-8"))
+                if isinstance(data, dict) and len(data) == 1:
+                    sku = f"{next(iter(data))}-C{copy}"
+                    (products_dir / f"{sku}.json").write_text(json.dumps({sku: next(iter(data.values()))}), encoding="utf-8")
+        print(f"Corpus: {len(list(products_dir.glob('*.json')))} files, {product_corpus.MAX_PARSE_WORKERS} parse worker(s)")
+
+        old = _timed("old", lambda: old_load_json_products(products_dir))
+        cold = _timed("cold", lambda: _load_json_products(products_dir))
+        _timed("warm", lambda: _load_json_products(products_dir))
+
+        touched = sorted(products_dir.glob("*.json"))[: args.touch]
+        for path in touched:
+            path.write_text(path.read_text(encoding="utf-8"), encoding="utf-8")
+            path.touch()
+        _timed("touched", lambda: _load_json_products(products_dir))
+
+        wanted = sorted(old)[:5]
+        product_corpus._snapshots.clear()
+        product_corpus.invalidate_snapshot(products_dir)
+        filtered = _timed("filtered", lambda: _load_json_products(products_dir, skus=wanted))
+        _timed("old filt.", lambda: old_load_json_products(products_dir, skus=wanted))
+
+        if old != cold:
+            failures += 1
+            differing = [sku for sku in old.keys() | cold.keys() if old.get(sku) != cold.get(sku)]
+            print(f"  corpus differs from old loader for {len(differing)} SKUs, e.g. {differing[:3]}")
+        if filtered != {sku: old[sku] for sku in wanted}:
+            failures += 1
+            print("  filtered load differs from old loader")
+
+    print(f"Failures: {failures}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
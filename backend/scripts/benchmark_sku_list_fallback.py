@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+"""
+Regression benchmark for the pandas fallback of sku_list.list_skus.
+
+Builds a synthetic inventory plus folder-images and eBay listings caches in a
+temp directory (the real caches are not touched), then:
+  - checks that Folder Images / Ebay Listing values and filters match the
+    per-SKU cache helpers (get_folder_image_count / get_sku_has_listing),
+  - times list_skus with those virtual columns filtered and sorted.
+
+Fails (exit 1) on any mismatch or if a request exceeds --max-seconds.
+
+Usage:
+    python scripts/benchmark_sku_list_fallback.py [--rows 20000] [--max-seconds 2.0]
+"""
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(backend_dir / "legacy"))
+
+import pandas as pd
+
+from app.services import ebay_listings_cache, excel_inventory as excel_inventory_module, folder_images_cache, sku_list
+from app.services.excel_inventory import excel_inventory
+
+
+def _build_fixture(tmp_dir: Path, rows: int) -> pd.DataFrame:
+    rng = random.Random(42)
+    skus = [f"JAL{i:05d}" for i in range(rows)] + ["", None]
+
+    counts = {sku: rng.randint(0, 12) for sku in skus if sku and rng.random() < 0.7}
+    (tmp_dir / "folder_images_cache.json").write_text(
+        json.dumps({"timestamp": "2024-01-01T00:00:00", "counts": counts}), encoding="utf-8"
+    )
+
+    listings = []
+    for i in range(0, rows, 3):
+        if rng.random() < 0.1 and i + 2 < rows:
+            sku = f"JAL{i:05d}-JAL{i + 2:05d}"  # range listing
+        elif rng.random() < 0.1 and i + 1 < rows:
+            sku = f"JAL{i:05d}, JAL{i + 1:05d}"  # combined listing
+        else:
+            sku = f"JAL{i:05d}"
+        listings.append({"item_id": str(100000 + i), "sku": sku, "title": f"Item {i}"})
+    (tmp_dir / "ebay_listings_cache.json").write_text(
+        json.dumps({"timestamp": "2024-01-01T00:00:00", "listings": listings}), encoding="utf-8"
+    )
+
+    return pd.DataFrame({
+        "SKU (Old)": skus,
+        "Brand": [rng.choice(["Nike", "Adidas", "Puma"]) for _ in skus],
+        "Price Net": [round(rng.uniform(1, 200), 2) for _ in skus],
+    })
+
+
+def _use_inventory(db_path: Path, df: pd.DataFrame) -> None:
+    """Serve df as the inventory table of the fallback's snapshot."""
+    with sqlite3.connect(db_path) as conn:
+        df.to_sql("inventory", conn, index=False, if_exists="replace")
+    excel_inventory_module._get_db_path = lambda: str(db_path)
+    excel_inventory.invalidate()
+
+
+def _reference(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-row values through the single-SKU cache helpers (the old fallback behaviour)."""
+    def folder(sku):
+        return folder_images_cache.get_folder_image_count(str(sku)) if sku and str(sku).strip() else None
+
+    def listed(sku):
+        return ebay_listings_cache.get_sku_has_listing(str(sku)) if sku and str(sku).strip() else None
+
+    return pd.DataFrame({
+        "SKU (Old)": df["SKU (Old)"],
+        "Folder Images": df["SKU (Old)"].apply(folder),
+        "Ebay Listing": df["SKU (Old)"].apply(listed),
+    })
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--reference-rows", type=int, default=500, help="rows checked against the per-row helpers")
+    parser.add_argument("--max-seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        df = _build_fixture(tmp_dir, args.rows)
+
+        # Point caches at the fixture and force the pandas fallback
+        folder_images_cache._get_cache_path = lambda: tmp_dir / "folder_images_cache.json"
+        ebay_listings_cache.CACHE_FILE = tmp_dir / "ebay_listings_cache.json"
+        sku_list.DB_PATH = tmp_dir / "missing.db"
+        _use_inventory(tmp_dir / "inventory.db", df)
+
+        failures = 0
+
+        # 1) Values match the per-row helpers
+        sample = df.head(args.reference_rows).copy()
+        start = time.perf_counter()
+        ref = _reference(sample)
+        ref_seconds = time.perf_counter() - start
+
+        snapshot = sku_list._VirtualCacheSnapshot()
+        start = time.perf_counter()
+        got_folder = snapshot.folder_image_counts(sample["SKU (Old)"])
+        got_listed = snapshot.ebay_listing_flags(sample["SKU (Old)"])
+        new_seconds = time.perf_counter() - start
+
+        for i, (exp_f, got_f, exp_l, got_l) in enumerate(
+            zip(ref["Folder Images"], got_folder, ref["Ebay Listing"], got_listed)
+        ):
+            exp_f = None if pd.isna(exp_f) else int(exp_f)
+            got_f = None if pd.isna(got_f) else int(got_f)
+            if exp_f != got_f or exp_l != got_l:
+                failures += 1
+                if failures <= 5:
+                    print(f"MISMATCH row {i} sku={sample['SKU (Old)'].iloc[i]!r}: "
+                          f"folder {exp_f} != {got_f} or listing {exp_l} != {got_l}")
+
+        print(f"Per-row helpers ({len(sample)} rows): {ref_seconds:.3f}s")
+        print(f"Snapshot + Series.map ({len(sample)} rows): {new_seconds:.4f}s")
+
+        # 2) End-to-end fallback requests over the full inventory
+        requests = {
+            "filter Folder Images >= 5": dict(filters=[{"column": "Folder Images", "type": "number", "operator": "gte", "value": 5}]),
+            "filter Ebay Listing is_true": dict(filters=[{"column": "Ebay Listing", "type": "boolean", "operator": "is_true"}]),
+            "sort by Folder Images": dict(sort_by="Folder Images", sort_dir="desc"),
+            "sort by Ebay Listing": dict(sort_by="Ebay Listing"),
+        }
+        for label, kwargs in requests.items():
+            start = time.perf_counter()
+            result = sku_list.list_skus(page=1, page_size=50, **kwargs)
+            seconds = time.perf_counter() - start
+            print(f"list_skus [{label}] rows={len(df)} total={result['total']}: {seconds:.3f}s")
+            if seconds > args.max_seconds:
+                failures += 1
+                print(f"  SLOW: exceeds {args.max_seconds:.1f}s")
+
+        # Totals agree with the per-row reference on the sample
+        _use_inventory(tmp_dir / "sample.db", sample)
+        listed_total = sku_list.list_skus(
+            page=1, page_size=10, filters=[{"column": "Ebay Listing", "type": "boolean", "operator": "is_true"}]
+        )["total"]
+        expected_listed = int((ref["Ebay Listing"] == True).sum())  # noqa: E712
+        if listed_total != expected_listed:
+            failures += 1
+            print(f"MISMATCH Ebay Listing total {listed_total} != {expected_listed}")
+
+        print(f"Failures: {failures}")
+        sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
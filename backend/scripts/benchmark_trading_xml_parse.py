@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""
+Benchmark Trading API item parsing: full tree vs streaming iterparse.
+
+Compares, on one large GetMyeBaySelling response:
+  - tree:   ET.fromstring(text) + findall + namespaced findtext per field
+            (the previous implementation, kept here as the reference)
+  - stream: ebay_listings_computation.parse_item_stream (iterparse, items
+            cleared after use, single pass over each item's children)
+and checks both produce identical payloads. Peak memory via tracemalloc.
+
+Pass --fixture with a recorded response (e.g. saved from the API with
+DetailLevel=ReturnAll); otherwise a synthetic one is generated with the
+fake Trading API.
+
+Usage:
+    python scripts/benchmark_trading_xml_parse.py [--fixture response.xml] [--items 5000] [--repeat 3]
+"""
+import argparse
+import io
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(backend_dir / "legacy"))
+
+from fake_trading_api import build_store, my_ebay_selling_xml
+
+from app.services.ebay_listings_computation import (
+    NS,
+    _clean_text,
+    _marketplace_from_url,
+    _parse_bool,
+    _parse_float,
+    _parse_int,
+    parse_item_stream,
+)
+
+
+def _reference_extract(item):
+    def text(path):
+        return item.findtext(path, default="", namespaces=NS)
+
+    view_url = _clean_text(text("e:ListingDetails/e:ViewItemURL"))
+    site = _clean_text(text("e:Site"))
+    price_node = item.find("e:SellingStatus/e:CurrentPrice", namespaces=NS)
+    picture_urls = [
+        _clean_text(node.text or "")
+        for node in item.findall("e:PictureDetails/e:PictureURL", namespaces=NS)
+        if _clean_text(node.text or "")
+    ]
+    primary = _clean_text(text("e:PictureDetails/e:GalleryURL"))
+    if not primary and picture_urls:
+        primary = picture_urls[0]
+    if primary and not picture_urls:
+        picture_urls = [primary]
+    return {
+        "item_id": _clean_text(text("e:ItemID")),
+        "sku": _clean_text(text("e:SKU")),
+        "title": _clean_text(text("e:Title")),
+        "marketplace": site or _marketplace_from_url(view_url),
+        "site": site,
+        "view_url": view_url,
+        "price": _parse_float(_clean_text(text("e:SellingStatus/e:CurrentPrice"))),
+        "currency": _clean_text(price_node.attrib.get("currencyID", "") if price_node is not None else "") or None,
+        "quantity_total": _parse_int(text("e:Quantity")),
+        "quantity_available": _parse_int(text("e:SellingStatus/e:QuantityAvailable")),
+        "quantity_sold": _parse_int(text("e:SellingStatus/e:QuantitySold")),
+        "listing_status": _clean_text(text("e:SellingStatus/e:ListingStatus")) or None,
+        "listing_type": _clean_text(text("e:ListingType")) or None,
+        "start_time": _clean_text(text("e:ListingDetails/e:StartTime")) or None,
+        "end_time": _clean_text(text("e:ListingDetails/e:EndTime")) or None,
+        "condition_id": _parse_int(text("e:ConditionID")),
+        "condition_name": _clean_text(text("e:ConditionDisplayName")) or None,
+        "category_id": _clean_text(text("e:PrimaryCategory/e:CategoryID")) or None,
+        "category_name": _clean_text(text("e:PrimaryCategory/e:CategoryName")) or None,
+        "best_offer_enabled": _parse_bool(text("e:BestOfferDetails/e:BestOfferEnabled")),
+        "primary_image_url": primary or None,
+        "image_urls": picture_urls,
+    }
+
+
+def parse_tree(raw: bytes):
+    root = ET.fromstring(raw.decode("utf-8"))
+    items = root.findall(".//e:ActiveList/e:ItemArray/e:Item", namespaces=NS)
+    return [_reference_extract(item) for item in items]
+
+
+def parse_stream(raw: bytes):
+    _, payloads = parse_item_stream(io.BytesIO(raw), "GetMyeBaySelling")
+    return payloads
+
+
+def _measure(fn, raw: bytes, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(raw)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixture", type=Path, help="recorded GetMyeBaySelling response")
+    parser.add_argument("--items", type=int, default=5000, help="items in the synthetic response")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.fixture:
+        raw = args.fixture.read_bytes()
+    else:
+        store = build_store(args.items, seed_missing_every=0)
+        raw = my_ebay_selling_xml(store, 1, len(store)).encode("utf-8")
+    print(f"Response: {len(raw) / 1024 / 1024:.1f} MB")
+
+    tree_payloads, tree_seconds, tree_peak = _measure(parse_tree, raw, args.repeat)
+    stream_payloads, stream_seconds, stream_peak = _measure(parse_stream, raw, args.repeat)
+
+    print(f"tree   (fromstring + findtext): {len(tree_payloads)} items, {tree_seconds:.3f}s, peak {tree_peak / 1024 / 1024:.1f} MB")
+    print(f"stream (iterparse, one pass):   {len(stream_payloads)} items, {stream_seconds:.3f}s, peak {stream_peak / 1024 / 1024:.1f} MB")
+
+    mismatches = sum(1 for a, b in zip(tree_payloads, stream_payloads) if a != b)
+    mismatches += abs(len(tree_payloads) - len(stream_payloads))
+    print(f"Mismatches: {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
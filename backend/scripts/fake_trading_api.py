@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+"""
+Local fake of the eBay Trading API for sync benchmarks and checks.
+
+Serves GetMyeBaySelling (ActiveList pagination), GetSellerEvents (ModTimeFrom/
+ModTimeTo window of at most 48 hours) and GetItem over plain HTTP from a
+deterministic synthetic store, with a configurable per-request latency.
+GetSellerList answers with a failure when asked for ModTimeFrom/ModTimeTo,
+which the real call does not support.
+Every request is recorded in server.calls as (call_name, page, item id or ModTimeFrom).
+
+Usage from another script:
+    with FakeTradingApi(items=2000, latency=0.2) as api:
+        ebay_listings_computation.TRADING_ENDPOINT = api.url
+        ...
+
+Standalone:
+    python scripts/fake_trading_api.py [--items 2000] [--latency 0.2] [--port 8765]
+"""
+import argparse
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+NS_URI = "urn:ebay:apis:eBLBaseComponents"
+SELLER_EVENTS_MAX_WINDOW = timedelta(hours=48)
+SELLER_EVENTS_MAX_ITEMS = 3000
+
+
+def build_store(items: int, seed_missing_every: int = 7) -> List[Dict[str, Any]]:
+    """Synthetic active listings; every Nth item lacks ConditionID/pictures in GetMyeBaySelling."""
+    store = []
+    for i in range(items):
+        item_id = str(300000000000 + i)
+        store.append({
+            "item_id": item_id,
+            "sku": f"JAL{i:05d}" if i % 11 else f"JAL{i:05d}-JAL{i + 1:05d}",
+            "title": f"Synthetic item {i} & co <test>",
+            "price": f"{5 + (i % 190) + 0.99:.2f}",
+            "quantity": 1 + i % 3,
+            "quantity_sold": i % 2,
+            "condition_id": 1000 if i % 4 else 3000,
+            "category_id": str(11450 + i % 40),
+            "start_time": f"2024-01-{1 + i % 28:02d}T10:00:00.000Z",
+            "pictures": [f"https://i.ebayimg.com/images/g/{item_id}/s-l{n}.jpg" for n in range(1 + i % 4)],
+            "partial": bool(seed_missing_every) and i % seed_missing_every == 0,
+            "status": "Active",
+            "mod_time": "2024-01-01T00:00:00.000Z",
+        })
+    return store
+
+
+def item_xml(item: Dict[str, Any], full: bool = True) -> str:
+    """One <Item> element; full=False leaves out the fields GetMyeBaySelling may omit."""
+    parts = [
+        f"<ItemID>{item['item_id']}</ItemID>",
+        f"<SKU>{escape(item['sku'])}</SKU>",
+        f"<Title>{escape(item['title'])}</Title>",
+        "<Site>Germany</Site>",
+        "<ListingType>FixedPriceItem</ListingType>",
+        f"<Quantity>{item['quantity']}</Quantity>",
+        "<ListingDetails>"
+        f"<StartTime>{item['start_time']}</StartTime>"
+        f"<ViewItemURL>https://www.ebay.de/itm/{item['item_id']}</ViewItemURL>"
+        "</ListingDetails>",
+        "<SellingStatus>"
+        f"<CurrentPrice currencyID=\"EUR\">{item['price']}</CurrentPrice>"
+        f"<QuantitySold>{item['quantity_sold']}</QuantitySold>"
+        f"<QuantityAvailable>{item['quantity'] - item['quantity_sold']}</QuantityAvailable>"
+        f"<ListingStatus>{item.get('status', 'Active')}</ListingStatus>"
+        "</SellingStatus>",
+        f"<PrimaryCategory><CategoryID>{item['category_id']}</CategoryID>"
+        f"<CategoryName>Kleidung &amp; Accessoires:{item['category_id']}</CategoryName></PrimaryCategory>",
+        "<BestOfferDetails><BestOfferEnabled>true</BestOfferEnabled></BestOfferDetails>",
+    ]
+    if full or not item["partial"]:
+        parts.append(f"<ConditionID>{item['condition_id']}</ConditionID>")
+        parts.append("<ConditionDisplayName>Neu mit Etikett</ConditionDisplayName>")
+        if item["pictures"]:
+            parts.append(
+                "<PictureDetails>"
+                f"<GalleryURL>{item['pictures'][0]}</GalleryURL>"
+                + "".join(f"<PictureURL>{url}</PictureURL>" for url in item["pictures"])
+                + "</PictureDetails>"
+            )
+    return "<Item>" + "".join(parts) + "</Item>"
+
+
+def my_ebay_selling_xml(store: List[Dict[str, Any]], page: int, per_page: int) -> str:
+    store = [item for item in store if item.get("status", "Active") == "Active"]
+    total_pages = max(1, -(-len(store) // per_page))
+    chunk = store[(page - 1) * per_page: page * per_page]
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<GetMyeBaySellingResponse xmlns="{NS_URI}">'
+        "<Timestamp>2024-02-01T12:00:00.000Z</Timestamp><Ack>Success</Ack>"
+        "<Version>1231</Version>"
+        "<ActiveList><ItemArray>"
+        + "".join(item_xml(item, full=False) for item in chunk)
+        + "</ItemArray>"
+        f"<PaginationResult><TotalNumberOfPages>{total_pages}</TotalNumberOfPages>"
+        f"<TotalNumberOfEntries>{len(store)}</TotalNumberOfEntries></PaginationResult>"
+        "</ActiveList></GetMyeBaySellingResponse>"
+    )
+
+
+def seller_events_xml(store: List[Dict[str, Any]], mod_from: str, mod_to: str) -> str:
+    """Items (any status) whose mod_time lies in [mod_from, mod_to]; timestamps compare as strings."""
+    if _parse_time(mod_to) - _parse_time(mod_from) > SELLER_EVENTS_MAX_WINDOW:
+        return failure_xml("GetSellerEvents", "21917", "Invalid time range", "ModTimeFrom to ModTimeTo exceeds 48 hours.")
+    changed = [item for item in store if mod_from <= item["mod_time"] <= mod_to][:SELLER_EVENTS_MAX_ITEMS]
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<GetSellerEventsResponse xmlns="{NS_URI}">'
+        "<Timestamp>2024-02-01T12:00:00.000Z</Timestamp><Ack>Success</Ack>"
+        f"<TimeTo>{mod_to}</TimeTo>"
+        "<ItemArray>"
+        + "".join(item_xml(item, full=True) for item in changed)
+        + "</ItemArray></GetSellerEventsResponse>"
+    )
+
+
+def failure_xml(call_name: str, code: str, short_message: str, long_message: str) -> str:
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?><{call_name}Response xmlns="{NS_URI}">'
+        f"<Ack>Failure</Ack><Errors><ShortMessage>{escape(short_message)}</ShortMessage>"
+        f"<LongMessage>{escape(long_message)}</LongMessage><ErrorCode>{code}</ErrorCode></Errors>"
+        f"</{call_name}Response>"
+    )
+
+
+def get_item_xml(item: Optional[Dict[str, Any]]) -> str:
+    if item is None:
+        return failure_xml("GetItem", "17", "Invalid item", "Item not found.")
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?><GetItemResponse xmlns="{NS_URI}">'
+        "<Ack>Success</Ack>" + item_xml(item, full=True) + "</GetItemResponse>"
+    )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, format, *args):  # noqa: A002 - silence default stderr logging
+        pass
+
+    def do_POST(self):
+        server: "FakeTradingApi" = self.server.api  # type: ignore[attr-defined]
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode("utf-8")
+        call_name = self.headers.get("X-EBAY-API-CALL-NAME", "")
+        key, payload = server.respond(call_name, body)
+        server.record(call_name, key)
+        if server.latency:
+            time.sleep(server.latency)
+        data = payload.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FakeTradingApi:
+    """Threaded local Trading API; use as a context manager."""
+
+    def __init__(self, items: int = 2000, latency: float = 0.0, port: int = 0, store: Optional[List[Dict[str, Any]]] = None):
+        self.store = store if store is not None else build_store(items)
+        self.latency = latency
+        self.calls: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.api = self  # type: ignore[attr-defined]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/ws/api.dll"
+
+    def record(self, call_name: str, key: str) -> None:
+        with self._lock:
+            self.calls.append((call_name, key))
+
+    def respond(self, call_name: str, body: str) -> Tuple[str, str]:
+        if call_name == "GetMyeBaySelling":
+            page = int(_tag(body, "PageNumber") or 1)
+            per_page = int(_tag(body, "EntriesPerPage") or 200)
+            return str(page), my_ebay_selling_xml(self.store, page, per_page)
+        if call_name == "GetSellerEvents":
+            mod_from = _tag(body, "ModTimeFrom") or ""
+            mod_to = _tag(body, "ModTimeTo") or ""
+            if not mod_from or not mod_to:
+                return mod_from, failure_xml(call_name, "21916", "Missing time filter", "ModTimeFrom and ModTimeTo are required.")
+            return mod_from, seller_events_xml(self.store, mod_from, mod_to)
+        if call_name == "GetSellerList" and ("<ModTimeFrom>" in body or "<ModTimeTo>" in body):
+            # GetSellerList filters by StartTime/EndTime ranges only
+            return "", failure_xml(call_name, "10007", "Unsupported filter", "ModTimeFrom/ModTimeTo are not GetSellerList fields.")
+        if call_name == "GetItem":
+            item_id = _tag(body, "ItemID") or ""
+            item = next((it for it in self.store if it["item_id"] == item_id), None)
+            return item_id, get_item_xml(item)
+        return "", f'<?xml version="1.0"?><{call_name}Response xmlns="{NS_URI}"><Ack>Failure</Ack></{call_name}Response>'
+
+    def __enter__(self) -> "FakeTradingApi":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _tag(body: str, name: str) -> Optional[str]:
+    match = re.search(rf"<{name}>([^<]*)</{name}>", body)
+    return match.group(1).strip() if match else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    with FakeTradingApi(items=args.items, latency=args.latency, port=args.port) as api:
+        print(f"Fake Trading API on {api.url} ({args.items} items, {args.latency:.2f}s latency). Ctrl+C to stop.")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -120,9 +120,11 @@ def main():
                         }
                         schema_data['_metadata']['fees'] = new_fees
                         
-                        # Write back
-                        with open(schema_file, 'w', encoding='utf-8') as f:
+                        # Write back atomically (bumps the schemas dir mtime for the catalogue index)
+                        tmp_path = schema_file.with_suffix(".tmp.json")
+                        with open(tmp_path, 'w', encoding='utf-8') as f:
                             json.dump(schema_data, f, indent=2, ensure_ascii=False)
+                        tmp_path.replace(schema_file)
                         
                         log_message(f"   ✅ FIXED - Added fees to schema file")
                         fixed_count += 1
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+"""
+Check the bulk update_db_from_jsons against the previous per-SKU version.
+
+Builds a synthetic inventory table in a temp SQLite file from the product
+JSONs (every Nth SKU missing, some values stale), then runs
+  - the previous implementation (taken from git, revision --baseline)
+  - the current bulk implementation
+on identical copies and checks both leave identical tables and counts.
+The "all, append" result is then imported again (a no-op re-run), once as is
+and once with "Total Cost Net" left out of the JSON fields (so the column is
+only computed from Price Net + Shipping Net); both must change no rows.
+The real inventory.db is not touched.
+
+Usage:
+    python scripts/verify_bulk_db_import.py [--baseline HEAD~1] [--missing-every 10] [--stale-every 3]
+"""
+import argparse
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(backend_dir / "legacy"))
+
+import config  # type: ignore
+
+from app.services import inventory_json_db_importer
+from app.services.inventory_json_importer import _load_json_products
+
+
+def _load_baseline(revision: str) -> types.ModuleType:
+    source = subprocess.run(
+        ["git", "show", f"{revision}:backend/app/services/inventory_json_db_importer.py"],
+        cwd=backend_dir, capture_output=True, text=True, check=True,
+    ).stdout
+    module = types.ModuleType("inventory_json_db_importer_baseline")
+    module.__file__ = inventory_json_db_importer.__file__
+    exec(compile(source, "inventory_json_db_importer_baseline", "exec"), module.__dict__)
+    return module
+
+
+def _build_db(path: Path, incoming, missing_every: int, stale_every: int) -> None:
+    sku_col = config.SKU_COLUMN
+    cols = {sku_col, "JSON", "Images", "Folder Images", "Status", "Total Cost Net"}
+    for flat in incoming.values():
+        cols.update(flat)
+    cols = [sku_col] + sorted(c for c in cols if c != sku_col)
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE inventory (" + ", ".join(f'"{c}"' for c in cols) + ")")
+        rows = []
+        for i, (sku, flat) in enumerate(sorted(incoming.items())):
+            if missing_every and i % missing_every == 0:
+                continue
+            row = {c: flat.get(c) for c in cols}
+            row[sku_col] = sku
+            if stale_every and i % stale_every == 0:
+                for c in list(row)[1:6]:
+                    row[c] = "stale"
+                row["Status"] = "OK" if i % 2 else "stale"
+            rows.append([row[c] for c in cols])
+        conn.executemany(f"INSERT INTO inventory VALUES ({','.join('?' * len(cols))})", rows)
+
+
+def _dump(path: Path):
+    with sqlite3.connect(path) as conn:
+        return sorted(conn.execute("SELECT * FROM inventory").fetchall(), key=repr)
+
+
+def _without_json_field(module, field: str) -> None:
+    """Make module import the product JSONs with field left out."""
+    def load(products_dir, skus=None):
+        products = _load_json_products(products_dir, skus=skus)
+        return {sku: {k: v for k, v in flat.items() if k != field} for sku, flat in products.items()}
+    module._load_json_products = load
+
+
+def _run(module, db_path: Path, **kwargs):
+    module._get_db_path = lambda: str(db_path)
+    start = time.perf_counter()
+    result = module.update_db_from_jsons(**kwargs)
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--baseline", default="HEAD~1")
+    parser.add_argument("--missing-every", type=int, default=10)
+    parser.add_argument("--stale-every", type=int, default=3)
+    args = parser.parse_args()
+
+    baseline = _load_baseline(args.baseline)
+    incoming = _load_json_products(Path(config.PRODUCTS_FOLDER_PATH))
+    failures = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template = Path(tmp) / "template.db"
+        _build_db(template, incoming, args.missing_every, args.stale_every)
+
+        cases = {
+            "all, append": dict(append_missing=True),
+            "all, no append": dict(append_missing=False),
+            "5 SKUs": dict(skus=sorted(incoming)[:5], append_missing=True),
+            "empty SKU list": dict(skus=[], append_missing=True),
+        }
+        for n, (label, kwargs) in enumerate(cases.items()):
+            # Fresh file names per case: pooled connections keep earlier files (and their WAL) open
+            old_db, new_db = Path(tmp) / f"old{n}.db", Path(tmp) / f"new{n}.db"
+            shutil.copy(template, old_db)
+            shutil.copy(template, new_db)
+            old_result, old_seconds = _run(baseline, old_db, **kwargs)
+            new_result, new_seconds = _run(inventory_json_db_importer, new_db, **kwargs)
+            print(f"{label:<15} old {old_seconds:.3f}s  bulk {new_seconds:.3f}s  "
+                  f"updated={new_result['updated']} appended={new_result['appended']} timings={new_result['timings']}")
+            for key in ("processed", "updated", "appended"):
+                if old_result[key] != new_result[key]:
+                    failures += 1
+                    print(f"  {key}: old {old_result[key]} != bulk {new_result[key]}")
+            if _dump(old_db) != _dump(new_db):
+                failures += 1
+                print("  resulting tables differ")
+        top = list(new_result["column_changes"].items())[:5]
+        print(f"column_changes (last case, top 5): {top}")
+
+        # No-op re-runs on the tables the first case produced
+        old_db, new_db = Path(tmp) / "old0.db", Path(tmp) / "new0.db"
+        for label in ("re-run", "re-run, computed Total Cost Net"):
+            if label != "re-run":
+                _without_json_field(baseline, "Total Cost Net")
+                _without_json_field(inventory_json_db_importer, "Total Cost Net")
+            old_result, _ = _run(baseline, old_db, **cases["all, append"])
+            new_result, new_seconds = _run(inventory_json_db_importer, new_db, **cases["all, append"])
+            print(f"{label:<15} bulk {new_seconds:.3f}s  updated={new_result['updated']} "
+                  f"appended={new_result['appended']} column_changes={new_result['column_changes']}")
+            for key in ("processed", "updated", "appended"):
+                if old_result[key] != new_result[key]:
+                    failures += 1
+                    print(f"  {key}: old {old_result[key]} != bulk {new_result[key]}")
+            if new_result["updated"] or new_result["appended"]:
+                failures += 1
+                print("  re-running the same import changed rows")
+            if _dump(old_db) != _dump(new_db):
+                failures += 1
+                print("  resulting tables differ")
+
+    print(f"Failures: {failures}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+"""
+Check cross-worker cache coordination (app/repositories/cache_coordination.py).
+
+Works on a synthetic inventory.db and a cache_state.db in a temp folder:
+  1. N worker processes hit a cold inventory_fast at the same time, first
+     without coordination (cache_state.db unusable) and then with it; with
+     coordination exactly one rebuilds and the others adopt its facets
+  2. excel_inventory.invalidate() in one worker makes another worker reload
+     its inventory DataFrame
+  3. invalidate_profit_caches() in one worker drops the fee caches of another
+  4. a committed write through the pooled (WAL) connection, which leaves
+     inventory.db's mtime and size unchanged, still refreshes the SKU cost
+     caches without any invalidate call
+  5. a product JSON rewritten through sku_json_repo in another worker
+     refreshes the JSON "Total Cost Net" fallback of a SKU missing from
+     inventory
+
+Usage:
+    python scripts/verify_cache_coordination.py [--workers 4] [--rows 20000]
+"""
+import argparse
+import multiprocessing
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(backend_dir / "legacy"))
+
+import config
+
+from app.repositories import cache_coordination, product_doc_store, sku_json_repo
+from app.repositories.sqlite_db import connection
+from app.services import ebay_category_fees, ebay_profit_calculator, excel_inventory as excel_inventory_module, sku_list
+from app.services.excel_inventory import excel_inventory
+
+
+def _build_inventory(path: Path, rows: int) -> None:
+    rng = random.Random(7)
+    brands = [f"Brand {i}" for i in range(25)]
+    with sqlite3.connect(path) as conn:
+        conn.execute('CREATE TABLE inventory ("SKU (Old)", "Status", "Brand", "Category", "Price Net", "Purchase Date")')
+        conn.executemany(
+            "INSERT INTO inventory VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    f"P{i:07d}",
+                    rng.choice(["OK", "Sold", "Listed"]),
+                    rng.choice(brands),
+                    f"Category {rng.randrange(300)}",
+                    f"{rng.uniform(1, 500):.2f}",
+                    f"2024-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+                )
+                for i in range(rows)
+            ],
+        )
+
+
+def _use(tmp: Path, state_db: Path) -> None:
+    sku_list.DB_PATH = tmp / "inventory.db"
+    excel_inventory_module._get_db_path = lambda: str(tmp / "inventory.db")
+    cache_coordination.CACHE_STATE_DB_PATH = state_db
+
+
+def _cold_start_worker(tmp: str, state_db: str, barrier, results) -> None:
+    _use(Path(tmp), Path(state_db))
+    rebuilds = []
+    rebuild = sku_list._rebuild_fast_table
+
+    def _counting_rebuild(now):
+        rebuilds.append(now)
+        rebuild(now)
+
+    sku_list._rebuild_fast_table = _counting_rebuild
+    barrier.wait()
+    start = time.perf_counter()
+    sku_list._ensure_fast_table(refreshed_recently_ok=True)
+    results.put((
+        len(rebuilds),
+        time.perf_counter() - start,
+        sku_list._FAST_TABLE_GENERATION,
+        sorted(sku_list._get_fast_table_column_types().items()),
+    ))
+
+
+def _cold_start(ctx, tmp: Path, state_db: Path, workers: int):
+    with sqlite3.connect(tmp / "inventory.db") as conn:
+        conn.execute(f"DROP TABLE IF EXISTS {sku_list.FAST_TABLE_NAME}")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    start = time.perf_counter()
+    procs = [ctx.Process(target=_cold_start_worker, args=(str(tmp), str(state_db), barrier, results)) for _ in range(workers)]
+    for proc in procs:
+        proc.start()
+    out = [results.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+    return out, time.perf_counter() - start
+
+
+def _invalidate_worker(tmp: str, state_db: str) -> None:
+    _use(Path(tmp), Path(state_db))
+    with sqlite3.connect(Path(tmp) / "inventory.db") as conn:
+        conn.execute("INSERT INTO inventory (\"SKU (Old)\") VALUES ('P9999999')")
+    excel_inventory.invalidate()
+    ebay_profit_calculator.invalidate_profit_caches()
+
+
+def _product_json_worker(tmp: str, state_db: str, cost: float) -> None:
+    _use(Path(tmp), Path(state_db))
+    config.PRODUCTS_FOLDER_PATH = str(Path(tmp) / "products")
+    product_doc_store.PRODUCT_DOCS_DB_PATH = Path(tmp) / "product_docs.db"
+    sku_json_repo.update_sku_json("J0000001", lambda product: product.setdefault("Price Data", {}).update({"Total Cost Net": cost}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp_name:
+        tmp = Path(tmp_name)
+        _build_inventory(tmp / "inventory.db", args.rows)
+        state_db = tmp / "cache_state.db"
+        # A regular file in place of the folder makes cache_state.db unusable
+        (tmp / "no_state").write_text("")
+        unusable_state_db = tmp / "no_state" / "cache_state.db"
+
+        # 1. Cold inventory_fast in every worker at once
+        for label, path in (("uncoordinated", unusable_state_db), ("coordinated", state_db)):
+            out, elapsed = _cold_start(ctx, tmp, path, args.workers)
+            rebuilds = sum(r[0] for r in out)
+            print(
+                f"{label:<14} {args.workers} workers: {rebuilds} inventory_fast rebuilds, "
+                f"{elapsed:.2f}s wall, slowest worker {max(r[1] for r in out):.2f}s"
+            )
+            if label == "coordinated":
+                if rebuilds != 1:
+                    failures += 1
+                    print(f"  expected exactly one rebuild, got {rebuilds}")
+                if len({(r[2], repr(r[3])) for r in out}) != 1 or not out[0][3]:
+                    failures += 1
+                    print("  workers ended with different generations or column types")
+
+        # 2./3. Invalidation from another worker
+        _use(tmp, state_db)
+        before = len(excel_inventory.load())
+        ebay_category_fees._indexes[ebay_category_fees.SCHEMA] = {"1": {"payment_fee": 0.35, "sales_commission_percentage": 12.0}}
+        ebay_profit_calculator._PROFIT_CACHES_WATCH.sync()
+        proc = ctx.Process(target=_invalidate_worker, args=(str(tmp), str(state_db)))
+        proc.start()
+        proc.join()
+        time.sleep(cache_coordination.GENERATION_CHECK_SECONDS + 0.1)
+
+        after = len(excel_inventory.load())
+        print(f"inventory DataFrame rows before/after another worker's invalidate: {before}/{after}")
+        if after != before + 1:
+            failures += 1
+            print("  DataFrame was not reloaded")
+        ebay_profit_calculator._ensure_fee_caches_current()
+        if ebay_category_fees._indexes:
+            failures += 1
+            print("  fee cache survived another worker's invalidate_profit_caches()")
+
+        # 4. Cost caches follow WAL commits
+        db_path = tmp / "inventory.db"
+        ebay_profit_calculator.INVENTORY_DB_PATH = db_path
+        with connection(db_path) as conn:
+            conn.execute('ALTER TABLE inventory ADD COLUMN "Total Cost Net"')
+            conn.execute('UPDATE inventory SET "Total Cost Net" = 10.0 WHERE "SKU (Old)" = \'P0000000\'')
+            conn.commit()
+        time.sleep(excel_inventory_module.VERSION_CHECK_SECONDS + 0.1)
+        cost_before = ebay_profit_calculator.get_total_cost_net_for_sku("P0000000")
+        stamp = (db_path.stat().st_mtime_ns, db_path.stat().st_size)
+        with connection(db_path) as conn:
+            conn.execute('UPDATE inventory SET "Total Cost Net" = 25.5 WHERE "SKU (Old)" = \'P0000000\'')
+            conn.commit()
+        stamp_unchanged = stamp == (db_path.stat().st_mtime_ns, db_path.stat().st_size)
+        time.sleep(excel_inventory_module.VERSION_CHECK_SECONDS + 0.1)
+        cost_after = ebay_profit_calculator.get_total_cost_net_for_sku("P0000000")
+        print(
+            f"Total Cost Net of P0000000 before/after a WAL commit: {cost_before}/{cost_after} "
+            f"(inventory.db mtime/size unchanged: {stamp_unchanged})"
+        )
+        if cost_before != 10.0 or cost_after != 25.5:
+            failures += 1
+            print("  cost caches kept the value from before the commit")
+
+        # 5. JSON cost fallbacks follow product JSON writes in other workers
+        ebay_profit_calculator.PRODUCTS_DIR = tmp / "products"
+        ebay_profit_calculator.PRODUCTS_DIR.mkdir()
+        for cost in (12.0, 19.9):
+            proc = ctx.Process(target=_product_json_worker, args=(str(tmp), str(state_db), cost))
+            proc.start()
+            proc.join()
+            time.sleep(cache_coordination.GENERATION_CHECK_SECONDS + 0.1)
+            json_cost = ebay_profit_calculator.get_total_cost_net_for_sku("J0000001")
+            print(f"JSON-only Total Cost Net after another worker wrote {cost}: {json_cost}")
+            if json_cost != cost:
+                failures += 1
+                print("  JSON cost fallback kept the value from before the write")
+
+    print(f"Failures: {failures}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+"""
+Check the unified category fee resolver (app/services/ebay_category_fees.py).
+
+Works on a synthetic schemas/ folder (category_mapping.json plus schema files)
+and inventory.db in a temp folder:
+  1. ebay_schema.get_category_fees and ebay_profit_calculator.get_category_fees
+     return what the previous per-call lookups returned, for mapping, schema,
+     inventory-only and unknown categories
+  2. timing of one lookup per category: filtering the cached DataFrame (as
+     before) vs. the resolver's index, cold and warm
+  3. a fee changed in the inventory table is picked up without invalidation
+
+Usage:
+    python scripts/verify_category_fees.py [--rows 20000] [--categories 300]
+"""
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(backend_dir / "legacy"))
+
+import pandas as pd
+
+from app.repositories import cache_coordination, ebay_schema_catalog_repo
+from app.services import ebay_category_fees, ebay_profit_calculator, ebay_schema
+from app.services import excel_inventory as excel_inventory_module
+from app.services.excel_inventory import excel_inventory
+
+
+def _build_fixture(tmp: Path, rows: int, categories: int):
+    """Category ids, split into mapping / schema / unknown (the rest of the first 3/4 are inventory-only)."""
+    rng = random.Random(5)
+    ids = [str(10000 + 7 * i) for i in range(categories)]
+    mapping_ids = ids[: categories // 3]
+    schema_ids = ids[categories // 4: categories // 2]          # overlaps the mapping ids
+    inventory_ids = ids[: (categories * 3) // 4]                 # beyond both for the last part
+    unknown_ids = ids[(categories * 3) // 4:]
+
+    schemas_dir = tmp / "schemas"
+    schemas_dir.mkdir()
+    mapping_rows = [
+        {
+            "categoryId": cat_id,
+            "fullPath": f"Root/Category {cat_id}",
+            "categoryName": f"Category {cat_id}",
+            "fees": {
+                "payment_fee": round(rng.uniform(0.1, 0.5), 2),
+                "sales_commission_up_to": rng.choice([6.5, 11.0, 12.0, None]),
+            },
+        }
+        for cat_id in mapping_ids
+    ]
+    (schemas_dir / "category_mapping.json").write_text(json.dumps({"categoryMappings": mapping_rows}), encoding="utf-8")
+    for cat_id in schema_ids:
+        fees = {"payment_fee": rng.choice([0.35, None]), "sales_commission_percentage": rng.choice([9.0, 12.5])}
+        body = {"_metadata": {"category_id": cat_id, "category_name": f"Category {cat_id}", "fees": fees}}
+        (schemas_dir / f"EbayCat_{cat_id}_Category.json").write_text(json.dumps(body), encoding="utf-8")
+
+    inventory_fees = {cat_id: (round(rng.uniform(0.1, 0.5), 2), rng.choice([8.0, 11.0, None])) for cat_id in inventory_ids}
+    with sqlite3.connect(tmp / "inventory.db") as conn:
+        conn.execute('CREATE TABLE inventory ("SKU (Old)", "Brand", "eBay Category ID", "Payment Fee €", "Sales Commission % up to 7500€")')
+        conn.executemany(
+            "INSERT INTO inventory VALUES (?, ?, ?, ?, ?)",
+            [
+                (f"P{i:07d}", f"Brand {i % 40}", int(cat_id), *inventory_fees[cat_id])
+                for i, cat_id in ((i, rng.choice(inventory_ids)) for i in range(rows))
+            ]
+            + [(f"N{i:07d}", "Brand 0", None, None, None) for i in range(50)],
+        )
+    return schemas_dir, ids, {"mapping": mapping_ids, "schema": schema_ids, "unknown": unknown_ids}
+
+
+def _reference_schema_fees(category_id: str, df: pd.DataFrame):
+    """ebay_schema.get_category_fees before the resolver (cached inventory DataFrame filtered per call)."""
+    entry = ebay_schema_catalog_repo.mapping_by_id().get(str(category_id).strip())
+    if entry:
+        mapping_fees = ebay_category_fees.normalize_fees(entry.get("fees", {}))
+        if mapping_fees:
+            return mapping_fees
+    category_row = df[df["eBay Category ID"] == int(category_id)]
+    if category_row.empty:
+        return {}
+    fees = {}
+    payment_fee = category_row["Payment Fee €"].iloc[0]
+    if pd.notna(payment_fee):
+        fees["payment_fee"] = float(payment_fee)
+    commission = category_row["Sales Commission % up to 7500€"].iloc[0]
+    if pd.notna(commission):
+        fees["sales_commission_percentage"] = float(commission)
+    return fees
+
+
+def _reference_profit_fees(category_id: str):
+    """ebay_profit_calculator.get_category_fees before the resolver (mapping, then schema files)."""
+    cat_id = str(category_id).strip()
+    mapping = {}
+    for entry in ebay_schema_catalog_repo.mapping_rows():
+        fees = entry.get("fees") or {}
+        commission = fees.get("sales_commission_percentage")
+        if commission is None:
+            commission = fees.get("sales_commission_up_to")
+        mapping[str(entry.get("categoryId") or "").strip()] = {
+            "payment_fee": float(fees["payment_fee"]) if fees.get("payment_fee") is not None else 0.0,
+            "sales_commission_percentage": float(commission) if commission is not None else 0.0,
+        }
+    if cat_id in mapping:
+        return mapping[cat_id]
+    fees = ebay_schema_catalog_repo.schema_fees_by_category_id().get(cat_id)
+    if fees:
+        payment_fee, commission = fees.get("payment_fee", 0.0), fees.get("sales_commission_percentage", 0.0)
+        return {
+            "payment_fee": float(payment_fee) if payment_fee is not None else 0.0,
+            "sales_commission_percentage": float(commission) if commission is not None else 0.0,
+        }
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--categories", type=int, default=300)
+    args = parser.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp_name:
+        tmp = Path(tmp_name)
+        schemas_dir, ids, groups = _build_fixture(tmp, args.rows, args.categories)
+        ebay_schema_catalog_repo.SCHEMAS_DIR = schemas_dir
+        ebay_schema_catalog_repo.MAPPING_FILE = schemas_dir / "category_mapping.json"
+        ebay_schema_catalog_repo.SIDECAR_FILE = tmp / "ebay_schema_catalog.json"
+        ebay_schema_catalog_repo.invalidate_catalog()
+        excel_inventory_module._get_db_path = lambda: str(tmp / "inventory.db")
+        cache_coordination.CACHE_STATE_DB_PATH = tmp / "cache_state.db"
+        excel_inventory.invalidate()
+        ebay_category_fees.invalidate()
+
+        # 1. Same answers as before
+        with sqlite3.connect(tmp / "inventory.db") as conn:
+            old_df = pd.read_sql("SELECT * FROM inventory", conn)
+        start = time.perf_counter()
+        expected_schema = {cat_id: _reference_schema_fees(cat_id, old_df) for cat_id in ids}
+        old_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        got_schema = {cat_id: ebay_schema.get_category_fees(cat_id) for cat_id in ids}
+        new_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        again = {cat_id: ebay_schema.get_category_fees(cat_id) for cat_id in ids}
+        warm_seconds = time.perf_counter() - start
+
+        schema_mismatches = [c for c in ids if expected_schema[c] != got_schema[c] or again[c] != got_schema[c]]
+        profit_mismatches = [c for c in ids if _reference_profit_fees(c) != ebay_profit_calculator.get_category_fees(c)]
+        for label, mismatches in (("ebay_schema", schema_mismatches), ("ebay_profit_calculator", profit_mismatches)):
+            print(f"{label}.get_category_fees: {len(ids) - len(mismatches)}/{len(ids)} categories match")
+            if mismatches:
+                failures += 1
+                print(f"  differing categories (first 5): {mismatches[:5]}")
+
+        # 2. Timing
+        print(
+            f"{len(ids)} lookups over {args.rows} inventory rows: previous {old_seconds:.2f}s, "
+            f"resolver {new_seconds:.3f}s cold (incl. index build) / {warm_seconds:.4f}s warm"
+        )
+        if warm_seconds >= old_seconds:
+            failures += 1
+            print("  resolver lookups are not faster than filtering the DataFrame")
+
+        # 3. Inventory change picked up by version
+        inventory_only = [c for c in ids if c not in groups["mapping"] and c not in groups["schema"] and got_schema[c]]
+        cat_id = inventory_only[0]
+        with sqlite3.connect(tmp / "inventory.db") as conn:
+            conn.execute('UPDATE inventory SET "Payment Fee €" = 0.99 WHERE "eBay Category ID" = ?', (int(cat_id),))
+        time.sleep(excel_inventory_module.VERSION_CHECK_SECONDS + 0.1)
+        updated = ebay_schema.get_category_fees(cat_id)
+        print(f"after an inventory UPDATE: category {cat_id} fees {updated}")
+        if updated.get("payment_fee") != 0.99:
+            failures += 1
+            print("  inventory fee change was not picked up")
+
+    print(f"Failures: {failures}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+"""
+Check the delta eBay listings sync against a local fake Trading API.
+
+Uses temp copies of the listings cache / sync state (the real ones are not
+touched):
+  1. first compute_ebay_listings_delta without sync state -> full fetch
+  2. modifies, ends and adds items in the fake store
+  3. second compute_ebay_listings_delta -> GetSellerEvents for the window only
+and checks that the delta result matches a full fast fetch of the changed
+store, that no GetMyeBaySelling pages were requested by the delta run and
+that profit was recomputed only for the changed rows. Then:
+  4. a last sync 5 days ago is read in 48 hour GetSellerEvents windows
+  5. a last sync older than DELTA_SYNC_MAX_AGE runs a full fetch
+  6. a window with more changes than GetSellerEvents returns runs a full fetch
+The fake API rejects ModTimeFrom/ModTimeTo on GetSellerList and GetSellerEvents
+windows over 48 hours, so the delta cannot pass through the wrong call.
+
+Usage:
+    python scripts/verify_delta_listing_sync.py [--items 3000] [--latency 0.05]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(backend_dir / "legacy"))
+
+from fake_trading_api import FakeTradingApi
+
+from app.services import ebay_listings_cache, ebay_listings_computation, ebay_oauth
+
+COMPARED_FIELDS = ("item_id", "sku", "title", "price", "quantity_total", "quantity_available", "quantity_sold",
+                   "listing_status", "condition_id", "category_id", "image_urls")
+
+
+def _run(gen):
+    complete = None
+    for event in gen:
+        if event["status"] == "error":
+            raise RuntimeError(event["message"])
+        if event["status"] == "complete":
+            complete = event
+    return complete
+
+
+def _call_counts(api):
+    calls = {}
+    for call, _ in api.calls:
+        calls[call] = calls.get(call, 0) + 1
+    return calls
+
+
+def _snapshot():
+    listings = (ebay_listings_cache.read_cache() or {}).get("listings", [])
+    return {l["item_id"]: tuple(str(l.get(f)) for f in COMPARED_FIELDS) for l in listings}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=3000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    failures = 0
+    profit_rows = []
+    original_enrich = ebay_listings_computation._enrich_listings_with_profit
+
+    def counting_enrich(listings, vectorized=True):
+        profit_rows.append(len(listings))
+        return original_enrich(listings, vectorized=vectorized)
+
+    with tempfile.TemporaryDirectory() as tmp, FakeTradingApi(items=args.items, latency=args.latency) as api:
+        tmp_dir = Path(tmp)
+        ebay_listings_cache.CACHE_FILE = tmp_dir / "ebay_listings_cache.json"
+        ebay_listings_cache.SYNC_STATE_FILE = tmp_dir / "ebay_listings_sync_state.json"
+        ebay_listings_computation.TRADING_ENDPOINT = api.url
+        ebay_listings_computation._enrich_listings_with_profit = counting_enrich
+        ebay_oauth.get_access_token = lambda: "fake-token"
+
+        # 1) No sync state yet -> full fetch
+        start = time.perf_counter()
+        first = _run(ebay_listings_computation.compute_ebay_listings_delta())
+        print(f"First sync: mode={first.get('mode')} count={first['count']} in {time.perf_counter() - start:.2f}s")
+        if first.get("mode") != "full" or first["count"] != args.items:
+            failures += 1
+            print("  expected a full fetch of every item")
+
+        # 2) Change the store: 25 price changes, 7 ended, 5 new listings
+        now = time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime())
+        for item in api.store[100:125]:
+            item["price"] = f"{float(item['price']) + 10:.2f}"
+            item["mod_time"] = now
+        for item in api.store[500:507]:
+            item["status"] = "Completed"
+            item["mod_time"] = now
+        for i in range(5):
+            new_item = dict(api.store[i], item_id=str(400000000000 + i), sku=f"NEW{i:05d}", mod_time=now, partial=True)
+            api.store.append(new_item)
+
+        # 3) Delta
+        api.calls.clear()
+        profit_rows.clear()
+        start = time.perf_counter()
+        delta = _run(ebay_listings_computation.compute_ebay_listings_delta())
+        seconds = time.perf_counter() - start
+        print(f"Delta sync: mode={delta.get('mode')} changed={delta.get('changed')} added={delta.get('added')} "
+              f"updated={delta.get('updated')} removed={delta.get('removed')} detail_lookups={delta.get('detail_lookups')} "
+              f"count={delta['count']} in {seconds:.2f}s")
+        calls = _call_counts(api)
+        print(f"  API calls: {calls}, profit rows recomputed: {sum(profit_rows)}")
+
+        expected = {"mode": "delta", "changed": 37, "added": 5, "updated": 25, "removed": 7}
+        for key, value in expected.items():
+            if delta.get(key) != value:
+                failures += 1
+                print(f"  {key}: {delta.get(key)} != {value}")
+        if calls.get("GetMyeBaySelling"):
+            failures += 1
+            print("  delta run requested GetMyeBaySelling pages")
+        if sum(profit_rows) != 30:
+            failures += 1
+            print(f"  profit recomputed for {sum(profit_rows)} rows, expected 30")
+        delta_snapshot = _snapshot()
+
+        # Reference: full fast fetch of the same store into a fresh cache
+        ebay_listings_cache.CACHE_FILE = tmp_dir / "reference_cache.json"
+        start = time.perf_counter()
+        _run(ebay_listings_computation.compute_ebay_listings_fast())
+        print(f"Full fast fetch (reference): {time.perf_counter() - start:.2f}s")
+        reference_snapshot = _snapshot()
+
+        if delta_snapshot.keys() != reference_snapshot.keys():
+            failures += 1
+            print(f"  item ids differ: {len(delta_snapshot.keys() ^ reference_snapshot.keys())} mismatched")
+        # The fast fetch lacks condition/pictures for partial items, so compare only rows it fully knows
+        differing = [
+            item_id for item_id, row in reference_snapshot.items()
+            if item_id in delta_snapshot and row != delta_snapshot[item_id] and "None" not in row and "[]" not in row
+        ]
+        if differing:
+            failures += 1
+            print(f"  {len(differing)} rows differ from the full fetch, e.g. {differing[:3]}")
+
+        # 4) Long gap -> several GetSellerEvents windows
+        ebay_listings_cache.CACHE_FILE = tmp_dir / "ebay_listings_cache.json"
+        sync_started = datetime.now(timezone.utc)
+        ebay_listings_cache.write_sync_state(sync_started - timedelta(days=5), "delta")
+        old_change = (sync_started - timedelta(days=4)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        for item in api.store[200:210]:
+            item["price"] = f"{float(item['price']) + 1:.2f}"
+            item["mod_time"] = old_change
+        api.calls.clear()
+        gap = _run(ebay_listings_computation.compute_ebay_listings_delta())
+        calls = _call_counts(api)
+        print(f"5 day gap: mode={gap.get('mode')} windows={gap.get('total_pages')} changed={gap.get('changed')} "
+              f"updated={gap.get('updated')} API calls: {calls}")
+        if gap.get("mode") != "delta" or gap.get("total_pages") != 3 or calls.get("GetSellerEvents") != 3:
+            failures += 1
+            print("  expected a delta over 3 GetSellerEvents windows")
+        # The 25+7+5 changes of step 2 are still in the window; the 5 new items are cached now
+        if gap.get("changed") != 47 or gap.get("updated") != 40:
+            failures += 1
+            print("  expected 47 changed items (10 of them from 4 days ago) and 40 updates")
+
+        # 5) Sync older than DELTA_SYNC_MAX_AGE -> full fetch
+        ebay_listings_cache.write_sync_state(
+            datetime.now(timezone.utc) - ebay_listings_computation.DELTA_SYNC_MAX_AGE - timedelta(hours=1), "delta"
+        )
+        api.calls.clear()
+        stale = _run(ebay_listings_computation.compute_ebay_listings_delta())
+        calls = _call_counts(api)
+        print(f"Sync older than {ebay_listings_computation.DELTA_SYNC_MAX_AGE.days} days: mode={stale.get('mode')} API calls: {calls}")
+        if stale.get("mode") != "full" or calls.get("GetSellerEvents"):
+            failures += 1
+            print("  expected a full fetch without GetSellerEvents calls")
+
+        # 6) More changes than one GetSellerEvents call returns -> full fetch
+        original_limit = ebay_listings_computation.SELLER_EVENTS_MAX_ITEMS
+        ebay_listings_computation.SELLER_EVENTS_MAX_ITEMS = 20
+        now = time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime())
+        for item in api.store[300:330]:
+            item["mod_time"] = now
+        api.calls.clear()
+        overflow = _run(ebay_listings_computation.compute_ebay_listings_delta())
+        ebay_listings_computation.SELLER_EVENTS_MAX_ITEMS = original_limit
+        calls = _call_counts(api)
+        print(f"Window over the item limit: mode={overflow.get('mode')} count={overflow['count']} API calls: {calls}")
+        if overflow.get("mode") != "full" or not calls.get("GetMyeBaySelling"):
+            failures += 1
+            print("  expected a full fetch after the overflowing window")
+
+    print(f"Failures: {failures}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
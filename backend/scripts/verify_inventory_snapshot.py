@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""
+Check the compact inventory snapshot (app/services/excel_inventory.py).
+
+Works on a synthetic inventory.db in a temp folder:
+  1. memory of the snapshot vs. the plain read_sql DataFrame of SELECT * (the
+     old cache), and that both hold the same values
+  2. a projected load reads only the requested columns
+  3. a write by another connection (no invalidate) is picked up on the next
+     version check, and an unchanged table is not read again
+
+Usage:
+    python scripts/verify_inventory_snapshot.py [--rows 50000]
+"""
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(backend_dir / "legacy"))
+
+import pandas as pd
+
+from app.repositories import cache_coordination
+from app.services import excel_inventory as excel_inventory_module
+from app.services.excel_inventory import excel_inventory
+
+
+def _build_inventory(path: Path, rows: int) -> None:
+    rng = random.Random(11)
+    brands = [f"Brand {i}" for i in range(40)]
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            'CREATE TABLE inventory ("SKU (Old)", "EAN", "Status", "Brand", "Category", "Condition", '
+            '"Price Net", "Quantity", "eBay Category ID", "Title", "Purchase Date")'
+        )
+        conn.executemany(
+            "INSERT INTO inventory VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    f"P{i:07d}",
+                    f"0{rng.randrange(10**11, 10**12)}",  # numeric-looking text with a leading zero
+                    rng.choice(["OK", "Sold", "Listed", None]),
+                    rng.choice(brands),
+                    f"Category {rng.randrange(300)}",
+                    rng.choice(["New", "Used", "Refurbished"]),
+                    round(rng.uniform(1, 500), 2),
+                    rng.choice([1, 1, 2, 3, None]),
+                    rng.choice([11450, 15724, 63861, 169291]),
+                    f"Item {i} {rng.choice(brands)} {rng.randrange(10**6)}",
+                    f"2024-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+                )
+                for i in range(rows)
+            ],
+        )
+
+
+def _same_values(expected: pd.DataFrame, got: pd.DataFrame) -> bool:
+    if list(expected.columns) != list(got.columns) or len(expected) != len(got):
+        return False
+    for col in expected.columns:
+        a = expected[col].astype(object).where(expected[col].notna(), None).tolist()
+        b = got[col].astype(object).where(got[col].notna(), None).tolist()
+        if a != b:
+            print(f"  values differ in {col}")
+            return False
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    args = parser.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp_name:
+        tmp = Path(tmp_name)
+        db_path = tmp / "inventory.db"
+        _build_inventory(db_path, args.rows)
+        excel_inventory_module._get_db_path = lambda: str(db_path)
+        cache_coordination.CACHE_STATE_DB_PATH = tmp / "cache_state.db"
+
+        with sqlite3.connect(db_path) as conn:
+            old = pd.read_sql("SELECT * FROM inventory", conn)
+        old_bytes = int(old.memory_usage(deep=True, index=False).sum())
+
+        reads = []
+        read = excel_inventory._read
+
+        def _counting_read(columns):
+            reads.append(list(columns))
+            return read(columns)
+
+        excel_inventory._read = _counting_read
+
+        # 1. Footprint and values
+        start = time.perf_counter()
+        df = excel_inventory.load()
+        seconds = time.perf_counter() - start
+        usage = excel_inventory.memory_usage()
+        print(
+            f"{args.rows} rows x {len(old.columns)} columns: read_sql DataFrame {old_bytes / 1024 / 1024:.1f} MB, "
+            f"snapshot {usage['bytes'] / 1024 / 1024:.1f} MB (load {seconds:.2f}s)"
+        )
+        print("  dtypes: " + ", ".join(f"{c}={t}" for c, t in usage["dtypes"].items()))
+        if usage["bytes"] >= old_bytes:
+            failures += 1
+            print("  snapshot is not smaller than the read_sql DataFrame")
+        if not _same_values(old, df):
+            failures += 1
+            print("  snapshot values differ from SELECT *")
+        if usage["dtypes"]["EAN"] != str(old["EAN"].dtype):
+            failures += 1
+            print("  numeric-looking text (EAN) was converted")
+
+        # 2. Projection
+        excel_inventory.invalidate()
+        reads.clear()
+        projected = excel_inventory.load(["SKU (Old)", "Price Net", "no such column"])
+        print(f"projected load: columns {list(projected.columns)}, read {reads}")
+        if list(projected.columns) != ["SKU (Old)", "Price Net"] or reads != [["SKU (Old)", "Price Net"]]:
+            failures += 1
+            print("  projection read more than the requested columns")
+        if excel_inventory.memory_usage()["columns_loaded"] != 2:
+            failures += 1
+            print("  snapshot holds unrequested columns")
+
+        # 3. Refresh on change, no re-read without one
+        time.sleep(excel_inventory_module.VERSION_CHECK_SECONDS + 0.1)
+        reads.clear()
+        excel_inventory.load(["SKU (Old)", "Price Net"])
+        if reads:
+            failures += 1
+            print(f"  unchanged table was read again: {reads}")
+
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("UPDATE inventory SET \"Price Net\" = 9999.5 WHERE \"SKU (Old)\" = 'P0000000'")
+        time.sleep(excel_inventory_module.VERSION_CHECK_SECONDS + 0.1)
+        refreshed = excel_inventory.load(["SKU (Old)", "Price Net"])
+        price = refreshed.loc[refreshed["SKU (Old)"] == "P0000000", "Price Net"].iloc[0]
+        print(f"after an external UPDATE: Price Net of P0000000 = {price}")
+        if price != 9999.5:
+            failures += 1
+            print("  external write was not picked up")
+
+    print(f"Failures: {failures}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+"""
+Check the pipelined invoice extraction (legacy/agents/invoice_extractor.py).
+
+pdfplumber and google.generativeai are replaced by stand-in modules written
+to a temp folder (so the PDF process pool imports them too): a "PDF" is a
+text file whose pages are read with a fixed amount of CPU work, and the
+Gemini model answers after a fixed latency by reading the invoice text back.
+Then:
+  1. extract_invoice_data per PDF (the old serial loop) vs. extract_invoices,
+     compares wall time and checks both give the same invoices in input order
+     (including an unreadable file, a PDF without text and a Gemini failure)
+  2. Gemini calls of the pipeline start at least 60/INVOICE_GEMINI_RPM apart
+  3. a re-run reads and parses only what was not cached (the PDF without
+     text, the unreadable file and the invoice Gemini failed on)
+  4. a different MODEL_NAME does not reuse the cached results
+
+Usage:
+    python scripts/verify_invoice_pipeline.py [--invoices 16] [--pdf-cpu 0.15] [--gemini 0.3] [--rpm 1200]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(backend_dir / "legacy"))
+
+FAKE_PDFPLUMBER = '''
+import builtins
+import os
+import time
+
+
+class _Page:
+    def __init__(self, text):
+        self._text = text
+
+    def extract_text(self):
+        return self._text
+
+
+class _Pdf:
+    def __init__(self, path):
+        with builtins.open(path, "rb") as f:
+            data = f.read()
+        log = os.environ.get("FAKE_PDFPLUMBER_LOG")
+        if log:
+            with builtins.open(log, "a", encoding="utf-8") as f:
+                f.write(os.path.basename(str(path)) + "\\n")
+        if not data.startswith(b"%FAKEPDF"):
+            raise ValueError("No /Root object! - Is this really a PDF?")
+        end = time.process_time() + float(os.environ.get("FAKE_PDFPLUMBER_CPU_SECONDS", "0"))
+        while time.process_time() < end:
+            pass
+        self.pages = [_Page(page) for page in data[len(b"%FAKEPDF"):].decode("utf-8").split("\\f")]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def open(path):
+    return _Pdf(path)
+'''
+
+FAKE_GENAI = '''
+import json
+import os
+import re
+import threading
+import time
+
+calls = []   # (monotonic start, invoice number)
+_lock = threading.Lock()
+
+
+def configure(api_key=None):
+    pass
+
+
+class types:
+    class GenerationConfig:
+        def __init__(self, **kwargs):
+            self.kwargs = kwargs
+
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+
+class GenerativeModel:
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    def generate_content(self, prompt, generation_config=None):
+        number = re.search(r"Invoice No\\. (\\S+)", prompt).group(1)
+        with _lock:
+            calls.append((time.monotonic(), number))
+        time.sleep(float(os.environ.get("FAKE_GEMINI_SECONDS", "0")))
+        if number in os.environ.get("FAKE_GEMINI_FAIL", "").split(","):
+            raise RuntimeError("429 Resource has been exhausted")
+        items = [
+            {"description": d, "quantity": float(q), "unit_price_net": float(p), "is_shipping": False}
+            for d, q, p in re.findall(r"Item (.+?) qty (\\S+) price (\\S+)", prompt)
+        ]
+        items += [
+            {"description": "Shipping", "quantity": 1.0, "unit_price_net": float(p), "is_shipping": True}
+            for p in re.findall(r"Shipping (\\S+)", prompt)
+        ]
+        return _Response(json.dumps({
+            "supplier_name": re.search(r"Supplier: (.+)", prompt).group(1).strip(),
+            "invoice_number": number,
+            "invoice_date": re.search(r"Date: (\\S+)", prompt).group(1),
+            "buying_entity": "Test Buyer GmbH",
+            "line_items": items,
+        }))
+'''
+
+
+def _install_stubs(tmp: Path) -> None:
+    stubs = tmp / "stubs"
+    (stubs / "google" / "generativeai").mkdir(parents=True)
+    (stubs / "pdfplumber.py").write_text(FAKE_PDFPLUMBER, encoding="utf-8")
+    (stubs / "google" / "generativeai" / "__init__.py").write_text(FAKE_GENAI, encoding="utf-8")
+    sys.path.insert(0, str(stubs))
+
+
+def _write_invoices(folder: Path, count: int):
+    """PDF paths in input order, and the file names of the special cases."""
+    folder.mkdir()
+    paths = []
+    for i in range(count):
+        pages = [
+            f"Supplier: Supplier {i % 4}\nInvoice No. INV-{i:04d}\nDate: 2025-{i % 12 + 1:02d}-15\n"
+            f"Item Jacket {i} qty {1 + i % 3} price {10 + i}.50",
+            f"Item Belt {i} qty 1 price 4.99\nShipping {i % 5}.90",
+        ]
+        path = folder / f"invoice_{i:04d}.pdf"
+        path.write_bytes(b"%FAKEPDF" + "\f".join(pages).encode("utf-8"))
+        paths.append(path)
+    scan = folder / "scan.pdf"
+    scan.write_bytes(b"%FAKEPDF")
+    broken = folder / "broken.pdf"
+    broken.write_bytes(b"<html>not a pdf</html>")
+    paths[3:3] = [scan]
+    paths[7:7] = [broken]
+    return paths
+
+
+def _summary(data):
+    if data is None:
+        return None
+    return (
+        data.filename, data.supplier, data.invoice_number, data.get_date_str(), data.buying_entity,
+        [(i.description, i.unit_price, i.quantity, i.is_shipping) for i in data.items],
+    )
+
+
+def _pdf_reads(log: Path):
+    reads = sorted(log.read_text(encoding="utf-8").split()) if log.exists() else []
+    log.unlink(missing_ok=True)
+    return reads
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--invoices", type=int, default=16)
+    parser.add_argument("--pdf-cpu", type=float, default=0.15, help="CPU seconds per PDF text extraction")
+    parser.add_argument("--gemini", type=float, default=0.3, help="seconds per Gemini call")
+    parser.add_argument("--rpm", type=float, default=1200, help="INVOICE_GEMINI_RPM for the pipeline")
+    args = parser.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp_name:
+        tmp = Path(tmp_name)
+        _install_stubs(tmp)
+        pdf_log = tmp / "pdf_reads.log"
+        failing_invoice = f"INV-{min(5, args.invoices - 1):04d}"
+        os.environ.update({
+            "GOOGLE_API_KEY": "test-key",
+            "FAKE_PDFPLUMBER_LOG": str(pdf_log),
+            "FAKE_PDFPLUMBER_CPU_SECONDS": str(args.pdf_cpu),
+            "FAKE_GEMINI_SECONDS": str(args.gemini),
+            "FAKE_GEMINI_FAIL": failing_invoice,
+        })
+        sys.path.insert(0, str(backend_dir / "legacy" / "agents"))
+        import google.generativeai as genai
+        import invoice_extractor
+
+        invoice_extractor.EXTRACTION_CACHE_DIR = tmp / "invoice_extractions"
+        invoice_extractor.GEMINI_REQUESTS_PER_MINUTE = args.rpm
+        pdfs = _write_invoices(tmp / "Invoices", args.invoices)
+        uncached = sorted(["scan.pdf", "broken.pdf", f"invoice_{int(failing_invoice[4:]):04d}.pdf"])
+
+        # 1. Serial reference vs pipeline
+        start = time.perf_counter()
+        expected = [_summary(invoice_extractor.extract_invoice_data(pdf)) for pdf in pdfs]
+        serial_seconds = time.perf_counter() - start
+        serial_calls = len(genai.calls)
+        _pdf_reads(pdf_log)
+
+        genai.calls.clear()
+        start = time.perf_counter()
+        results = invoice_extractor.extract_invoices(pdfs)
+        seconds = time.perf_counter() - start
+        got = [_summary(data) for _, data, _ in results]
+        print(
+            f"{len(pdfs)} PDFs: serial {serial_seconds:.2f}s ({serial_calls} Gemini calls), "
+            f"pipeline {seconds:.2f}s ({len(genai.calls)} Gemini calls, "
+            f"{invoice_extractor.PDF_TEXT_WORKERS} PDF processes, {invoice_extractor.GEMINI_WORKERS} Gemini threads)"
+        )
+        if [pdf for pdf, _, _ in results] != pdfs or any(error for _, _, error in results):
+            failures += 1
+            print("  pipeline results are not one per PDF in input order without errors")
+        if got != expected:
+            failures += 1
+            print(f"  pipeline invoices differ from the serial ones: {sum(a != b for a, b in zip(got, expected))}")
+        if seconds >= serial_seconds:
+            failures += 1
+            print("  pipeline is not faster than the serial loop")
+
+        # 2. Rate limit
+        starts = sorted(t for t, _ in genai.calls)
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        interval = 60.0 / args.rpm
+        print(f"Gemini call spacing: min {min(gaps):.3f}s (limit {interval:.3f}s)")
+        if min(gaps) < interval - 0.005:
+            failures += 1
+            print("  Gemini calls started closer together than INVOICE_GEMINI_RPM allows")
+
+        # 3. Re-run from the cache
+        _pdf_reads(pdf_log)
+        genai.calls.clear()
+        start = time.perf_counter()
+        again = [_summary(data) for _, data, _ in invoice_extractor.extract_invoices(pdfs)]
+        seconds = time.perf_counter() - start
+        reads = _pdf_reads(pdf_log)
+        print(f"re-run: {seconds:.2f}s, PDFs read {reads}, Gemini calls {[n for _, n in genai.calls]}")
+        if again != expected:
+            failures += 1
+            print("  re-run invoices differ from the first run")
+        if reads != uncached or [n for _, n in genai.calls] != [failing_invoice]:
+            failures += 1
+            print(f"  expected only {uncached} to be read again and only {failing_invoice} to be parsed again")
+
+        # 4. Cache entries belong to one model
+        invoice_extractor.MODEL_NAME = "models/another-model"
+        genai.calls.clear()
+        invoice_extractor.extract_invoices(pdfs)
+        print(f"after changing MODEL_NAME: {len(genai.calls)} Gemini calls")
+        if len(genai.calls) != serial_calls:
+            failures += 1
+            print("  cached results of another model were reused")
+
+    print(f"Failures: {failures}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""
+Check the product document store against the file scans it replaces.
+
+Works on a temp copy of products/ and a temp product_docs.db:
+  1. cold build (refresh) and warm refresh timings
+  2. list_skus / image_counts / DE-listing JSON mapping / find_skus compared
+     with the equivalent per-file scans
+  3. a write through write_sku_json is visible immediately; a file written
+     directly is picked up by the next refresh; a deleted file disappears
+
+Usage:
+    python scripts/verify_product_doc_store.py
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(backend_dir / "legacy"))
+os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+import config  # type: ignore
+
+from app import main
+from app.repositories import cache_coordination, product_doc_store, sku_json_repo
+from app.services import sku_list
+
+
+def _scan(products_dir: Path):
+    docs = {}
+    for path in sorted(products_dir.glob("*.json")):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if isinstance(data, dict) and len(data) == 1 and isinstance(next(iter(data.values())), dict):
+            docs[next(iter(data))] = next(iter(data.values()))
+    return docs
+
+
+def main_check() -> None:
+    failures = 0
+    source = Path(config.PRODUCTS_FOLDER_PATH)
+    with tempfile.TemporaryDirectory() as tmp:
+        products_dir = Path(tmp) / "products"
+        shutil.copytree(source, products_dir)
+        config.PRODUCTS_FOLDER_PATH = products_dir
+        product_doc_store.PRODUCT_DOCS_DB_PATH = Path(tmp) / "product_docs.db"
+        cache_coordination.CACHE_STATE_DB_PATH = Path(tmp) / "cache_state.db"
+
+        start = time.perf_counter()
+        built = product_doc_store.refresh(force=True)
+        print(f"cold build: {built} in {time.perf_counter() - start:.3f}s")
+        start = time.perf_counter()
+        product_doc_store.refresh(force=True)
+        print(f"warm refresh (stat only): {time.perf_counter() - start:.3f}s")
+
+        start = time.perf_counter()
+        docs = _scan(products_dir)
+        print(f"full file scan for comparison: {time.perf_counter() - start:.3f}s")
+
+        if product_doc_store.list_skus() != set(docs):
+            failures += 1
+            print("  list_skus differs from the JSON files")
+
+        counts = product_doc_store.image_counts()
+        sku_list._json_counts_for_sku_cached.cache_clear()
+        bad = [sku for sku in docs if counts.get(sku) != sku_list._json_counts_for_sku_cached(sku)]
+        if bad:
+            failures += 1
+            print(f"  image_counts differ for {len(bad)} SKUs, e.g. {bad[:3]}")
+
+        start = time.perf_counter()
+        documents = product_doc_store.get_sections(docs, main.LISTING_SKU_JSON_PATHS)
+        bulk_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        per_file = {sku: main._get_listing_sku_json_mapping(sku) for sku in docs}
+        file_seconds = time.perf_counter() - start
+        bulk = {sku: main._get_listing_sku_json_mapping(sku, documents) for sku in docs}
+        print(f"DE listing JSON mapping: per-file {file_seconds:.3f}s, doc store {bulk_seconds:.3f}s")
+        bad = [sku for sku in docs if per_file[sku] != bulk[sku]]
+        if bad:
+            failures += 1
+            print(f"  listing mapping differs for {len(bad)} SKUs, e.g. {bad[:3]}")
+
+        expected = sorted(
+            sku for sku, doc in docs.items()
+            if not str((doc.get("eBay SEO") or {}).get("eBay Title") or "").strip()
+            and (doc.get("Images") or {}).get("main_images")
+        )
+        found = product_doc_store.find_skus(missing_seo_title=True, has_main_images=True)
+        print(f"find_skus(missing_seo_title, has_main_images): {len(found)} SKUs")
+        if found != expected:
+            failures += 1
+            print(f"  find_skus differs from scan: {len(found)} vs {len(expected)}")
+
+        # Sync on write / external change / delete
+        sku = next(iter(docs))
+        doc = dict(docs[sku], **{"eBay SEO": {"eBay Title": "Doc store check"}})
+        sku_json_repo.write_sku_json(sku, doc)
+        if sku in product_doc_store.find_skus(missing_seo_title=True):
+            failures += 1
+            print("  repository write not mirrored")
+
+        other = sorted(docs)[1]
+        path = products_dir / f"{other}.json"
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data[other]["Ebay Category"] = {"eBay Category ID": "999999"}
+        path.write_text(json.dumps(data), encoding="utf-8")
+        (products_dir / f"{sorted(docs)[2]}.json").unlink()
+        changed = product_doc_store.refresh(force=True)
+        print(f"after external write + delete: {changed}")
+        if product_doc_store.find_skus(ebay_category_id="999999") != [other] or changed["removed"] != 1:
+            failures += 1
+            print("  external write/delete not picked up by refresh")
+
+    print(f"Failures: {failures}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main_check()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""
+Check locked, atomic product JSON writes under concurrency.
+
+Works on a temp products/ folder:
+  1. threads and processes append change-log entries to the same SKU via
+     sku_json_repo.update_sku_json; every entry must survive (no lost updates)
+  2. an optimistic write with a stale expected_version raises VersionConflict
+  3. no temp files are left behind and every file still parses
+
+Usage:
+    python scripts/verify_product_file_locking.py [--threads 8] [--processes 4] [--writes 25]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(backend_dir / "legacy"))
+
+import config  # type: ignore
+import json_codec  # type: ignore
+
+from app.repositories import cache_coordination, product_doc_store, sku_json_repo
+
+SKU = "LOCKTEST001"
+
+
+def _use_folder(products_dir: str) -> None:
+    config.PRODUCTS_FOLDER_PATH = Path(products_dir)
+    product_doc_store.PRODUCT_DOCS_DB_PATH = Path(products_dir).parent / "product_docs.db"
+    cache_coordination.CACHE_STATE_DB_PATH = Path(products_dir).parent / "cache_state.db"
+
+
+def _append_entries(worker: str, writes: int) -> None:
+    for i in range(writes):
+        def _append(detail, entry=f"{worker}-{i}"):
+            detail.setdefault("Change Log", []).append(entry)
+        sku_json_repo.update_sku_json(SKU, _append)
+
+
+def _process_worker(products_dir: str, worker: str, threads: int, writes: int) -> None:
+    _use_folder(products_dir)
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for t in range(threads):
+            pool.submit(_append_entries, f"{worker}.{t}", writes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--writes", type=int, default=25)
+    args = parser.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        products_dir = Path(tmp) / "products"
+        products_dir.mkdir()
+        _use_folder(str(products_dir))
+        sku_json_repo.write_sku_json(SKU, {"Product Info": {"Title": "Lock test"}})
+
+        # 1. Lost updates across threads and processes
+        start = time.perf_counter()
+        procs = [
+            multiprocessing.Process(target=_process_worker, args=(str(products_dir), f"p{p}", args.threads, args.writes))
+            for p in range(args.processes)
+        ]
+        for proc in procs:
+            proc.start()
+        _process_worker(str(products_dir), "main", args.threads, args.writes)
+        for proc in procs:
+            proc.join()
+        elapsed = time.perf_counter() - start
+
+        expected = (args.processes + 1) * args.threads * args.writes
+        log = sku_json_repo.read_sku_json(SKU).get("Change Log", [])
+        print(f"{expected} concurrent read-modify-writes in {elapsed:.2f}s, {len(log)} entries kept")
+        if len(log) != expected or len(set(log)) != expected:
+            failures += 1
+            print(f"  lost updates: expected {expected}, found {len(log)} ({len(set(log))} unique)")
+
+        # 2. Optimistic write with a stale version
+        detail, version = sku_json_repo.read_sku_json_versioned(SKU)
+        sku_json_repo.update_sku_json(SKU, lambda d: d.update({"Touched": True}))
+        try:
+            sku_json_repo.write_sku_json(SKU, detail, expected_version=version)
+            failures += 1
+            print("  stale expected_version was accepted")
+        except sku_json_repo.VersionConflict as exc:
+            print(f"stale write rejected: {exc}")
+        if not sku_json_repo.read_sku_json(SKU).get("Touched"):
+            failures += 1
+            print("  stale write overwrote the newer file")
+
+        # 3. Leftovers and readability
+        leftovers = [p.name for p in products_dir.iterdir() if p.name.endswith(".tmp")]
+        if leftovers:
+            failures += 1
+            print(f"  temp files left behind: {leftovers}")
+        for path in products_dir.glob("*.json"):
+            json_codec.read_file(path)
+        mode = os.stat(products_dir / f"{SKU}.json").st_mode & 0o777
+        if mode != 0o644:
+            failures += 1
+            print(f"  unexpected file mode {oct(mode)}")
+
+    print(f"Failures: {failures}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
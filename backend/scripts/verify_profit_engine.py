@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""
+Check the vectorized profit engine against the scalar reference.
+
+Runs both paths over the current eBay listings cache (read-only), reports any
+listing whose profit_analysis differs, and prints timings for each path.
+"""
+import copy
+import math
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(backend_dir / "legacy"))
+
+from app.services import ebay_listings_cache
+from app.services.ebay_listings_computation import _enrich_listings_with_profit
+from app.services.ebay_profit_calculator import invalidate_profit_caches
+
+
+def _same(a, b) -> bool:
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return a == b and type(a) is type(b)
+
+
+def main() -> None:
+    cache = ebay_listings_cache.read_cache() or {}
+    listings = cache.get("listings", []) or []
+    print(f"Listings in cache: {len(listings)}")
+    if not listings:
+        return
+
+    # Warm fee/cost caches once so both timings measure only the computation
+    invalidate_profit_caches()
+    _enrich_listings_with_profit(copy.deepcopy(listings[:1]), vectorized=False)
+
+    scalar = copy.deepcopy(listings)
+    start = time.perf_counter()
+    _enrich_listings_with_profit(scalar, vectorized=False)
+    scalar_seconds = time.perf_counter() - start
+
+    vectorized = copy.deepcopy(listings)
+    start = time.perf_counter()
+    _enrich_listings_with_profit(vectorized)
+    vectorized_seconds = time.perf_counter() - start
+
+    mismatches = 0
+    for ref, vec in zip(scalar, vectorized):
+        ref_pa, vec_pa = ref["profit_analysis"], vec["profit_analysis"]
+        if ref_pa.keys() != vec_pa.keys() or not all(_same(ref_pa[k], vec_pa[k]) for k in ref_pa):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"MISMATCH item_id={ref.get('item_id')}: {ref_pa} != {vec_pa}")
+
+    print(f"Scalar:     {scalar_seconds:.3f}s")
+    print(f"Vectorized: {vectorized_seconds:.3f}s")
+    print(f"Mismatches: {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+"""
+Check the concurrent schema refresh (ebay_schema.iter_refresh_schemas).
+
+Runs a local stand-in for the eBay Taxonomy API (fixed latency per request,
+ETag / If-None-Match support that can be switched off) and a temp schemas/
+folder, then:
+  1. refreshes stale schemas serially (1 worker) and on the pool, and
+     compares wall time and TCP connections used
+  2. without ETags, a refresh of unchanged schemas rewrites no file
+     (content hash)
+  3. with ETags, unchanged schemas come back as 304 and are not rewritten;
+     after changing a few categories on the server exactly those are
+     reported as changed and rewritten
+  4. the progress stream is start, one result per category, complete
+
+Usage:
+    python scripts/verify_schema_refresh.py [--categories 100] [--latency 0.03]
+"""
+import argparse
+import json
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(backend_dir / "legacy"))
+
+from app.repositories import cache_coordination, ebay_schema_catalog_repo, ebay_schema_repo
+from app.services import ebay_category_fees, ebay_schema
+from app.services import excel_inventory as excel_inventory_module
+from app.services.excel_inventory import excel_inventory
+
+
+class FakeTaxonomy:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.etags = True
+        self.versions = {}
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "not_modified": 0, "connections": 0}
+
+    def payload(self, category_id: str) -> dict:
+        version = self.versions.get(category_id, 1)
+        return {
+            "aspects": [
+                {
+                    "localizedAspectName": "Brand",
+                    "aspectConstraint": {"aspectRequired": True},
+                    "aspectValues": [{"localizedValue": f"Brand {category_id}"}],
+                },
+                {
+                    "localizedAspectName": "Colour",
+                    "aspectConstraint": {"aspectRequired": False},
+                    "aspectValues": [{"localizedValue": f"Colour v{version}"}],
+                },
+            ]
+        }
+
+    def handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"   # keep-alive
+
+            def setup(self):
+                super().setup()
+                with api.lock:
+                    api.stats["connections"] += 1
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes = b"", etag: str = "") -> None:
+                self.send_response(status)
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                time.sleep(api.latency)
+                url = urlparse(self.path)
+                with api.lock:
+                    api.stats["requests"] += 1
+                if url.path.endswith("/get_default_category_tree_id"):
+                    self._send(200, json.dumps({"categoryTreeId": "77"}).encode())
+                    return
+                category_id = parse_qs(url.query)["category_id"][0]
+                etag = f'"{category_id}-v{api.versions.get(category_id, 1)}"' if api.etags else ""
+                if etag and self.headers.get("If-None-Match") == etag:
+                    with api.lock:
+                        api.stats["not_modified"] += 1
+                    self._send(304, etag=etag)
+                    return
+                self._send(200, json.dumps(api.payload(category_id)).encode(), etag)
+
+        return Handler
+
+
+def _mtimes(ids):
+    return {c: ebay_schema_repo.get_schema_path(c).stat().st_mtime_ns for c in ids}
+
+
+def _refresh(api: FakeTaxonomy, max_workers=None):
+    before = dict(api.stats)
+    start = time.perf_counter()
+    events = list(ebay_schema.iter_refresh_schemas(max_workers=max_workers))
+    seconds = time.perf_counter() - start
+    used = {k: api.stats[k] - before[k] for k in api.stats}
+    return events, seconds, used
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--categories", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.03, help="seconds per fake API request")
+    args = parser.parse_args()
+
+    failures = 0
+    api = FakeTaxonomy(args.latency)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), api.handler())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as tmp_name:
+        tmp = Path(tmp_name)
+        schemas_dir = tmp / "schemas"
+        schemas_dir.mkdir()
+        ebay_schema_repo.SCHEMAS_DIR = schemas_dir
+        ebay_schema_catalog_repo.SCHEMAS_DIR = schemas_dir
+        ebay_schema_catalog_repo.MAPPING_FILE = schemas_dir / "category_mapping.json"
+        ebay_schema_catalog_repo.SIDECAR_FILE = tmp / "ebay_schema_catalog.json"
+        ebay_schema_catalog_repo.invalidate_catalog()
+        with sqlite3.connect(tmp / "inventory.db") as conn:
+            conn.execute('CREATE TABLE inventory ("SKU (Old)", "eBay Category ID", "Payment Fee €", "Sales Commission % up to 7500€")')
+            conn.execute("INSERT INTO inventory VALUES ('P1', 20000, 0.35, 11.0)")
+        excel_inventory_module._get_db_path = lambda: str(tmp / "inventory.db")
+        cache_coordination.CACHE_STATE_DB_PATH = tmp / "cache_state.db"
+        excel_inventory.invalidate()
+        ebay_category_fees.invalidate()
+        ebay_schema.get_taxonomy_endpoint = lambda: f"http://127.0.0.1:{server.server_port}"
+        ebay_schema.get_ebay_token = lambda: "test-token"
+
+        ids = [str(20000 + i) for i in range(args.categories)]
+        for cat_id in ids:
+            ebay_schema_repo.save_schema(
+                cat_id, {"required": [], "optional": []},
+                {"category_name": f"Category {cat_id}", "category_id": cat_id, "marketplace": "EBAY_DE", "fees": {}},
+            )
+
+        # 1. Stale schemas: serial vs pool (no ETags yet)
+        api.etags = False
+        events, serial_seconds, serial_used = _refresh(api, max_workers=1)
+        changed = events[-1]["changed"]
+        print(f"serial refresh of {len(ids)} stale schemas: {serial_seconds:.2f}s, {len(changed)} changed, "
+              f"{serial_used['connections']} connections")
+        if sorted(changed) != ids:
+            failures += 1
+            print("  not every stale schema was reported as changed")
+
+        mtimes = _mtimes(ids)
+        events, pool_seconds, pool_used = _refresh(api)
+        print(f"pool refresh ({ebay_schema.ebay_schema_fetch.MAX_PARALLEL_SCHEMA_FETCHES} workers), nothing changed: "
+              f"{pool_seconds:.2f}s, {len(events[-1]['changed'])} changed, {pool_used['connections']} connections")
+        if pool_seconds >= serial_seconds:
+            failures += 1
+            print("  pool is not faster than the serial refresh")
+
+        # 2. Content hash: nothing rewritten
+        rewritten = [c for c, m in _mtimes(ids).items() if m != mtimes[c]]
+        if events[-1]["changed"] or rewritten:
+            failures += 1
+            print(f"  unchanged schemas rewritten without ETags: {len(rewritten)}")
+
+        # 3. ETags: first refresh stores them, then 304s; then a few real changes
+        api.etags = True
+        _refresh(api)
+        mtimes = _mtimes(ids)
+        events, seconds, used = _refresh(api)
+        print(f"refresh with stored ETags: {seconds:.2f}s, {used['not_modified']}/{len(ids)} answered 304, "
+              f"{len(events[-1]['changed'])} changed")
+        rewritten = [c for c, m in _mtimes(ids).items() if m != mtimes[c]]
+        if used["not_modified"] != len(ids) or events[-1]["changed"] or rewritten:
+            failures += 1
+            print(f"  expected all 304 and no writes, rewritten {len(rewritten)}")
+
+        bumped = ids[3:8]
+        for cat_id in bumped:
+            api.versions[cat_id] = 2
+        events, seconds, used = _refresh(api)
+        rewritten = sorted(c for c, m in _mtimes(ids).items() if m != mtimes[c])
+        print(f"after changing {len(bumped)} categories: changed {sorted(events[-1]['changed'])}, rewritten {len(rewritten)}")
+        if sorted(events[-1]["changed"]) != bumped or rewritten != bumped:
+            failures += 1
+            print("  changed/rewritten categories do not match the server changes")
+        values = ebay_schema_repo.get_schema(bumped[0])["schema"]["optional"][0]["values"]
+        if values != ["Colour v2"]:
+            failures += 1
+            print(f"  rewritten schema has old values {values}")
+
+        # 4. Stream shape
+        results = [e for e in events if e["type"] == "result"]
+        if (
+            events[0] != {"type": "start", "total": len(ids)}
+            or events[-1]["type"] != "complete"
+            or [e["done"] for e in results] != list(range(1, len(ids) + 1))
+            or sorted(e["category_id"] for e in results) != ids
+        ):
+            failures += 1
+            print("  progress events are not start, one result per category, complete")
+
+    server.shutdown()
+    print(f"Failures: {failures}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
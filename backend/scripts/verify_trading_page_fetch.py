@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""
+Check concurrent GetMyeBaySelling paging against a local fake Trading API.
+
+Runs fetch_ebay_listings_fast, fetch_ebay_listings_detailed and
+ebay_sync.fetch_active_listings_from_ebay once with a single page in flight
+(the old sequential behaviour) and once with MAX_PARALLEL_PAGE_FETCHES, then
+checks that both return identical listings in page order, that progress
+events stay monotonic and that every page was requested exactly once.
+
+Usage:
+    python scripts/verify_trading_page_fetch.py [--items 3000] [--latency 0.15]
+"""
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(backend_dir / "legacy"))
+
+from fake_trading_api import FakeTradingApi
+
+from app.services import ebay_listings_computation, ebay_sync, ebay_trading_client
+
+
+def _run_generator(gen):
+    progress, complete = [], None
+    for event in gen:
+        if event["status"] == "progress":
+            progress.append(event)
+        elif event["status"] == "complete":
+            complete = event
+    return progress, complete
+
+
+def _check_progress(label, progress, total_pages) -> int:
+    pages = [event["page"] for event in progress]
+    counts = [event["count"] for event in progress]
+    if pages != list(range(1, total_pages + 1)) or counts != sorted(counts):
+        print(f"  {label}: progress not monotonic: pages={pages} counts={counts}")
+        return 1
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=3000)
+    parser.add_argument("--latency", type=float, default=0.15)
+    args = parser.parse_args()
+
+    failures = 0
+    parallel = ebay_trading_client.MAX_PARALLEL_PAGE_FETCHES
+
+    with FakeTradingApi(items=args.items, latency=args.latency) as api:
+        ebay_listings_computation.TRADING_ENDPOINT = api.url
+        ebay_sync.get_api_endpoint = lambda: api.url
+        ebay_sync.get_ebay_token = lambda: "fake-token"
+        total_pages = -(-args.items // 200)
+
+        runs = {
+            "fast": lambda: _run_generator(ebay_listings_computation.fetch_ebay_listings_fast("fake-token")),
+            "detailed": lambda: _run_generator(ebay_listings_computation.fetch_ebay_listings_detailed("fake-token")),
+            "ebay_sync": lambda: (None, {"listings": ebay_sync.fetch_active_listings_from_ebay()}),
+        }
+        for label, run in runs.items():
+            results = {}
+            for workers in (1, parallel):
+                ebay_trading_client.MAX_PARALLEL_PAGE_FETCHES = workers
+                api.calls.clear()
+                start = time.perf_counter()
+                progress, complete = run()
+                seconds = time.perf_counter() - start
+                results[workers] = complete["listings"]
+                print(f"{label:<10} pages in flight={workers}: {len(complete['listings'])} listings in {seconds:.2f}s")
+
+                page_calls = Counter(key for call, key in api.calls if call == "GetMyeBaySelling")
+                if sorted(page_calls) != sorted(str(p) for p in range(1, total_pages + 1)) or max(page_calls.values()) != 1:
+                    failures += 1
+                    print(f"  {label}: unexpected page requests {dict(page_calls)}")
+                if progress is not None:
+                    failures += _check_progress(label, progress, total_pages)
+                    if complete.get("total_pages") != total_pages:
+                        failures += 1
+                        print(f"  {label}: total_pages {complete.get('total_pages')} != {total_pages}")
+
+            sequential, concurrent = results[1], results[parallel]
+            expected_ids = [item["item_id"] for item in api.store]
+            if [l["item_id"] for l in concurrent] != expected_ids:
+                failures += 1
+                print(f"  {label}: listings not in page order")
+            if sequential != concurrent:
+                failures += 1
+                print(f"  {label}: sequential and concurrent results differ")
+
+        ebay_trading_client.MAX_PARALLEL_PAGE_FETCHES = parallel
+
+    print(f"Failures: {failures}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -122,6 +122,57 @@ export default function App() {
     }
   };
 
+  const computeEbayListingsDelta = async () => {
+    setEbayListingsComputing(true);
+    setEbayListingsMode("delta");
+    setEbayListingsProgress({ page: 0, total_pages: 0, count: 0, detail_lookups: 0 });
+    const finish = () => {
+      setEbayListingsComputing(false);
+      setEbayListingsMode("");
+      setEbayListingsProgress({ page: 0, total_pages: 0, count: 0, detail_lookups: 0 });
+    };
+    try {
+      const eventSource = new EventSource("/api/skus/ebay-listings/compute-delta");
+
+      eventSource.onmessage = (event) => {
+        try {
+          const progress = JSON.parse(event.data);
+          if (progress.status === "progress") {
+            setEbayListingsProgress({
+              page: Number(progress.page || 0),
+              total_pages: Number(progress.total_pages || 0),
+              count: Number(progress.count || 0),
+              detail_lookups: Number(progress.detail_lookups || 0),
+            });
+          } else if (progress.status === "complete") {
+            eventSource.close();
+            if (progress.mode === "delta") {
+              alert(`✅ Delta sync completed: ${progress.changed} changed (${progress.added} new, ${progress.updated} updated, ${progress.removed} ended), ${progress.count} listings in cache`);
+            } else {
+              alert(`✅ No previous sync found - full fetch completed: ${progress.count} eBay listings synced (${progress.total_pages} pages)`);
+            }
+            finish();
+          } else if (progress.status === "error") {
+            eventSource.close();
+            alert(`❌ Delta sync failed: ${progress.message || "Unknown error"}`);
+            finish();
+          }
+        } catch {
+          eventSource.close();
+          finish();
+        }
+      };
+
+      eventSource.onerror = () => {
+        eventSource.close();
+        finish();
+      };
+    } catch (error) {
+      alert(`❌ Failed to start delta sync: ${error.message}`);
+      finish();
+    }
+  };
+
   return (
     <div style={{ fontFamily: "system-ui, Arial", padding: 16 }}>
       <header style={{ display: "flex", gap: 12, alignItems: "center", marginBottom: 16 }}>
@@ -183,20 +234,36 @@ export default function App() {
         >
           {ebayListingsComputing && ebayListingsMode === "detailed" ? "⏳ Detailed Fetch..." : "🔎 eBay Fetch Detailed"}
         </button>
+        <button
+          onClick={computeEbayListingsDelta}
+          disabled={ebayListingsComputing}
+          title="Only fetch listings changed since the last sync"
+          style={{
+            padding: "8px 16px",
+            backgroundColor: ebayListingsComputing ? "#ccc" : "#20c997",
+            color: "white",
+            border: "none",
+            borderRadius: "4px",
+            fontSize: "14px",
+            cursor: ebayListingsComputing ? "default" : "pointer"
+          }}
+        >
+          {ebayListingsComputing && ebayListingsMode === "delta" ? "⏳ Syncing Changes..." : "🔄 eBay Sync Changes"}
+        </button>
         <div style={{ marginLeft: "auto", color: "#666" }}>FastAPI + React (Vite) + eBay Integration</div>
       </header>
 
       {ebayListingsComputing && ebayListingsProgress.total_pages > 0 && (
         <div style={{ marginBottom: 16, background: "#f8f9fa", border: "1px solid #dee2e6", borderRadius: 6, padding: 10 }}>
           <div style={{ fontSize: "13px", marginBottom: 6, color: "#333" }}>
-            {ebayListingsMode === "detailed" ? "🔎 Detailed Fetch" : "⚡ Fast Fetch"} • Page {ebayListingsProgress.page} / {ebayListingsProgress.total_pages} • Listings: {ebayListingsProgress.count}
+            {ebayListingsMode === "detailed" ? "🔎 Detailed Fetch" : ebayListingsMode === "delta" ? "🔄 Delta Sync" : "⚡ Fast Fetch"} • Page {ebayListingsProgress.page} / {ebayListingsProgress.total_pages} • Listings: {ebayListingsProgress.count}
             {ebayListingsMode === "detailed" ? ` • Enrichments: ${ebayListingsProgress.detail_lookups}` : ""}
           </div>
           <div style={{ width: "100%", height: 14, background: "#e0e0e0", borderRadius: 4, overflow: "hidden" }}>
             <div
               style={{
                 height: "100%",
-                background: ebayListingsMode === "detailed" ? "#6f42c1" : "#17a2b8",
+                background: ebayListingsMode === "detailed" ? "#6f42c1" : ebayListingsMode === "delta" ? "#20c997" : "#17a2b8",
                 width: `${Math.min(100, (ebayListingsProgress.page / ebayListingsProgress.total_pages) * 100)}%`,
                 transition: "width 0.3s ease",
               }}
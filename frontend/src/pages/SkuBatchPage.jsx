@@ -106,6 +106,7 @@ export default function SkuBatchPage() {
   const [bulkEbayListingOpen, setBulkEbayListingOpen] = useState(false);
   const [bulkEbayListingSaving, setBulkEbayListingSaving] = useState(false);
   const [bulkEbayListingCreating, setBulkEbayListingCreating] = useState(false);
+  const [bulkEbayListingProgress, setBulkEbayListingProgress] = useState({ current: 0, total: 0, sku: "" });
   const [bulkEbayImageSyncing, setBulkEbayImageSyncing] = useState(false);
   const [bulkEbaySeoOpen, setBulkEbaySeoOpen] = useState(false);
   const [bulkEbaySeoSaving, setBulkEbaySeoSaving] = useState(false);
@@ -1588,7 +1589,7 @@ export default function SkuBatchPage() {
 
       setBulkEbayListingCreating(true);
       try {
-        const res = await fetch("/api/ebay/listings/batch", {
+        const res = await fetch("/api/ebay/listings/batch/stream", {
           method: "POST",
           headers: { "Content-Type": "application/json" },
           body: JSON.stringify({ listings })
@@ -1599,8 +1600,71 @@ export default function SkuBatchPage() {
           throw new Error(err.detail || "Batch create failed");
         }
 
-        const data = await res.json();
-        alert(`✅ Created ${data.successful_count} listings, ${data.failed_count} failed`);
+        if (!res.body) {
+          throw new Error("Streaming is not available in this browser");
+        }
+
+        setBulkEbayListingProgress({ current: 0, total: listings.length, sku: "" });
+        const reader = res.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = "";
+        let summary = null;
+        const failedRows = [];
+
+        while (true) {
+          const { value, done } = await reader.read();
+          if (done) {
+            break;
+          }
+
+          buffer += decoder.decode(value, { stream: true });
+          const chunks = buffer.split("\n\n");
+          buffer = chunks.pop() || "";
+
+          for (const chunk of chunks) {
+            const dataLines = chunk
+              .split("\n")
+              .filter((line) => line.startsWith("data:"))
+              .map((line) => line.slice(5).trim());
+
+            if (dataLines.length === 0) {
+              continue;
+            }
+
+            let payload;
+            try {
+              payload = JSON.parse(dataLines.join("\n"));
+            } catch {
+              continue;
+            }
+
+            if (payload.type === "result") {
+              const result = payload.result || {};
+              if (!payload.success) {
+                failedRows.push(`${payload.sku}: ${result.message || "failed"}`);
+              }
+              setBulkEbayListingProgress({ current: payload.completed, total: payload.total, sku: payload.sku || "" });
+              continue;
+            }
+
+            if (payload.type === "complete") {
+              summary = payload;
+              continue;
+            }
+
+            if (payload.type === "error") {
+              throw new Error(payload.message || "Batch create failed");
+            }
+          }
+        }
+
+        if (!summary) {
+          throw new Error("Batch create stream ended unexpectedly");
+        }
+
+        const skippedText = summary.skipped ? `, ${summary.skipped} skipped (stopped on error)` : "";
+        const preview = failedRows.slice(0, 10).join("\n");
+        alert(`✅ Created ${summary.successful} listings, ${summary.failed} failed${skippedText}${preview ? `\n\n${preview}` : ""}`);
       } catch (e) {
         alert(`❌ ${e.message}`);
       } finally {
@@ -2735,7 +2799,11 @@ export default function SkuBatchPage() {
               disabled={bulkEbayListingSaving || bulkEbayListingCreating}
               style={{ padding: "8px 12px", background: "#4CAF50", color: "white", border: "none", borderRadius: 4, cursor: (bulkEbayListingSaving || bulkEbayListingCreating) ? "not-allowed" : "pointer" }}
             >
-              {bulkEbayListingSaving ? "Saving..." : bulkEbayListingCreating ? "Creating..." : "Save & Create All"}
+              {bulkEbayListingSaving
+                ? "Saving..."
+                : bulkEbayListingCreating
+                  ? `Creating... ${bulkEbayListingProgress.current}/${bulkEbayListingProgress.total}`
+                  : "Save & Create All"}
             </button>
           </div>
         </div>
@@ -28,6 +28,8 @@ export default function SkuListPage() {
   const location = useLocation();
   const hasRestoredState = useRef(false);
   const latestRequestIdRef = useRef(0);
+  // Keyset cursors per page for the current query ({ sig, cursors: { [page]: cursor } })
+  const pageCursorsRef = useRef({ sig: "", cursors: {} });
   const syncModalAutoOpenedRef = useRef(false);
   const [reloadTick, setReloadTick] = useState(0);
 
@@ -295,6 +297,18 @@ export default function SkuListPage() {
       params.append("filters", JSON.stringify(filters));
     }
 
+    // Reuse the cursor returned for this page as long as the query is unchanged
+    const sigParams = new URLSearchParams(params);
+    sigParams.delete("page");
+    const querySig = sigParams.toString();
+    if (pageCursorsRef.current.sig !== querySig) {
+      pageCursorsRef.current = { sig: querySig, cursors: {} };
+    }
+    const pageCursor = pageCursorsRef.current.cursors[page];
+    if (pageCursor) {
+      params.append("cursor", pageCursor);
+    }
+
     const requestId = ++latestRequestIdRef.current;
     setTableLoading(true);
     setErr("");
@@ -310,6 +324,9 @@ export default function SkuListPage() {
           if (Array.isArray(data.items)) {
             setRows(data.items);
             setTotal(data.total);
+            if (data.next_cursor && pageCursorsRef.current.sig === querySig) {
+              pageCursorsRef.current.cursors[page + 1] = data.next_cursor;
+            }
           } else {
             setRows([]);
           }